@@ -131,6 +131,10 @@ __all__ = ['heappush', 'heappop', 'heapify', 'heapreplace', 'merge',
 
 from itertools import islice, count, imap, izip, tee, chain
 from operator import itemgetter
+try:
+    from __pypy__ import list_topk as _list_topk
+except ImportError:
+    _list_topk = None
 
 def cmp_lt(x, y):
     # Use __lt__ if available; otherwise, try __le__.
@@ -420,6 +424,10 @@ def nsmallest(n, iterable, key=None):
         if n >= size:
             return sorted(iterable, key=key)[:n]
 
+    # Lists are handled natively on PyPy
+    if _list_topk is not None and type(iterable) is list:
+        return _list_topk(iterable, n, key)
+
     # When key is none, use simpler decoration
     if key is None:
         it = izip(iterable, count())                        # decorate
@@ -458,6 +466,10 @@ def nlargest(n, iterable, key=None):
         if n >= size:
             return sorted(iterable, key=key, reverse=True)[:n]
 
+    # Lists are handled natively on PyPy
+    if _list_topk is not None and type(iterable) is list:
+        return _list_topk(iterable, n, key, True)
+
     # When key is none, use simpler decoration
     if key is None:
         it = izip(iterable, count(0,-1))                    # decorate
@@ -275,18 +275,23 @@ def walk(top, topdown=True, onerror=None, followlinks=False):
     try:
         # Note that listdir and error are globals in this module due
         # to earlier import-*.
-        names = listdir(top)
+        if _have_scandir:
+            # PyPy: the type of most entries is known without a stat()
+            dirs, nondirs = _scandir_split(top)
+        else:
+            names = listdir(top)
     except error, err:
         if onerror is not None:
             onerror(err)
         return
 
-    dirs, nondirs = [], []
-    for name in names:
-        if isdir(join(top, name)):
-            dirs.append(name)
-        else:
-            nondirs.append(name)
+    if not _have_scandir:
+        dirs, nondirs = [], []
+        for name in names:
+            if isdir(join(top, name)):
+                dirs.append(name)
+            else:
+                nondirs.append(name)
 
     if topdown:
         yield top, dirs, nondirs
@@ -298,6 +303,26 @@ def walk(top, topdown=True, onerror=None, followlinks=False):
     if not topdown:
         yield top, dirs, nondirs
 
+_have_scandir = 'scandir' in globals()
+
+def _scandir_split(top):
+    # the directories and the other entries of 'top', for walk()
+    dirs, nondirs = [], []
+    it = scandir(top)
+    try:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except error:
+                is_dir = False
+            if is_dir:
+                dirs.append(entry.name)
+            else:
+                nondirs.append(entry.name)
+    finally:
+        it.close()
+    return dirs, nondirs
+
 __all__.append("walk")
 
 # Make sure os.environ exists, at least
@@ -51,6 +51,54 @@ def copyfileobj(fsrc, fdst, length=16*1024):
             break
         fdst.write(buf)
 
+# PyPy on Linux: copyfile() copies the data inside the kernel when it can,
+# with os.copy_file_range() or else os.sendfile()
+_fastcopy_funcs = []
+if hasattr(os, 'copy_file_range'):
+    _fastcopy_funcs.append(
+        lambda infd, outfd, count: os.copy_file_range(infd, outfd, count))
+if hasattr(os, 'sendfile'):
+    _fastcopy_funcs.append(
+        lambda infd, outfd, count: os.sendfile(outfd, infd, None, count))
+
+# errors meaning that a function cannot be used for these two files
+_FASTCOPY_ERRNOS = frozenset(getattr(errno, _name) for _name in
+                             ['EINVAL', 'ENOSYS', 'EXDEV', 'ENOTSUP',
+                              'EOPNOTSUPP', 'ETXTBSY']
+                             if hasattr(errno, _name))
+
+def _fastcopy(fsrc, fdst):
+    """copy data from the real file fsrc to the real file fdst inside the
+    kernel; return False if nothing was copied, in which case
+    copyfileobj() must be used"""
+    if not _fastcopy_funcs:
+        return False
+    try:
+        infd = fsrc.fileno()
+        outfd = fdst.fileno()
+    except Exception:
+        return False
+    for copy in _fastcopy_funcs:
+        copied = 0
+        while 1:
+            try:
+                n = copy(infd, outfd, 2**30)
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                if copied == 0 and e.errno in _FASTCOPY_ERRNOS:
+                    break       # try the next function
+                raise
+            if n == 0:
+                if copied == 0:
+                    # nothing copied at all: either an empty file, or a
+                    # file that this function silently doesn't support
+                    # (e.g. copy_file_range() from /proc on some kernels)
+                    break
+                return True
+            copied += n
+    return False
+
 def _samefile(src, dst):
     # Macintosh, Unix.
     if hasattr(os.path, 'samefile'):
@@ -81,7 +129,8 @@ def copyfile(src, dst):
 
     with open(src, 'rb') as fsrc:
         with open(dst, 'wb') as fdst:
-            copyfileobj(fsrc, fdst)
+            if not _fastcopy(fsrc, fdst):
+                copyfileobj(fsrc, fdst)
 
 def copymode(src, dst):
     """Copy mode bits from src to dst"""
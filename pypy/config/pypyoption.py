@@ -32,8 +32,9 @@ working_modules = default_modules.copy()
 working_modules.update([
     "_socket", "unicodedata", "mmap", "fcntl", "_locale", "pwd",
     "select", "zipimport", "_lsprof", "crypt", "signal", "_rawffi", "termios",
-    "zlib", "bz2", "struct", "_hashlib", "_md5", "_sha", "_minimal_curses",
-    "cStringIO", "thread", "itertools", "pyexpat", "_ssl", "cpyext", "array",
+    "zlib", "bz2", "struct", "_hashlib", "_md5", "_sha", "_sha256", "_sha512",
+    "_minimal_curses", "cStringIO", "thread", "itertools", "pyexpat", "_ssl",
+    "cpyext", "array",
     "binascii", "_multiprocessing", '_warnings', "_collections",
     "_multibytecodec", "micronumpy", "_continuation", "_cffi_backend",
     "_csv", "_cppyy", "_pypyjson", "_jitlog"
@@ -201,9 +202,10 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
                requires=[("objspace.usemodules.cpyext", False)]),
 
     ChoiceOption("hash",
-                 "The hash function to use for strings: fnv from CPython 2.7"
-                 " or siphash24 from CPython >= 3.4",
-                 ["fnv", "siphash24"],
+                 "The hash function to use for strings: fnv from CPython 2.7,"
+                 " siphash24 from CPython >= 3.4 or siphash13 from"
+                 " CPython >= 3.11",
+                 ["fnv", "siphash24", "siphash13"],
                  default="fnv",
                  cmdline="--hash"),
 
@@ -227,6 +229,10 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
                    "use specialised tuples",
                    default=False),
 
+        BoolOption("withstrbuf", "use strings optimized for addition "
+                   "(lazily built on the first operation other than '+')",
+                   default=False),
+
         BoolOption("withliststrategies",
                    "enable optimized ways to store lists of primitives ",
                    default=True),
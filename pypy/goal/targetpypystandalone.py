@@ -49,6 +49,9 @@ def create_entry_point(space, w_dict):
         if hashfunc == "siphash24":
             from rpython.rlib import rsiphash
             rsiphash.enable_siphash24()
+        elif hashfunc == "siphash13":
+            from rpython.rlib import rsiphash
+            rsiphash.enable_siphash13()
 
         #debug("entry point starting")
         #for arg in argv:
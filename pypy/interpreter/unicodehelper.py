@@ -1,3 +1,4 @@
+from rpython.rlib import jit
 from rpython.rlib.objectmodel import specialize
 from rpython.rlib.rarithmetic import intmask
 from rpython.rlib.rstring import StringBuilder, UnicodeBuilder
@@ -33,6 +34,13 @@ def encode_error_handler(space):
                                              space.newtext(msg)]))
     return raise_unicode_exception_encode
 
+@jit.elidable
+def is_ascii(s):
+    for c in s:
+        if ord(c) >= 0x80:
+            return False
+    return True
+
 # ____________________________________________________________
 
 def encode(space, w_data, encoding=None, errors='strict'):
@@ -92,12 +92,14 @@ class Module(MixedModule):
         'do_what_I_mean'            : 'interp_magic.do_what_I_mean',
         'resizelist_hint'           : 'interp_magic.resizelist_hint',
         'newlist_hint'              : 'interp_magic.newlist_hint',
+        'list_topk'                 : 'interp_magic.list_topk',
         'add_memory_pressure'       : 'interp_magic.add_memory_pressure',
         'newdict'                   : 'interp_dict.newdict',
         'reversed_dict'             : 'interp_dict.reversed_dict',
         'dict_popitem_first'        : 'interp_dict.dict_popitem_first',
         'delitem_if_value_is'       : 'interp_dict.delitem_if_value_is',
         'move_to_end'               : 'interp_dict.move_to_end',
+        'dict_compact'              : 'interp_dict.dict_compact',
         'strategy'                  : 'interp_magic.strategy',  # dict,set,list
         'specialized_zip_2_lists'   : 'interp_magic.specialized_zip_2_lists',
         'set_debug'                 : 'interp_magic.set_debug',
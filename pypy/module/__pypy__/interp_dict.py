@@ -76,3 +76,14 @@ def move_to_end(space, w_obj, w_key, last=True):
     if not isinstance(w_obj, W_DictMultiObject):
         raise OperationError(space.w_TypeError, space.w_None)
     return w_obj.nondescr_move_to_end(space, w_key, last)
+
+def dict_compact(space, w_obj):
+    """Shrink the memory used by a dictionary to fit the items that are
+    left in it.  Dictionaries already shrink automatically when most of
+    their items are deleted; this forces it, e.g. after removing many
+    entries from a long-lived cache.
+    """
+    from pypy.objspace.std.dictmultiobject import W_DictMultiObject
+    if not isinstance(w_obj, W_DictMultiObject):
+        raise OperationError(space.w_TypeError, space.w_None)
+    w_obj.nondescr_compact(space)
@@ -121,6 +121,16 @@ def resizelist_hint(space, w_list, sizehint):
         raise oefmt(space.w_TypeError, "arg 1 must be a 'list'")
     w_list._resize_hint(sizehint)
 
+@unwrap_spec(k=int, reverse=bool)
+def list_topk(space, w_list, k, w_key=None, reverse=False):
+    """ Return a new list with the k smallest items of the argument list,
+    sorted, or the k largest ones if reverse is true.  Equivalent to
+    sorted(lst, key=key, reverse=reverse)[:k], but uses a bounded heap
+    on the unwrapped items of the list when possible """
+    if not isinstance(w_list, W_ListObject):
+        raise oefmt(space.w_TypeError, "arg 1 must be a 'list'")
+    return w_list.topk(k, w_key, reverse)
+
 @unwrap_spec(sizehint=int)
 def newlist_hint(space, sizehint):
     """ Create a new empty list that has an underlying storage of length sizehint """
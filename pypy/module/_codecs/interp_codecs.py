@@ -422,8 +422,6 @@ for encoder in [
     make_encoder_wrapper(encoder)
 
 for decoder in [
-         "ascii_decode",
-         "latin_1_decode",
          "utf_7_decode",
          "utf_16_decode",
          "utf_16_be_decode",
@@ -435,6 +433,28 @@ for decoder in [
          ]:
     make_decoder_wrapper(decoder)
 
+# the ascii and latin-1 decoders return compact unicode objects, storing
+# the characters of the input string without copying them
+@unwrap_spec(string='bufferstr', errors='text_or_none',
+             w_final=WrappedDefault(False))
+def ascii_decode(space, string, errors="strict", w_final=None):
+    if unicodehelper.is_ascii(string):
+        return space.newtuple([space.newlatin1(string),
+                               space.newint(len(string))])
+    if errors is None:
+        errors = 'strict'
+    final = space.is_true(w_final)
+    state = space.fromcache(CodecState)
+    result, consumed = runicode.str_decode_ascii(
+        string, len(string), errors, final, state.decode_error_handler)
+    return space.newtuple([space.newunicode(result), space.newint(consumed)])
+
+@unwrap_spec(string='bufferstr', errors='text_or_none',
+             w_final=WrappedDefault(False))
+def latin_1_decode(space, string, errors="strict", w_final=None):
+    return space.newtuple([space.newlatin1(string),
+                           space.newint(len(string))])
+
 if hasattr(runicode, 'str_decode_mbcs'):
     make_encoder_wrapper('mbcs_encode')
     make_decoder_wrapper('mbcs_decode')
@@ -459,6 +479,9 @@ def utf_8_encode(space, uni, errors="strict"):
 def utf_8_decode(space, string, errors="strict", w_final=None):
     if errors is None:
         errors = 'strict'
+    if unicodehelper.is_ascii(string):
+        return space.newtuple([space.newlatin1(string),
+                               space.newint(len(string))])
     final = space.is_true(w_final)
     state = space.fromcache(CodecState)
     # NB. can't call str_decode_utf_8() directly because that's
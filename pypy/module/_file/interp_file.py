@@ -600,7 +600,9 @@ when opened for writing or appending; it will be truncated when
 opened for writing.  Add a 'b' to the mode for binary files.
 Add a '+' to the mode to allow simultaneous reading and writing.
 If the buffering argument is given, 0 means unbuffered, 1 means line
-buffered, and larger numbers specify the buffer size.
+buffered, and larger numbers specify the buffer size.  On PyPy, -2
+opens a regular file in read-only mode as a memory-mapped file: read(),
+readline() and iteration then copy directly out of the mapping.
 Add a 'U' to mode to open the file for input with universal newline
 support.  Any line ending in the input file will be seen as a '\n'
 in Python.  Also, a file so opened gains the attribute 'newlines';
@@ -72,6 +72,34 @@ class AppTestFile(object):
         finally:
             f.close()
 
+    def test_mmap_buffering(self):
+        data = "".join(["line %d\n" % i for i in range(2000)]) + "end"
+        f = self.file(self.temppath, "wb")
+        f.write(data)
+        f.close()
+        f = self.file(self.temppath, "rb", -2)
+        try:
+            assert list(f) == data.splitlines(True)
+            f.seek(5)
+            assert f.read(3) == "0\nl"
+            assert f.readline() == "ine 1\n"
+            assert f.readline(4) == "line"
+            assert f.tell() == 18
+            assert f.readlines()[-2:] == ["line 1999\n", "end"]
+            assert f.read() == ""
+            f.seek(-3, 2)
+            assert f.read() == "end"
+        finally:
+            f.close()
+        raises(ValueError, f.read)
+        for mode in ["rb+", "w"]:
+            f = self.file(self.temppath, mode, -2)
+            f.write("hello")
+            f.close()
+        f = self.file(self.temppath, "r", -2)
+        assert f.read() == "hello"
+        f.close()
+
     def test_fdopen(self):
         import os
         f = self.file(self.temppath, "w")
@@ -1,12 +1,14 @@
 from __future__ import with_statement
 
 from rpython.rlib import rgc, ropenssl
-from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib.objectmodel import (
+    keepalive_until_here, specialize, we_are_translated)
 from rpython.rlib.rstring import StringBuilder
 from rpython.rtyper.lltypesystem import lltype, rffi
 from rpython.tool.sourcetools import func_renamer
 
 from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.buffer import BufferInterfaceNotFound
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.gateway import unwrap_spec, interp2app, WrappedDefault
 from pypy.interpreter.typedef import TypeDef, GetSetProperty
@@ -15,6 +17,13 @@ from pypy.module.thread.os_lock import Lock
 
 algorithms = ('md5', 'sha1', 'sha224', 'sha256', 'sha384', 'sha512')
 
+# updates with less data than this are done without releasing the GIL
+# (same value as HASHLIB_GIL_MINSIZE in CPython)
+GIL_MINSIZE = 2048
+
+# larger updates from a mutable buffer are copied in chunks of this size
+COPY_CHUNK_SIZE = 65536
+
 def hash_name_mapper_callback(obj_name, userdata):
     if not obj_name:
         return
@@ -44,20 +53,47 @@ def fetch_names(space):
     return space.call_function(space.w_frozenset, space.newlist(
         [space.newtext(name) for name in meth_names]))
 
+@specialize.argtype(0)
+def _has_raw_address(buf):
+    try:
+        buf.get_raw_address()
+    except ValueError:
+        return False
+    return True
+
+def _get_raw_buffer(space, w_obj):
+    """Return the read buffer of 'w_obj' if it is not a str or a unicode
+    and its data can be given to C directly; otherwise return None.
+    """
+    if (space.isinstance_w(w_obj, space.w_bytes) or
+            space.isinstance_w(w_obj, space.w_unicode)):
+        return None
+    try:
+        view = w_obj.buffer_w(space, 0)
+    except BufferInterfaceNotFound:
+        try:
+            buf = w_obj.readbuf_w(space)
+        except BufferInterfaceNotFound:
+            return None
+    else:
+        if not _has_raw_address(view):
+            return None
+        buf = view.as_readbuf()
+    if not _has_raw_address(buf):
+        return None
+    return buf
+
+
 class W_Hash(W_Root):
     NULL_CTX = lltype.nullptr(ropenssl.EVP_MD_CTX.TO)
     ctx = NULL_CTX
+    lock = None
 
     def __init__(self, space, name, copy_from=NULL_CTX):
         self.name = name
         digest_type = self.digest_type_by_name(space)
         self.digest_size = ropenssl.EVP_MD_size(digest_type)
 
-        # Allocate a lock for each HASH object.
-        # An optimization would be to not release the GIL on small requests,
-        # and use a custom lock only when needed.
-        self.lock = Lock(space)
-
         ctx = ropenssl.EVP_MD_CTX_new()
         if ctx is None:
             raise MemoryError
@@ -92,15 +128,69 @@ class W_Hash(W_Root):
         return space.newtext("<%s HASH object at 0x%s>" % (
             self.name, addrstring))
 
-    @unwrap_spec(string='bufferstr')
-    def update(self, space, string):
-        with rffi.scoped_nonmovingbuffer(string) as buf:
+    def update(self, space, w_string):
+        buf = _get_raw_buffer(space, w_string)
+        if buf is None:
+            string = space.bufferstr_w(w_string)
+            with rffi.scoped_nonmovingbuffer(string) as ptr:
+                self._update(space, ptr, len(string))
+        elif buf.getlength() < GIL_MINSIZE:
+            self._update_in_place(buf)
+        else:
+            self._update_by_chunks(space, buf)
+
+    def _update_in_place(self, buf):
+        # hash the data in place, e.g. in the raw memory of an array.  The
+        # raw address is only valid as long as we hold the GIL: otherwise
+        # another thread could resize the bytearray or the array, or close
+        # the mmap.  Acquiring 'self.lock' may release the GIL, so we only
+        # ask for the address after that.
+        if self.lock is None:
+            ropenssl.EVP_DigestUpdate_nogil(self.ctx, buf.get_raw_address(),
+                                            buf.getlength())
+        else:
+            with self.lock:
+                ropenssl.EVP_DigestUpdate_nogil(self.ctx,
+                                                buf.get_raw_address(),
+                                                buf.getlength())
+        keepalive_until_here(buf)
+
+    def _update_by_chunks(self, space, buf):
+        # the data of a large buffer is hashed with the GIL released, so
+        # it cannot be hashed in place (see _update_in_place()).  Copy it
+        # in chunks instead; the length is read again for every chunk, in
+        # case another thread changed it meanwhile.
+        start = 0
+        while True:
+            size = min(buf.getlength() - start, COPY_CHUNK_SIZE)
+            if size <= 0:
+                break
+            chunk = buf.getslice(start, start + size, 1, size)
+            with rffi.scoped_nonmovingbuffer(chunk) as ptr:
+                self._update(space, ptr, size)
+            start += size
+
+    def _update(self, space, ptr, length):
+        # Small updates are done without releasing the GIL.  Larger ones
+        # release it, so that several threads can hash in parallel; then
+        # 'self.lock', allocated the first time, protects 'self.ctx' from
+        # being used by two threads at the same time.
+        if length < GIL_MINSIZE:
+            if self.lock is None:
+                ropenssl.EVP_DigestUpdate_nogil(self.ctx, ptr, length)
+            else:
+                with self.lock:
+                    ropenssl.EVP_DigestUpdate_nogil(self.ctx, ptr, length)
+        else:
+            if self.lock is None:
+                self.lock = Lock(space)
             with self.lock:
-                # XXX try to not release the GIL for small requests
-                ropenssl.EVP_DigestUpdate(self.ctx, buf, len(string))
+                ropenssl.EVP_DigestUpdate(self.ctx, ptr, length)
 
     def copy(self, space):
         "Return a copy of the hash object."
+        if self.lock is None:
+            return W_Hash(space, self.name, copy_from=self.ctx)
         with self.lock:
             return W_Hash(space, self.name, copy_from=self.ctx)
 
@@ -135,9 +225,13 @@ class W_Hash(W_Root):
         if ctx is None:
             raise MemoryError
         try:
-            with self.lock:
-                if not ropenssl.EVP_MD_CTX_copy(ctx, self.ctx):
-                    raise ValueError
+            if self.lock is None:
+                ok = ropenssl.EVP_MD_CTX_copy(ctx, self.ctx)
+            else:
+                with self.lock:
+                    ok = ropenssl.EVP_MD_CTX_copy(ctx, self.ctx)
+            if not ok:
+                raise ValueError
             digest_size = self.digest_size
             with rffi.scoped_alloc_buffer(digest_size) as buf:
                 ropenssl.EVP_DigestFinal(ctx, buf.raw, None)
@@ -161,18 +255,18 @@ W_Hash.typedef = TypeDef(
 )
 W_Hash.typedef.acceptable_as_base_class = False
 
-@unwrap_spec(name='text', string='bufferstr')
-def new(space, name, string=''):
+@unwrap_spec(name='text')
+def new(space, name, w_string=None):
     w_hash = W_Hash(space, name)
-    w_hash.update(space, string)
+    if w_string is not None:
+        w_hash.update(space, w_string)
     return w_hash
 
 # shortcut functions
 def make_new_hash(name, funcname):
     @func_renamer(funcname)
-    @unwrap_spec(string='bufferstr')
-    def new_hash(space, string=''):
-        return new(space, name, string)
+    def new_hash(space, w_string=None):
+        return new(space, name, w_string)
     return new_hash
 
 for _name in algorithms:
@@ -1,8 +1,20 @@
 class AppTestHashlib:
     spaceconfig = {
-        "usemodules": ['_hashlib', 'array', 'struct', 'binascii'],
+        "usemodules": ['_hashlib', 'array', 'struct', 'binascii', 'mmap',
+                       'thread'],
     }
 
+    def setup_class(cls):
+        from pypy.module._hashlib import interp_hashlib
+        # smaller chunks, to test several of them in a reasonable time
+        # when untranslated
+        cls.old_chunk_size = interp_hashlib.COPY_CHUNK_SIZE
+        interp_hashlib.COPY_CHUNK_SIZE = 3000
+
+    def teardown_class(cls):
+        from pypy.module._hashlib import interp_hashlib
+        interp_hashlib.COPY_CHUNK_SIZE = cls.old_chunk_size
+
     def test_method_names(self):
         import _hashlib
         assert isinstance(_hashlib.openssl_md_meth_names, frozenset)
@@ -86,6 +98,69 @@ class AppTestHashlib:
         assert h.digest() == _hashlib.openssl_md5('x' * 20).digest()
         _hashlib.openssl_sha1(b).digest()
 
+    def test_buffer_types(self):
+        import _hashlib, array
+        for data in ['x' * 100, 'abcdefgh' * 1000]:
+            expected = _hashlib.openssl_sha256(data).digest()
+            for buf in [bytearray(data), memoryview(data),
+                        buffer(data), array.array('c', data),
+                        memoryview(bytearray(data)),
+                        buffer(array.array('c', 'abc' + data), 3)]:
+                h = _hashlib.new('sha256', buf)
+                assert h.digest() == expected
+                h = _hashlib.openssl_sha256()
+                h.update(buf)
+                assert h.digest() == expected
+
+    def test_large_updates(self):
+        import _hashlib
+        data = ''.join([chr(i & 0xff) for i in range(10000)])
+        h1 = _hashlib.openssl_sha1()
+        h2 = _hashlib.openssl_sha1()
+        for i in range(0, len(data), 500):
+            h1.update(data[i:i + 500])
+            h2.update(data[i:i + 500] * 10)
+        h3 = h1.copy()
+        h1.update(data)
+        h3.update(bytearray(data))
+        assert h1.hexdigest() == h3.hexdigest()
+        assert h1.digest() == _hashlib.openssl_sha1(data * 2).digest()
+        expected = _hashlib.openssl_sha1(
+            ''.join([data[i:i + 500] * 10 for i in range(0, len(data), 500)]))
+        assert h2.digest() == expected.digest()
+
+    def test_large_buffers(self):
+        # two chunks of COPY_CHUNK_SIZE, and an incomplete one
+        import _hashlib, array, mmap
+        data = 'abcdefg' * 1000 + 'x'
+        expected = _hashlib.openssl_sha256(data).digest()
+        m = mmap.mmap(-1, len(data))
+        m[:] = data
+        for buf in [bytearray(data), memoryview(bytearray(data)),
+                    array.array('c', data), m, buffer(m)]:
+            h = _hashlib.openssl_sha256()
+            h.update(buf)
+            assert h.digest() == expected
+        m.close()
+        raises(ValueError, _hashlib.openssl_sha256, m)
+
+    def test_resize_while_hashing(self):
+        # the large updates release the GIL: another thread that resizes
+        # the bytearray meanwhile must not make us read freed memory
+        import _hashlib, thread, time
+        b = bytearray('x' * 20000)
+        state = []
+        def resize():
+            for i in range(50):
+                b[:] = 'y' * (i % 7 * 4000)
+            state.append(1)
+        thread.start_new_thread(resize, ())
+        h = _hashlib.openssl_sha1()
+        while not state:
+            h.update(b)
+            time.sleep(0.001)
+        h.digest()
+
     def test_extra_algorithms(self):
         expected_results = {
             "md5": "bb649c83dd1ea5c9d9dec9a18df0ffe9",
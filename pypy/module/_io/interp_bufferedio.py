@@ -619,12 +619,94 @@ class BufferedMixin:
             return res
         return None
 
+    def readinto_w(self, space, w_buffer):
+        self._check_init(space)
+        self._check_closed(space, "readinto of closed file")
+        rwbuffer = space.writebuf_w(w_buffer)
+        length = rwbuffer.getlength()
+
+        with self.lock:
+            have = self._readahead()
+            if have >= length:
+                rwbuffer.setslice(0, self.buffer[self.pos:self.pos + length])
+                self.pos += length
+                return space.newint(length)
+            written = 0
+            if have > 0:
+                rwbuffer.setslice(0, self.buffer[self.pos:self.pos + have])
+                self.pos += have
+                written = have
+
+            if self.writable:
+                self._flush_and_rewind_unlocked(space)
+            self._reader_reset_buf()
+            self.pos = 0
+            self.raw_pos = 0
+
+            while written < length:
+                remaining = length - written
+                try:
+                    if remaining > self.buffer_size:
+                        # Big reads go directly into the caller's buffer,
+                        # without passing through self.buffer
+                        size = self._raw_read(space, rwbuffer, written,
+                                              remaining)
+                    else:
+                        size = self._fill_buffer(space)
+                        if size > remaining:
+                            size = remaining
+                        rwbuffer.setslice(
+                            written, self.buffer[self.pos:self.pos + size])
+                        self.pos += size
+                except BlockingIOError:
+                    if written == 0:
+                        return space.w_None
+                    break
+                if size == 0:
+                    break
+                written += size
+        return space.newint(written)
+
     def readline_w(self, space, w_limit=None):
         self._check_init(space)
         self._check_closed(space, "readline of closed file")
-
         limit = convert_size(space, w_limit)
+        return space.newbytes(self._readline(space, limit))
+
+    def _is_exact_type(self):
+        # True if readline() cannot have been overridden by a subclass
+        return (type(self) is W_BufferedReader or
+                type(self) is W_BufferedRandom)
+
+    def next_w(self, space):
+        if not self._is_exact_type():
+            return W_IOBase.next_w(self, space)
+        self._check_init(space)
+        self._check_closed(space, "readline of closed file")
+        line = self._readline(space, -1)
+        if not line:
+            raise OperationError(space.w_StopIteration, space.w_None)
+        return space.newbytes(line)
+
+    def readlines_w(self, space, w_hint=None):
+        if not self._is_exact_type():
+            return W_IOBase.readlines_w(self, space, w_hint)
+        self._check_init(space)
+        self._check_closed(space, "readline of closed file")
+        hint = convert_size(space, w_hint)
+        lines_w = []
+        length = 0
+        while True:
+            line = self._readline(space, -1)
+            if not line:
+                break
+            lines_w.append(space.newbytes(line))
+            length += len(line)
+            if hint > 0 and length > hint:
+                break
+        return space.newlist(lines_w)
 
+    def _readline(self, space, limit):
         # First, try to find a line in the buffer. This can run
         # unlocked because the calls to the C API are simple enough
         # that they can't trigger any thread switch.
@@ -637,13 +719,13 @@ class BufferedMixin:
         else:
             pos = -1
         if pos >= 0:
-            w_res = space.newbytes(self.buffer[self.pos:pos+1])
+            res = self.buffer[self.pos:pos+1]
             self.pos = pos + 1
-            return w_res
+            return res
         if have == limit:
-            w_res = space.newbytes(self.buffer[self.pos:self.pos+have])
+            res = self.buffer[self.pos:self.pos+have]
             self.pos += have
-            return w_res
+            return res
 
         written = 0
         with self.lock:
@@ -684,7 +766,7 @@ class BufferedMixin:
                 written += have
                 if limit >= 0:
                     limit -= have
-            return space.newbytes(''.join(chunks))
+            return ''.join(chunks)
 
     # ____________________________________________________
     # Write methods
@@ -845,6 +927,9 @@ W_BufferedReader.typedef = TypeDef(
     read1 = interp2app(W_BufferedReader.read1_w),
     raw = interp_attrproperty_w("w_raw", cls=W_BufferedReader),
     readline = interp2app(W_BufferedReader.readline_w),
+    readinto = interp2app(W_BufferedReader.readinto_w),
+    readlines = interp2app(W_BufferedReader.readlines_w),
+    next = interp2app(W_BufferedReader.next_w),
 
     # from the mixin class
     __repr__ = interp2app(W_BufferedReader.repr_w),
@@ -1041,6 +1126,9 @@ W_BufferedRandom.typedef = TypeDef(
     peek = interp2app(W_BufferedRandom.peek_w),
     read1 = interp2app(W_BufferedRandom.read1_w),
     readline = interp2app(W_BufferedRandom.readline_w),
+    readinto = interp2app(W_BufferedRandom.readinto_w),
+    readlines = interp2app(W_BufferedRandom.readlines_w),
+    next = interp2app(W_BufferedRandom.next_w),
 
     write = interp2app(W_BufferedRandom.write_w),
     flush = interp2app(W_BufferedRandom.flush_w),
@@ -184,6 +184,55 @@ class AppTestBufferedReader:
         f = _io.BufferedReader(raw)
         assert f.readlines() == ['a\n', 'b\n', 'c']
 
+    def test_readinto_bypasses_buffer(self):
+        import _io
+        class RecordingFileIO(_io.FileIO):
+            def readinto(self, buf):
+                self.sizes.append(len(buf))
+                return _io.FileIO.readinto(self, buf)
+        raw = RecordingFileIO(self.bigtmpfile)
+        raw.sizes = []
+        f = _io.BufferedReader(raw, 16)
+        assert f.read(2) == 'a\n'
+        a = bytearray(60)
+        assert f.readinto(a) == 60
+        assert a == ('a\nb\nc' * 20)[2:62]
+        # 14 bytes from the buffer, then 46 directly into 'a'
+        assert raw.sizes == [16, 46]
+        a = bytearray(10)
+        assert f.readinto(a) == 10
+        assert a == ('a\nb\nc' * 20)[62:72]
+        assert raw.sizes == [16, 46, 16]
+        a = bytearray(100)
+        assert f.readinto(a) == 28
+        assert a[:28] == ('a\nb\nc' * 20)[72:]
+        assert f.readinto(a) == 0
+        f.close()
+
+    def test_iter_and_readlines(self):
+        import _io
+        f = _io.BufferedReader(_io.FileIO(self.bigtmpfile), 7)
+        lines = list(f)
+        assert lines == ['a\n', 'b\n'] + ['ca\n', 'b\n'] * 19 + ['c']
+        f.seek(0)
+        assert f.readlines() == lines
+        f.seek(0)
+        assert f.readlines(5) == ['a\n', 'b\n', 'ca\n']
+        assert next(f) == 'b\n'
+        f.close()
+        raises(ValueError, next, f)
+        raises(ValueError, f.readlines)
+
+    def test_iter_subclass_readline(self):
+        import _io
+        class MyReader(_io.BufferedReader):
+            def readline(self, limit=-1):
+                return _io.BufferedReader.readline(self, limit).upper()
+        f = MyReader(_io.FileIO(self.tmpfile))
+        assert list(f) == ['A\n', 'B\n', 'C']
+        f.seek(0)
+        assert f.readlines() == ['A\n', 'B\n', 'C']
+
     def test_detach(self):
         import _io
         raw = _io.FileIO(self.tmpfile)
@@ -680,6 +729,19 @@ class AppTestBufferedRandom:
         f.seek(0)
         assert f.read() == 'a\nbxxxx'
 
+    def test_readinto_after_write(self):
+        import _io
+        raw = _io.FileIO(self.tmpfile, 'wb+')
+        f = _io.BufferedRandom(raw, 4)
+        f.write('0123456789')
+        f.seek(2)
+        f.write('ab')
+        a = bytearray(5)
+        assert f.readinto(a) == 5
+        assert a == '45678'
+        f.seek(0)
+        assert list(f) == ['01ab456789']
+
     def test_simple_read_after_write(self):
         import _io
         raw = _io.FileIO(self.tmpfile, 'wb+')
@@ -1,35 +1,56 @@
-from rpython.rlib import rsha
-from rpython.rlib.objectmodel import import_from_mixin
+from rpython.rlib import rhashaccel
 from pypy.interpreter.baseobjspace import W_Root
-from pypy.interpreter.typedef import TypeDef
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
 from pypy.interpreter.gateway import interp2app, unwrap_spec
 
 
-class W_SHA(W_Root):
+class W_Hash(W_Root):
     """
-    A subclass of RSHA that can be exposed to app-level.
+    Base class of the hash objects of the _sha, _sha256 and _sha512
+    modules, computed by rpython.rlib.rhashaccel.
     """
-    import_from_mixin(rsha.RSHA)
+    _immutable_fields_ = ['name']
 
-    def __init__(self, space):
+    def __init__(self, space, algo, name):
         self.space = space
-        self._init()
+        self.hash = rhashaccel.RHash(algo)
+        self.name = name
+
+    def new_empty(self):
+        raise NotImplementedError
 
     @unwrap_spec(string='bufferstr')
     def update_w(self, string):
-        self.update(string)
+        self.hash.update(string)
 
     def digest_w(self):
-        return self.space.newbytes(self.digest())
+        return self.space.newbytes(self.hash.digest())
 
     def hexdigest_w(self):
-        return self.space.newtext(self.hexdigest())
+        return self.space.newtext(self.hash.hexdigest())
 
     def copy_w(self):
-        clone = W_SHA(self.space)
-        clone._copyfrom(self)
+        clone = self.new_empty()
+        clone.hash = self.hash.copy()
         return clone
 
+    def get_digest_size(self, space):
+        return space.newint(self.hash.digest_size)
+
+    def get_block_size(self, space):
+        return space.newint(self.hash.block_size)
+
+    def get_name(self, space):
+        return space.newtext(self.name)
+
+
+class W_SHA(W_Hash):
+    def __init__(self, space):
+        W_Hash.__init__(self, space, rhashaccel.SHA1, 'SHA1')
+
+    def new_empty(self):
+        return W_SHA(self.space)
+
 
 @unwrap_spec(initialdata='bufferstr')
 def W_SHA___new__(space, w_subtype, initialdata=''):
@@ -39,7 +60,7 @@ def W_SHA___new__(space, w_subtype, initialdata=''):
     w_sha = space.allocate_instance(W_SHA, w_subtype)
     sha = space.interp_w(W_SHA, w_sha)
     W_SHA.__init__(sha, space)
-    sha.update(initialdata)
+    sha.hash.update(initialdata)
     return w_sha
 
 
@@ -50,6 +71,7 @@ W_SHA.typedef = TypeDef(
     digest    = interp2app(W_SHA.digest_w),
     hexdigest = interp2app(W_SHA.hexdigest_w),
     copy      = interp2app(W_SHA.copy_w),
+    name      = GetSetProperty(W_SHA.get_name),
     digest_size = 20,
     digestsize = 20,
     block_size = 64,
@@ -0,0 +1,19 @@
+"""
+Mixed-module definition for the _sha256 module, used by hashlib when
+OpenSSL is not available.  The pure Python version in lib_pypy/_sha256.py
+is used if it is not enabled.
+"""
+
+from pypy.interpreter.mixedmodule import MixedModule
+
+
+class Module(MixedModule):
+    """Implementations of the SHA-256 and SHA-224 hash algorithms."""
+
+    interpleveldefs = {
+        'sha256': 'interp_sha256.sha256',
+        'sha224': 'interp_sha256.sha224',
+        }
+
+    appleveldefs = {
+        }
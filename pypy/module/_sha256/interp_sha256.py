@@ -0,0 +1,47 @@
+from rpython.rlib import rhashaccel
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.module._sha.interp_sha import W_Hash
+
+
+class W_SHA256(W_Hash):
+    def __init__(self, space, algo):
+        if algo == rhashaccel.SHA256:
+            name = 'SHA256'
+        else:
+            name = 'SHA224'
+        W_Hash.__init__(self, space, algo, name)
+
+    def new_empty(self):
+        return W_SHA256(self.space, self.hash.algo)
+
+
+@unwrap_spec(string='bufferstr')
+def sha256(space, string=''):
+    """Return a new SHA-256 hash object, optionally initialized with a
+    string."""
+    w_sha = W_SHA256(space, rhashaccel.SHA256)
+    w_sha.hash.update(string)
+    return w_sha
+
+@unwrap_spec(string='bufferstr')
+def sha224(space, string=''):
+    """Return a new SHA-224 hash object, optionally initialized with a
+    string."""
+    w_sha = W_SHA256(space, rhashaccel.SHA224)
+    w_sha.hash.update(string)
+    return w_sha
+
+
+W_SHA256.typedef = TypeDef(
+    '_sha256.sha256',
+    update      = interp2app(W_SHA256.update_w),
+    digest      = interp2app(W_SHA256.digest_w),
+    hexdigest   = interp2app(W_SHA256.hexdigest_w),
+    copy        = interp2app(W_SHA256.copy_w),
+    digest_size = GetSetProperty(W_SHA256.get_digest_size),
+    digestsize  = GetSetProperty(W_SHA256.get_digest_size),
+    block_size  = GetSetProperty(W_SHA256.get_block_size),
+    name        = GetSetProperty(W_SHA256.get_name),
+)
+W_SHA256.typedef.acceptable_as_base_class = False
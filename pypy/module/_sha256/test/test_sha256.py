@@ -0,0 +1,57 @@
+"""
+Tests for the _sha256 module implemented at interp-level.
+"""
+
+
+class AppTestSHA256(object):
+    spaceconfig = {
+        'usemodules': ['_sha256', 'binascii', 'struct'],
+    }
+
+    def test_values(self):
+        import _sha256
+        cases = [
+            (_sha256.sha256, "",
+             "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"),
+            (_sha256.sha256, "abc",
+             "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"),
+            (_sha256.sha256, "just a test string" * 7,
+             "8113ebf33c97daa9998762aacafe750c7cefc2b2f173c90c59663a57fe626f21"),
+            (_sha256.sha224, "",
+             "d14a028c2a3a2bc9476102bb288234c415a2b01f828ea62ac5b3e42f"),
+            (_sha256.sha224, "abc",
+             "23097d223405d8228642a477bda255b32aadbce4bda0b3f7e36c9da7"),
+        ]
+        for func, input, expected in cases:
+            d = func(input)
+            assert d.hexdigest() == expected
+            assert d.digest() == expected.decode('hex')
+
+    def test_attributes(self):
+        import _sha256
+        d = _sha256.sha256()
+        assert d.digest_size == d.digestsize == 32
+        assert d.block_size == 64
+        assert d.name == 'SHA256'
+        d = _sha256.sha224()
+        assert d.digest_size == d.digestsize == 28
+        assert d.block_size == 64
+        assert d.name == 'SHA224'
+
+    def test_update_copy(self):
+        import _sha256
+        d1 = _sha256.sha256("abc" * 30)
+        d2 = d1.copy()
+        d1.update(buffer("def" * 30))
+        d2.update(u"gh" * 30)
+        assert d1.digest() == _sha256.sha256("abc" * 30 + "def" * 30).digest()
+        assert d2.digest() == _sha256.sha256("abc" * 30 + "gh" * 30).digest()
+        d3 = _sha256.sha224("x").copy()
+        assert d3.name == 'SHA224'
+        assert d3.digest() == _sha256.sha224("x").digest()
+
+    def test_hashlib(self):
+        import hashlib
+        assert hashlib.sha256("abc").hexdigest() == (
+            "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad")
+        assert hashlib.new("sha224", "abc").digest_size == 28
@@ -0,0 +1,19 @@
+"""
+Mixed-module definition for the _sha512 module, used by hashlib when
+OpenSSL is not available.  The pure Python version in lib_pypy/_sha512.py
+is used if it is not enabled.
+"""
+
+from pypy.interpreter.mixedmodule import MixedModule
+
+
+class Module(MixedModule):
+    """Implementations of the SHA-512 and SHA-384 hash algorithms."""
+
+    interpleveldefs = {
+        'sha512': 'interp_sha512.sha512',
+        'sha384': 'interp_sha512.sha384',
+        }
+
+    appleveldefs = {
+        }
@@ -0,0 +1,47 @@
+from rpython.rlib import rhashaccel
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.module._sha.interp_sha import W_Hash
+
+
+class W_SHA512(W_Hash):
+    def __init__(self, space, algo):
+        if algo == rhashaccel.SHA512:
+            name = 'SHA512'
+        else:
+            name = 'SHA384'
+        W_Hash.__init__(self, space, algo, name)
+
+    def new_empty(self):
+        return W_SHA512(self.space, self.hash.algo)
+
+
+@unwrap_spec(string='bufferstr')
+def sha512(space, string=''):
+    """Return a new SHA-512 hash object, optionally initialized with a
+    string."""
+    w_sha = W_SHA512(space, rhashaccel.SHA512)
+    w_sha.hash.update(string)
+    return w_sha
+
+@unwrap_spec(string='bufferstr')
+def sha384(space, string=''):
+    """Return a new SHA-384 hash object, optionally initialized with a
+    string."""
+    w_sha = W_SHA512(space, rhashaccel.SHA384)
+    w_sha.hash.update(string)
+    return w_sha
+
+
+W_SHA512.typedef = TypeDef(
+    '_sha512.sha512',
+    update      = interp2app(W_SHA512.update_w),
+    digest      = interp2app(W_SHA512.digest_w),
+    hexdigest   = interp2app(W_SHA512.hexdigest_w),
+    copy        = interp2app(W_SHA512.copy_w),
+    digest_size = GetSetProperty(W_SHA512.get_digest_size),
+    digestsize  = GetSetProperty(W_SHA512.get_digest_size),
+    block_size  = GetSetProperty(W_SHA512.get_block_size),
+    name        = GetSetProperty(W_SHA512.get_name),
+)
+W_SHA512.typedef.acceptable_as_base_class = False
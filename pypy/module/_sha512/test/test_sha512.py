@@ -0,0 +1,53 @@
+"""
+Tests for the _sha512 module implemented at interp-level.
+"""
+
+
+class AppTestSHA512(object):
+    spaceconfig = {
+        'usemodules': ['_sha512', 'binascii', 'struct'],
+    }
+
+    def test_values(self):
+        import _sha512
+        cases = [
+            (_sha512.sha512, "",
+             "cf83e1357eefb8bdf1542850d66d8007d620e4050b5715dc83f4a921d36ce9ce"
+             "47d0d13c5d85f2b0ff8318d2877eec2f63b931bd47417a81a538327af927da3e"),
+            (_sha512.sha512, "abc",
+             "ddaf35a193617abacc417349ae20413112e6fa4e89a97ea20a9eeee64b55d39a"
+             "2192992a274fc1a836ba3c23a3feebbd454d4423643ce80e2a9ac94fa54ca49f"),
+            (_sha512.sha384, "abc",
+             "cb00753f45a35e8bb5a03d699ac65007272c32ab0eded163"
+             "1a8b605a43ff5bed8086072ba1e7cc2358baeca134c825a7"),
+        ]
+        for func, input, expected in cases:
+            d = func(input)
+            assert d.hexdigest() == expected
+            assert d.digest() == expected.decode('hex')
+
+    def test_attributes(self):
+        import _sha512
+        d = _sha512.sha512()
+        assert d.digest_size == d.digestsize == 64
+        assert d.block_size == 128
+        assert d.name == 'SHA512'
+        d = _sha512.sha384()
+        assert d.digest_size == d.digestsize == 48
+        assert d.block_size == 128
+        assert d.name == 'SHA384'
+
+    def test_update_copy(self):
+        import _sha512
+        d1 = _sha512.sha512("abc" * 100)
+        d2 = d1.copy()
+        d1.update("def" * 100)
+        d2.update("gh" * 100)
+        assert d1.digest() == _sha512.sha512("abc" * 100 + "def" * 100).digest()
+        assert d2.digest() == _sha512.sha512("abc" * 100 + "gh" * 100).digest()
+
+    def test_hashlib(self):
+        import hashlib
+        assert hashlib.sha384("abc").hexdigest() == (
+            "cb00753f45a35e8bb5a03d699ac65007272c32ab0eded163"
+            "1a8b605a43ff5bed8086072ba1e7cc2358baeca134c825a7")
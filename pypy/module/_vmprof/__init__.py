@@ -14,6 +14,8 @@ class Module(MixedModule):
         'enable': 'interp_vmprof.enable',
         'disable': 'interp_vmprof.disable',
         'is_enabled': 'interp_vmprof.is_enabled',
+        'enable_aggregating': 'interp_vmprof.enable_aggregating',
+        'snapshot': 'interp_vmprof.snapshot',
         'get_profile_path': 'interp_vmprof.get_profile_path',
         'stop_sampling': 'interp_vmprof.stop_sampling',
         'start_sampling': 'interp_vmprof.start_sampling',
@@ -21,6 +23,16 @@ class Module(MixedModule):
         'VMProfError': 'space.fromcache(interp_vmprof.Cache).w_VMProfError',
     }
 
+    def __init__(self, space, *args):
+        "NOT_RPYTHON"
+        MixedModule.__init__(self, space, *args)
+        from pypy.module._vmprof.interp_vmprof import DrainAction
+        # needs the bytecode counter: otherwise a single-threaded program
+        # would only drain the ring buffer in snapshot(), and lose all the
+        # samples after the first 'nslots'
+        space.actionflag.register_periodic_action(DrainAction(space),
+                                                  use_bytecode_counter=True)
+
 
 # Force the __extend__ hacks and method replacements to occur
 # early.  Without this, for example, 'PyCode._init_ready' was
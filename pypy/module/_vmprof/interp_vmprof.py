@@ -3,6 +3,7 @@ from pypy.interpreter.gateway import unwrap_spec
 from pypy.interpreter.pyframe import PyFrame
 from pypy.interpreter.pycode import PyCode
 from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.executioncontext import PeriodicAsyncAction
 from rpython.rlib import rvmprof, jit
 from pypy.interpreter.error import oefmt
 
@@ -70,6 +71,22 @@ def enable(space, fileno, period, memory, lines, native, real_time):
     except rvmprof.VMProfError as e:
         raise VMProfError(space, e)
 
+@unwrap_spec(period=float, nslots=int, real_time=int)
+def enable_aggregating(space, period, nslots=rvmprof.DEFAULT_RING_SLOTS,
+                       real_time=0):
+    """Enable vmprof without writing a profile file.  The samples are
+    stored in a ring buffer of 'nslots' entries in memory, and merged
+    regularly into a call tree that snapshot() returns.  Stop it with
+    disable().
+
+    'period' is a float representing the sampling interval, in seconds.
+    Must be smaller than 1.0
+    """
+    try:
+        rvmprof.enable_aggregating(period, nslots, real_time)
+    except rvmprof.VMProfError as e:
+        raise VMProfError(space, e)
+
 def disable(space):
     """Disable vmprof.  Remember to close the file descriptor afterwards
     if necessary.
@@ -82,6 +99,41 @@ def disable(space):
 def is_enabled(space):
     return space.newbool(rvmprof.is_enabled())
 
+def _wrap_call_tree(space, node, name):
+    children_w = [_wrap_call_tree(space, child,
+                                  rvmprof.get_code_name(child.get_unique_id()))
+                  for child in node.children.values()]
+    return space.newtuple([space.newtext(name),
+                           space.newbool(node.is_jitted()),
+                           space.newint(node.count),
+                           space.newint(node.self_count),
+                           space.newlist(children_w)])
+
+@unwrap_spec(clear=bool)
+def snapshot(space, clear=False):
+    """Return the call tree collected since enable_aggregating(), as a
+    tuple (lost_samples, root).  Every node of the tree is a tuple
+    (name, jitted, count, self_count, children): 'name' is the code
+    object's name as written in vmprof files, or '' if it is unknown;
+    'jitted' tells if the samples were taken in JIT-compiled code;
+    'count' includes the samples of the children.  The root node has
+    the name '<root>'.  If 'clear' is true, start a new tree afterwards.
+
+    Samples are attributed to code objects only, not to source lines,
+    both in interpreted and in JIT-compiled code: the codemap records
+    which code objects a piece of machine code belongs to, but not the
+    bytecode position of each instruction.
+    """
+    tree = rvmprof.get_call_tree()
+    if tree is None:
+        raise oefmt(space.w_RuntimeError,
+                    "enable_aggregating() was not called")
+    w_result = space.newtuple([space.newint(rvmprof.get_lost_samples()),
+                               _wrap_call_tree(space, tree, '<root>')])
+    if clear:
+        rvmprof.clear_call_tree()
+    return w_result
+
 def get_profile_path(space):
     path = rvmprof.get_profile_path(space)
     if path is None:
@@ -98,3 +150,12 @@ def stop_sampling(space):
 def start_sampling(space):
     rvmprof.start_sampling()
     return space.w_None
+
+
+class DrainAction(PeriodicAsyncAction):
+    """Merge the samples of enable_aggregating() into the call tree, so
+    that the ring buffer does not overflow between calls to snapshot().
+    """
+    def perform(self, executioncontext, frame):
+        if rvmprof.is_aggregating():
+            rvmprof.drain()
@@ -108,6 +108,55 @@ class AppTestVMProf(object):
         _vmprof.disable()
         assert _vmprof.is_enabled() is False
 
+    def test_aggregating(self):
+        import _vmprof
+        tmpfile = open(self.tmpfilename, 'wb')
+        _vmprof.enable_aggregating(0.01)
+        assert _vmprof.is_enabled() is True
+        assert _vmprof.get_profile_path() != self.tmpfilename
+        raises(_vmprof.VMProfError, _vmprof.enable_aggregating, 0.01)
+        raises(_vmprof.VMProfError, _vmprof.enable, tmpfile.fileno(),
+               0.01, 0, 0, 0, 0)
+        j = 0
+        for i in range(100000):
+            j += i
+        _vmprof.disable()
+        assert _vmprof.is_enabled() is False
+        #
+        def check(node):
+            name, jitted, count, self_count, children = node
+            assert count == self_count + sum([child[2] for child in children])
+            for child in children:
+                assert child[0] == '' or child[0].startswith('py:')
+                check(child)
+        lost, root = _vmprof.snapshot(clear=True)
+        assert lost == 0
+        assert root[0] == '<root>'
+        assert root[1] is False
+        check(root)
+        lost, root = _vmprof.snapshot()
+        assert (lost, root) == (0, ('<root>', False, 0, 0, []))
+
+    def test_aggregating_drains_periodically(self):
+        # single-threaded, for much longer than it takes to fill the
+        # 32 slots of the ring buffer: the samples must be drained by
+        # the periodic action, not lost until snapshot().  The check
+        # interval is lowered only because this test runs untranslated.
+        import _vmprof, sys, time
+        old_interval = sys.getcheckinterval()
+        sys.setcheckinterval(100)
+        try:
+            _vmprof.enable_aggregating(0.001, 32)
+            end = time.time() + 3.0
+            j = 0
+            while time.time() < end:
+                j += 1
+            _vmprof.disable()
+        finally:
+            sys.setcheckinterval(old_interval)
+        lost, root = _vmprof.snapshot(clear=True)
+        assert lost == 0
+
     @py.test.mark.xfail(sys.platform.startswith('freebsd'), reason = "not implemented")
     def test_get_profile_path(self):
         import _vmprof
@@ -329,6 +329,57 @@ class W_ArrayBase(W_Root):
         """
         raise NotImplementedError
 
+    def descr_sum(self, space):
+        """ sum() -> number
+
+        Return the sum of the items of a numeric array.
+        """
+        raise NotImplementedError
+
+    def descr_min(self, space):
+        """ min() -> item
+
+        Return the smallest item of the array.
+        """
+        raise NotImplementedError
+
+    def descr_max(self, space):
+        """ max() -> item
+
+        Return the largest item of the array.
+        """
+        raise NotImplementedError
+
+    def descr_iadd(self, space, w_other):
+        """ iadd(x)
+
+        Add x to every item of a numeric array, in place.  x is either a
+        number, or an array of the same typecode and length, which is
+        added elementwise.  Note that 'a += x' concatenates instead.
+        """
+        raise NotImplementedError
+
+    def descr_imul(self, space, w_other):
+        """ imul(x)
+
+        Multiply every item of a numeric array by x, in place.  x is
+        either a number, or an array of the same typecode and length,
+        which is multiplied elementwise.  Note that 'a *= x' repeats
+        the array instead.
+        """
+        raise NotImplementedError
+
+    def descr_take(self, space, w_indices):
+        """ take(indices) -> array
+
+        Return a new array with the items at the given indices, which is
+        a sequence or an array of integers.
+        """
+        raise NotImplementedError
+
+    def getindices(self, space):
+        raise NotImplementedError
+
     def descr_tolist(self, space):
         """ tolist() -> list
 
@@ -764,6 +815,13 @@ W_ArrayBase.typedef = TypeDef(
     __copy__ = interp2app(W_ArrayBase.descr_copy),
     __reduce__ = interp2app(W_ArrayBase.descr_reduce),
     byteswap = interp2app(W_ArrayBase.descr_byteswap),
+
+    sum = interpindirect2app(W_ArrayBase.descr_sum),
+    min = interpindirect2app(W_ArrayBase.descr_min),
+    max = interpindirect2app(W_ArrayBase.descr_max),
+    iadd = interpindirect2app(W_ArrayBase.descr_iadd),
+    imul = interpindirect2app(W_ArrayBase.descr_imul),
+    take = interpindirect2app(W_ArrayBase.descr_take),
 )
 
 
@@ -861,6 +919,16 @@ unpack_driver = jit.JitDriver(name='unpack_array',
 def make_array(mytype):
     W_ArrayBase = globals()['W_ArrayBase']
 
+    def widen_item(item):
+        # comparisons are not supported on the small integer types
+        if mytype.typecode in 'fd':
+            return float(item)
+        elif mytype.unwrap == 'int_w':
+            return rffi.cast(lltype.Signed, item)
+        elif mytype.unwrap == 'bigint_w':
+            return rffi.cast(lltype.Unsigned, item)
+        return item
+
     class W_Array(W_ArrayBase):
         itemsize = mytype.bytes
         typecode = mytype.typecode
@@ -1110,6 +1178,178 @@ def make_array(mytype):
                 keepalive_until_here(w_item)
                 keepalive_until_here(self)
 
+        # Numeric interface.  The loops below are not traced: the JIT
+        # calls them as compiled C loops over the raw buffer.
+
+        def _check_numeric(self, space, operation):
+            if mytype.typecode == 'c' or mytype.typecode == 'u':
+                raise oefmt(space.w_TypeError,
+                            "%s() not supported for arrays of typecode '%s'",
+                            operation, mytype.typecode)
+
+        def descr_sum(self, space):
+            self._check_numeric(space, "sum")
+            buf = self.get_buffer()
+            if mytype.typecode in 'fd':
+                ftotal = 0.0
+                for i in range(self.len):
+                    ftotal += float(buf[i])
+                keepalive_until_here(self)
+                return space.newfloat(ftotal)
+            total = 0
+            i = 0
+            if mytype.unwrap == 'int_w':
+                while i < self.len:
+                    try:
+                        total = ovfcheck(total +
+                                         rffi.cast(lltype.Signed, buf[i]))
+                    except OverflowError:
+                        break
+                    i += 1
+                keepalive_until_here(self)
+            # the sum does not fit in a machine word (or the items are
+            # unsigned words): continue with boxed integers
+            w_total = space.newint(total)
+            while i < self.len:
+                w_total = space.add(w_total, self.w_getitem(space, i))
+                i += 1
+            return w_total
+
+        def _find_extremum(self, space, operation, is_max):
+            if self.len == 0:
+                raise oefmt(space.w_ValueError,
+                            "%s() arg is an empty array", operation)
+            buf = self.get_buffer()
+            best = widen_item(buf[0])
+            best_index = 0
+            for i in range(1, self.len):
+                item = widen_item(buf[i])
+                if is_max:
+                    found = item > best
+                else:
+                    found = item < best
+                if found:
+                    best = item
+                    best_index = i
+            keepalive_until_here(self)
+            return self.w_getitem(space, best_index)
+
+        def descr_min(self, space):
+            return self._find_extremum(space, "min", False)
+
+        def descr_max(self, space):
+            return self._find_extremum(space, "max", True)
+
+        def _elementwise(self, space, w_other, operation, mul):
+            self._check_numeric(space, operation)
+            if mytype.unwrap == 'bigint_w':
+                raise oefmt(space.w_TypeError,
+                            "%s() not supported for arrays of typecode '%s'",
+                            operation, mytype.typecode)
+            length = self.len
+            if isinstance(w_other, W_ArrayBase):
+                if not isinstance(w_other, W_Array):
+                    raise oefmt(space.w_TypeError,
+                                "%s() needs an array of the same kind",
+                                operation)
+                if w_other.len != length:
+                    raise oefmt(space.w_ValueError,
+                                "%s() needs an array of the same length",
+                                operation)
+                w_array = w_other
+                srcbuf = w_other.get_buffer()
+            else:
+                w_array = None
+                srcbuf = lltype.nullptr(mytype.arraytype)
+            buf = self.get_buffer()
+            if mytype.typecode in 'fd':
+                fvalue = 0.0
+                if w_array is None:
+                    fvalue = space.float_w(w_other)
+                for i in range(length):
+                    if w_array is not None:
+                        fvalue = float(srcbuf[i])
+                    if mul:
+                        result = float(buf[i]) * fvalue
+                    else:
+                        result = float(buf[i]) + fvalue
+                    buf[i] = rffi.cast(mytype.itemtype, result)
+                keepalive_until_here(w_array)
+                keepalive_until_here(self)
+                return
+            value = 0
+            if w_array is None:
+                value = space.int_w(w_other)
+            if length == 0:
+                return
+            # integer items can overflow: compute the result in a new
+            # buffer, so that the array is unchanged if one of them does
+            newbuffer = lltype.malloc(rffi.CCHARP.TO, length * self.itemsize,
+                                      flavor='raw', add_memory_pressure=True)
+            dstbuf = rffi.cast(mytype.arrayptrtype, newbuffer)
+            try:
+                for i in range(length):
+                    if w_array is not None:
+                        value = rffi.cast(lltype.Signed, srcbuf[i])
+                    item = rffi.cast(lltype.Signed, buf[i])
+                    try:
+                        if mul:
+                            result = ovfcheck(item * value)
+                        else:
+                            result = ovfcheck(item + value)
+                    except OverflowError:
+                        raise oefmt(space.w_OverflowError,
+                                    "integer overflow")
+                    dstbuf[i] = self.item_from_int_or_float(result)
+            except OperationError:
+                lltype.free(newbuffer, flavor='raw')
+                raise
+            keepalive_until_here(w_array)
+            lltype.free(self._buffer, flavor='raw')
+            self._buffer = newbuffer
+            self.allocated = length
+
+        def descr_iadd(self, space, w_other):
+            self._elementwise(space, w_other, "iadd", False)
+
+        def descr_imul(self, space, w_other):
+            self._elementwise(space, w_other, "imul", True)
+
+        def getindices(self, space):
+            if mytype.unwrap != 'int_w':
+                raise oefmt(space.w_TypeError,
+                            "array indices must be integers")
+            buf = self.get_buffer()
+            indices = [rffi.cast(lltype.Signed, buf[i])
+                       for i in range(self.len)]
+            keepalive_until_here(self)
+            return indices
+
+        def descr_take(self, space, w_indices):
+            indices = space.listview_int(w_indices)
+            if indices is None:
+                if isinstance(w_indices, W_ArrayBase):
+                    indices = w_indices.getindices(space)
+                else:
+                    indices = [space.getindex_w(w_index, space.w_IndexError)
+                               for w_index in space.fixedview(w_indices)]
+            w_a = mytype.w_class(space)
+            w_a.setlen(len(indices), overallocate=False)
+            buf = w_a.get_buffer()
+            srcbuf = self.get_buffer()
+            length = self.len
+            for j in range(len(indices)):
+                i = indices[j]
+                if i < 0:
+                    i += length
+                if not 0 <= i < length:
+                    raise oefmt(space.w_IndexError,
+                                "array index out of range")
+                buf[j] = srcbuf[i]
+            keepalive_until_here(self)
+            keepalive_until_here(w_a)
+            return w_a
+
         def _repeat_single_item(self, a, start, repeat):
             # <a performance hack>
             assert isinstance(a, W_Array)
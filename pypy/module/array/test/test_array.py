@@ -668,6 +668,85 @@ class AppTestArray(object):
         a *= mulable()
         assert a == 'rmul'
 
+    def test_sum_min_max(self):
+        for t in 'bBhHiIlLfd':
+            a = self.array(t, [3, 1, 4, 1, 5])
+            assert a.sum() == 14
+            assert a.min() == 1
+            assert a.max() == 5
+            assert type(a.sum()) is type(a[0])
+            assert self.array(t).sum() == 0
+            raises(ValueError, self.array(t).min)
+            raises(ValueError, self.array(t).max)
+        a = self.array('d', [1.5, -2.25, 0.5])
+        assert a.sum() == -0.25
+        assert a.min() == -2.25
+        assert a.max() == 1.5
+        a = self.array('l', [self.maxint, self.maxint, -5])
+        assert a.sum() == 2 * self.maxint - 5
+        a = self.array('L', [2 * self.maxint + 1] * 3)
+        assert a.sum() == 3 * (2 * self.maxint + 1)
+        assert a.max() == 2 * self.maxint + 1
+        a = self.array('c', 'hello')
+        assert a.min() == 'e'
+        assert a.max() == 'o'
+        raises(TypeError, a.sum)
+        raises(TypeError, self.array('u', u'xyz').sum)
+
+    def test_iadd_imul(self):
+        a = self.array('i', [1, 2, 3])
+        b = a
+        assert a.iadd(10) is None
+        assert a is b
+        assert a == self.array('i', [11, 12, 13])
+        a.imul(-2)
+        assert a == self.array('i', [-22, -24, -26])
+        a.iadd(self.array('i', [22, 25, 30]))
+        assert a == self.array('i', [0, 1, 4])
+        a.imul(a)
+        assert a == self.array('i', [0, 1, 16])
+        raises(ValueError, a.iadd, self.array('i', [1]))
+        raises(TypeError, a.iadd, self.array('l', [1, 2, 3]))
+        raises(TypeError, a.iadd, 1.5)
+        raises(TypeError, a.iadd, [1, 2, 3])
+        a = self.array('d', [1.0, 2.0])
+        a.iadd(1)
+        a.imul(self.array('d', [0.5, 2.0]))
+        assert a == self.array('d', [1.0, 6.0])
+        a = self.array('f', [1.5])
+        a.imul(2)
+        assert a[0] == 3.0
+        # on overflow, the array is left unchanged
+        a = self.array('b', [1, 100, 2])
+        raises(OverflowError, a.iadd, 28)
+        assert a == self.array('b', [1, 100, 2])
+        a = self.array('B', [1, 2])
+        raises(OverflowError, a.iadd, -2)
+        assert a == self.array('B', [1, 2])
+        a = self.array('l', [self.maxint // 2 + 1])
+        raises(OverflowError, a.imul, 2)
+        assert a[0] == self.maxint // 2 + 1
+        a = self.array('h')
+        a.iadd(5)
+        assert len(a) == 0
+        raises(TypeError, self.array('c', 'x').iadd, 1)
+        raises(TypeError, self.array('L', [1]).iadd, 1)
+
+    def test_take(self):
+        a = self.array('d', [0.5, 1.5, 2.5, 3.5])
+        b = a.take([3, 0, -1, 0])
+        assert type(b) is self.array
+        assert b == self.array('d', [3.5, 0.5, 3.5, 0.5])
+        assert a.take(self.array('B', [1, 2])) == self.array('d', [1.5, 2.5])
+        assert a.take((2,)) == self.array('d', [2.5])
+        assert a.take(iter([1])) == self.array('d', [1.5])
+        assert a.take([]) == self.array('d')
+        assert self.array('c', 'abc').take([2, 1]).tostring() == 'cb'
+        raises(IndexError, a.take, [4])
+        raises(IndexError, a.take, [-5])
+        raises(TypeError, a.take, [1.0])
+        raises(TypeError, a.take, self.array('d', [1.0]))
+
     def test_delitem(self):
         a = self.array('i', [1, 2, 3])
         del a[1]
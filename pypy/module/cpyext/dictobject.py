@@ -2,6 +2,7 @@ from rpython.rtyper.lltypesystem import rffi, lltype
 from rpython.rlib.objectmodel import specialize
 from pypy.interpreter.error import OperationError
 from pypy.objspace.std.classdict import ClassDictStrategy
+from pypy.objspace.std.dictmultiobject import W_DictMultiObject
 from pypy.interpreter.typedef import GetSetProperty
 from pypy.module.cpyext.api import (
     cpython_api, CANNOT_FAIL, build_type_checkers_flags, Py_ssize_t,
@@ -62,6 +63,13 @@ def dict_dealloc(space, py_obj):
     py_dict.c__tmpkeys = lltype.nullptr(PyObject.TO)
     _dealloc(space, py_obj)
 
+def _ensure_boxed_values(w_dict):
+    # the strategies that store the values unboxed make a new object at
+    # every getitem(), which nothing would keep alive: switch the dict to
+    # a strategy with boxed values before returning borrowed refs to them
+    if isinstance(w_dict, W_DictMultiObject):
+        w_dict.ensure_boxed_values()
+
 @cpython_api([], PyObject)
 def PyDict_New(space):
     return space.newdict()
@@ -71,13 +79,16 @@ PyDict_Check, PyDict_CheckExact = build_type_checkers_flags("Dict")
 @cpython_api([PyObject, PyObject], PyObject, error=CANNOT_FAIL,
              result_borrowed=True)
 def PyDict_GetItem(space, w_dict, w_key):
+    _ensure_boxed_values(w_dict)
     try:
         w_res = space.getitem(w_dict, w_key)
     except:
         return None
-    # NOTE: this works so far because all our dict strategies store
-    # *values* as full objects, which stay alive as long as the dict is
-    # alive and not modified.  So we can return a borrowed ref.
+    # NOTE: this works so far because, apart from the strategies with
+    # unboxed values that _ensure_boxed_values() switched away from, all
+    # our dict strategies store *values* as full objects, which stay
+    # alive as long as the dict is alive and not modified.  So we can
+    # return a borrowed ref.
     # XXX this is wrong with IntMutableCell.  Hope it works...
     return w_res
 
@@ -111,13 +122,12 @@ def PyDict_SetItemString(space, w_dict, key_ptr, w_obj):
 def PyDict_GetItemString(space, w_dict, key):
     """This is the same as PyDict_GetItem(), but key is specified as a
     char*, rather than a PyObject*."""
+    _ensure_boxed_values(w_dict)
     try:
         w_res = space.finditem_str(w_dict, rffi.charp2str(key))
     except:
         w_res = None
-    # NOTE: this works so far because all our dict strategies store
-    # *values* as full objects, which stay alive as long as the dict is
-    # alive and not modified.  So we can return a borrowed ref.
+    # NOTE: see PyDict_GetItem() for why we can return a borrowed ref
     # XXX this is wrong with IntMutableCell.  Hope it works...
     return w_res
 
@@ -284,6 +294,7 @@ def PyDict_Next(space, w_dict, ppos, pkey, pvalue):
         py_dict.c__tmpkeys = lltype.nullptr(PyObject.TO)
         return 0
     w_key = space.listview(w_keys)[pos]  # fast iff w_keys uses object strat
+    _ensure_boxed_values(w_dict)    # the value is a borrowed ref too
     w_value = space.getitem(w_dict, w_key)
     if pkey:
         pkey[0] = as_pyobj(space, w_key)
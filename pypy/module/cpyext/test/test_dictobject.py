@@ -52,6 +52,33 @@ class TestDictObject(BaseApiTest):
         PyDict_Clear(space, d)
         assert PyDict_Size(space, d) == 0
 
+    def test_borrowed_unboxed_values(self, space):
+        from pypy.objspace.std.dictmultiobject import (
+            BytesIntDictStrategy, BytesDictStrategy, IntIntDictStrategy,
+            IntDictStrategy)
+        w_d = space.appexec([], "(): return {'a': 1, 'b': 2}")
+        assert isinstance(w_d.get_strategy(), BytesIntDictStrategy)
+        w_a = PyDict_GetItem(space, w_d, space.wrap('a'))
+        assert isinstance(w_d.get_strategy(), BytesDictStrategy)
+        assert PyDict_GetItem(space, w_d, space.wrap('a')) is w_a
+        buf = rffi.str2charp("a")
+        assert PyDict_GetItemString(space, w_d, buf) is w_a
+        rffi.free_charp(buf)
+        #
+        w_d = space.appexec([], "(): return {1: 10, 2: 20}")
+        assert isinstance(w_d.get_strategy(), IntIntDictStrategy)
+        with lltype.scoped_alloc(Py_ssize_tP.TO, 1) as ppos:
+            with lltype.scoped_alloc(PyObjectP.TO, 1) as pvalue:
+                ppos[0] = 0
+                pvalue[0] = lltype.nullptr(PyObjectP.TO.OF.TO)
+                assert PyDict_Next(space, w_d, ppos, None, pvalue)
+                assert isinstance(w_d.get_strategy(), IntDictStrategy)
+                w_value = from_ref(space, pvalue[0])
+                w_key = space.listview(space.call_method(w_d, 'keys'))[0]
+                assert space.getitem(w_d, w_key) is w_value
+                while PyDict_Next(space, w_d, ppos, None, pvalue):
+                    pass
+
     def test_check(self, space):
         d = PyDict_New(space, )
         assert PyDict_Check(space, d)
@@ -240,6 +267,27 @@ class AppTestDictObject(AppTestCpythonExtensionBase):
         d = {1: 'xyz', 3: 'abcd'}
         assert module.keys_and_values(d) == (d.keys(), d.values())
 
+    def test_getitem_unboxed_value(self):
+        module = self.import_extension('foo', [
+            ("get_twice", "METH_VARARGS",
+             '''
+             PyObject *dict, *key, *v1, *v2;
+             if (!PyArg_ParseTuple(args, "OO", &dict, &key))
+                 return NULL;
+             v1 = PyDict_GetItem(dict, key);
+             v2 = PyDict_GetItem(dict, key);
+             if (v1 == NULL || v1 != v2) {
+                 PyErr_SetNone(PyExc_ValueError);
+                 return NULL;
+             }
+             Py_INCREF(v1);
+             return v1;
+             ''')])
+        # these dicts store their values unboxed
+        assert module.get_twice({'a': 1}, 'a') == 1
+        assert module.get_twice({'a': 1.5}, 'a') == 1.5
+        assert module.get_twice({2: 3}, 2) == 3
+
     def test_typedict2(self):
         module = self.import_extension('foo', [
             ("get_type_dict", "METH_O",
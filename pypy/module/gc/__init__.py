@@ -36,5 +36,9 @@ class Module(MixedModule):
                 'GcRef': 'referents.W_GcRef',
                 'hooks': 'space.fromcache(hook.W_AppLevelHooks)',
                 'GcCollectStepStats': 'hook.W_GcCollectStepStats',
+                'enable_alloc_sampling': 'allocsampler.enable_alloc_sampling',
+                'disable_alloc_sampling':
+                    'allocsampler.disable_alloc_sampling',
+                'get_alloc_samples': 'allocsampler.get_alloc_samples',
                 })
         MixedModule.__init__(self, space, w_name)
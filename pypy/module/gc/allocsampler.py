@@ -0,0 +1,255 @@
+"""
+Sampling allocation profiler.  The GC calls the hooks in hook.py for
+one allocation out of every 'period' bytes allocated in the nursery,
+and then again when the sampled object survives its first minor
+collection and when it dies.  We record the vmprof stack of the
+allocation, and keep statistics per allocation site.
+"""
+
+from rpython.rlib import rvmprof
+from rpython.rlib.nonconst import NonConstant
+from rpython.rlib.rvmprof import cintf, traceback
+from rpython.rtyper.lltypesystem import lltype, llmemory, rffi
+
+from pypy.interpreter.executioncontext import AsyncAction
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.interpreter.pycode import PyCode
+
+
+MAX_TRACKED = 4096         # maximum number of sampled objects alive
+MAX_DEPTH = 32             # frames recorded per sample
+STACK_WORDS = 2 * MAX_DEPTH + 2
+WORD = rffi.sizeof(lltype.Signed)
+
+
+class AllocSite(object):
+    """Statistics for the sampled objects allocated with the same stack."""
+
+    def __init__(self, stack):
+        self.stack = stack        # list of words, as vmprof records them
+        self.died_young = 0       # samples that died in the nursery
+        self.died_old = 0         # samples that were promoted, then died
+        self.majors_survived = 0  # total major collections survived by those
+        self.dead_bytes = 0
+        self.alive = 0            # these three are computed by report()
+        self.alive_old = 0
+        self.alive_bytes = 0
+
+
+class AllocSampler(object):
+    """
+    The methods on_sample(), on_promoted() and on_freed() are called from
+    the GC: like the hooks they can't allocate GC memory.  They store the
+    samples into preallocated tables, and the dead samples are moved to
+    the 'sites' dictionary later by AllocSamplerAction.
+    """
+
+    def __init__(self, space):
+        self.space = space
+        self.period = 0
+        self.dropped = 0
+        self.stacks = lltype.nullptr(rffi.SIGNEDP.TO)
+        self.depths = []          # -1 for the free slots
+        self.sizes = []
+        self.promoted = []
+        self.free_slots = []
+        self.num_free = 0
+        self.dead_slots = []
+        self.dead_majors = []
+        self.num_dead = 0
+        self.sites = {}
+        self.action = AllocSamplerAction(space, self)
+
+    def enable(self, period):
+        if not self.stacks:
+            # allocated once: the GC can still report old samples after
+            # disable() is called
+            self.stacks = lltype.malloc(rffi.SIGNEDP.TO,
+                                        MAX_TRACKED * STACK_WORDS,
+                                        flavor='raw',
+                                        track_allocation=False)
+            self.depths = [-1] * MAX_TRACKED
+            self.sizes = [0] * MAX_TRACKED
+            self.promoted = [0] * MAX_TRACKED
+            self.free_slots = range(MAX_TRACKED - 1, -1, -1)
+            self.num_free = MAX_TRACKED
+            self.dead_slots = [0] * MAX_TRACKED
+            self.dead_majors = [0] * MAX_TRACKED
+            self.num_dead = 0
+        self.period = period
+        self.fix_annotation()
+
+    def fix_annotation(self):
+        # the methods called by the GC must be annotated BEFORE we do the
+        # gc transform, see GcMinorHookAction.fix_annotation() in hook.py
+        if NonConstant(False):
+            slot = self.on_sample(NonConstant(42))
+            self.on_promoted(slot)
+            self.on_freed(slot, NonConstant(-42))
+
+    def disable(self):
+        self.period = 0
+
+    def clear(self):
+        self.collect_dead()
+        self.sites = {}
+        self.dropped = 0
+
+    # ---------- called from the GC ----------
+
+    def on_sample(self, size):
+        if self.num_free == 0:
+            self.dropped += 1
+            return -1
+        self.num_free -= 1
+        slot = self.free_slots[self.num_free]
+        self.depths[slot] = self._record_stack(slot)
+        self.sizes[slot] = size
+        self.promoted[slot] = 0
+        return slot
+
+    def _record_stack(self, slot):
+        if not cintf.IS_SUPPORTED:
+            return 0
+        stack = cintf.get_rvmprof_stack()
+        if not stack:
+            return 0
+        _cintf = rvmprof.rvmprof._get_vmprof().cintf
+        array_p = rffi.ptradd(self.stacks, slot * STACK_WORDS)
+        return _cintf.vmprof_get_traceback(stack, llmemory.NULL, array_p,
+                                           STACK_WORDS)
+
+    def on_promoted(self, slot):
+        self.promoted[slot] = 1
+
+    def on_freed(self, slot, major_collections):
+        self.dead_slots[self.num_dead] = slot
+        self.dead_majors[self.num_dead] = major_collections
+        self.num_dead += 1
+        self.action.fire()
+
+    # ---------- called normally ----------
+
+    def _get_site(self, slot):
+        depth = self.depths[slot]
+        array_p = rffi.ptradd(self.stacks, slot * STACK_WORDS)
+        key = rffi.charpsize2str(rffi.cast(rffi.CCHARP, array_p),
+                                 depth * WORD)
+        site = self.sites.get(key, None)
+        if site is None:
+            site = AllocSite([array_p[i] for i in range(depth)])
+            self.sites[key] = site
+        return site
+
+    def collect_dead(self):
+        while self.num_dead > 0:
+            self.num_dead -= 1
+            slot = self.dead_slots[self.num_dead]
+            major_collections = self.dead_majors[self.num_dead]
+            site = self._get_site(slot)
+            if major_collections < 0:
+                site.died_young += 1
+            else:
+                site.died_old += 1
+                site.majors_survived += major_collections
+            site.dead_bytes += self.sizes[slot]
+            self.depths[slot] = -1
+            self.free_slots[self.num_free] = slot
+            self.num_free += 1
+
+    def report(self):
+        self.collect_dead()
+        for site in self.sites.values():
+            site.alive = 0
+            site.alive_old = 0
+            site.alive_bytes = 0
+        for slot in range(len(self.depths)):
+            if self.depths[slot] >= 0:
+                site = self._get_site(slot)
+                site.alive += 1
+                site.alive_old += self.promoted[slot]
+                site.alive_bytes += self.sizes[slot]
+        return self.sites.values()
+
+
+class AllocSamplerAction(AsyncAction):
+    """Move the samples of the objects that died into the statistics."""
+
+    def __init__(self, space, sampler):
+        AsyncAction.__init__(self, space)
+        self.sampler = sampler
+
+    def perform(self, ec, frame):
+        self.sampler.collect_dead()
+
+
+class _StackBuilder(object):
+    def __init__(self, space):
+        self.space = space
+        self.codes_w = []
+
+def _add_code(code, loc, builder):
+    if code is None:
+        builder.codes_w.append(builder.space.w_None)
+    else:
+        builder.codes_w.append(code)
+
+def wrap_stack(space, stack):
+    builder = _StackBuilder(space)
+    if rvmprof._was_registered(PyCode) and len(stack) > 0:
+        length = len(stack)
+        with lltype.scoped_alloc(rffi.SIGNEDP.TO, length) as array_p:
+            for i in range(length):
+                array_p[i] = stack[i]
+            traceback.walk_traceback(PyCode, _add_code, builder,
+                                     array_p, length)
+    return space.newlist(builder.codes_w)
+
+
+@unwrap_spec(period=int)
+def enable_alloc_sampling(space, period=65536):
+    """Sample one allocation every 'period' bytes allocated by the GC,
+    and follow the sampled objects until they die.  The results are
+    returned by get_alloc_samples().  The stacks are only recorded if
+    the _vmprof module is enabled."""
+    if period <= 0:
+        raise oefmt(space.w_ValueError, "period must be positive")
+    space.fromcache(AllocSampler).enable(period)
+
+def disable_alloc_sampling(space):
+    """Stop sampling allocations.  The objects sampled so far are still
+    followed."""
+    space.fromcache(AllocSampler).disable()
+
+@unwrap_spec(clear=bool)
+def get_alloc_samples(space, clear=False):
+    """Return a list with one dict per allocation site, i.e. per stack
+    of code objects (innermost first) found in the samples.  The keys
+    are: 'stack', 'samples', 'bytes', 'alive', 'alive_old' (still alive
+    objects that survived a minor collection), 'died_young',
+    'died_old' and 'majors_survived' (the total number of major
+    collections survived by the objects in 'died_old').  If 'clear'
+    is true, start again from zero afterwards, apart from the objects
+    that are still alive."""
+    sampler = space.fromcache(AllocSampler)
+    sites_w = []
+    for site in sampler.report():
+        samples = site.alive + site.died_young + site.died_old
+        if samples == 0:
+            continue
+        w_site = space.newdict()
+        space.setitem_str(w_site, 'stack', wrap_stack(space, site.stack))
+        space.setitem_str(w_site, 'samples', space.newint(samples))
+        space.setitem_str(w_site, 'bytes',
+                          space.newint(site.alive_bytes + site.dead_bytes))
+        space.setitem_str(w_site, 'alive', space.newint(site.alive))
+        space.setitem_str(w_site, 'alive_old', space.newint(site.alive_old))
+        space.setitem_str(w_site, 'died_young', space.newint(site.died_young))
+        space.setitem_str(w_site, 'died_old', space.newint(site.died_old))
+        space.setitem_str(w_site, 'majors_survived',
+                          space.newint(site.majors_survived))
+        sites_w.append(w_site)
+    if clear:
+        sampler.clear()
+    return space.newlist(sites_w)
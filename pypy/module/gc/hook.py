@@ -6,6 +6,7 @@ from pypy.interpreter.gateway import interp2app, unwrap_spec, WrappedDefault
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.typedef import TypeDef, interp_attrproperty, GetSetProperty
 from pypy.interpreter.executioncontext import AsyncAction
+from pypy.module.gc.allocsampler import AllocSampler
 
 class LowLevelGcHooks(GcHooks):
     """
@@ -21,6 +22,7 @@ class LowLevelGcHooks(GcHooks):
     def __init__(self, space):
         self.space = space
         self.w_hooks = space.fromcache(W_AppLevelHooks)
+        self.sampler = space.fromcache(AllocSampler)
 
     def is_gc_minor_enabled(self):
         return self.w_hooks.gc_minor_enabled
@@ -65,6 +67,18 @@ class LowLevelGcHooks(GcHooks):
         action.rawmalloc_bytes_after = rawmalloc_bytes_after
         action.fire()
 
+    def get_alloc_sample_period(self):
+        return self.sampler.period
+
+    def on_gc_alloc_sample(self, size):
+        return self.sampler.on_sample(size)
+
+    def on_gc_alloc_sample_promoted(self, sample):
+        self.sampler.on_promoted(sample)
+
+    def on_gc_alloc_sample_freed(self, sample, major_collections):
+        self.sampler.on_freed(sample, major_collections)
+
 
 class W_AppLevelHooks(W_Root):
 
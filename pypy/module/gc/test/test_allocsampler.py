@@ -0,0 +1,98 @@
+import pytest
+from pypy.module.gc.hook import LowLevelGcHooks
+from pypy.interpreter.baseobjspace import ObjSpace
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+
+class AppTestAllocSampler(object):
+    spaceconfig = {'usemodules': ['_vmprof']}
+
+    def setup_class(cls):
+        if cls.runappdirect:
+            pytest.skip("these tests cannot work with -A")
+        space = cls.space
+        gchooks = space.fromcache(LowLevelGcHooks)
+
+        @unwrap_spec(ObjSpace)
+        def get_alloc_sample_period(space):
+            return space.newint(gchooks.get_alloc_sample_period())
+
+        @unwrap_spec(ObjSpace, int)
+        def fire_gc_alloc_sample(space, size):
+            return space.newint(gchooks.fire_gc_alloc_sample(size))
+
+        @unwrap_spec(ObjSpace, int)
+        def fire_gc_alloc_sample_promoted(space, sample):
+            gchooks.fire_gc_alloc_sample_promoted(sample)
+
+        @unwrap_spec(ObjSpace, int, int)
+        def fire_gc_alloc_sample_freed(space, sample, major_collections):
+            gchooks.fire_gc_alloc_sample_freed(sample, major_collections)
+
+        cls.w_get_alloc_sample_period = space.wrap(
+            interp2app(get_alloc_sample_period))
+        cls.w_fire_gc_alloc_sample = space.wrap(
+            interp2app(fire_gc_alloc_sample))
+        cls.w_fire_gc_alloc_sample_promoted = space.wrap(
+            interp2app(fire_gc_alloc_sample_promoted))
+        cls.w_fire_gc_alloc_sample_freed = space.wrap(
+            interp2app(fire_gc_alloc_sample_freed))
+
+    def test_enable_disable(self):
+        import gc
+        assert self.get_alloc_sample_period() == 0
+        gc.enable_alloc_sampling(1000)
+        assert self.get_alloc_sample_period() == 1000
+        gc.disable_alloc_sampling()
+        assert self.get_alloc_sample_period() == 0
+        raises(ValueError, gc.enable_alloc_sampling, 0)
+
+    def test_samples(self):
+        import gc, sys
+        gc.enable_alloc_sampling(1000)
+        def allocate(size):
+            return self.fire_gc_alloc_sample(size)
+        a = allocate(16)
+        b = allocate(32)
+        c = allocate(48)
+        d = self.fire_gc_alloc_sample(64)
+        self.fire_gc_alloc_sample_freed(a, -1)
+        self.fire_gc_alloc_sample_promoted(b)
+        self.fire_gc_alloc_sample_promoted(c)
+        self.fire_gc_alloc_sample_freed(c, 3)
+        gc.disable_alloc_sampling()
+        #
+        sites = gc.get_alloc_samples()
+        assert len(sites) == 2
+        sites.sort(key=lambda site: site['samples'])
+        site_d, site_abc = sites
+        assert site_abc['stack'][0] is allocate.__code__
+        assert site_d['stack'][0] is sys._getframe().f_code
+        assert site_abc['stack'][1:] == site_d['stack']
+        assert site_abc['samples'] == 3
+        assert site_abc['bytes'] == 16 + 32 + 48
+        assert site_abc['alive'] == 1
+        assert site_abc['alive_old'] == 1
+        assert site_abc['died_young'] == 1
+        assert site_abc['died_old'] == 1
+        assert site_abc['majors_survived'] == 3
+        assert site_d['samples'] == 1
+        assert site_d['bytes'] == 64
+        assert site_d['alive'] == 1
+        assert site_d['alive_old'] == 0
+        assert site_d['died_young'] == site_d['died_old'] == 0
+        #
+        # the GC can still report about the objects sampled before
+        self.fire_gc_alloc_sample_freed(d, -1)
+        sites = gc.get_alloc_samples(clear=True)
+        sites.sort(key=lambda site: site['samples'])
+        assert sites[0]['alive'] == 0
+        assert sites[0]['died_young'] == 1
+        #
+        # 'b' is still alive, so it is reported again
+        sites = gc.get_alloc_samples()
+        assert len(sites) == 1
+        assert sites[0]['samples'] == sites[0]['alive'] == 1
+        assert sites[0]['bytes'] == 32
+        self.fire_gc_alloc_sample_freed(b, 0)
+        gc.get_alloc_samples(clear=True)
+        assert gc.get_alloc_samples() == []
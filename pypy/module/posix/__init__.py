@@ -2,6 +2,7 @@ from pypy.interpreter.mixedmodule import MixedModule
 from rpython.rlib import rposix
 
 import os
+import sys
 exec 'import %s as posix' % os.name
 
 class Module(MixedModule):
@@ -94,6 +95,19 @@ corresponding Unix manual entries for more information on calls."""
         interpleveldefs['fdatasync'] = 'interp_posix.fdatasync'
     if hasattr(os, 'fchdir'):
         interpleveldefs['fchdir'] = 'interp_posix.fchdir'
+    if os.name != 'nt':
+        interpleveldefs['scandir'] = 'interp_scandir.scandir'
+        interpleveldefs['DirEntry'] = 'interp_scandir.W_DirEntry'
+    if sys.platform.startswith('linux'):
+        # rposix.sendfile() follows the Linux API
+        interpleveldefs['sendfile'] = 'interp_posix.sendfile'
+    if hasattr(rposix, 'copy_file_range'):
+        interpleveldefs['copy_file_range'] = 'interp_posix.copy_file_range'
+    if hasattr(rposix, 'splice'):
+        interpleveldefs['splice'] = 'interp_posix.splice'
+        for _name in ['SPLICE_F_MOVE', 'SPLICE_F_NONBLOCK', 'SPLICE_F_MORE']:
+            interpleveldefs[_name] = 'space.wrap(%d)' % getattr(rposix, _name)
+        del _name
     if hasattr(os, 'putenv'):
         interpleveldefs['putenv'] = 'interp_posix.putenv'
     if hasattr(posix, 'unsetenv'): # note: emulated in os
@@ -208,6 +208,73 @@ opened on a directory, not a file."""
     except OSError as e:
         raise wrap_oserror(space, e)
 
+def _offset_w(space, w_offset):
+    # None is passed as -1 to rposix: use the current file position
+    if space.is_none(w_offset):
+        return r_longlong(-1)
+    offset = space.r_longlong_w(w_offset)
+    if offset < 0:
+        raise oefmt(space.w_ValueError, "offset must be non-negative")
+    return offset
+
+def _check_count(space, count):
+    if count < 0:
+        raise oefmt(space.w_ValueError, "count must be non-negative")
+
+@unwrap_spec(out_fd=c_int, in_fd=c_int, count=int)
+def sendfile(space, out_fd, in_fd, w_offset, count):
+    """sendfile(out_fd, in_fd, offset, count) -> byteswritten
+
+Copy count bytes from file descriptor in_fd to file descriptor out_fd,
+starting at offset, without going through user space.  If offset is None,
+start at the current position of in_fd and update it."""
+    offset = _offset_w(space, w_offset)
+    _check_count(space, count)
+    try:
+        if offset == -1:
+            res = rposix.sendfile_no_offset(out_fd, in_fd, count)
+        else:
+            res = rposix.sendfile(out_fd, in_fd, offset, count)
+    except OSError as e:
+        raise wrap_oserror(space, e)
+    return space.newint(res)
+
+@unwrap_spec(src=c_int, dst=c_int, count=int)
+def copy_file_range(space, src, dst, count, w_offset_src=None,
+                    w_offset_dst=None):
+    """copy_file_range(src, dst, count, offset_src=None, offset_dst=None)
+    -> bytescopied
+
+Copy count bytes from file descriptor src to file descriptor dst inside
+the kernel.  If offset_src or offset_dst is None, the current position of
+the corresponding file is used and updated."""
+    offset_src = _offset_w(space, w_offset_src)
+    offset_dst = _offset_w(space, w_offset_dst)
+    _check_count(space, count)
+    try:
+        res = rposix.copy_file_range(src, dst, count, offset_src, offset_dst)
+    except OSError as e:
+        raise wrap_oserror(space, e)
+    return space.newint(res)
+
+@unwrap_spec(src=c_int, dst=c_int, count=int, flags=c_int)
+def splice(space, src, dst, count, w_offset_src=None, w_offset_dst=None,
+           flags=0):
+    """splice(src, dst, count, offset_src=None, offset_dst=None, flags=0)
+    -> bytesmoved
+
+Move count bytes from file descriptor src to file descriptor dst, one of
+which must be a pipe, without going through user space.  The offset of a
+pipe must be None."""
+    offset_src = _offset_w(space, w_offset_src)
+    offset_dst = _offset_w(space, w_offset_dst)
+    _check_count(space, count)
+    try:
+        res = rposix.splice(src, dst, count, offset_src, offset_dst, flags)
+    except OSError as e:
+        raise wrap_oserror(space, e)
+    return space.newint(res)
+
 # ____________________________________________________________
 
 STAT_FIELDS = unrolling_iterable(enumerate(rposix_stat.STAT_FIELDS))
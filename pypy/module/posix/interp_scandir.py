@@ -0,0 +1,327 @@
+"""
+posix.scandir() and the DirEntry objects, like in Python 3.  The file type
+comes from the 'd_type' of the directory entry when the OS gives it, and
+stat() and lstat() are called at most once per entry, with fstatat() on
+the directory if possible.
+"""
+
+import stat
+from errno import ENOENT
+
+from rpython.rlib import rgc, rposix, rposix_scandir, rposix_stat
+from rpython.rtyper.lltypesystem import lltype, rffi
+
+from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.error import OperationError, oefmt, wrap_oserror2
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+from pypy.module.posix.interp_posix import build_stat_result
+from pypy.module.sys.interp_encoding import getfilesystemencoding
+
+
+def scandir(space, w_path=None):
+    """scandir(path='.') -> iterator of DirEntry objects for given path
+
+Like listdir(), the names are unicode strings if path is a unicode
+string, and byte strings otherwise.  The special entries '.' and '..'
+are skipped."""
+    if space.is_none(w_path):
+        w_path = space.newtext('.')
+    if space.isinstance_w(w_path, space.w_unicode):
+        path = space.fsencode_w(w_path)
+        upath = space.unicode_w(w_path)
+        if len(upath) > 0 and upath[-1] != u'/':
+            upath += u'/'
+        w_path_prefix = space.newunicode(upath)
+        w_fs_encoding = getfilesystemencoding(space)
+    else:
+        path = space.bytes0_w(w_path)
+        path_prefix = path
+        if len(path_prefix) > 0 and path_prefix[-1] != '/':
+            path_prefix += '/'
+        w_path_prefix = space.newbytes(path_prefix)
+        w_fs_encoding = None
+    try:
+        dirp = rposix_scandir.opendir(path)
+    except OSError as e:
+        raise wrap_oserror2(space, e, w_path)
+    if rposix.HAVE_FSTATAT:
+        dirfd = rffi.cast(lltype.Signed, rposix.c_dirfd(dirp))
+    else:
+        dirfd = -1
+    return W_ScandirIterator(space, dirp, dirfd, w_path_prefix, w_fs_encoding)
+
+class W_ScandirIterator(W_Root):
+    _in_next = False
+
+    def __init__(self, space, dirp, dirfd, w_path_prefix, w_fs_encoding):
+        self.space = space
+        self.dirp = dirp
+        self.dirfd = dirfd
+        self.w_path_prefix = w_path_prefix
+        self.w_fs_encoding = w_fs_encoding    # None if the names are bytes
+
+    @rgc.must_be_light_finalizer
+    def __del__(self):
+        if self.dirp:
+            rposix_scandir.closedir(self.dirp)
+
+    def close(self):
+        dirp = self.dirp
+        if dirp:
+            self.dirfd = -1
+            self.dirp = rposix_scandir.NULL_DIRP
+            rposix_scandir.closedir(dirp)
+
+    def fail(self, err=None):
+        self.close()
+        if err is None:
+            raise OperationError(self.space.w_StopIteration, self.space.w_None)
+        raise err
+
+    def iter_w(self):
+        return self
+
+    def next_w(self):
+        space = self.space
+        if not self.dirp:
+            raise self.fail()
+        if self._in_next:
+            raise self.fail(oefmt(space.w_RuntimeError,
+                            "cannot use ScandirIterator from multiple "
+                            "threads concurrently"))
+        self._in_next = True
+        try:
+            while True:
+                try:
+                    entry = rposix_scandir.nextentry(self.dirp)
+                except OSError as e:
+                    raise self.fail(wrap_oserror2(space, e,
+                                                  self.w_path_prefix))
+                if not entry:
+                    raise self.fail()
+                name = rposix_scandir.get_name_bytes(entry)
+                if name != '.' and name != '..':
+                    break
+            known_type = rposix_scandir.get_known_type(entry)
+            inode = rposix_scandir.get_inode(entry)
+        finally:
+            self._in_next = False
+        return W_DirEntry(self, name, known_type, inode)
+
+    def close_w(self):
+        """close() -> None.  Close the directory."""
+        self.close()
+
+    def enter_w(self):
+        return self
+
+    def exit_w(self, __args__):
+        self.close()
+
+W_ScandirIterator.typedef = TypeDef(
+    'posix.ScandirIterator',
+    __iter__ = interp2app(W_ScandirIterator.iter_w),
+    next = interp2app(W_ScandirIterator.next_w),
+    close = interp2app(W_ScandirIterator.close_w),
+    __enter__ = interp2app(W_ScandirIterator.enter_w),
+    __exit__ = interp2app(W_ScandirIterator.exit_w),
+)
+W_ScandirIterator.typedef.acceptable_as_base_class = False
+
+
+# the low 8 bits of W_DirEntry.flags are the d_type of the entry
+assert 0 <= rposix_scandir.DT_UNKNOWN <= 255
+assert 0 <= rposix_scandir.DT_REG <= 255
+assert 0 <= rposix_scandir.DT_DIR <= 255
+assert 0 <= rposix_scandir.DT_LNK <= 255
+FLAG_STAT  = 256
+FLAG_LSTAT = 512
+
+
+class W_DirEntry(W_Root):
+    w_path = None
+
+    def __init__(self, scandir_iterator, name, known_type, inode):
+        space = scandir_iterator.space
+        self.space = space
+        self.scandir_iterator = scandir_iterator
+        self.name = name     # always bytes
+        self.inode = inode
+        self.flags = known_type
+        assert known_type == (known_type & 255)
+        #
+        w_name = space.newbytes(name)
+        w_fs_encoding = scandir_iterator.w_fs_encoding
+        if w_fs_encoding is not None:
+            # like listdir(): fall back to the byte string
+            try:
+                w_name = space.call_method(w_name, "decode", w_fs_encoding)
+            except OperationError as e:
+                if e.async(space):
+                    raise
+        self.w_name = w_name
+
+    def descr_repr(self, space):
+        return space.newtext("<DirEntry %s>" %
+                             space.text_w(space.repr(self.w_name)))
+
+    def fget_name(self, space):
+        return self.w_name
+
+    def fget_path(self, space):
+        w_path = self.w_path
+        if w_path is None:
+            w_path_prefix = self.scandir_iterator.w_path_prefix
+            w_path = space.add(w_path_prefix, self.w_name)
+            self.w_path = w_path
+        return w_path
+
+    # The internal methods, used to implement the public methods at
+    # the end of the class.  Every method only calls methods *before*
+    # it in program order, so there is no cycle.
+
+    def get_lstat(self):
+        """Get the lstat() of the direntry."""
+        if (self.flags & FLAG_LSTAT) == 0:
+            dirfd = self.scandir_iterator.dirfd
+            if dirfd != -1 and rposix.HAVE_FSTATAT:
+                st = rposix_stat.fstatat(self.name, dirfd,
+                                         follow_symlinks=False)
+            else:
+                path = self.space.fsencode_w(self.fget_path(self.space))
+                st = rposix_stat.lstat(path)
+            self.d_lstat = st
+            self.flags |= FLAG_LSTAT
+        return self.d_lstat
+
+    def get_stat(self):
+        """Get the stat() of the direntry.  This is implemented in
+        such a way that it won't do both a stat() and a lstat().
+        """
+        if (self.flags & FLAG_STAT) == 0:
+            # If the known type says the direntry is not a DT_LNK, get
+            # and cache the lstat(), which is then also the stat().  If
+            # it is a DT_LNK or DT_UNKNOWN, reuse the lstat() only if we
+            # already have it and it is not a symlink.
+            known_type = self.flags & 255
+            if (known_type != rposix_scandir.DT_UNKNOWN and
+                known_type != rposix_scandir.DT_LNK):
+                self.get_lstat()    # fill the 'd_lstat' cache
+                have_lstat = True
+            else:
+                have_lstat = (self.flags & FLAG_LSTAT) != 0
+
+            if have_lstat:
+                must_call_stat = stat.S_ISLNK(self.d_lstat.st_mode)
+            else:
+                must_call_stat = True
+
+            if must_call_stat:
+                dirfd = self.scandir_iterator.dirfd
+                if dirfd != -1 and rposix.HAVE_FSTATAT:
+                    st = rposix_stat.fstatat(self.name, dirfd,
+                                             follow_symlinks=True)
+                else:
+                    path = self.space.fsencode_w(self.fget_path(self.space))
+                    st = rposix_stat.stat(path)
+            else:
+                st = self.d_lstat
+
+            self.d_stat = st
+            self.flags |= FLAG_STAT
+        return self.d_stat
+
+    def get_stat_or_lstat(self, follow_symlinks):
+        if follow_symlinks:
+            return self.get_stat()
+        else:
+            return self.get_lstat()
+
+    def check_mode(self, follow_symlinks):
+        """Get the stat() or lstat() of the direntry, and return the
+        S_IFMT.  If calling stat()/lstat() gives us ENOENT, return -1
+        instead; it is better to give up and answer "no, not this type"
+        to requests, rather than propagate the error.
+        """
+        try:
+            st = self.get_stat_or_lstat(follow_symlinks)
+        except OSError as e:
+            if e.errno == ENOENT:    # not found
+                return -1
+            raise wrap_oserror2(self.space, e, self.fget_path(self.space))
+        return stat.S_IFMT(st.st_mode)
+
+    def is_dir(self, follow_symlinks):
+        known_type = self.flags & 255
+        if known_type != rposix_scandir.DT_UNKNOWN:
+            if known_type == rposix_scandir.DT_DIR:
+                return True
+            elif follow_symlinks and known_type == rposix_scandir.DT_LNK:
+                pass    # don't know in this case
+            else:
+                return False
+        return self.check_mode(follow_symlinks) == stat.S_IFDIR
+
+    def is_file(self, follow_symlinks):
+        known_type = self.flags & 255
+        if known_type != rposix_scandir.DT_UNKNOWN:
+            if known_type == rposix_scandir.DT_REG:
+                return True
+            elif follow_symlinks and known_type == rposix_scandir.DT_LNK:
+                pass    # don't know in this case
+            else:
+                return False
+        return self.check_mode(follow_symlinks) == stat.S_IFREG
+
+    def is_symlink(self):
+        """Check if the direntry is a symlink.  May get the lstat()."""
+        known_type = self.flags & 255
+        if known_type != rposix_scandir.DT_UNKNOWN:
+            return known_type == rposix_scandir.DT_LNK
+        return self.check_mode(follow_symlinks=False) == stat.S_IFLNK
+
+    @unwrap_spec(follow_symlinks=bool)
+    def descr_is_dir(self, space, follow_symlinks=True):
+        """return True if the entry is a directory; cached per entry"""
+        return space.newbool(self.is_dir(follow_symlinks))
+
+    @unwrap_spec(follow_symlinks=bool)
+    def descr_is_file(self, space, follow_symlinks=True):
+        """return True if the entry is a file; cached per entry"""
+        return space.newbool(self.is_file(follow_symlinks))
+
+    def descr_is_symlink(self, space):
+        """return True if the entry is a symbolic link; cached per entry"""
+        return space.newbool(self.is_symlink())
+
+    @unwrap_spec(follow_symlinks=bool)
+    def descr_stat(self, space, follow_symlinks=True):
+        """return stat_result object for the entry; cached per entry"""
+        try:
+            st = self.get_stat_or_lstat(follow_symlinks)
+        except OSError as e:
+            raise wrap_oserror2(space, e, self.fget_path(space))
+        return build_stat_result(space, st)
+
+    def descr_inode(self, space):
+        """return inode of the entry; cached per entry"""
+        return space.newint(self.inode)
+
+
+W_DirEntry.typedef = TypeDef(
+    'posix.DirEntry',
+    __repr__ = interp2app(W_DirEntry.descr_repr),
+    name = GetSetProperty(W_DirEntry.fget_name,
+                          doc="the entry's base filename, relative to "
+                              'scandir() "path" argument'),
+    path = GetSetProperty(W_DirEntry.fget_path,
+                          doc="the entry's full path name; equivalent to "
+                              "os.path.join(scandir_path, entry.name)"),
+    is_dir = interp2app(W_DirEntry.descr_is_dir),
+    is_file = interp2app(W_DirEntry.descr_is_file),
+    is_symlink = interp2app(W_DirEntry.descr_is_symlink),
+    stat = interp2app(W_DirEntry.descr_stat),
+    inode = interp2app(W_DirEntry.descr_inode),
+)
+W_DirEntry.typedef.acceptable_as_base_class = False
@@ -858,6 +858,125 @@ class AppTestPosix:
             finally:
                 os.chdir(localdir)
 
+    if sys.platform.startswith('linux'):
+        def test_sendfile(self):
+            os = self.posix
+            fd1 = os.open(self.path2 + 'sendfile1', os.O_RDWR | os.O_CREAT)
+            fd2 = os.open(self.path2 + 'sendfile2', os.O_RDWR | os.O_CREAT)
+            try:
+                os.write(fd1, 'abcdefghij')
+                assert os.sendfile(fd2, fd1, 3, 5) == 5
+                assert os.sendfile(fd2, fd1, 20, 5) == 0
+                os.lseek(fd1, 8, 0)
+                assert os.sendfile(fd2, fd1, None, 5) == 2
+                assert os.lseek(fd1, 0, 1) == 10
+                os.lseek(fd2, 0, 0)
+                assert os.read(fd2, 20) == 'defghij'
+                raises(ValueError, os.sendfile, fd2, fd1, -1, 5)
+                raises(ValueError, os.sendfile, fd2, fd1, 0, -5)
+                raises(OSError, os.sendfile, fd2, -1, 0, 5)
+            finally:
+                os.close(fd1)
+                os.close(fd2)
+
+        def test_copy_file_range(self):
+            os = self.posix
+            if not hasattr(os, 'copy_file_range'):
+                skip("no copy_file_range()")
+            import errno
+            fd1 = os.open(self.path2 + 'cfr1', os.O_RDWR | os.O_CREAT)
+            fd2 = os.open(self.path2 + 'cfr2', os.O_RDWR | os.O_CREAT)
+            try:
+                os.write(fd1, 'abcdefghij')
+                try:
+                    res = os.copy_file_range(fd1, fd2, 4, 0)
+                except OSError as e:
+                    if e.errno in (errno.ENOSYS, errno.EXDEV):
+                        skip("copy_file_range() not supported here")
+                    raise
+                assert res == 4
+                assert os.lseek(fd1, 0, 1) == 10
+                assert os.copy_file_range(fd1, fd2, 3, offset_src=7,
+                                          offset_dst=10) == 3
+                assert os.copy_file_range(fd1, fd2, 3) == 0
+                os.lseek(fd2, 0, 0)
+                assert os.read(fd2, 20) == 'abcd' + '\x00' * 6 + 'hij'
+                raises(ValueError, os.copy_file_range, fd1, fd2, 3, -1)
+            finally:
+                os.close(fd1)
+                os.close(fd2)
+
+        def test_splice(self):
+            os = self.posix
+            if not hasattr(os, 'splice'):
+                skip("no splice()")
+            fd = os.open(self.path2 + 'splice', os.O_RDWR | os.O_CREAT)
+            r, w = os.pipe()
+            try:
+                os.write(fd, 'abcdefghij')
+                assert os.splice(fd, w, 5, offset_src=2) == 5
+                assert os.read(r, 10) == 'cdefg'
+                os.write(w, 'XYZ')
+                assert os.splice(r, fd, 10, None, 0,
+                                 os.SPLICE_F_MOVE) == 3
+                os.lseek(fd, 0, 0)
+                assert os.read(fd, 20) == 'XYZdefghij'
+            finally:
+                os.close(fd)
+                os.close(r)
+                os.close(w)
+
+        def test_shutil_copyfile(self):
+            import shutil
+            data = '0123456789abcdef' * (3 * 65536) + 'tail'
+            src = self.path2 + 'copyfile_src'
+            dst = self.path2 + 'copyfile_dst'
+            with open(src, 'wb') as f:
+                f.write(data)
+            calls = []
+            def spying(name, func):
+                def spy(*args):
+                    res = func(*args)
+                    calls.append((name, res))
+                    return res
+                return spy
+            orig_funcs = shutil._fastcopy_funcs[:]
+            try:
+                shutil._fastcopy_funcs[:] = [spying('fast', func)
+                                             for func in orig_funcs]
+                shutil.copyfile(src, dst)
+                with open(dst, 'rb') as f:
+                    got = f.read()
+                assert len(got) == len(data) and got == data
+                assert calls[0][0] == 'fast' and calls[0][1] > 0
+                assert calls[-1] == ('fast', 0)
+                assert sum([n for name, n in calls]) == len(data)
+                #
+                # a first call that returns 0 (copy_file_range() from /proc
+                # on some kernels) must not give an empty copy
+                del calls[:]
+                shutil._fastcopy_funcs[:] = (
+                    [spying('zero', lambda infd, outfd, count: 0)] +
+                    [spying('fast', func) for func in orig_funcs])
+                shutil.copyfile(src, dst)
+                with open(dst, 'rb') as f:
+                    got = f.read()
+                assert len(got) == len(data) and got == data
+                assert calls[0] == ('zero', 0)
+                assert calls[1][0] == 'fast' and calls[1][1] > 0
+                #
+                # if every function returns 0 at once, copyfileobj() is used
+                del calls[:]
+                shutil._fastcopy_funcs[:] = [
+                    spying('zero', lambda infd, outfd, count: 0)] * 2
+                shutil.copyfile(src, dst)
+                with open(dst, 'rb') as f:
+                    got = f.read()
+                assert len(got) == len(data) and got == data
+                assert calls == [('zero', 0), ('zero', 0)]
+            finally:
+                shutil._fastcopy_funcs[:] = orig_funcs
+
     def test_largefile(self):
         os = self.posix
         fd = os.open(self.path2 + 'test_largefile', os.O_RDWR | os.O_CREAT, 0666)
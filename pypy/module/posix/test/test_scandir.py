@@ -0,0 +1,198 @@
+import sys, os
+import py
+from rpython.tool.udir import udir
+from pypy.module.posix.test import test_posix2
+
+
+def _make_dir(dirname, content):
+    d = os.path.join(str(udir), dirname)
+    os.mkdir(d)
+    for key, value in content.items():
+        filename = os.path.join(d, key)
+        if value == 'dir':
+            os.mkdir(filename)
+        elif value == 'file':
+            with open(filename, 'w') as f:
+                pass
+        elif value.startswith('symlink:'):
+            os.symlink(value[8:], filename)
+        else:
+            raise NotImplementedError(repr(value))
+    return d
+
+
+class AppTestScandir(object):
+    spaceconfig = {'usemodules': test_posix2.USEMODULES}
+
+    def setup_class(cls):
+        if sys.platform == 'win32':
+            py.test.skip("posix only")
+        space = cls.space
+        cls.w_dir_empty = space.wrap(_make_dir('empty', {}))
+        cls.w_dir0 = space.wrap(_make_dir('dir0', {'f1': 'file',
+                                                   'f2': 'file',
+                                                   'f3': 'file'}))
+        cls.w_dir1 = space.wrap(_make_dir('dir1', {'file1': 'file'}))
+        cls.w_dir2 = space.wrap(_make_dir('dir2', {'subdir2': 'dir'}))
+        cls.w_dir3 = space.wrap(_make_dir('dir3', {'sfile3': 'symlink:file3'}))
+        cls.w_dir4 = space.wrap(_make_dir('dir4',
+                                          {'sdir4': 'symlink:../dir2/subdir2'}))
+        cls.w_dir5 = space.wrap(_make_dir('dir5', {'sbrok5': 'symlink:broken'}))
+        cls.w_dir6 = space.wrap(_make_dir('dir6', {'sdir6': 'symlink:../dir6'}))
+        cls.w_posix = space.appexec([], test_posix2.GET_POSIX)
+
+    def test_scandir_empty(self):
+        posix = self.posix
+        sd = posix.scandir(self.dir_empty)
+        assert list(sd) == []
+        assert list(sd) == []
+
+    def test_scandir_files(self):
+        posix = self.posix
+        sd = posix.scandir(self.dir0)
+        names = [d.name for d in sd]
+        assert sorted(names) == ['f1', 'f2', 'f3']
+
+    def test_unicode_versus_bytes(self):
+        posix = self.posix
+        d = next(posix.scandir())
+        assert type(d.name) is str
+        assert type(d.path) is str
+        assert d.path == './' + d.name
+        d = next(posix.scandir(None))
+        assert type(d.name) is str
+        assert type(d.path) is str
+        assert d.path == './' + d.name
+        d = next(posix.scandir(u'.'))
+        assert type(d.name) is unicode
+        assert type(d.path) is unicode
+        assert d.path == u'./' + d.name
+        d = next(posix.scandir(self.dir1))
+        assert type(d.name) is str
+        assert type(d.path) is str
+        assert d.name == 'file1'
+        assert d.path == self.dir1 + '/file1'
+        d = next(posix.scandir(unicode(self.dir1)))
+        assert type(d.name) is unicode
+        assert type(d.path) is unicode
+        assert d.name == u'file1'
+        assert d.path == self.dir1 + u'/file1'
+
+    def test_stat1(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir1))
+        assert d.name == 'file1'
+        assert d.stat().st_mode & 0o170000 == 0o100000    # S_IFREG
+        assert d.stat().st_size == 0
+        assert d.stat() is not d.stat()    # a new stat_result each time
+        assert d.stat().st_ino == d.inode()
+        assert d.stat(follow_symlinks=False).st_ino == d.inode()
+
+    def test_stat4(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir4))
+        assert d.name == 'sdir4'
+        assert d.stat().st_mode & 0o170000 == 0o040000    # S_IFDIR
+        assert d.stat(follow_symlinks=True).st_mode & 0o170000 == 0o040000
+        assert (d.stat(follow_symlinks=False).st_mode & 0o170000
+                == 0o120000)    # S_IFLNK
+        raises(OSError, next(posix.scandir(self.dir5)).stat)
+
+    def test_dir1(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir1))
+        assert d.name == 'file1'
+        assert     d.is_file()
+        assert not d.is_dir()
+        assert not d.is_symlink()
+        raises(TypeError, d.is_file, True, True)
+        assert     d.is_file(follow_symlinks=False)
+        assert not d.is_dir(follow_symlinks=False)
+
+    def test_dir2(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir2))
+        assert d.name == 'subdir2'
+        assert not d.is_file()
+        assert     d.is_dir()
+        assert not d.is_symlink()
+        assert not d.is_file(follow_symlinks=False)
+        assert     d.is_dir(follow_symlinks=False)
+
+    def test_dir3(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir3))
+        assert d.name == 'sfile3'
+        assert not d.is_file()     # broken symlink
+        assert not d.is_dir()
+        assert     d.is_symlink()
+        assert not d.is_file(follow_symlinks=False)
+        assert not d.is_dir(follow_symlinks=False)
+
+    def test_dir4(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir4))
+        assert d.name == 'sdir4'
+        assert not d.is_file()
+        assert     d.is_dir()
+        assert     d.is_symlink()
+        assert not d.is_file(follow_symlinks=False)
+        assert not d.is_dir(follow_symlinks=False)
+
+    def test_dir6(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir6))
+        assert d.name == 'sdir6'
+        assert not d.is_file()
+        assert     d.is_dir()
+        assert     d.is_symlink()
+        assert not d.is_file(follow_symlinks=False)
+        assert not d.is_dir(follow_symlinks=False)
+
+    def test_repr(self):
+        posix = self.posix
+        d = next(posix.scandir(self.dir1))
+        assert isinstance(d, posix.DirEntry)
+        assert repr(d) == "<DirEntry 'file1'>"
+        raises(TypeError, posix.DirEntry)
+        raises(TypeError, "class Foo(posix.DirEntry): pass")
+
+    def test_close(self):
+        posix = self.posix
+        sd = posix.scandir(self.dir0)
+        assert next(sd).name in ('f1', 'f2', 'f3')
+        sd.close()
+        raises(StopIteration, next, sd)
+        sd.close()
+        with posix.scandir(self.dir0) as sd:
+            assert len(list(sd)) == 3
+        assert list(sd) == []
+
+    def test_errors(self):
+        posix = self.posix
+        e = raises(OSError, posix.scandir, self.dir1 + '/file1')
+        assert e.value.filename == self.dir1 + '/file1'
+        raises(OSError, posix.scandir, self.dir_empty + '/missing')
+        raises(TypeError, posix.scandir, 42)
+
+    def test_walk(self):
+        import os
+        assert os.scandir is self.posix.scandir
+        assert list(os.walk(self.dir2)) == [
+            (self.dir2, ['subdir2'], []),
+            (self.dir2 + '/subdir2', [], [])]
+        assert list(os.walk(self.dir2, topdown=False)) == [
+            (self.dir2 + '/subdir2', [], []),
+            (self.dir2, ['subdir2'], [])]
+        assert list(os.walk(self.dir3)) == [(self.dir3, [], ['sfile3'])]
+        assert list(os.walk(self.dir4)) == [(self.dir4, ['sdir4'], [])]
+        assert list(os.walk(self.dir4, followlinks=True)) == [
+            (self.dir4, ['sdir4'], []),
+            (self.dir4 + '/sdir4', [], [])]
+        assert list(os.walk(unicode(self.dir1))) == [
+            (unicode(self.dir1), [], [u'file1'])]
+        errors = []
+        missing = self.dir_empty + '/missing'
+        assert list(os.walk(missing, onerror=errors.append)) == []
+        assert len(errors) == 1
+        assert errors[0].filename == missing
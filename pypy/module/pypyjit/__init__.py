@@ -17,6 +17,9 @@ class Module(MixedModule):
         'set_trace_too_long_hook': 'interp_resop.set_trace_too_long_hook',
         'get_stats_snapshot': 'interp_resop.get_stats_snapshot',
         'get_stats_asmmemmgr': 'interp_resop.get_stats_asmmemmgr',
+        'enable_jit_summary': 'interp_resop.enable_jit_summary',
+        'disable_jit_summary': 'interp_resop.disable_jit_summary',
+        'get_jit_summary': 'interp_resop.get_jit_summary',
         # those things are disabled because they have bugs, but if
         # they're found to be useful, fix test_ztranslation_jit_stats
         # in the backend first. get_stats_snapshot still produces
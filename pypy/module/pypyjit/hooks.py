@@ -12,12 +12,15 @@ class PyPyJitIface(JitHookInterface):
         cache = space.fromcache(Cache)
         return (cache.w_compile_hook is not None or
                 cache.w_abort_hook is not None or
-                cache.w_trace_too_long_hook is not None)
+                cache.w_trace_too_long_hook is not None or
+                cache.jit_summary)
 
 
     def on_abort(self, reason, jitdriver, greenkey, greenkey_repr, logops, operations):
         space = self.space
         cache = space.fromcache(Cache)
+        if cache.jit_summary:
+            cache.record_abort(jitdriver, greenkey, reason)
         if cache.in_recursion:
             return
         if cache.w_abort_hook is not None:
@@ -68,6 +71,10 @@ class PyPyJitIface(JitHookInterface):
     def _compile_hook(self, debug_info, is_bridge):
         space = self.space
         cache = space.fromcache(Cache)
+        if cache.jit_summary and not is_bridge:
+            cache.loop_greenkeys[debug_info.looptoken.number] = wrap_greenkey(
+                space, debug_info.get_jitdriver(), debug_info.greenkey,
+                debug_info.get_greenkey_repr())
         if cache.in_recursion:
             return
         if cache.w_compile_hook is not None:
@@ -25,11 +25,33 @@ class Cache(object):
         self.w_abort_hook = None
         self.w_trace_too_long_hook = None
         self.compile_hook_with_ops = False
+        self.reset_jit_summary(False)
 
     def getno(self):
         self.no += 1
         return self.no - 1
 
+    def reset_jit_summary(self, enabled):
+        self.jit_summary = enabled
+        self.loop_greenkeys = {}     # loop number -> wrapped greenkey
+        self.abort_counts = {}       # PyCode -> list of counts per reason
+
+    def record_abort(self, jitdriver, greenkey, reason):
+        if greenkey is None or jitdriver.name != 'pypyjit':
+            return
+        pycode = greenkey_to_pycode(greenkey)
+        try:
+            counts = self.abort_counts[pycode]
+        except KeyError:
+            counts = [0] * len(Counters.counter_names)
+            self.abort_counts[pycode] = counts
+        counts[reason] += 1
+
+def greenkey_to_pycode(greenkey):
+    ll_code = lltype.cast_opaque_ptr(lltype.Ptr(OBJECT),
+                                     greenkey[2].getref_base())
+    return cast_base_ptr_to_instance(PyCode, ll_code)
+
 def wrap_greenkey(space, jitdriver, greenkey, greenkey_repr):
     if greenkey is None:
         return space.w_None
@@ -37,9 +59,7 @@ def wrap_greenkey(space, jitdriver, greenkey, greenkey_repr):
     if jitdriver_name == 'pypyjit':
         next_instr = greenkey[0].getint()
         is_being_profiled = greenkey[1].getint()
-        ll_code = lltype.cast_opaque_ptr(lltype.Ptr(OBJECT),
-                                         greenkey[2].getref_base())
-        pycode = cast_base_ptr_to_instance(PyCode, ll_code)
+        pycode = greenkey_to_pycode(greenkey)
         return space.newtuple([pycode, space.newint(next_instr),
                                space.newbool(bool(is_being_profiled))])
     else:
@@ -397,6 +417,79 @@ def get_stats_asmmemmgr(space):
     m2 = jit_hooks.stats_asmmemmgr_used(None)
     return space.newtuple([space.newint(m1), space.newint(m2)])
 
+def enable_jit_summary(space):
+    """ enable_jit_summary()
+
+    Start collecting the data returned by get_jit_summary(): the
+    greenkey of each compiled loop and the reasons why tracing was
+    aborted, per code object.  The per-loop counters are always
+    maintained by the JIT, so this does not slow down the compiled code.
+    Calling it again discards the data collected so far.
+    """
+    cache = space.fromcache(Cache)
+    cache.reset_jit_summary(True)
+    cache.in_recursion = NonConstant(False)
+
+def disable_jit_summary(space):
+    """ disable_jit_summary()
+
+    Stop collecting the data for get_jit_summary() and discard it.
+    """
+    cache = space.fromcache(Cache)
+    cache.reset_jit_summary(False)
+
+def get_jit_summary(space):
+    """ get_jit_summary()
+
+    Return a dictionary describing the state of the JIT, meant to be
+    consumed by tools.  It contains:
+
+        'loops': a list with one dict per loop that is still alive, with
+                 the keys 'loop_no', 'greenkey' (like JitLoopInfo.greenkey,
+                 or None if the loop was compiled before
+                 enable_jit_summary() was called), 'entries' (times the
+                 interpreter entered the loop), 'guard_failures' (guard
+                 failures that left the compiled code, including the ones
+                 that started a bridge) and 'bridges'.
+        'aborts': a dict mapping code objects to a dict {reason: count}
+                  of the aborted traces that started in that code object.
+    """
+    cache = space.fromcache(Cache)
+    ll_loops = jit_hooks.stats_get_loop_summary(None)
+    alive = {}
+    loops_w = []
+    if ll_loops:
+        for i in range(len(ll_loops)):
+            number = ll_loops[i].number
+            alive[number] = None
+            w_loop = space.newdict()
+            space.setitem_str(w_loop, 'loop_no', space.newint(number))
+            space.setitem_str(w_loop, 'greenkey',
+                              cache.loop_greenkeys.get(number, space.w_None))
+            space.setitem_str(w_loop, 'entries',
+                              space.newint(ll_loops[i].entries))
+            space.setitem_str(w_loop, 'guard_failures',
+                              space.newint(ll_loops[i].guard_failures))
+            space.setitem_str(w_loop, 'bridges',
+                              space.newint(ll_loops[i].bridges))
+            loops_w.append(w_loop)
+    # forget about the loops that were freed in the meantime
+    for number in cache.loop_greenkeys.keys():
+        if number not in alive:
+            del cache.loop_greenkeys[number]
+    w_aborts = space.newdict()
+    for pycode, counts in cache.abort_counts.items():
+        w_reasons = space.newdict()
+        for reason in range(len(counts)):
+            if counts[reason]:
+                space.setitem_str(w_reasons, Counters.counter_names[reason],
+                                  space.newint(counts[reason]))
+        space.setitem(w_aborts, pycode, w_reasons)
+    w_summary = space.newdict()
+    space.setitem_str(w_summary, 'loops', space.newlist(loops_w))
+    space.setitem_str(w_summary, 'aborts', w_aborts)
+    return w_summary
+
 def enable_debug(space):
     """ Set the jit debugging - completely necessary for some stats to work,
     most notably assembler counters.
@@ -15,6 +15,7 @@ from pypy.module.pypyjit.hooks import pypy_hooks
 from rpython.jit.tool.oparser import parse
 from rpython.jit.metainterp.typesystem import llhelper
 from rpython.rlib.jit import JitDebugInfo, AsmInfo, Counters
+from rpython.rlib import jit_hooks
 
 
 class MockJitDriverSD(object):
@@ -126,6 +127,21 @@ class AppTestJitHook(object):
         cls.orig_oplist_no_descrs = oplist_no_descrs
         cls.w_sorted_keys = space.wrap(sorted(Counters.counter_names))
 
+        # the real helper needs a translated JIT
+        def stats_get_loop_summary(warmrunnerdesc):
+            l = lltype.malloc(jit_hooks.LOOP_SUMMARY_CONTAINER, 2)
+            for i in range(2):
+                l[i].number = i
+                l[i].entries = 10 + i
+                l[i].guard_failures = 20 + i
+                l[i].bridges = 30 + i
+            return l
+        cls.orig_stats_get_loop_summary = jit_hooks.stats_get_loop_summary
+        jit_hooks.stats_get_loop_summary = stats_get_loop_summary
+
+    def teardown_class(cls):
+        jit_hooks.stats_get_loop_summary = cls.orig_stats_get_loop_summary
+
     def setup_method(self, meth):
         self.__class__.oplist = self.orig_oplist[:]
         self.__class__.oplist_no_descrs = self.orig_oplist_no_descrs[:]
@@ -244,6 +260,32 @@ class AppTestJitHook(object):
         assert len(ops) == 4
         assert ops[2].hash == 0
 
+    def test_jit_summary(self):
+        import pypyjit
+        self.on_compile()
+        self.on_abort()
+        summary = pypyjit.get_jit_summary()
+        assert summary['aborts'] == {}
+        assert [loop['greenkey'] for loop in summary['loops']] == [None, None]
+        pypyjit.enable_jit_summary()
+        try:
+            self.on_compile()
+            self.on_compile_bridge()
+            self.on_abort()
+            self.on_abort()
+            summary = pypyjit.get_jit_summary()
+        finally:
+            pypyjit.disable_jit_summary()
+        loop0, loop1 = summary['loops']
+        assert loop0 == {'loop_no': 0,
+                         'greenkey': (self.f.func_code, 0, False),
+                         'entries': 10, 'guard_failures': 20, 'bridges': 30}
+        assert loop1['loop_no'] == 1
+        assert loop1['greenkey'] is None
+        assert loop1['entries'] == 11
+        assert summary['aborts'] == {self.f.func_code: {'ABORT_TOO_LONG': 2}}
+        assert pypyjit.get_jit_summary()['aborts'] == {}
+
     def test_creation(self):
         from pypyjit import ResOperation
 
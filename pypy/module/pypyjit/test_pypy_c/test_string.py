@@ -209,8 +209,8 @@ class TestString(BaseTestPyPyC):
         guard_not_invalidated(descr=...)
         p80 = call_r(ConstClass(ll_str__IntegerR_SignedConst_Signed), i47, descr=<Callr . i EF=3>)
         guard_no_exception(descr=...)
-        p53 = call_r(ConstClass(fast_str_decode_ascii), p80, descr=<Callr . r EF=4>)
-        guard_no_exception(descr=...)
+        i53 = call_i(ConstClass(is_ascii), p80, descr=<Calli . r EF=0>)
+        guard_true(i53, descr=...)
         --TICK--
         jump(..., descr=...)
         """)
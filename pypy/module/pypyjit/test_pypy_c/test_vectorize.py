@@ -0,0 +1,144 @@
+import py
+from pypy.module.pypyjit.test_pypy_c.test_00_model import BaseTestPyPyC
+from pypy.module.pypyjit.test_pypy_c.test_micronumpy import no_vector_backend
+
+# Kernels written in plain Python over array.array and over lists using
+# the int/float list strategies.  Each one is run with and without
+# 'vec_all' to check that the vectorized loops compute the same result.
+# The number of operations in the loops with and without 'vec_all' is
+# printed (run with -s), as a first measure of what vectorizing gains.
+# The sum, min and max kernels are reductions, which stay scalar in
+# application level loops (see rpython/doc/jit/vectorization.rst): for
+# them, only the loads and the comparisons against a loop invariant value
+# can be packed.
+
+ARRAY_KERNELS = {
+    'sum': """
+        def kernel(a, b, n):
+            s = 0.0
+            for i in range(n):
+                s += a[i]
+            return s
+    """,
+    'max': """
+        def kernel(a, b, n):
+            return max(a)
+    """,
+    'min': """
+        def kernel(a, b, n):
+            m = a[0]
+            for i in range(n):
+                x = a[i]
+                if x < m:
+                    m = x
+            return m
+    """,
+    'add': """
+        def kernel(a, b, n):
+            for i in range(n):
+                b[i] = a[i] + b[i]
+            return b[n // 2]
+    """,
+    'scale': """
+        def kernel(a, b, n):
+            for i in range(n):
+                b[i] = a[i] * 2.5
+            return b[n - 1]
+    """,
+}
+
+INT_KERNELS = {
+    'to_float': """
+        def kernel(a, b, n):
+            for i in range(n):
+                b[i] = a[i] * 0.5
+            return b[n - 1]
+    """,
+    'sum': """
+        def kernel(a, b, n):
+            s = 0
+            for i in range(n):
+                s += a[i]
+            return s
+    """,
+}
+
+def count_loop_ops(log):
+    """ Return the number of operations and of vector operations
+        in all the loops of 'log'.
+    """
+    ops = 0
+    vec_ops = 0
+    for loop in log.loops:
+        for op in loop.allops():
+            ops += 1
+            if op.name.startswith('vec_'):
+                vec_ops += 1
+    return ops, vec_ops
+
+class TestVectorize(BaseTestPyPyC):
+
+    def run_kernel(self, kernel, setup):
+        source = "%s\ndef main():\n%s\n%s" % (
+            py.code.Source(kernel),
+            py.code.Source(setup).indent(),
+            py.code.Source("""
+                for _ in range(20):
+                    r = kernel(a, b, n)
+                return r
+            """).indent())
+        log = self.run(source, [], vec=0, vec_all=0)
+        vlog = self.run(source, [], vec=1, vec_all=1)
+        assert log.result == vlog.result
+        assert log.jit_summary.vecopt_tried == 0
+        assert log.jit_summary.vecopt_success == 0
+        ops, vec_ops = count_loop_ops(log)
+        vops, vvec_ops = count_loop_ops(vlog)
+        print 'operations in loops: %d without vec_all, %d with vec_all ' \
+              '(%d vector operations)' % (ops, vops, vvec_ops)
+        assert vec_ops == 0
+        if vlog.jit_summary.vecopt_success == 0:
+            assert vvec_ops == 0
+        return vlog
+
+    @py.test.mark.parametrize('name', sorted(ARRAY_KERNELS))
+    @py.test.mark.skipif('no_vector_backend()')
+    def test_array_double(self, name):
+        vlog = self.run_kernel(ARRAY_KERNELS[name], """
+            from array import array
+            n = 3000
+            a = array('d', [float(i % 113) for i in range(n)])
+            b = array('d', [1.5] * n)
+        """)
+        assert vlog.jit_summary.vecopt_tried > 0
+
+    @py.test.mark.parametrize('name', sorted(ARRAY_KERNELS))
+    @py.test.mark.skipif('no_vector_backend()')
+    def test_float_list(self, name):
+        vlog = self.run_kernel(ARRAY_KERNELS[name], """
+            n = 3000
+            a = [float(i % 113) for i in range(n)]
+            b = [1.5] * n
+        """)
+        assert vlog.jit_summary.vecopt_tried > 0
+
+    @py.test.mark.parametrize('name', sorted(INT_KERNELS))
+    @py.test.mark.skipif('no_vector_backend()')
+    def test_array_long(self, name):
+        vlog = self.run_kernel(INT_KERNELS[name], """
+            from array import array
+            n = 3000
+            a = array('l', [i * (2**40 + 1) for i in range(n)])
+            b = array('d', [0.0] * n)
+        """)
+        assert vlog.jit_summary.vecopt_tried > 0
+
+    @py.test.mark.parametrize('name', sorted(INT_KERNELS))
+    @py.test.mark.skipif('no_vector_backend()')
+    def test_int_list(self, name):
+        vlog = self.run_kernel(INT_KERNELS[name], """
+            n = 3000
+            a = [i * 7 for i in range(n)]
+            b = [0.0] * n
+        """)
+        assert vlog.jit_summary.vecopt_tried > 0
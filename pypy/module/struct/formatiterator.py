@@ -199,3 +199,189 @@ class UnpackFormatIterator(FormatIterator):
 
     def skip(self, size):
         self.read(size) # XXX, could avoid taking the slice
+
+
+class Column(object):
+    """The values of one field of the records, unboxed as long as they are
+    all ints or all floats."""
+    EMPTY, INTS, FLOATS, OBJECTS = range(4)
+
+    def __init__(self, space):
+        self.space = space
+        self.kind = Column.EMPTY
+        self.ints = []
+        self.floats = []
+        self.items_w = []
+
+    def append_int(self, value):
+        if self.kind == Column.EMPTY:
+            self.kind = Column.INTS
+        if self.kind == Column.INTS:
+            self.ints.append(value)
+        else:
+            self.append_w(self.space.newint(value))
+
+    def append_float(self, value):
+        if self.kind == Column.EMPTY:
+            self.kind = Column.FLOATS
+        if self.kind == Column.FLOATS:
+            self.floats.append(value)
+        else:
+            self.append_w(self.space.newfloat(value))
+
+    def append_w(self, w_value):
+        if self.kind != Column.OBJECTS:
+            space = self.space
+            self.items_w = ([space.newint(x) for x in self.ints] +
+                            [space.newfloat(x) for x in self.floats])
+            self.ints = []
+            self.floats = []
+            self.kind = Column.OBJECTS
+        self.items_w.append(w_value)
+
+    def wrap(self):
+        if self.kind == Column.INTS:
+            return self.space.newlist_int(self.ints)
+        elif self.kind == Column.FLOATS:
+            return self.space.newlist_float(self.floats)
+        return self.space.newlist(self.items_w)
+
+
+class UnpackColumnsFormatIterator(UnpackFormatIterator):
+    """Unpacks consecutive records, appending the values of the fields
+    to one Column each."""
+
+    def __init__(self, space, buf, nfields):
+        UnpackFormatIterator.__init__(self, space, buf)
+        self.columns = [Column(space) for i in range(nfields)]
+        self.field = 0
+        self.start = 0
+
+    def start_record(self, start):
+        self.pos = self.start = start
+        self.field = 0
+
+    def align(self, mask):
+        # the alignment is relative to the start of the record
+        self.pos = self.start + ((self.pos - self.start + mask) & ~mask)
+
+    def finished(self):
+        pass
+
+    @specialize.argtype(1)
+    def appendobj(self, value):
+        column = self.columns[self.field]
+        self.field += 1
+        is_unsigned = (isinstance(value, r_uint) or
+                       isinstance(value, r_ulonglong))
+        if is_unsigned:
+            if value <= maxint:
+                column.append_int(intmask(value))
+            else:
+                column.append_w(self.space.newint(value))
+        elif isinstance(value, r_longlong):
+            if value == r_longlong(intmask(value)):
+                column.append_int(intmask(value))
+            else:
+                column.append_w(self.space.newint(value))
+        elif isinstance(value, bool):
+            column.append_w(self.space.newbool(value))
+        elif isinstance(value, int):
+            column.append_int(value)
+        elif isinstance(value, float):
+            column.append_float(value)
+        elif isinstance(value, str):
+            column.append_w(self.space.newbytes(value))
+        elif isinstance(value, unicode):
+            column.append_w(self.space.newunicode(value))
+        else:
+            assert 0, "unreachable"
+
+    def wrap_columns(self):
+        return self.space.newtuple([column.wrap() for column in self.columns])
+
+
+class PackColumnsFormatIterator(PackFormatIterator):
+    """Packs consecutive records, taking the values of each field from
+    one sequence.  Lists of ints or floats are read without boxing."""
+
+    def __init__(self, space, wbuf, columns_w):
+        PackFormatIterator.__init__(self, space, wbuf, [])
+        self.ints = []
+        self.floats = []
+        self.items_w = []
+        for w_col in columns_w:
+            # copies: the lists could be modified while we are packing
+            ints = space.listview_int(w_col)
+            if ints is not None:
+                ints = ints[:]
+            floats = None
+            items_w = None
+            if ints is None:
+                floats = space.listview_float(w_col)
+                if floats is not None:
+                    floats = floats[:]
+                else:
+                    items_w = space.fixedview(w_col)
+            self.ints.append(ints)
+            self.floats.append(floats)
+            self.items_w.append(items_w)
+        self.row = 0
+        self.start = 0
+
+    def column_length(self, field):
+        ints = self.ints[field]
+        if ints is not None:
+            return len(ints)
+        floats = self.floats[field]
+        if floats is not None:
+            return len(floats)
+        return len(self.items_w[field])
+
+    def start_record(self, start, row):
+        self.pos = self.start = start
+        self.row = row
+        self.args_index = 0
+
+    @jit.unroll_safe
+    def align(self, mask):
+        # the alignment is relative to the start of the record
+        pad = (self.start - self.pos) & mask
+        for i in range(self.pos, self.pos+pad):
+            self.wbuf.setitem(i, '\x00')
+        self.advance(pad)
+
+    def finished(self):
+        pass
+
+    def accept_obj_arg(self):
+        field = self.args_index
+        self.args_index += 1
+        ints = self.ints[field]
+        if ints is not None:
+            return self.space.newint(ints[self.row])
+        floats = self.floats[field]
+        if floats is not None:
+            return self.space.newfloat(floats[self.row])
+        return self.items_w[field][self.row]
+
+    def accept_int_arg(self):
+        ints = self.ints[self.args_index]
+        if ints is not None:
+            self.args_index += 1
+            return ints[self.row]
+        return PackFormatIterator.accept_int_arg(self)
+
+    def accept_longlong_arg(self):
+        ints = self.ints[self.args_index]
+        if ints is not None:
+            self.args_index += 1
+            return r_longlong(ints[self.row])
+        return PackFormatIterator.accept_longlong_arg(self)
+
+    def accept_float_arg(self):
+        floats = self.floats[self.args_index]
+        if floats is not None:
+            self.args_index += 1
+            return floats[self.row]
+        return PackFormatIterator.accept_float_arg(self)
@@ -1,8 +1,10 @@
 from rpython.rlib import jit
 from rpython.rlib.buffer import SubBuffer
 from rpython.rlib.mutbuffer import MutableStringBuffer
+from rpython.rlib.objectmodel import specialize
 from rpython.rlib.rstruct.error import StructError, StructOverflowError
-from rpython.rlib.rstruct.formatiterator import CalcSizeFormatIterator
+from rpython.rlib.rstruct.formatiterator import (
+    CalcSizeFormatIterator, compile_format)
 
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.gateway import interp2app, unwrap_spec
@@ -10,7 +12,8 @@ from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.typedef import TypeDef, interp_attrproperty
 from pypy.interpreter.typedef import make_weakref_descr
 from pypy.module.struct.formatiterator import (
-    PackFormatIterator, UnpackFormatIterator
+    PackFormatIterator, UnpackFormatIterator,
+    PackColumnsFormatIterator, UnpackColumnsFormatIterator
 )
 
 
@@ -60,12 +63,7 @@ def pack(space, format, args_w):
     return space.newbytes(_pack(space, format, args_w))
 
 
-@unwrap_spec(format='text', offset=int)
-def pack_into(space, format, w_buffer, offset, args_w):
-    """ Pack the values v1, v2, ... according to fmt.
-Write the packed bytes into the writable buffer buf starting at offset
-    """
-    size = _calcsize(space, format)
+def _pack_into_buffer(space, w_buffer, offset, size):
     buf = space.getarg_w('w*', w_buffer)
     if offset < 0:
         offset += buf.getlength()
@@ -73,8 +71,16 @@ Write the packed bytes into the writable buffer buf starting at offset
         raise oefmt(get_error(space),
                     "pack_into requires a buffer of at least %d bytes",
                     size)
-    #
-    wbuf = SubBuffer(buf, offset, size)
+    return SubBuffer(buf, offset, size)
+
+
+@unwrap_spec(format='text', offset=int)
+def pack_into(space, format, w_buffer, offset, args_w):
+    """ Pack the values v1, v2, ... according to fmt.
+Write the packed bytes into the writable buffer buf starting at offset
+    """
+    size = _calcsize(space, format)
+    wbuf = _pack_into_buffer(space, w_buffer, offset, size)
     fmtiter = PackFormatIterator(space, wbuf, args_w)
     try:
         fmtiter.interpret(format)
@@ -101,11 +107,7 @@ def unpack(space, format, w_str):
     return _unpack(space, format, buf)
 
 
-@unwrap_spec(format='text', offset=int)
-def unpack_from(space, format, w_buffer, offset=0):
-    """Unpack the buffer, containing packed C structure data, according to
-fmt, starting at offset. Requires len(buffer[offset:]) >= calcsize(fmt)."""
-    size = _calcsize(space, format)
+def _unpack_from_buffer(space, w_buffer, offset, size):
     buf = space.getarg_w('z*', w_buffer)
     if buf is None:
         raise oefmt(get_error(space), "unpack_from requires a buffer argument")
@@ -115,37 +117,164 @@ fmt, starting at offset. Requires len(buffer[offset:]) >= calcsize(fmt)."""
         raise oefmt(get_error(space),
                     "unpack_from requires a buffer of at least %d bytes",
                     size)
-    buf = SubBuffer(buf, offset, size)
+    return SubBuffer(buf, offset, size)
+
+
+@unwrap_spec(format='text', offset=int)
+def unpack_from(space, format, w_buffer, offset=0):
+    """Unpack the buffer, containing packed C structure data, according to
+fmt, starting at offset. Requires len(buffer[offset:]) >= calcsize(fmt)."""
+    size = _calcsize(space, format)
+    buf = _unpack_from_buffer(space, w_buffer, offset, size)
     return _unpack(space, format, buf)
 
 
+@unwrap_spec(format='text')
+def iter_unpack(space, format, w_buffer):
+    """Return an iterator yielding tuples unpacked from the buffer
+according to fmt, one record after the other.  The size of the buffer
+must be a multiple of calcsize(fmt)."""
+    w_struct = W_Struct()
+    w_struct.descr__init__(space, format)
+    return w_struct.descr_iter_unpack(space, w_buffer)
+
+
+@specialize.argtype(1)
+def _interpret_plan(space, fmtiter, plan):
+    try:
+        fmtiter.interpret_plan(plan)
+    except StructOverflowError as e:
+        raise OperationError(space.w_OverflowError, space.newtext(e.msg))
+    except StructError as e:
+        raise OperationError(get_error(space), space.newtext(e.msg))
+
+
 class W_Struct(W_Root):
-    _immutable_fields_ = ["format", "size"]
+    """A format string compiled once into a FormatPlan: pack() and
+    unpack() don't parse it again."""
+    _immutable_fields_ = ["format", "size", "plan"]
 
     format = ""
     size = -1
+    plan = compile_format("")
 
     def descr__new__(space, w_subtype, __args__):
         return space.allocate_instance(W_Struct, w_subtype)
 
     @unwrap_spec(format='text')
     def descr__init__(self, space, format):
+        try:
+            plan = compile_format(format)
+        except StructOverflowError as e:
+            raise OperationError(space.w_OverflowError, space.newtext(e.msg))
+        except StructError as e:
+            raise OperationError(get_error(space), space.newtext(e.msg))
         self.format = format
-        self.size = _calcsize(space, format)
+        self.size = plan.size
+        self.plan = plan
 
     def descr_pack(self, space, args_w):
-        return pack(space, jit.promote_string(self.format), args_w)
+        plan = jit.promote(self.plan)
+        wbuf = MutableStringBuffer(plan.size)
+        fmtiter = PackFormatIterator(space, wbuf, args_w)
+        _interpret_plan(space, fmtiter, plan)
+        return space.newbytes(wbuf.finish())
 
     @unwrap_spec(offset=int)
     def descr_pack_into(self, space, w_buffer, offset, args_w):
-        return pack_into(space, jit.promote_string(self.format), w_buffer, offset, args_w)
+        plan = jit.promote(self.plan)
+        wbuf = _pack_into_buffer(space, w_buffer, offset, plan.size)
+        fmtiter = PackFormatIterator(space, wbuf, args_w)
+        _interpret_plan(space, fmtiter, plan)
 
     def descr_unpack(self, space, w_str):
-        return unpack(space, jit.promote_string(self.format), w_str)
+        buf = space.getarg_w('s*', w_str)
+        return self._unpack_buf(space, buf)
 
     @unwrap_spec(offset=int)
     def descr_unpack_from(self, space, w_buffer, offset=0):
-        return unpack_from(space, jit.promote_string(self.format), w_buffer, offset)
+        buf = _unpack_from_buffer(space, w_buffer, offset, self.size)
+        return self._unpack_buf(space, buf)
+
+    def _unpack_buf(self, space, buf):
+        plan = jit.promote(self.plan)
+        fmtiter = UnpackFormatIterator(space, buf)
+        _interpret_plan(space, fmtiter, plan)
+        return space.newtuple(fmtiter.result_w[:])
+
+    def _check_iterative(self, space):
+        if self.size == 0:
+            raise oefmt(get_error(space),
+                        "cannot iteratively unpack with a struct of length 0")
+
+    def descr_iter_unpack(self, space, w_buffer):
+        """Return an iterator yielding tuples unpacked from the buffer,
+one record after the other.  The size of the buffer must be a multiple
+of the size of the struct."""
+        self._check_iterative(space)
+        buf = space.getarg_w('s*', w_buffer)
+        if buf.getlength() % self.size != 0:
+            raise oefmt(get_error(space),
+                        "iterative unpacking requires a buffer of a "
+                        "multiple of %d bytes", self.size)
+        return W_UnpackIter(self, buf)
+
+    @unwrap_spec(count=int, offset=int)
+    def descr_unpack_many(self, space, w_buffer, count=-1, offset=0):
+        """Unpack 'count' consecutive records from the buffer, starting at
+offset, or all of them if count is -1; the size of the buffer must then
+be offset plus a multiple of the size of the struct.  Return a tuple
+with one list per field, giving the values of this field in all the
+records.  Lists of ints or floats use an unboxed representation."""
+        self._check_iterative(space)
+        plan = jit.promote(self.plan)
+        buf = space.getarg_w('s*', w_buffer)
+        length = buf.getlength()
+        if offset < 0:
+            offset += length
+        if offset < 0 or offset > length:
+            raise oefmt(get_error(space), "offset out of range")
+        if count < 0:
+            if (length - offset) % plan.size != 0:
+                raise oefmt(get_error(space),
+                            "unpack_many requires a buffer of a multiple "
+                            "of %d bytes after the offset", plan.size)
+            count = (length - offset) // plan.size
+        elif (length - offset) // plan.size < count:
+            raise oefmt(get_error(space),
+                        "unpack_many requires a buffer of at least %d bytes",
+                        offset + count * plan.size)
+        fmtiter = UnpackColumnsFormatIterator(space, buf, plan.nfields)
+        for i in range(count):
+            fmtiter.start_record(offset + i * plan.size)
+            _interpret_plan(space, fmtiter, plan)
+        return fmtiter.wrap_columns()
+
+    def descr_pack_many(self, space, w_columns):
+        """Pack records from a sequence of columns, with one sequence per
+field giving the values of this field in all the records.  Lists of
+ints or floats are read without boxing their items."""
+        plan = jit.promote(self.plan)
+        columns_w = space.fixedview(w_columns)
+        if len(columns_w) != plan.nfields:
+            raise oefmt(get_error(space),
+                        "pack_many expected %d columns, got %d",
+                        plan.nfields, len(columns_w))
+        fmtiter = PackColumnsFormatIterator(space, None, columns_w)
+        count = 0
+        for i in range(len(columns_w)):
+            length = fmtiter.column_length(i)
+            if i == 0:
+                count = length
+            elif length != count:
+                raise oefmt(get_error(space),
+                            "pack_many requires columns of the same length")
+        wbuf = MutableStringBuffer(count * plan.size)
+        fmtiter.wbuf = wbuf
+        for row in range(count):
+            fmtiter.start_record(row * plan.size, row)
+            _interpret_plan(space, fmtiter, plan)
+        return space.newbytes(wbuf.finish())
 
 W_Struct.typedef = TypeDef("Struct",
     __new__=interp2app(W_Struct.descr__new__.im_func),
@@ -157,8 +286,46 @@ W_Struct.typedef = TypeDef("Struct",
     unpack=interp2app(W_Struct.descr_unpack),
     pack_into=interp2app(W_Struct.descr_pack_into),
     unpack_from=interp2app(W_Struct.descr_unpack_from),
+    iter_unpack=interp2app(W_Struct.descr_iter_unpack),
+    unpack_many=interp2app(W_Struct.descr_unpack_many),
+    pack_many=interp2app(W_Struct.descr_pack_many),
     __weakref__=make_weakref_descr(W_Struct),
 )
 
+
+class W_UnpackIter(W_Root):
+    def __init__(self, w_struct, buf):
+        self.w_struct = w_struct
+        self.buf = buf
+        self.index = 0
+
+    def descr_iter(self, space):
+        return self
+
+    def descr_next(self, space):
+        if self.w_struct is None:
+            raise OperationError(space.w_StopIteration, space.w_None)
+        size = self.w_struct.size
+        if self.index >= self.buf.getlength():
+            self.w_struct = None
+            raise OperationError(space.w_StopIteration, space.w_None)
+        buf = SubBuffer(self.buf, self.index, size)
+        w_res = self.w_struct._unpack_buf(space, buf)
+        self.index += size
+        return w_res
+
+    def descr_length_hint(self, space):
+        if self.w_struct is None:
+            return space.newint(0)
+        length = (self.buf.getlength() - self.index) // self.w_struct.size
+        return space.newint(length)
+
+W_UnpackIter.typedef = TypeDef("unpack_iterator",
+    __iter__=interp2app(W_UnpackIter.descr_iter),
+    next=interp2app(W_UnpackIter.descr_next),
+    __length_hint__=interp2app(W_UnpackIter.descr_length_hint),
+)
+W_UnpackIter.typedef.acceptable_as_base_class = False
+
 def clearcache(space):
     """No-op on PyPy"""
@@ -462,6 +462,76 @@ class AppTestStruct(object):
         assert val == sys.maxint+1
         assert type(val) is long
 
+    def test_struct_reinit(self):
+        s = self.struct.Struct('i')
+        s.__init__('<hd')
+        assert s.format == '<hd'
+        assert s.size == 10
+        assert s.unpack(s.pack(3, 1.5)) == (3, 1.5)
+        raises(self.struct.error, s.__init__, 'Z')
+        assert s.unpack(s.pack(3, 1.5)) == (3, 1.5)
+
+    def test_iter_unpack(self):
+        s = self.struct.Struct('<ih')
+        data = s.pack(1, 2) + s.pack(-3, 4) + s.pack(5, -6)
+        it = s.iter_unpack(data)
+        assert it.__length_hint__() == 3
+        assert iter(it) is it
+        assert next(it) == (1, 2)
+        assert list(it) == [(-3, 4), (5, -6)]
+        assert it.__length_hint__() == 0
+        raises(StopIteration, next, it)
+        assert list(self.struct.iter_unpack('<ih', bytearray(data))) == [
+            (1, 2), (-3, 4), (5, -6)]
+        raises(self.struct.error, s.iter_unpack, data[:-1])
+        raises(self.struct.error, self.struct.iter_unpack, '0s', '')
+        # native alignment is relative to the start of each record
+        data = self.struct.pack('ci', 'a', 7) * 2
+        assert list(self.struct.iter_unpack('ci', data)) == [('a', 7)] * 2
+
+    def test_unpack_many(self):
+        import sys
+        s = self.struct.Struct('<bxQd3s?')
+        records = [(i - 5, i * 1000, i / 4.0, str(i) * 3, i % 2 == 1)
+                   for i in range(10)]
+        data = ''.join([s.pack(*r) for r in records])
+        columns = s.unpack_many(data)
+        assert type(columns) is tuple
+        assert columns == tuple([list(c) for c in zip(*records)])
+        assert s.unpack_many(data, 3, 2 * s.size) == tuple(
+            [list(c) for c in zip(*records[2:5])])
+        assert s.unpack_many(data, 0) == ([], [], [], [], [])
+        raises(self.struct.error, s.unpack_many, data, 11)
+        raises(self.struct.error, s.unpack_many, data + 'x')
+        raises(self.struct.error, s.unpack_many, data, -1, len(data) + 1)
+        # values that don't fit in an int
+        s = self.struct.Struct('Q')
+        data = s.pack(5) + s.pack(sys.maxint + 1)
+        assert s.unpack_many(data) == ([5, sys.maxint + 1],)
+        # alignment relative to each record
+        data = self.struct.pack('ci', 'a', 7) * 3
+        assert self.struct.Struct('ci').unpack_many(data) == (['a'] * 3,
+                                                              [7] * 3)
+
+    def test_pack_many(self):
+        s = self.struct.Struct('<bxQd3s?')
+        records = [(i - 5, i * 1000, i / 4.0, str(i) * 3, i % 2 == 1)
+                   for i in range(10)]
+        data = ''.join([s.pack(*r) for r in records])
+        columns = [list(c) for c in zip(*records)]
+        assert s.pack_many(columns) == data
+        assert s.pack_many([tuple(c) for c in columns]) == data
+        assert s.pack_many([[]] * 5) == ''
+        raises(self.struct.error, s.pack_many, columns[:4])
+        raises(self.struct.error, s.pack_many, columns[:4] + [[True]])
+        columns[0][3] = 200
+        raises(self.struct.error, s.pack_many, columns)
+        s = self.struct.Struct('cI')
+        data = s.pack('a', 1) + s.pack('b', 2)
+        assert s.pack_many([['a', 'b'], [1, 2]]) == data
+        assert s.pack_many([['a', 'b'], [1.5, 2.5]]) == data
+        raises(self.struct.error, s.pack_many, [['a'], [-1]])
+
 class AppTestStructBuffer(object):
     spaceconfig = dict(usemodules=['struct', '__pypy__'])
 
@@ -493,6 +563,18 @@ class AppTestStructBuffer(object):
         b[:sz] = self.struct.pack("ii", 18, 43)
         assert self.struct.unpack_from("ii", b) == (18, 43)
 
+    def test_unpack_many_strategies(self):
+        from __pypy__ import strategy
+        s = self.struct.Struct('<qdc')
+        data = s.pack(1, 2.5, 'a') + s.pack(-3, 4.0, 'b')
+        ints, floats, chars = s.unpack_many(data)
+        assert ints == [1, -3]
+        assert strategy(ints) == "IntegerListStrategy"
+        assert floats == [2.5, 4.0]
+        assert strategy(floats) == "FloatListStrategy"
+        assert chars == ['a', 'b']
+        assert s.pack_many([ints, floats, chars]) == data
+
 
 class AppTestFastPath(object):
     spaceconfig = dict(usemodules=['array', 'struct', '__pypy__'])
@@ -32,9 +32,12 @@ objects support decompress() and flush()."""
         'decompress': 'interp_zlib.decompress',
         '__version__': 'space.newtext("1.0")',
         'error': 'space.fromcache(interp_zlib.Cache).w_error',
+        '_GzipFile': 'interp_gzip.W_GzipFile',
+        '_compress_block': 'interp_zlib._compress_block',
         }
 
     appleveldefs = {
+        'compress_parallel': 'app_zlib.compress_parallel',
         }
 
 
@@ -0,0 +1,114 @@
+"""
+Plain Python part of the zlib module: compress_parallel().
+"""
+
+def compress_parallel(string, level=-1, wbits=15, blocksize=131072,
+                      threads=4):
+    """compress_parallel(string[, level[, wbits[, blocksize[, threads]]]])
+-- Return compressed string.
+
+Same result format as compressobj(level, DEFLATED, wbits): a zlib stream
+if 9 <= wbits <= 15, a raw deflate stream if -15 <= wbits <= -9, and a
+gzip member if 25 <= wbits <= 31.  The string is cut into blocks of
+'blocksize' bytes that are compressed independently by 'threads' threads,
+each block using the end of the previous one as dictionary.  The
+compressed data is a little bigger than with compress().  PyPy only."""
+    import zlib
+    if 9 <= wbits <= 15:
+        window = wbits
+    elif -15 <= wbits <= -9:
+        window = -wbits
+    elif 25 <= wbits <= 31:
+        window = wbits - 16
+    else:
+        raise zlib.error("Bad window buffer size")
+    if blocksize <= 0:
+        raise ValueError("blocksize must be positive")
+    if not isinstance(string, str):
+        string = buffer(string)[:]
+    length = len(string)
+    nblocks = max(1, (length + blocksize - 1) // blocksize)
+    results = [None] * nblocks
+
+    def compress_block(i):
+        start = i * blocksize
+        stop = min(start + blocksize, length)
+        results[i] = zlib._compress_block(string, start, stop, level,
+                                          window, i == nblocks - 1)
+
+    workers = _start_workers(compress_block, range(nblocks), threads)
+    # compute the checksum while the workers are running; this releases
+    # the GIL too
+    if wbits > 15:
+        checksum = zlib.crc32(string) & 0xffffffff
+        header = '\x1f\x8b\x08\x00\x00\x00\x00\x00%s\xff' % (
+            '\x04' if level == 1 else '\x02' if level == 9 else '\x00')
+        trailer = _le32(checksum) + _le32(length & 0xffffffff)
+    elif wbits > 0:
+        checksum = zlib.adler32(string) & 0xffffffff
+        header = _zlib_header(window, level)
+        trailer = _le32(checksum)[::-1]
+    else:
+        header = trailer = ''
+    _join_workers(workers)
+    return header + ''.join(results) + trailer
+
+def _start_workers(function, todo, threads):
+    try:
+        import thread
+    except ImportError:
+        threads = 1
+    threads = min(threads, len(todo))
+    if threads <= 1:
+        for i in todo:
+            function(i)
+        return None
+    todo = iter(todo)
+    lock = thread.allocate_lock()
+    errors = []
+
+    def worker(done):
+        try:
+            while not errors:
+                with lock:
+                    i = next(todo, None)
+                if i is None:
+                    break
+                function(i)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            done.release()
+
+    done_locks = []
+    for n in range(threads):
+        done = thread.allocate_lock()
+        done.acquire()
+        thread.start_new_thread(worker, (done,))
+        done_locks.append(done)
+    return done_locks, errors
+
+def _join_workers(workers):
+    if workers is not None:
+        done_locks, errors = workers
+        for done in done_locks:
+            done.acquire()
+        if errors:
+            raise errors[0]
+
+def _le32(x):
+    return ''.join([chr((x >> shift) & 0xff) for shift in (0, 8, 16, 24)])
+
+def _zlib_header(window, level):
+    cmf = ((window - 8) << 4) | 8
+    if level == 0 or level == 1:
+        flevel = 0
+    elif 2 <= level <= 5:
+        flevel = 1
+    elif level == 6 or level == -1:
+        flevel = 2
+    else:
+        flevel = 3
+    flg = flevel << 6
+    flg += 31 - (cmf * 256 + flg) % 31
+    return chr(cmf) + chr(flg)
@@ -0,0 +1,319 @@
+"""
+A native file type for gzip files, built on top of rpython.rlib.rzlib
+in the same way as bz2.BZ2File.  The header and the trailer of each
+member are handled by zlib itself (window bits = 16 + MAX_WBITS), so
+the CRC and the size are checked in C.  Reading goes through a stream
+filter with a peek() method, so that readline() and iteration split
+the decompressed data directly.
+"""
+
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.typedef import TypeDef
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.module._file.interp_file import W_File
+from pypy.module.zlib.interp_zlib import zlib_error
+from rpython.rlib import rzlib
+from rpython.rlib.rarithmetic import intmask, r_longlong
+from rpython.rlib.streamio import Stream
+
+GZIP_WBITS = 16 + rzlib.MAX_WBITS    # zlib writes and checks gzip headers
+MIN_READ = 16384    # minimum amount of compressed data read at once
+
+
+class W_GzipFile(W_File):
+
+    def check_mode_ok(self, mode):
+        if (not mode or mode[0] not in ['r', 'w', 'a', 'U']):
+            space = self.space
+            raise oefmt(space.w_ValueError, "invalid mode: '%s'", mode)
+
+    @unwrap_spec(mode='text', buffering=int, compresslevel=int)
+    def direct_gzip__init__(self, w_name, mode='r', buffering=-1,
+                            compresslevel=9):
+        self.direct_close()
+        self.w_name = w_name
+        # the stream should always be opened in binary mode
+        if "b" not in mode:
+            mode = mode + "b"
+        self.check_mode_ok(mode)
+        stream = open_gzipfile_as_stream(self.space, w_name, mode,
+                                         buffering, compresslevel)
+        fd = stream.try_to_find_file_descriptor()
+        self.fdopenstream(stream, fd, mode, w_name)
+
+    _exposed_method_names = []
+    W_File._decl.im_func(locals(), "gzip__init__",
+                         """Opens a gzip-compressed file.""",
+                         wrapresult="space.w_None")
+    # see W_BZ2File for why this is not simply called "__init__"
+
+    def file_gzip__repr__(self):
+        if self.stream is None:
+            head = "closed"
+        else:
+            head = "open"
+        info = "%s zlib._GzipFile %s, mode '%s'" % (
+            head, self.getdisplayname(), self.mode)
+        return self.getrepr(self.space, info)
+
+def descr_gzipfile__new__(space, w_subtype, __args__):
+    gzipfile = space.allocate_instance(W_GzipFile, w_subtype)
+    W_GzipFile.__init__(gzipfile, space)
+    return gzipfile
+
+same_attributes_as_in_file = list(W_File._exposed_method_names)
+same_attributes_as_in_file.remove('__init__')
+same_attributes_as_in_file.extend([
+    'name', 'mode', 'encoding', 'closed', 'newlines', 'softspace',
+    'writelines', '__exit__', '__weakref__', 'write'])
+
+W_GzipFile.typedef = TypeDef(
+    "zlib._GzipFile",
+    __doc__ = """\
+_GzipFile(name [, mode='r', buffering=-1, compresslevel=9]) -> file object
+
+Open a gzip file.  The mode can be 'r' for reading (default), 'w' for
+writing, or 'a' for appending a new member to the file.  When reading,
+files made of several members are read as the concatenation of the
+members.  The buffering argument gives the amount of compressed data
+read at once.  If compresslevel is given, must be a number between 1
+and 9.
+
+This is a regular file object: unlike gzip.GzipFile, readline() and
+iteration are done at interpreter level.""",
+    __new__  = interp2app(descr_gzipfile__new__),
+    __init__ = interp2app(W_GzipFile.file_gzip__init__),
+    __repr__ = interp2app(W_GzipFile.file_gzip__repr__),
+    **dict([(name, W_File.typedef.rawdict[name])
+            for name in same_attributes_as_in_file]))
+
+
+# ____________________________________________________________
+
+def open_gzipfile_as_stream(space, w_path, mode="r", buffering=-1,
+                            compresslevel=9):
+    from rpython.rlib.streamio import decode_mode, open_path_helper
+    from rpython.rlib.streamio import construct_stream_tower
+    os_flags, universal, reading, writing, basemode, binary = decode_mode(mode)
+    if reading and writing:
+        raise oefmt(space.w_ValueError, "cannot open in read-write mode")
+    if writing and not 1 <= compresslevel <= 9:
+        raise oefmt(space.w_ValueError,
+                    "compresslevel must be between 1 and 9")
+    stream = open_path_helper(space.fsencode_w(w_path), os_flags,
+                              basemode == "a")
+    if reading:
+        gzipstream = ReadGzipFilter(space, stream, buffering)
+        buffering = 0     # by construction, the ReadGzipFilter acts like
+                          # a read buffer too - no need for another one
+    else:
+        assert writing
+        gzipstream = WriteGzipFilter(space, stream, compresslevel)
+    stream = construct_stream_tower(gzipstream, buffering, universal, reading,
+                                    writing, binary)
+    return stream
+
+
+class ReadGzipFilter(Stream):
+
+    """Standard I/O stream filter that decompresses a gzip stream."""
+
+    def __init__(self, space, stream, buffering):
+        self.space = space
+        self.stream = stream
+        self.inflate = rzlib.inflateInit(GZIP_WBITS)
+        self.readlength = r_longlong(0)
+        self.buffer = ""
+        self.pos = 0
+        self.unused = ""          # compressed data after the end of a member
+        self.in_member = False    # inside a member that is not finished yet
+        self.finished = False
+        if buffering < MIN_READ:
+            buffering = MIN_READ
+        self.buffering = buffering
+
+    def close1(self, closefileno):
+        self._end_inflate()
+        self.stream.close1(closefileno)
+
+    def _end_inflate(self):
+        if self.inflate:
+            rzlib.inflateEnd(self.inflate)
+            self.inflate = rzlib.null_stream
+
+    def _rewind(self):
+        self.stream.seek(0, 0)
+        self._end_inflate()
+        self.inflate = rzlib.inflateInit(GZIP_WBITS)
+        self.readlength = r_longlong(0)
+        self.buffer = ""
+        self.pos = 0
+        self.unused = ""
+        self.in_member = False
+        self.finished = False
+
+    def _fill_buffer(self):
+        # Decompress more data into self.buffer, which must be consumed.
+        # Returns False at the end of the file.
+        while not self.finished:
+            data = self.unused
+            self.unused = ""
+            if not data:
+                data = self.stream.read(self.buffering)
+                if not data:
+                    if self.in_member:
+                        raise oefmt(self.space.w_EOFError,
+                                    "compressed file ended before the "
+                                    "end-of-stream marker was reached")
+                    self.finished = True
+                    break
+            if not self.in_member:
+                # skip the zero padding that can follow the last member
+                start = 0
+                while start < len(data) and data[start] == '\x00':
+                    start += 1
+                if start == len(data):
+                    continue
+                data = data[start:]
+                self.in_member = True
+            try:
+                result, end, unused_len = rzlib.decompress(self.inflate, data)
+            except rzlib.RZlibError as e:
+                raise zlib_error(self.space, e.msg)
+            if end:
+                # the member is complete; the next one needs a new header
+                self.in_member = False
+                if unused_len > 0:
+                    start = len(data) - unused_len
+                    assert start >= 0
+                    self.unused = data[start:]
+                self._end_inflate()
+                self.inflate = rzlib.inflateInit(GZIP_WBITS)
+            if result:
+                self.buffer = result
+                self.pos = 0
+                return True
+        return False
+
+    def tell(self):
+        return self.readlength
+
+    def seek(self, offset, whence):
+        READMAX = 2**18   # 256KB
+
+        # Make offset relative to the start of the file
+        if whence == 2:
+            # Read everything to arrive at the end
+            while len(self.read(READMAX)) > 0:
+                pass
+            offset += self.readlength
+        elif whence == 1:
+            offset += self.readlength
+        elif whence == 0:
+            pass
+        else:
+            raise oefmt(self.space.w_ValueError,
+                        "Invalid value for whence: %d", whence)
+
+        # Make offset relative to the current pos
+        # Rewind iff necessary
+        if offset < self.readlength:
+            self._rewind()
+        else:
+            offset -= self.readlength
+
+        # Seek
+        read = r_longlong(0)
+        while read < offset:
+            count = offset - read
+            if count < READMAX:
+                count = intmask(count)
+            else:
+                count = READMAX
+            length = len(self.read(count))
+            if not length:
+                break
+            read += length
+
+    def readall(self):
+        pos = self.pos
+        assert pos >= 0
+        chunks = [self.buffer[pos:]]
+        self.buffer = ""
+        self.pos = 0
+        while self._fill_buffer():
+            chunks.append(self.buffer)
+            self.buffer = ""
+        result = "".join(chunks)
+        self.readlength += len(result)
+        return result
+
+    def read(self, n):
+        if n <= 0:
+            return ''
+        if self.pos == len(self.buffer):
+            if not self._fill_buffer():
+                return ""
+        pos = self.pos
+        assert pos >= 0
+        if len(self.buffer) - pos >= n:
+            result = self.buffer[pos:pos + n]
+            self.pos += n
+        else:
+            result = self.buffer[pos:]
+            self.pos = 0
+            self.buffer = ""
+        self.readlength += len(result)
+        return result
+
+    def peek(self):
+        return (self.pos, self.buffer)
+
+    def try_to_find_file_descriptor(self):
+        return self.stream.try_to_find_file_descriptor()
+
+    def write(self, s):
+        raise oefmt(self.space.w_IOError, "file is not ready for writing")
+
+
+class WriteGzipFilter(Stream):
+    """Standard I/O stream filter that writes a gzip member."""
+
+    def __init__(self, space, stream, compresslevel):
+        self.stream = stream
+        self.space = space
+        self.deflate = rzlib.deflateInit(compresslevel, wbits=GZIP_WBITS)
+        self.writtenlength = 0
+
+    def close1(self, closefileno):
+        if self.deflate:
+            try:
+                self.stream.write(rzlib.compress(self.deflate, "",
+                                                 rzlib.Z_FINISH))
+            finally:
+                rzlib.deflateEnd(self.deflate)
+                self.deflate = rzlib.null_stream
+        self.stream.close1(closefileno)
+
+    def write(self, data):
+        try:
+            compressed = rzlib.compress(self.deflate, data)
+        except rzlib.RZlibError as e:
+            raise zlib_error(self.space, e.msg)
+        self.stream.write(compressed)
+        self.writtenlength += len(data)
+
+    def tell(self):
+        return self.writtenlength
+
+    def seek(self, offset, whence):
+        raise oefmt(self.space.w_IOError, "seek works only while reading")
+
+    def read(self, n):
+        raise oefmt(self.space.w_IOError, "file is not ready for reading")
+
+    def readall(self):
+        raise oefmt(self.space.w_IOError, "file is not ready for reading")
+
+    def try_to_find_file_descriptor(self):
+        return self.stream.try_to_find_file_descriptor()
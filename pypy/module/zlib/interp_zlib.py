@@ -108,6 +108,31 @@ def decompress(space, string, wbits=rzlib.MAX_WBITS, bufsize=0):
     return space.newbytes(result)
 
 
+@unwrap_spec(string='bufferstr', start=int, stop=int, level=int, wbits=int,
+             last=bool)
+def _compress_block(space, string, start, stop, level, wbits, last):
+    """
+    _compress_block(string, start, stop, level, wbits, last) -- Compress
+    string[start:stop] as one piece of a raw deflate stream, primed with
+    the 2**wbits bytes before 'start'.  Used by compress_parallel().
+    """
+    if not 0 <= start <= stop <= len(string):
+        raise oefmt(space.w_ValueError, "block out of range")
+    if not 9 <= wbits <= rzlib.MAX_WBITS:
+        raise zlib_error(space, "Bad window buffer size")
+    assert start >= 0
+    dictstart = max(0, start - (1 << wbits))
+    try:
+        result = rzlib.deflate_block(string[start:stop],
+                                     string[dictstart:start],
+                                     level, -wbits, last)
+    except ValueError:
+        raise zlib_error(space, "Bad compression level")
+    except rzlib.RZlibError as e:
+        raise zlib_error(space, e.msg)
+    return space.newbytes(result)
+
+
 class ZLibObject(W_Root):
     """
     Common base class for Compress and Decompress.
@@ -0,0 +1,106 @@
+import gzip
+import py
+
+try:
+    from pypy.module.zlib import interp_zlib
+except ImportError:
+    py.test.skip("no zlib C library on this machine")
+
+
+class AppTestGzipFile(object):
+    spaceconfig = dict(usemodules=['zlib'])
+
+    def setup_class(cls):
+        tmpdir = py.test.ensuretemp("gzipfile")
+        cls.w_temppath = cls.space.wrap(str(tmpdir.join("foo.gz")))
+        data = "".join(["line %d\n" % i for i in range(5000)])
+        cls.w_data = cls.space.wrap(data)
+        path = tmpdir.join("lines.gz")
+        f = gzip.GzipFile(str(path), "wb")
+        f.write(data)
+        f.close()
+        cls.w_linespath = cls.space.wrap(str(path))
+        # two members, with zero padding at the end
+        path = tmpdir.join("members.gz")
+        for part, mode in [("hello\nwor", "wb"), ("ld\n", "ab")]:
+            f = gzip.GzipFile(str(path), mode)
+            f.write(part)
+            f.close()
+        path.write(path.read("rb") + "\x00" * 10, "wb")
+        cls.w_memberspath = cls.space.wrap(str(path))
+        path = tmpdir.join("truncated.gz")
+        path.write(tmpdir.join("lines.gz").read("rb")[:-100], "wb")
+        cls.w_truncatedpath = cls.space.wrap(str(path))
+
+    def test_attributes(self):
+        from zlib import _GzipFile
+        f = _GzipFile(self.temppath, "w")
+        assert f.name == self.temppath
+        assert f.mode == "wb"
+        assert f.closed == False
+        f.close()
+        assert f.closed == True
+        assert repr(f).startswith("<closed zlib._GzipFile ")
+        raises(ValueError, _GzipFile, self.temppath, "w", compresslevel=10)
+        raises(ValueError, _GzipFile, self.temppath, "z")
+
+    def test_read(self):
+        from zlib import _GzipFile
+        with _GzipFile(self.linespath) as f:
+            assert f.read() == self.data
+        with _GzipFile(self.linespath, buffering=20000) as f:
+            assert f.read(7) == "line 0\n"
+            assert f.tell() == 7
+            assert f.read(50000) + f.read() == self.data[7:]
+
+    def test_readline_and_iter(self):
+        from zlib import _GzipFile
+        lines = self.data.splitlines(True)
+        with _GzipFile(self.linespath) as f:
+            assert f.readline() == lines[0]
+            assert f.readline(3) == lines[1][:3]
+            assert list(f) == [lines[1][3:]] + lines[2:]
+        with _GzipFile(self.linespath) as f:
+            assert f.readlines() == lines
+
+    def test_seek(self):
+        from zlib import _GzipFile
+        with _GzipFile(self.linespath) as f:
+            f.seek(100)
+            assert f.read(10) == self.data[100:110]
+            f.seek(-20, 1)
+            assert f.read(10) == self.data[90:100]
+            f.seek(-5, 2)
+            assert f.read() == self.data[-5:]
+
+    def test_members(self):
+        from zlib import _GzipFile
+        with _GzipFile(self.memberspath) as f:
+            assert list(f) == ["hello\n", "world\n"]
+
+    def test_write_append(self):
+        import zlib
+        from zlib import _GzipFile
+        with _GzipFile(self.temppath, "w") as f:
+            f.write("abc\n")
+            f.writelines(["def\n", "ghi"])
+            assert f.tell() == 11
+        with open(self.temppath, "rb") as f:
+            data = f.read()
+        assert data.startswith("\x1f\x8b")
+        assert zlib.decompress(data, 16 + zlib.MAX_WBITS) == "abc\ndef\nghi"
+        with _GzipFile(self.temppath, "a", compresslevel=1) as f:
+            f.write("jkl\n")
+        with _GzipFile(self.temppath) as f:
+            assert f.readlines() == ["abc\n", "def\n", "ghijkl\n"]
+
+    def test_errors(self):
+        import zlib
+        with open(self.temppath, "wb") as f:
+            f.write("this is not a gzip file")
+        f = zlib._GzipFile(self.temppath)
+        raises(zlib.error, f.read)
+        f.close()
+        f = zlib._GzipFile(self.truncatedpath)
+        raises(EOFError, f.read)
+        f.close()
@@ -276,3 +276,48 @@ class AppTestZlib(object):
         assert dco.flush(1) == input1[1:]
         assert dco.unused_data == b''
         assert dco.unconsumed_tail == b''
+
+
+class AppTestCompressParallel(object):
+    spaceconfig = dict(usemodules=['zlib', 'thread'])
+
+    def setup_class(cls):
+        data = ''.join(['%d:%s,' % (i, 'x' * (i % 37)) for i in range(300)])
+        cls.w_data = cls.space.wrap(data)
+
+    def test_formats(self):
+        import zlib
+        data = self.data
+        for wbits in [15, 9, -15, -12, 31, 25]:
+            for threads in [1, 3]:
+                compressed = zlib.compress_parallel(data, 6, wbits, 10000,
+                                                    threads)
+                assert zlib.decompress(compressed, wbits) == data
+        compressed = zlib.compress_parallel(data, 9, 31)
+        assert compressed[:3] == '\x1f\x8b\x08'
+        assert compressed[8] == '\x02'
+        d = zlib.decompressobj(31)
+        assert d.decompress(compressed) == data
+        assert d.unused_data == ''
+
+    def test_same_header_as_compress(self):
+        import zlib
+        for level in [-1, 0, 1, 4, 6, 9]:
+            compressed = zlib.compress_parallel(self.data, level)
+            assert compressed[:2] == zlib.compress(self.data, level)[:2]
+            assert compressed[-4:] == zlib.compress(self.data, level)[-4:]
+
+    def test_small_and_buffers(self):
+        import zlib
+        for data in ['', 'a', 'hello world']:
+            assert zlib.decompress(zlib.compress_parallel(data)) == data
+        data = bytearray(self.data)
+        compressed = zlib.compress_parallel(data, blocksize=777)
+        assert zlib.decompress(compressed) == self.data
+
+    def test_errors(self):
+        import zlib
+        raises(zlib.error, zlib.compress_parallel, self.data, 10)
+        raises(zlib.error, zlib.compress_parallel, self.data, 6, 8)
+        raises(ValueError, zlib.compress_parallel, self.data, 6, 15, 0)
+        raises(ValueError, zlib._compress_block, 'abc', 2, 5, 6, 15, True)
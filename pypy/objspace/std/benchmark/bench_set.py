@@ -0,0 +1,52 @@
+""" some simple benchmarking stuff for the set strategies
+"""
+
+import random, time
+
+def count_operation(name, function, repeat=20):
+    t0 = time.time()
+    for i in xrange(repeat):
+        retval = function()
+    tk = time.time()
+    print "%-40s takes: %f" % (name, tk - t0)
+    return retval
+
+def bench_set(SIZE = 100000):
+    ints = [random.randrange(SIZE * 4) for i in xrange(SIZE)]
+    floats = [random.random() * SIZE for i in xrange(SIZE)]
+    strings = [str(i) for i in ints]
+    other_ints = random.sample(ints, SIZE // 10) + range(SIZE // 10)
+    other_floats = random.sample(floats, SIZE // 10) + [0.5] * 100
+
+    count_operation("set(range(n))", lambda : set(range(SIZE)))
+    count_operation("set(int list)", lambda : set(ints))
+    count_operation("set(float list)", lambda : set(floats))
+    count_operation("set(str list)", lambda : set(strings))
+
+    s_ints = set(ints)
+    s_floats = set(floats)
+
+    count_operation("int set & int list",
+                    lambda : s_ints.intersection(other_ints))
+    count_operation("float set & float list",
+                    lambda : s_floats.intersection(other_floats))
+
+    def difference_update(s, items):
+        s = s.copy()
+        s.difference_update(items)
+        return s
+
+    count_operation("int set -= int list",
+                    lambda : difference_update(s_ints, other_ints))
+    count_operation("float set -= float list",
+                    lambda : difference_update(s_floats, other_floats))
+    return s_floats
+
+if __name__ == '__main__':
+    s = bench_set()
+    try:
+        import __pypy__
+    except ImportError:
+        pass
+    else:
+        print __pypy__.strategy(s)
@@ -77,6 +77,9 @@ class W_AbstractBytesObject(W_Root):
     def descr_ge(self, space, w_other):
         """x.__ge__(y) <==> x>=y"""
 
+    def descr_getbuffer(self, space, w_flags):
+        ""
+
     def descr_getitem(self, space, w_index):
         """x.__getitem__(y) <==> x[y]"""
 
@@ -197,6 +200,12 @@ class W_AbstractBytesObject(W_Root):
         Return -1 on failure.
         """
 
+    def descr_formatter_parser(self, space):
+        ""
+
+    def descr_formatter_field_name_split(self, space):
+        ""
+
     def descr_format(self, space, __args__):
         """S.format(*args, **kwargs) -> string
 
@@ -612,31 +621,55 @@ class W_BytesObject(W_AbstractBytesObject):
         return mod_format(space, w_values, self, do_unicode=False)
 
     def descr_eq(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value == w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value == w_other._value)
 
     def descr_ne(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value != w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value != w_other._value)
 
     def descr_lt(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value < w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value < w_other._value)
 
     def descr_le(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value <= w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value <= w_other._value)
 
     def descr_gt(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value > w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value > w_other._value)
 
     def descr_ge(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return space.newbool(self._value >= w_other.force())
         if not isinstance(w_other, W_BytesObject):
             return space.w_NotImplemented
         return space.newbool(self._value >= w_other._value)
@@ -654,6 +687,13 @@ class W_BytesObject(W_AbstractBytesObject):
             from .bytearrayobject import W_BytearrayObject, _make_data
             self_as_bytearray = W_BytearrayObject(_make_data(self._value))
             return space.add(self_as_bytearray, w_other)
+        if (space.config.objspace.std.withstrbuf and
+                isinstance(w_other, W_AbstractBytesObject)):
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            builder = StringBuilder()
+            builder.append(self._value)
+            builder.append(space.bytes_w(w_other))
+            return W_StringBufferObject(builder)
         return self._StringMethods_descr_add(space, w_other)
 
     _StringMethods__startswith = _startswith
@@ -661,7 +701,7 @@ class W_BytesObject(W_AbstractBytesObject):
         if space.isinstance_w(w_prefix, space.w_unicode):
             self_as_unicode = unicode_from_encoded_object(space, self, None,
                                                           None)
-            return self_as_unicode._startswith(space, self_as_unicode._value,
+            return self_as_unicode._startswith(space, self_as_unicode._val(space),
                                                w_prefix, start, end)
         return self._StringMethods__startswith(space, value, w_prefix, start,
                                                end)
@@ -671,7 +711,7 @@ class W_BytesObject(W_AbstractBytesObject):
         if space.isinstance_w(w_suffix, space.w_unicode):
             self_as_unicode = unicode_from_encoded_object(space, self, None,
                                                           None)
-            return self_as_unicode._endswith(space, self_as_unicode._value,
+            return self_as_unicode._endswith(space, self_as_unicode._val(space),
                                              w_suffix, start, end)
         return self._StringMethods__endswith(space, value, w_suffix, start,
                                              end)
@@ -679,12 +719,9 @@ class W_BytesObject(W_AbstractBytesObject):
     _StringMethods_descr_contains = descr_contains
     def descr_contains(self, space, w_sub):
         if space.isinstance_w(w_sub, space.w_unicode):
-            from pypy.objspace.std.unicodeobject import W_UnicodeObject
-            assert isinstance(w_sub, W_UnicodeObject)
             self_as_unicode = unicode_from_encoded_object(space, self, None,
                                                           None)
-            return space.newbool(
-                self_as_unicode._value.find(w_sub._value) >= 0)
+            return self_as_unicode.descr_contains(space, w_sub)
         return self._StringMethods_descr_contains(space, w_sub)
 
     _StringMethods_descr_replace = descr_replace
@@ -902,17 +939,18 @@ W_BytesObject.typedef = TypeDef(
     translate = interpindirect2app(W_AbstractBytesObject.descr_translate),
     upper = interpindirect2app(W_AbstractBytesObject.descr_upper),
     zfill = interpindirect2app(W_AbstractBytesObject.descr_zfill),
-    __buffer__ = interp2app(W_BytesObject.descr_getbuffer),
+    __buffer__ = interpindirect2app(W_AbstractBytesObject.descr_getbuffer),
 
-    format = interpindirect2app(W_BytesObject.descr_format),
-    __format__ = interpindirect2app(W_BytesObject.descr__format__),
-    __mod__ = interpindirect2app(W_BytesObject.descr_mod),
-    __rmod__ = interpindirect2app(W_BytesObject.descr_rmod),
+    format = interpindirect2app(W_AbstractBytesObject.descr_format),
+    __format__ = interpindirect2app(W_AbstractBytesObject.descr__format__),
+    __mod__ = interpindirect2app(W_AbstractBytesObject.descr_mod),
+    __rmod__ = interpindirect2app(W_AbstractBytesObject.descr_rmod),
     __getnewargs__ = interpindirect2app(
         W_AbstractBytesObject.descr_getnewargs),
-    _formatter_parser = interp2app(W_BytesObject.descr_formatter_parser),
-    _formatter_field_name_split =
-        interp2app(W_BytesObject.descr_formatter_field_name_split),
+    _formatter_parser =
+        interpindirect2app(W_AbstractBytesObject.descr_formatter_parser),
+    _formatter_field_name_split = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_field_name_split),
 )
 W_BytesObject.typedef.flag_sequence_bug_compat = True
 
@@ -2,6 +2,7 @@
 
 from rpython.rlib import jit, rerased, objectmodel
 from rpython.rlib.debug import mark_dict_non_null
+from rpython.rlib.longlong2float import float2longlong
 from rpython.rlib.objectmodel import newlist_hint, r_dict, specialize
 from rpython.tool.sourcetools import func_renamer, func_with_new_name
 
@@ -12,6 +13,7 @@ from pypy.interpreter.gateway import (
 from pypy.interpreter.mixedmodule import MixedModule
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
+from pypy.objspace.std.tupleobject import W_AbstractTupleObject
 from pypy.objspace.std.util import negate
 
 
@@ -302,6 +304,11 @@ class W_DictMultiObject(W_Root):
         strategy = self.get_strategy()
         strategy.move_to_end(self, w_key, last_flag)
 
+    def nondescr_compact(self, space):
+        """Not exposed directly to app-level, but via __pypy__.dict_compact().
+        """
+        self.get_strategy().compact(self)
+
     def nondescr_popitem_first(self, space):
         """Not exposed directly to app-level, but via __pypy__.popitem_first().
         """
@@ -359,6 +366,12 @@ class W_DictMultiObject(W_Root):
             strategy.switch_to_object_strategy(self)
         return object_strategy
 
+    def ensure_boxed_values(self):    # called by cpyext
+        """Make sure that the values are stored as W_Roots, so that
+        getitem() returns objects that stay alive as long as the dict
+        is alive and not modified."""
+        self.get_strategy().ensure_boxed_values(self)
+
 
 class W_DictObject(W_DictMultiObject):
     """ a regular dict object """
@@ -498,6 +511,9 @@ class DictStrategy(object):
     def get_empty_storage(self):
         raise NotImplementedError
 
+    def ensure_boxed_values(self, w_dict):
+        pass     # the values are already W_Roots in most strategies
+
     @jit.look_inside_iff(lambda self, w_dict:
                          w_dict_unrolling_heuristic(w_dict))
     def w_keys(self, w_dict):
@@ -584,6 +600,9 @@ class DictStrategy(object):
     def prepare_update(self, w_dict, num_extra):
         pass
 
+    def compact(self, w_dict):
+        pass
+
     def move_to_end(self, w_dict, w_key, last_flag):
         # fall-back
         w_value = w_dict.getitem(w_key)
@@ -635,23 +654,35 @@ class EmptyDictStrategy(DictStrategy):
     def get_empty_storage(self):
         return self.erase(None)
 
-    def switch_to_correct_strategy(self, w_dict, w_key):
+    def switch_to_correct_strategy(self, w_dict, w_key, w_value=None):
         if type(w_key) is self.space.StringObjectCls:
-            self.switch_to_bytes_strategy(w_dict)
+            self.switch_to_bytes_strategy(w_dict, w_value)
             return
         elif type(w_key) is self.space.UnicodeObjectCls:
             self.switch_to_unicode_strategy(w_dict)
             return
         w_type = self.space.type(w_key)
         if self.space.is_w(w_type, self.space.w_int):
-            self.switch_to_int_strategy(w_dict)
+            self.switch_to_int_strategy(w_dict, w_value)
+        elif self.space.is_w(w_type, self.space.w_float):
+            self.switch_to_float_strategy(w_dict)
+        elif self.space.is_w(w_type, self.space.w_tuple):
+            self.switch_to_tuple_strategy(w_dict, w_key)
         elif w_type.compares_by_identity():
             self.switch_to_identity_strategy(w_dict)
         else:
             self.switch_to_object_strategy(w_dict)
 
-    def switch_to_bytes_strategy(self, w_dict):
-        strategy = self.space.fromcache(BytesDictStrategy)
+    def switch_to_bytes_strategy(self, w_dict, w_value=None):
+        # if the first value is an int or a float, start with a strategy
+        # that stores the values unboxed too
+        space = self.space
+        if _is_int_value(space, w_value):
+            strategy = space.fromcache(BytesIntDictStrategy)
+        elif _is_float_value(space, w_value):
+            strategy = space.fromcache(BytesFloatDictStrategy)
+        else:
+            strategy = space.fromcache(BytesDictStrategy)
         storage = strategy.get_empty_storage()
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
@@ -662,8 +693,29 @@ class EmptyDictStrategy(DictStrategy):
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
 
-    def switch_to_int_strategy(self, w_dict):
-        strategy = self.space.fromcache(IntDictStrategy)
+    def switch_to_int_strategy(self, w_dict, w_value=None):
+        space = self.space
+        if _is_int_value(space, w_value):
+            strategy = space.fromcache(IntIntDictStrategy)
+        else:
+            strategy = space.fromcache(IntDictStrategy)
+        storage = strategy.get_empty_storage()
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
+
+    def switch_to_float_strategy(self, w_dict):
+        strategy = self.space.fromcache(FloatDictStrategy)
+        storage = strategy.get_empty_storage()
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
+
+    def switch_to_tuple_strategy(self, w_dict, w_key):
+        space = self.space
+        strategy = space.fromcache(IntPairDictStrategy)
+        if not strategy.is_correct_type(w_key):
+            strategy = space.fromcache(BytesIntPairDictStrategy)
+            if not strategy.is_correct_type(w_key):
+                strategy = space.fromcache(ObjectDictStrategy)
         storage = strategy.get_empty_storage()
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
@@ -694,16 +746,16 @@ class EmptyDictStrategy(DictStrategy):
 
     def setdefault(self, w_dict, w_key, w_default):
         # here the dict is always empty
-        self.switch_to_correct_strategy(w_dict, w_key)
+        self.switch_to_correct_strategy(w_dict, w_key, w_default)
         w_dict.setitem(w_key, w_default)
         return w_default
 
     def setitem(self, w_dict, w_key, w_value):
-        self.switch_to_correct_strategy(w_dict, w_key)
+        self.switch_to_correct_strategy(w_dict, w_key, w_value)
         w_dict.setitem(w_key, w_value)
 
     def setitem_str(self, w_dict, key, w_value):
-        self.switch_to_bytes_strategy(w_dict)
+        self.switch_to_bytes_strategy(w_dict, w_value)
         w_dict.setitem_str(key, w_value)
 
     def delitem(self, w_dict, w_key):
@@ -1091,6 +1143,9 @@ class AbstractTypedStrategy(object):
         objectmodel.prepare_dict_update(self.unerase(w_dict.dstorage),
                                         num_extra)
 
+    def compact(self, w_dict):
+        objectmodel.dict_compact(self.unerase(w_dict.dstorage))
+
     def setitem_untyped(self, dstorage, key, w_value, keyhash):
         d = self.unerase(dstorage)
         objectmodel.setitem_with_hash(d, key, keyhash, w_value)
@@ -1304,6 +1359,411 @@ class IntDictStrategy(AbstractTypedStrategy, DictStrategy):
 create_iterator_classes(IntDictStrategy)
 
 
+def _is_int_value(space, w_value):
+    return (w_value is not None and
+            space.is_w(space.type(w_value), space.w_int))
+
+def _is_float_value(space, w_value):
+    return (w_value is not None and
+            space.is_w(space.type(w_value), space.w_float))
+
+
+class AbstractUnboxedValuesStrategy(AbstractTypedStrategy):
+    """Strategies that store the values unboxed too, as long as they are
+    all ints or all floats.  Storing another value switches to the
+    strategy returned by get_boxed_strategy(), which has the same keys;
+    like the list strategies, we never switch back.  The unboxed values
+    are not W_Roots, so all the methods returning values must wrap them.
+    """
+    _mixin_ = True
+
+    def get_boxed_strategy(self):
+        raise NotImplementedError("abstract base class")
+
+    def ensure_boxed_values(self, w_dict):
+        self.switch_to_boxed_strategy(w_dict)
+
+    def is_correct_value(self, w_value):
+        raise NotImplementedError("abstract base class")
+
+    def wrap_value(self, value):
+        raise NotImplementedError("abstract base class")
+
+    def unwrap_value(self, w_value):
+        raise NotImplementedError("abstract base class")
+
+    def setitem(self, w_dict, w_key, w_value):
+        if self.is_correct_type(w_key):
+            if self.is_correct_value(w_value):
+                d = self.unerase(w_dict.dstorage)
+                d[self.unwrap(w_key)] = self.unwrap_value(w_value)
+                return
+            self.switch_to_boxed_strategy(w_dict)
+        else:
+            self.switch_to_object_strategy(w_dict)
+        w_dict.setitem(w_key, w_value)
+
+    def setdefault(self, w_dict, w_key, w_default):
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_dict.dstorage)
+            key = self.unwrap(w_key)
+            if self.is_correct_value(w_default):
+                value = d.setdefault(key, self.unwrap_value(w_default))
+                return self.wrap_value(value)
+            if key in d:
+                return self.wrap_value(d[key])
+            self.switch_to_boxed_strategy(w_dict)
+        else:
+            self.switch_to_object_strategy(w_dict)
+        return w_dict.setdefault(w_key, w_default)
+
+    def getitem(self, w_dict, w_key):
+        space = self.space
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_dict.dstorage)
+            key = self.unwrap(w_key)
+            # the JIT removes the second lookup
+            if key in d:
+                return self.wrap_value(d[key])
+            return None
+        elif self._never_equal_to(space.type(w_key)):
+            return None
+        else:
+            self.switch_to_object_strategy(w_dict)
+            return w_dict.getitem(w_key)
+
+    def values(self, w_dict):
+        return [self.wrap_value(value)
+                for value in self.unerase(w_dict.dstorage).itervalues()]
+
+    def items(self, w_dict):
+        space = self.space
+        d = self.unerase(w_dict.dstorage)
+        return [space.newtuple([self.wrap(key), self.wrap_value(value)])
+                for (key, value) in d.iteritems()]
+
+    def popitem(self, w_dict):
+        key, value = self.unerase(w_dict.dstorage).popitem()
+        return (self.wrap(key), self.wrap_value(value))
+
+    def pop(self, w_dict, w_key, w_default):
+        space = self.space
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_dict.dstorage)
+            key = self.unwrap(w_key)
+            if key in d:
+                return self.wrap_value(d.pop(key))
+        elif not self._never_equal_to(space.type(w_key)):
+            self.switch_to_object_strategy(w_dict)
+            return w_dict.get_strategy().pop(w_dict, w_key, w_default)
+        if w_default is not None:
+            return w_default
+        raise KeyError
+
+    def switch_to_boxed_strategy(self, w_dict):
+        d = self.unerase(w_dict.dstorage)
+        strategy = self.get_boxed_strategy()
+        d_new = strategy.unerase(strategy.get_empty_storage())
+        for key, value in d.iteritems():
+            d_new[key] = self.wrap_value(value)
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = strategy.erase(d_new)
+
+    def switch_to_object_strategy(self, w_dict):
+        d = self.unerase(w_dict.dstorage)
+        strategy = self.space.fromcache(ObjectDictStrategy)
+        d_new = strategy.unerase(strategy.get_empty_storage())
+        for key, value in d.iteritems():
+            d_new[self.wrap(key)] = self.wrap_value(value)
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = strategy.erase(d_new)
+
+
+class AbstractBytesKeysUnboxedValuesStrategy(AbstractUnboxedValuesStrategy):
+    """The keys are handled like in BytesDictStrategy."""
+    _mixin_ = True
+
+    def wrap(self, unwrapped):
+        return self.space.newbytes(unwrapped)
+
+    def unwrap(self, wrapped):
+        return self.space.bytes_w(wrapped)
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_bytes)
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def _never_equal_to(self, w_lookup_type):
+        return _never_equal_to_string(self.space, w_lookup_type)
+
+    def get_boxed_strategy(self):
+        return self.space.fromcache(BytesDictStrategy)
+
+    def setitem_str(self, w_dict, key, w_value):
+        assert key is not None
+        if self.is_correct_value(w_value):
+            self.unerase(w_dict.dstorage)[key] = self.unwrap_value(w_value)
+        else:
+            self.switch_to_boxed_strategy(w_dict)
+            w_dict.setitem_str(key, w_value)
+
+    def getitem(self, w_dict, w_key):
+        space = self.space
+        # -- This is called extremely often.  Hack for performance --
+        if type(w_key) is space.StringObjectCls:
+            return self.getitem_str(w_dict, w_key.unwrap(space))
+        # -- End of performance hack --
+        return AbstractUnboxedValuesStrategy.getitem(self, w_dict, w_key)
+
+    def getitem_str(self, w_dict, key):
+        assert key is not None
+        d = self.unerase(w_dict.dstorage)
+        if key in d:
+            return self.wrap_value(d[key])
+        return None
+
+    def listview_bytes(self, w_dict):
+        return self.unerase(w_dict.dstorage).keys()
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_bytes(self.listview_bytes(w_dict))
+
+    def wrapkey(space, key):
+        return space.newbytes(key)
+
+
+class BytesIntDictStrategy(AbstractBytesKeysUnboxedValuesStrategy,
+                           DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("bytesint")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def is_correct_value(self, w_value):
+        return _is_int_value(self.space, w_value)
+
+    def wrap_value(self, value):
+        return self.space.newint(value)
+
+    def unwrap_value(self, w_value):
+        return self.space.int_w(w_value)
+
+    def wrapvalue(space, value):
+        return space.newint(value)
+
+create_iterator_classes(BytesIntDictStrategy)
+
+
+class BytesFloatDictStrategy(AbstractBytesKeysUnboxedValuesStrategy,
+                             DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("bytesfloat")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def is_correct_value(self, w_value):
+        return _is_float_value(self.space, w_value)
+
+    def wrap_value(self, value):
+        return self.space.newfloat(value)
+
+    def unwrap_value(self, w_value):
+        return self.space.float_w(w_value)
+
+    def wrapvalue(space, value):
+        return space.newfloat(value)
+
+create_iterator_classes(BytesFloatDictStrategy)
+
+
+class IntIntDictStrategy(AbstractUnboxedValuesStrategy, DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("intint")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, unwrapped):
+        return self.space.newint(unwrapped)
+
+    def unwrap(self, wrapped):
+        return self.space.int_w(wrapped)
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_int)
+
+    def _never_equal_to(self, w_lookup_type):
+        space = self.space
+        return (space.is_w(w_lookup_type, space.w_NoneType) or
+                space.is_w(w_lookup_type, space.w_bytes) or
+                space.is_w(w_lookup_type, space.w_unicode)
+                )
+
+    def get_boxed_strategy(self):
+        return self.space.fromcache(IntDictStrategy)
+
+    def is_correct_value(self, w_value):
+        return _is_int_value(self.space, w_value)
+
+    def wrap_value(self, value):
+        return self.space.newint(value)
+
+    def unwrap_value(self, w_value):
+        return self.space.int_w(w_value)
+
+    def listview_int(self, w_dict):
+        return self.unerase(w_dict.dstorage).keys()
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_int(self.listview_int(w_dict))
+
+    def wrapkey(space, key):
+        return space.newint(key)
+
+    def wrapvalue(space, value):
+        return space.newint(value)
+
+create_iterator_classes(IntIntDictStrategy)
+
+
+def _float_key_eq(x, y):
+    # like the keys of an ObjectDictStrategy, which are compared with 'is'
+    # before '==': a NaN is equal to itself, as 'is' compares floats by
+    # their bits
+    return x == y or float2longlong(x) == float2longlong(y)
+
+def _float_key_hash(x):
+    # only needs to be consistent with _float_key_eq(): -0.0 and 0.0 have
+    # the same hash, and so have all the NaNs
+    return objectmodel.compute_hash(x)
+
+
+class FloatDictStrategy(AbstractTypedStrategy, DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, unwrapped):
+        return self.space.newfloat(unwrapped)
+
+    def unwrap(self, wrapped):
+        return self.space.float_w(wrapped)
+
+    def get_empty_storage(self):
+        new_dict = r_dict(_float_key_eq, _float_key_hash)
+        return self.erase(new_dict)
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_float)
+
+    def _never_equal_to(self, w_lookup_type):
+        space = self.space
+        return (space.is_w(w_lookup_type, space.w_NoneType) or
+                space.is_w(w_lookup_type, space.w_bytes) or
+                space.is_w(w_lookup_type, space.w_unicode)
+                )
+
+    def wrapkey(space, key):
+        return space.newfloat(key)
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_float(self.unerase(w_dict.dstorage).keys())
+
+create_iterator_classes(FloatDictStrategy)
+
+
+class AbstractPairDictStrategy(AbstractTypedStrategy):
+    """Keys that are tuples of two items, stored unboxed as RPython
+    tuples.  The concrete classes say which types the items have, and the
+    second item is always an int."""
+    _mixin_ = True
+
+    def is_correct_item0(self, w_item):
+        raise NotImplementedError("abstract base class")
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        if not space.is_w(space.type(w_obj), space.w_tuple):
+            return False
+        assert isinstance(w_obj, W_AbstractTupleObject)
+        if w_obj.length() != 2:
+            return False
+        w_item1 = w_obj.getitem(space, 1)
+        return (self.is_correct_item0(w_obj.getitem(space, 0)) and
+                space.is_w(space.type(w_item1), space.w_int))
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def _never_equal_to(self, w_lookup_type):
+        space = self.space
+        return (space.is_w(w_lookup_type, space.w_NoneType) or
+                space.is_w(w_lookup_type, space.w_int) or
+                space.is_w(w_lookup_type, space.w_bool) or
+                space.is_w(w_lookup_type, space.w_float) or
+                space.is_w(w_lookup_type, space.w_bytes) or
+                space.is_w(w_lookup_type, space.w_unicode)
+                )
+
+
+class IntPairDictStrategy(AbstractPairDictStrategy, DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("intpair")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def is_correct_item0(self, w_item):
+        space = self.space
+        return space.is_w(space.type(w_item), space.w_int)
+
+    def wrap(self, unwrapped):
+        space = self.space
+        x, y = unwrapped
+        return space.newtuple([space.newint(x), space.newint(y)])
+
+    def unwrap(self, wrapped):
+        space = self.space
+        assert isinstance(wrapped, W_AbstractTupleObject)
+        return (space.int_w(wrapped.getitem(space, 0)),
+                space.int_w(wrapped.getitem(space, 1)))
+
+    def wrapkey(space, key):
+        x, y = key
+        return space.newtuple([space.newint(x), space.newint(y)])
+
+create_iterator_classes(IntPairDictStrategy)
+
+
+class BytesIntPairDictStrategy(AbstractPairDictStrategy, DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("bytesintpair")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def is_correct_item0(self, w_item):
+        space = self.space
+        return space.is_w(space.type(w_item), space.w_bytes)
+
+    def wrap(self, unwrapped):
+        space = self.space
+        s, y = unwrapped
+        return space.newtuple([space.newbytes(s), space.newint(y)])
+
+    def unwrap(self, wrapped):
+        space = self.space
+        assert isinstance(wrapped, W_AbstractTupleObject)
+        return (space.bytes_w(wrapped.getitem(space, 0)),
+                space.int_w(wrapped.getitem(space, 1)))
+
+    def wrapkey(space, key):
+        s, y = key
+        return space.newtuple([space.newbytes(s), space.newint(y)])
+
+create_iterator_classes(BytesIntPairDictStrategy)
+
+
 def update1(space, w_dict, w_data):
     if isinstance(w_data, W_DictMultiObject):    # optimization case only
         update1_dict_dict(space, w_dict, w_data)
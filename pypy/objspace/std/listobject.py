@@ -419,6 +419,40 @@ class W_ListObject(W_Root):
         argument reverse. Argument must be unwrapped."""
         self.strategy.sort(self, reverse)
 
+    def topk(self, k, w_key, reverse):
+        """Returns a new list with the k smallest items, sorted; or the k
+        largest ones in decreasing order if reverse is true.  The result
+        is the same as sorted(self, key=w_key, reverse=reverse)[:k], but
+        it is computed with a bounded heap that works directly on the
+        unwrapped storage of the list.  The key function, if any, is
+        called once per item."""
+        space = self.space
+        if k <= 0:
+            return W_ListObject(space, [])
+        if space.is_none(w_key):
+            return self.strategy.topk(self, k, reverse)
+        items_w = self.getitems_copy()
+        keys_w = [space.call_function(w_key, w_item) for w_item in items_w]
+        if k < len(items_w):
+            # select on the list of keys, which gets its own strategy
+            w_keys = W_ListObject(space, keys_w)
+            indices = w_keys.strategy.topk_indices(w_keys, k, reverse)
+        else:
+            indices = range(len(items_w))
+        sorter = CustomKeySort([KeyContainer(keys_w[i], items_w[i])
+                                for i in indices])
+        sorter.space = space
+        if reverse:
+            sorter.list.reverse()
+        sorter.sort()
+        if reverse:
+            sorter.list.reverse()
+        result_w = []
+        for w_obj in sorter.list:
+            assert isinstance(w_obj, KeyContainer)
+            result_w.append(w_obj.w_item)
+        return W_ListObject(space, result_w)
+
     # exposed to app-level
 
     @staticmethod
@@ -891,6 +925,17 @@ class ListStrategy(object):
     def sort(self, w_list, reverse):
         raise NotImplementedError
 
+    def topk(self, w_list, k, reverse):
+        """See W_ListObject.topk().  Requires k > 0."""
+        sorter = _simple_sorter(self.space, w_list.getitems_copy())
+        return W_ListObject(self.space, _topk(sorter, k, reverse))
+
+    def topk_indices(self, w_list, k, reverse):
+        """Returns the indices of the items that topk() would return, in
+        increasing order.  Requires 0 < k < length."""
+        sorter = _simple_sorter(self.space, w_list.getitems_copy())
+        return _topk_indices(sorter, k, reverse)
+
     def is_empty_strategy(self):
         return False
 
@@ -1362,6 +1407,16 @@ class AbstractUnwrappedStrategy(object):
             return self.erase([])
         return self.erase(newlist_hint(sizehint))
 
+    def topk(self, w_list, k, reverse):
+        l = self.unerase(w_list.lstorage)
+        l = _topk(self._topk_sorter(l), k, reverse)
+        return W_ListObject.from_storage_and_strategy(
+                self.space, self.erase(l), self)
+
+    def topk_indices(self, w_list, k, reverse):
+        l = self.unerase(w_list.lstorage)
+        return _topk_indices(self._topk_sorter(l), k, reverse)
+
     def clone(self, w_list):
         l = self.unerase(w_list.lstorage)
         storage = self.erase(l[:])
@@ -1657,6 +1712,11 @@ class ObjectListStrategy(ListStrategy):
     # no sort() method here: W_ListObject.descr_sort() handles this
     # case explicitly
 
+    def _topk_sorter(self, l):
+        # work on a copy: the comparisons can call app-level code that
+        # modifies the list
+        return _simple_sorter(self.space, l[:])
+
 
 class IntegerListStrategy(ListStrategy):
     import_from_mixin(AbstractUnwrappedStrategy)
@@ -1679,6 +1739,9 @@ class IntegerListStrategy(ListStrategy):
     def list_is_correct_type(self, w_list):
         return w_list.strategy is self.space.fromcache(IntegerListStrategy)
 
+    def _topk_sorter(self, l):
+        return IntSort(l, len(l))
+
     def sort(self, w_list, reverse):
         l = self.unerase(w_list.lstorage)
         sorter = IntSort(l, len(l))
@@ -1775,6 +1838,9 @@ class FloatListStrategy(ListStrategy):
     def list_is_correct_type(self, w_list):
         return w_list.strategy is self.space.fromcache(FloatListStrategy)
 
+    def _topk_sorter(self, l):
+        return FloatSort(l, len(l))
+
     def sort(self, w_list, reverse):
         l = self.unerase(w_list.lstorage)
         sorter = FloatSort(l, len(l))
@@ -1899,6 +1965,9 @@ class IntOrFloatListStrategy(ListStrategy):
     def list_is_correct_type(self, w_list):
         return w_list.strategy is self.space.fromcache(IntOrFloatListStrategy)
 
+    def _topk_sorter(self, l):
+        return IntOrFloatSort(l, len(l))
+
     def sort(self, w_list, reverse):
         l = self.unerase(w_list.lstorage)
         sorter = IntOrFloatSort(l, len(l))
@@ -1992,6 +2061,9 @@ class BytesListStrategy(ListStrategy):
     def list_is_correct_type(self, w_list):
         return w_list.strategy is self.space.fromcache(BytesListStrategy)
 
+    def _topk_sorter(self, l):
+        return StringSort(l, len(l))
+
     def sort(self, w_list, reverse):
         l = self.unerase(w_list.lstorage)
         sorter = StringSort(l, len(l))
@@ -2025,6 +2097,9 @@ class UnicodeListStrategy(ListStrategy):
     def list_is_correct_type(self, w_list):
         return w_list.strategy is self.space.fromcache(UnicodeListStrategy)
 
+    def _topk_sorter(self, l):
+        return UnicodeSort(l, len(l))
+
     def sort(self, w_list, reverse):
         l = self.unerase(w_list.lstorage)
         sorter = UnicodeSort(l, len(l))
@@ -2076,6 +2151,94 @@ class KeyContainer(W_Root):
         self.w_item = w_item
 
 
+def _simple_sorter(space, list_w):
+    sorter = SimpleSort(list_w, len(list_w))
+    sorter.space = space
+    return sorter
+
+@specialize.argtype(0)
+def _topk(sorter, k, reverse):
+    """Returns a new list with the k first items of the sorted
+    sorter.list, see W_ListObject.topk().  Requires k > 0."""
+    l = sorter.list
+    if k < sorter.listlength:
+        l = [l[i] for i in _topk_indices(sorter, k, reverse)]
+    else:
+        l = l[:sorter.listlength]
+    sorter.list = l
+    sorter.listlength = len(l)
+    if reverse:
+        l.reverse()
+    sorter.sort()
+    if reverse:
+        l.reverse()
+    return l
+
+@specialize.argtype(0)
+def _topk_lt(sorter, a, b, reverse):
+    if reverse:
+        return sorter.lt(b, a)
+    return sorter.lt(a, b)
+
+@specialize.argtype(0)
+def _topk_siftdown(sorter, heap, pos, reverse):
+    # 'heap' keeps the worst of its items at position 0
+    size = len(heap)
+    item = heap[pos]
+    child = 2 * pos + 1
+    while child < size:
+        right = child + 1
+        if right < size and _topk_lt(sorter, heap[child], heap[right],
+                                     reverse):
+            child = right
+        if not _topk_lt(sorter, item, heap[child], reverse):
+            break
+        heap[pos] = heap[child]
+        pos = child
+        child = 2 * pos + 1
+    heap[pos] = item
+
+@specialize.argtype(0)
+def _topk_indices(sorter, k, reverse):
+    """Returns the indices of the k smallest items of sorter.list (or of
+    the k largest if 'reverse'), in increasing order.  Among items that
+    compare equal, the leftmost ones are taken, like a stable sort
+    does.  Requires 0 < k < sorter.listlength."""
+    l = sorter.list
+    length = sorter.listlength
+    # first pass: a bounded heap of the k best items seen so far, to
+    # find the k-th one
+    heap = l[:k]
+    for i in range(k // 2 - 1, -1, -1):
+        _topk_siftdown(sorter, heap, i, reverse)
+    for i in range(k, length):
+        item = l[i]
+        if _topk_lt(sorter, item, heap[0], reverse):
+            heap[0] = item
+            _topk_siftdown(sorter, heap, 0, reverse)
+    pivot = heap[0]
+    # all the items better than the k-th one are in the heap; the rest
+    # of the result is made of the leftmost items equal to it
+    num_equal = 0
+    for item in heap:
+        if not _topk_lt(sorter, item, pivot, reverse):
+            num_equal += 1
+    # second pass: collect the indices
+    indices = []
+    for i in range(length):
+        item = l[i]
+        if _topk_lt(sorter, item, pivot, reverse):
+            indices.append(i)
+        elif num_equal > 0 and not _topk_lt(sorter, pivot, item, reverse):
+            indices.append(i)
+            num_equal -= 1
+        else:
+            continue
+        if len(indices) == k:
+            break
+    return indices
+
+
 # NOTE: all the subclasses of TimSort should inherit from a common subclass,
 #       so make sure that only SimpleSort inherits directly from TimSort.
 #       This is necessary to hide the parent method TimSort.lt() from the
@@ -366,6 +366,12 @@ class StdObjSpace(ObjSpace):
         assert isinstance(uni, unicode)
         return W_UnicodeObject(uni)
 
+    def newlatin1(self, s):
+        """Return the unicode object with the characters of the byte
+        string 's', i.e. 's' decoded as latin-1, without copying it."""
+        assert isinstance(s, str)
+        return W_UnicodeObject.from_latin1(s)
+
     def type(self, w_obj):
         jit.promote(w_obj.__class__)
         return w_obj.getclass(self)
@@ -524,8 +530,8 @@ class StdObjSpace(ObjSpace):
     def listview_float(self, w_obj):
         if type(w_obj) is W_ListObject:
             return w_obj.getitems_float()
-        # dict and set don't have FloatStrategy, so we can just ignore them
-        # for now
+        if type(w_obj) is W_SetObject or type(w_obj) is W_FrozensetObject:
+            return w_obj.listview_float()
         if isinstance(w_obj, W_ListObject) and self._uses_list_iter(w_obj):
             return w_obj.getitems_float()
         return None
@@ -4,13 +4,17 @@ from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
 from pypy.objspace.std.bytesobject import W_BytesObject
+from pypy.objspace.std.dictmultiobject import _float_key_eq, _float_key_hash
+from pypy.objspace.std.floatobject import W_FloatObject
 from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.listobject import W_ListObject, BaseRangeListStrategy
 from pypy.objspace.std.unicodeobject import W_UnicodeObject
 from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT
 
 from rpython.rlib.objectmodel import r_dict
 from rpython.rlib.objectmodel import iterkeys_with_hash, contains_with_hash
 from rpython.rlib.objectmodel import setitem_with_hash, delitem_with_hash
+from rpython.rlib.objectmodel import prepare_dict_update
 from rpython.rlib.rarithmetic import intmask, r_uint
 from rpython.rlib import rerased, jit
 
@@ -94,6 +98,10 @@ class W_BaseSetObject(W_Root):
         """ If this is an int set return its contents as a list of uwnrapped ints. Otherwise return None. """
         return self.strategy.listview_int(self)
 
+    def listview_float(self):
+        """ If this is a float set return its contents as a list of uwnrapped floats. Otherwise return None. """
+        return self.strategy.listview_float(self)
+
     def get_storage_copy(self):
         """ Returns a copy of the storage. Needed when we want to clone all elements from one set and
         put them into another. """
@@ -337,7 +345,8 @@ class W_BaseSetObject(W_Root):
             w_other = others_w[i]
             if isinstance(w_other, W_BaseSetObject):
                 result.intersect_update(w_other)
-            else:
+            elif not result.strategy.intersect_update_from_list(result,
+                                                                w_other):
                 w_other_as_set = self._newobj(space, w_other)
                 result.intersect_update(w_other_as_set)
         return result
@@ -427,7 +436,8 @@ class W_BaseSetObject(W_Root):
         for w_other in others_w:
             if isinstance(w_other, W_BaseSetObject):
                 self.difference_update(w_other)
-            else:
+            elif not self.strategy.difference_update_from_list(self,
+                                                               w_other):
                 w_other_as_set = self._newobj(space, w_other)
                 self.difference_update(w_other_as_set)
 
@@ -696,6 +706,20 @@ class SetStrategy(object):
     def listview_int(self, w_set):
         return None
 
+    def listview_float(self, w_set):
+        return None
+
+    def difference_update_from_list(self, w_set, w_iterable):
+        """ Removes the items of w_iterable if it can be seen as a list
+        of items unwrapped like the ones of this strategy (see
+        space.listview_int() & co.).  Returns False if it can't. """
+        return False
+
+    def intersect_update_from_list(self, w_set, w_iterable):
+        """ Like difference_update_from_list(), but keeps only the items
+        that are also in w_iterable. """
+        return False
+
     #def erase(self, storage):
     #    raise NotImplementedError
 
@@ -793,6 +817,8 @@ class EmptySetStrategy(SetStrategy):
     def add(self, w_set, w_key):
         if type(w_key) is W_IntObject:
             strategy = self.space.fromcache(IntegerSetStrategy)
+        elif type(w_key) is W_FloatObject:
+            strategy = self.space.fromcache(FloatSetStrategy)
         elif type(w_key) is W_BytesObject:
             strategy = self.space.fromcache(BytesSetStrategy)
         elif type(w_key) is W_UnicodeObject:
@@ -888,10 +914,41 @@ class AbstractUnwrappedSetStrategy(object):
             jit.loop_unrolling_heuristic(items, len(items), UNROLL_CUTOFF))
     def get_storage_from_unwrapped_list(self, items):
         setdata = self.get_empty_dict()
+        prepare_dict_update(setdata, len(items))
         for item in items:
             setdata[item] = None
         return self.erase(setdata)
 
+    def listview_same_type(self, w_iterable):
+        """ Returns the items of w_iterable unwrapped like the keys of this
+        strategy, if it is possible without iterating over w_iterable,
+        or None. """
+        return None
+
+    def difference_update_from_list(self, w_set, w_iterable):
+        items = self.listview_same_type(w_iterable)
+        if items is None:
+            return False
+        d = self.unerase(w_set.sstorage)
+        for item in items:
+            try:
+                del d[item]
+            except KeyError:
+                pass
+        return True
+
+    def intersect_update_from_list(self, w_set, w_iterable):
+        items = self.listview_same_type(w_iterable)
+        if items is None:
+            return False
+        d = self.unerase(w_set.sstorage)
+        result = self.get_empty_dict()
+        for item in items:
+            if item in d:
+                result[item] = None
+        w_set.sstorage = self.erase(result)
+        return True
+
     def length(self, w_set):
         return len(self.unerase(w_set.sstorage))
 
@@ -1236,12 +1293,17 @@ class BytesSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def listview_bytes(self, w_set):
         return self.unerase(w_set.sstorage).keys()
 
+    def listview_same_type(self, w_iterable):
+        return self.space.listview_bytes(w_iterable)
+
     def is_correct_type(self, w_key):
         return type(w_key) is W_BytesObject
 
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(FloatSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
@@ -1275,12 +1337,17 @@ class UnicodeSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def listview_unicode(self, w_set):
         return self.unerase(w_set.sstorage).keys()
 
+    def listview_same_type(self, w_iterable):
+        return self.space.listview_unicode(w_iterable)
+
     def is_correct_type(self, w_key):
         return type(w_key) is W_UnicodeObject
 
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(FloatSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
@@ -1314,6 +1381,18 @@ class IntegerSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def listview_int(self, w_set):
         return self.unerase(w_set.sstorage).keys()
 
+    def listview_same_type(self, w_iterable):
+        return self.space.listview_int(w_iterable)
+
+    def get_storage_from_range(self, start, step, length):
+        setdata = self.get_empty_dict()
+        prepare_dict_update(setdata, length)
+        item = start
+        for i in range(length):
+            setdata[item] = None
+            item += step
+        return self.erase(setdata)
+
     def is_correct_type(self, w_key):
         return type(w_key) is W_IntObject
 
@@ -1338,6 +1417,51 @@ class IntegerSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
         return IntegerIteratorImplementation(self.space, self, w_set)
 
 
+class FloatSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
+    erase, unerase = rerased.new_erasing_pair("float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    intersect_jmp = jit.JitDriver(greens = [], reds = 'auto',
+                                  name='set(float).intersect')
+
+    def get_empty_storage(self):
+        return self.erase(self.get_empty_dict())
+
+    def get_empty_dict(self):
+        # same as FloatDictStrategy: a NaN is found again by 'is'
+        return r_dict(_float_key_eq, _float_key_hash)
+
+    def listview_float(self, w_set):
+        return self.unerase(w_set.sstorage).keys()
+
+    def listview_same_type(self, w_iterable):
+        return self.space.listview_float(w_iterable)
+
+    def is_correct_type(self, w_key):
+        return type(w_key) is W_FloatObject
+
+    def may_contain_equal_elements(self, strategy):
+        if strategy is self.space.fromcache(BytesSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(UnicodeSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(EmptySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IdentitySetStrategy):
+            return False
+        return True
+
+    def unwrap(self, w_item):
+        return self.space.float_w(w_item)
+
+    def wrap(self, item):
+        return self.space.newfloat(item)
+
+    def iter(self, w_set):
+        return FloatIteratorImplementation(self.space, self, w_set)
+
+
 class ObjectSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     erase, unerase = rerased.new_erasing_pair("object")
     erase = staticmethod(erase)
@@ -1409,6 +1533,8 @@ class IdentitySetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
             return False
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        if strategy is self.space.fromcache(FloatSetStrategy):
+            return False
         if strategy is self.space.fromcache(BytesSetStrategy):
             return False
         if strategy is self.space.fromcache(UnicodeSetStrategy):
@@ -1514,6 +1640,18 @@ class IntegerIteratorImplementation(IteratorImplementation):
         else:
             return None
 
+class FloatIteratorImplementation(IteratorImplementation):
+    def __init__(self, space, strategy, w_set):
+        IteratorImplementation.__init__(self, space, strategy, w_set)
+        d = strategy.unerase(w_set.sstorage)
+        self.iterator = d.iterkeys()
+
+    def next_entry(self):
+        for key in self.iterator:
+            return self.space.newfloat(key)
+        else:
+            return None
+
 class IdentityIteratorImplementation(IteratorImplementation):
     def __init__(self, space, strategy, w_set):
         IteratorImplementation.__init__(self, space, strategy, w_set)
@@ -1598,6 +1736,20 @@ def set_strategy_and_setdata(space, w_set, w_iterable):
         w_set.sstorage = strategy.get_storage_from_unwrapped_list(unicodelist)
         return
 
+    if (type(w_iterable) is W_ListObject and
+            isinstance(w_iterable.strategy, BaseRangeListStrategy)):
+        # set(range(...)): don't build the list of ints first
+        liststrategy = w_iterable.strategy
+        length = liststrategy.length(w_iterable)
+        if length > 0:
+            start = liststrategy._getitem_unwrapped(w_iterable, 0)
+            step = liststrategy.step(w_iterable)
+            strategy = space.fromcache(IntegerSetStrategy)
+            w_set.strategy = strategy
+            w_set.sstorage = strategy.get_storage_from_range(start, step,
+                                                             length)
+            return
+
     intlist = space.listview_int(w_iterable)
     if intlist is not None:
         strategy = space.fromcache(IntegerSetStrategy)
@@ -1605,6 +1757,13 @@ def set_strategy_and_setdata(space, w_set, w_iterable):
         w_set.sstorage = strategy.get_storage_from_unwrapped_list(intlist)
         return
 
+    floatlist = space.listview_float(w_iterable)
+    if floatlist is not None:
+        strategy = space.fromcache(FloatSetStrategy)
+        w_set.strategy = strategy
+        w_set.sstorage = strategy.get_storage_from_unwrapped_list(floatlist)
+        return
+
     length_hint = space.length_hint(w_iterable, 0)
 
     if jit.isconstant(length_hint):
@@ -1626,6 +1785,15 @@ def _pick_correct_strategy_unroll(space, w_set, w_iterable):
         w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
         return
 
+    # check for floats
+    for w_item in iterable_w:
+        if type(w_item) is not W_FloatObject:
+            break
+    else:
+        w_set.strategy = space.fromcache(FloatSetStrategy)
+        w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
+        return
+
     # check for strings
     for w_item in iterable_w:
         if type(w_item) is not W_BytesObject:
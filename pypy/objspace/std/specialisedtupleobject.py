@@ -1,7 +1,8 @@
 from pypy.interpreter.error import oefmt
 from pypy.objspace.std.tupleobject import W_AbstractTupleObject
 from pypy.objspace.std.util import negate
-from rpython.rlib.objectmodel import specialize
+from rpython.rlib.debug import make_sure_not_resized
+from rpython.rlib.objectmodel import compute_hash, specialize
 from rpython.rlib.rarithmetic import intmask
 from rpython.rlib.unroll import unrolling_iterable
 from rpython.tool.sourcetools import func_with_new_name
@@ -159,6 +160,125 @@ def makespecialisedtuple(space, list_w):
     else:
         raise NotSpecialised
 
+# --------------------------------------------------
+# Tuples of any length whose items are all ints, all floats or all
+# bytes, stored unboxed.  They are built by tuple(lst) when the list
+# 'lst' uses the corresponding list strategy.
+
+def _hash_bytes(space, s):
+    # same as W_BytesObject.descr_hash()
+    x = compute_hash(s)
+    x -= (x == -1)
+    return x
+
+def make_homogeneous_class(typ, name):
+    if typ == int:
+        from pypy.objspace.std.intobject import _hash_int
+        wrap = lambda space, x: space.newint(x)
+        hash_item = lambda space, x: _hash_int(x)
+    elif typ == float:
+        from pypy.objspace.std.floatobject import _hash_float
+        wrap = lambda space, x: space.newfloat(x)
+        hash_item = _hash_float
+    elif typ == str:
+        wrap = lambda space, x: space.newbytes(x)
+        hash_item = _hash_bytes
+    else:
+        assert 0
+
+    class cls(W_AbstractTupleObject):
+        _immutable_fields_ = ['items[*]']
+
+        def __init__(self, space, items):
+            make_sure_not_resized(items)
+            self.space = space
+            self.items = items
+
+        def length(self):
+            return len(self.items)
+
+        def tolist(self):
+            items = self.items
+            list_w = [None] * len(items)
+            for i in range(len(items)):
+                list_w[i] = wrap(self.space, items[i])
+            return list_w
+
+        # same source code, but builds and returns a resizable list
+        getitems_copy = func_with_new_name(tolist, 'getitems_copy')
+
+        def descr_hash(self, space):
+            # the same as W_TupleObject.descr_hash(), without the boxes
+            mult = 1000003
+            x = 0x345678
+            z = len(self.items)
+            for item in self.items:
+                y = hash_item(space, item)
+                x = (x ^ y) * mult
+                z -= 1
+                mult += 82520 + z + z
+            x += 97531
+            return space.newint(intmask(x))
+
+        def descr_eq(self, space, w_other):
+            if not isinstance(w_other, W_AbstractTupleObject):
+                return space.w_NotImplemented
+            if not isinstance(w_other, cls):
+                if self.length() != w_other.length():
+                    return space.w_False
+                for i in range(len(self.items)):
+                    w_myval = wrap(space, self.items[i])
+                    if not space.eq_w(w_myval, w_other.getitem(space, i)):
+                        return space.w_False
+                return space.w_True
+            return space.newbool(self._items_eq(w_other.items))
+
+        def _items_eq(self, otheritems):
+            items = self.items
+            if len(items) != len(otheritems):
+                return False
+            for i in range(len(items)):
+                if items[i] != otheritems[i]:
+                    if typ == float:
+                        # NaNs are equal here, like in W_TupleObject
+                        # where eq_w() first checks with is_w()
+                        if (float2longlong(items[i]) ==
+                                float2longlong(otheritems[i])):
+                            continue
+                    return False
+            return True
+
+        descr_ne = negate(descr_eq)
+
+        def getitem(self, space, index):
+            try:
+                return wrap(space, self.items[index])
+            except IndexError:
+                raise oefmt(space.w_IndexError, "tuple index out of range")
+
+    cls.__name__ = name
+    return cls
+
+W_IntTupleObject = make_homogeneous_class(int, 'W_IntTupleObject')
+W_FloatTupleObject = make_homogeneous_class(float, 'W_FloatTupleObject')
+W_BytesTupleObject = make_homogeneous_class(str, 'W_BytesTupleObject')
+
+def make_tuple_from_list(space, w_list):
+    """Returns a homogeneous tuple with the items of the W_ListObject,
+    or None if its strategy is not for ints, floats or bytes."""
+    if w_list.length() == 0:
+        return None
+    intlist = w_list.getitems_int()
+    if intlist is not None:
+        return W_IntTupleObject(space, intlist[:])
+    floatlist = w_list.getitems_float()
+    if floatlist is not None:
+        return W_FloatTupleObject(space, floatlist[:])
+    byteslist = w_list.getitems_bytes()
+    if byteslist is not None:
+        return W_BytesTupleObject(space, byteslist[:])
+    return None
+
 # --------------------------------------------------
 # Special code based on list strategies to implement zip(),
 # here with two list arguments only.  This builds a zipped
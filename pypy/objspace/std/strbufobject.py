@@ -0,0 +1,182 @@
+"""Lazily concatenated strings, enabled with 'withstrbuf'.
+
+With this option, 'a + b' between two str (or unicode) objects returns an
+object that only records the concatenation in a StringBuilder (or
+UnicodeBuilder).  Adding more strings to the result appends them to the
+same builder, so that code doing 's += piece' in a loop is linear even
+when the JIT doesn't see the loop.  The string is built the first time
+anything else is done with the object.
+"""
+
+import py
+
+from rpython.rlib.rstring import StringBuilder, UnicodeBuilder
+
+from pypy.interpreter.error import OperationError
+from pypy.objspace.std.bytesobject import W_AbstractBytesObject, W_BytesObject
+from pypy.objspace.std.unicodeobject import W_UnicodeObject
+
+
+class W_StringBufferObject(W_AbstractBytesObject):
+    w_str = None
+
+    def __init__(self, builder):
+        self.builder = builder             # StringBuilder
+        self.length = builder.getlength()
+
+    def force(self):
+        if self.w_str is None:
+            s = self.builder.build()
+            if self.length < len(s):
+                # other strings were appended to the builder after us
+                s = s[:self.length]
+            self.w_str = W_BytesObject(s)
+            return s
+        else:
+            return self.w_str._value
+
+    def force_w(self):
+        self.force()
+        return self.w_str
+
+    def __repr__(self):
+        """representation for debugging purposes"""
+        return "%s(%r[:%d])" % (
+            self.__class__.__name__, self.builder, self.length)
+
+    def unwrap(self, space):
+        return self.force()
+
+    def str_w(self, space):
+        return self.force()
+
+    charbuf_w = str_w
+
+    def buffer_w(self, space, flags):
+        return self.force_w().buffer_w(space, flags)
+
+    def readbuf_w(self, space):
+        return self.force_w().readbuf_w(space)
+
+    def writebuf_w(self, space):
+        return self.force_w().writebuf_w(space)
+
+    def listview_bytes(self):
+        return self.force_w().listview_bytes()
+
+    def ord(self, space):
+        return self.force_w().ord(space)
+
+    def descr_len(self, space):
+        return space.newint(self.length)
+
+    def descr_add(self, space, w_other):
+        if not isinstance(w_other, W_AbstractBytesObject):
+            # unicode, bytearray, or not supported
+            return self.force_w().descr_add(space, w_other)
+        other = space.bytes_w(w_other)
+        if self.builder.getlength() != self.length:
+            builder = StringBuilder()
+            builder.append(self.force())
+        else:
+            builder = self.builder
+        builder.append(other)
+        return W_StringBufferObject(builder)
+
+    def descr_str(self, space):
+        # you cannot get subclasses of W_StringBufferObject here
+        assert type(self) is W_StringBufferObject
+        return self
+
+
+def _forced(w_obj):
+    if isinstance(w_obj, W_StringBufferObject):
+        return w_obj.force_w()
+    return w_obj
+
+def _make_delegating_method(name):
+    # same signature as in W_AbstractBytesObject, forcing 'self' and the
+    # wrapped arguments
+    import inspect
+    func = getattr(W_AbstractBytesObject, name).im_func
+    argnames, varargs, varkw, defaults = inspect.getargspec(func)
+    assert varargs is None and varkw is None
+    assert argnames[:2] == ['self', 'space']
+    args = []
+    for argname in argnames[2:]:
+        if argname.startswith('w_'):
+            args.append('_forced(%s)' % (argname,))
+        else:
+            args.append(argname)
+    source = py.code.Source("""
+        def %s(%s):
+            return self.force_w().%s(space, %s)
+    """ % (name, inspect.formatargspec(argnames, defaults=defaults)[1:-1],
+           name, ', '.join(args)))
+    d = {'_forced': _forced}
+    exec source.compile() in d
+    return d[name]
+
+for _name in W_AbstractBytesObject.__dict__:
+    if _name.startswith('descr_') and _name not in W_StringBufferObject.__dict__:
+        setattr(W_StringBufferObject, _name, _make_delegating_method(_name))
+del _name
+
+W_StringBufferObject.typedef = W_BytesObject.typedef
+
+
+class W_UnicodeBufferObject(W_UnicodeObject):
+    """The unicode version of W_StringBufferObject.  It is a subclass of
+    W_UnicodeObject whose '_value' and '_latin1' are both None: the
+    methods of W_UnicodeObject only use them through the methods that
+    are overridden here.
+    """
+    forced = None
+
+    def __init__(self, builder):
+        self._value = None
+        self._latin1 = None
+        self.builder = builder             # UnicodeBuilder
+        self.length = builder.getlength()
+
+    @staticmethod
+    def concat(w_self, other):
+        if (isinstance(w_self, W_UnicodeBufferObject) and
+                w_self.builder.getlength() == w_self.length):
+            builder = w_self.builder
+        else:
+            builder = UnicodeBuilder()
+            builder.append(w_self._as_unicode())
+        builder.append(other)
+        return W_UnicodeBufferObject(builder)
+
+    def _as_unicode(self):
+        if self.forced is None:
+            u = self.builder.build()
+            if self.length < len(u):
+                # other strings were appended to the builder after us
+                u = u[:self.length]
+            self.forced = u
+        return self.forced
+
+    def __repr__(self):
+        """representation for debugging purposes"""
+        return "%s(%r[:%d])" % (
+            self.__class__.__name__, self.builder, self.length)
+
+    def _len(self):
+        return self.length
+
+    def _ord_at(self, index):
+        return ord(self._as_unicode()[index])
+
+    def is_w(self, space, w_other):
+        if self.length > 1:
+            # only identical to itself, see immutable_unique_id()
+            return self is w_other
+        return W_UnicodeObject.is_w(self, space, w_other)
+
+    def immutable_unique_id(self, space):
+        if self.length > 1:
+            return None
+        return W_UnicodeObject.immutable_unique_id(self, space)
@@ -32,6 +32,30 @@ class StringMethods(object):
     def _multi_chr(self, c):
         return c
 
+    # Unicode objects whose characters are all latin-1 can store them as a
+    # byte string, see unicodeobject.py.  When both operands are stored
+    # like that, the operations that don't depend on the properties of
+    # the characters are done directly on the byte strings, and their
+    # result is compact too.  For the other types _compact_val() returns
+    # None and these fast paths vanish.
+
+    def _compact_val(self):
+        return None
+
+    @staticmethod
+    def _compact_op_val(w_other):
+        return None
+
+    def _compact_idx_params(self, space, w_sub, w_start, w_end):
+        value = self._compact_val()
+        if value is not None:
+            sub = self._compact_op_val(w_sub)
+            if sub is not None:
+                start, end = unwrap_start_stop(space, len(value), w_start,
+                                               w_end)
+                return (value, sub, start, end)
+        return (None, None, 0, 0)
+
     def descr_len(self, space):
         return space.newint(self._len())
 
@@ -39,6 +63,9 @@ class StringMethods(object):
     #    pass
 
     def descr_contains(self, space, w_sub):
+        value, sub, _, _ = self._compact_idx_params(space, w_sub, None, None)
+        if value is not None:
+            return space.newbool(value.find(sub) >= 0)
         value, start, end, _ = self._convert_idx_params(space, None, None)
         if self._use_rstr_ops(space, w_sub):
             other = self._op_val(space, w_sub)
@@ -55,6 +82,11 @@ class StringMethods(object):
         return space.newbool(res >= 0)
 
     def descr_add(self, space, w_other):
+        value = self._compact_val()
+        if value is not None:
+            other = self._compact_op_val(w_other)
+            if other is not None:
+                return self._new_compact(value + other)
         if self._use_rstr_ops(space, w_other):
             try:
                 other = self._op_val(space, w_other)
@@ -77,6 +109,9 @@ class StringMethods(object):
             raise
         if times <= 0:
             return self._empty()
+        value = self._compact_val()
+        if value is not None:
+            return self._new_compact(value * times)
         if self._len() == 1:
             return self._new(self._multi_chr(self._val(space)[0]) * times)
         return self._new(self._val(space) * times)
@@ -84,7 +119,10 @@ class StringMethods(object):
     descr_rmul = descr_mul
 
     def descr_getitem(self, space, w_index):
+        compact = self._compact_val()
         if isinstance(w_index, W_SliceObject):
+            if compact is not None:
+                return self._compact_getslice(space, compact, w_index)
             selfvalue = self._val(space)
             length = len(selfvalue)
             start, stop, step, sl = w_index.indices4(space, length)
@@ -98,8 +136,25 @@ class StringMethods(object):
                 return self._new_from_list(ret)
 
         index = space.getindex_w(w_index, space.w_IndexError, "string index")
+        if compact is not None:
+            try:
+                character = compact[index]
+            except IndexError:
+                raise oefmt(space.w_IndexError, "string index out of range")
+            return self._new_compact(character)
         return self._getitem_result(space, index)
 
+    def _compact_getslice(self, space, compact, w_slice):
+        start, stop, step, sl = w_slice.indices4(space, len(compact))
+        if sl == 0:
+            return self._empty()
+        elif step == 1:
+            assert start >= 0 and stop >= 0
+            return self._new_compact(compact[start:stop])
+        else:
+            ret = _descr_getslice_slowpath(compact, start, step, sl)
+            return self._new_compact(''.join(ret))
+
     def _getitem_result(self, space, index):
         selfvalue = self._val(space)
         try:
@@ -109,6 +164,13 @@ class StringMethods(object):
         return self._new(character)
 
     def descr_getslice(self, space, w_start, w_stop):
+        compact = self._compact_val()
+        if compact is not None:
+            start, stop = normalize_simple_slice(space, len(compact),
+                                                 w_start, w_stop)
+            if start == stop:
+                return self._empty()
+            return self._new_compact(compact[start:stop])
         selfvalue = self._val(space)
         start, stop = normalize_simple_slice(space, len(selfvalue), w_start,
                                              w_stop)
@@ -147,6 +209,10 @@ class StringMethods(object):
         return self._new(centered)
 
     def descr_count(self, space, w_sub, w_start=None, w_end=None):
+        compact, sub, start, end = self._compact_idx_params(space, w_sub,
+                                                            w_start, w_end)
+        if compact is not None:
+            return space.newint(compact.count(sub, start, end))
         value, start, end, _ = self._convert_idx_params(space, w_start, w_end)
 
         if self._use_rstr_ops(space, w_sub):
@@ -236,6 +302,10 @@ class StringMethods(object):
         return distance
 
     def descr_find(self, space, w_sub, w_start=None, w_end=None):
+        compact, sub, start, end = self._compact_idx_params(space, w_sub,
+                                                            w_start, w_end)
+        if compact is not None:
+            return space.newint(compact.find(sub, start, end))
         value, start, end, ofs = self._convert_idx_params(space, w_start, w_end)
 
         if self._use_rstr_ops(space, w_sub):
@@ -256,6 +326,10 @@ class StringMethods(object):
         return space.newint(res)
 
     def descr_rfind(self, space, w_sub, w_start=None, w_end=None):
+        compact, sub, start, end = self._compact_idx_params(space, w_sub,
+                                                            w_start, w_end)
+        if compact is not None:
+            return space.newint(compact.rfind(sub, start, end))
         value, start, end, ofs = self._convert_idx_params(space, w_start, w_end)
 
         if self._use_rstr_ops(space, w_sub):
@@ -276,6 +350,14 @@ class StringMethods(object):
         return space.newint(res)
 
     def descr_index(self, space, w_sub, w_start=None, w_end=None):
+        compact, sub, start, end = self._compact_idx_params(space, w_sub,
+                                                            w_start, w_end)
+        if compact is not None:
+            res = compact.find(sub, start, end)
+            if res < 0:
+                raise oefmt(space.w_ValueError,
+                            "substring not found in string.index")
+            return space.newint(res)
         value, start, end, ofs = self._convert_idx_params(space, w_start, w_end)
 
         from pypy.objspace.std.bytearrayobject import W_BytearrayObject
@@ -298,6 +380,14 @@ class StringMethods(object):
         return space.newint(res)
 
     def descr_rindex(self, space, w_sub, w_start=None, w_end=None):
+        compact, sub, start, end = self._compact_idx_params(space, w_sub,
+                                                            w_start, w_end)
+        if compact is not None:
+            res = compact.rfind(sub, start, end)
+            if res < 0:
+                raise oefmt(space.w_ValueError,
+                            "substring not found in string.rindex")
+            return space.newint(res)
         value, start, end, ofs = self._convert_idx_params(space, w_start, w_end)
 
         from pypy.objspace.std.bytearrayobject import W_BytearrayObject
@@ -551,6 +641,19 @@ class StringMethods(object):
 
     @unwrap_spec(count=int)
     def descr_replace(self, space, w_old, w_new, count=-1):
+        compact = self._compact_val()
+        if compact is not None:
+            sub = self._compact_op_val(w_old)
+            by = self._compact_op_val(w_new)
+            if sub is not None and by is not None:
+                if count >= 0 and len(compact) == 0:
+                    return self._empty()
+                try:
+                    res = replace(compact, sub, by, count)
+                except OverflowError:
+                    raise oefmt(space.w_OverflowError,
+                                "replace string is too long")
+                return self._new_compact(res)
         input = self._val(space)
 
         sub = self._op_val(space, w_old)
@@ -619,6 +722,13 @@ class StringMethods(object):
         return self._newlist_unwrapped(space, strs)
 
     def descr_startswith(self, space, w_prefix, w_start=None, w_end=None):
+        compact, prefix, start, end = self._compact_idx_params(
+            space, w_prefix, w_start, w_end)
+        if compact is not None:
+            # only unicodes are compact: see _starts_ends_unicode
+            if len(prefix) == 0:
+                return space.w_True
+            return space.newbool(startswith(compact, prefix, start, end))
         value, start, end, _ = self._convert_idx_params(space, w_start, w_end)
         if space.isinstance_w(w_prefix, space.w_tuple):
             return self._startswith_tuple(space, value, w_prefix, start, end)
@@ -645,6 +755,13 @@ class StringMethods(object):
                                   # bytearrays, but overridden for unicodes
 
     def descr_endswith(self, space, w_suffix, w_start=None, w_end=None):
+        compact, suffix, start, end = self._compact_idx_params(
+            space, w_suffix, w_start, w_end)
+        if compact is not None:
+            # only unicodes are compact: see _starts_ends_unicode
+            if len(suffix) == 0:
+                return space.w_True
+            return space.newbool(endswith(compact, suffix, start, end))
         value, start, end, _ = self._convert_idx_params(space, w_start, w_end)
         if space.isinstance_w(w_suffix, space.w_tuple):
             return self._endswith_tuple(space, value, w_suffix, start, end)
@@ -669,6 +786,11 @@ class StringMethods(object):
 
     def _strip(self, space, w_chars, left, right, name='strip'):
         "internal function called by str_xstrip methods"
+        compact = self._compact_val()
+        if compact is not None:
+            chars = self._compact_op_val(w_chars)
+            if chars is not None:
+                return self._compact_strip(compact, chars, left, right)
         value = self._val(space)
         chars = self._op_val(space, w_chars, strict=name)
 
@@ -686,6 +808,21 @@ class StringMethods(object):
         assert rpos >= lpos    # annotator hint, don't remove
         return self._sliced(space, value, lpos, rpos, self)
 
+    def _compact_strip(self, value, chars, left, right):
+        lpos = 0
+        rpos = len(value)
+
+        if left:
+            while lpos < rpos and value[lpos] in chars:
+                lpos += 1
+
+        if right:
+            while rpos > lpos and value[rpos - 1] in chars:
+                rpos -= 1
+
+        assert rpos >= lpos    # annotator hint, don't remove
+        return self._new_compact(value[lpos:rpos])
+
     def _strip_none(self, space, left, right):
         "internal function called by str_xstrip methods"
         value = self._val(space)
@@ -329,6 +329,30 @@ class AppTest_DictObject:
         __pypy__.delitem_if_value_is(d, 2, x3)
         assert d == {3: x3}
 
+    def test_dict_compact(self):
+        import __pypy__
+        def kwdict(**k):
+            return k
+        for d in [dict.fromkeys(range(1000)),
+                  dict.fromkeys(str(i) for i in range(1000)),
+                  dict.fromkeys(float(i) for i in range(1000)),
+                  kwdict(a=1, b=2, c=3, d=4, e=5)]:
+            keys = list(d)
+            for key in keys[:-3]:
+                del d[key]
+            __pypy__.dict_compact(d)
+            assert sorted(d) == sorted(keys[-3:])
+            for key in keys[-3:]:
+                assert d[key] is d.get(key)
+            d[keys[0]] = 42
+            assert sorted(d) == sorted(keys[-3:] + keys[:1])
+            assert d[keys[0]] == 42
+        d = {}
+        __pypy__.dict_compact(d)
+        d[5] = 6
+        assert d == {5: 6}
+        raises(TypeError, __pypy__.dict_compact, [])
+
     def test_move_to_end(self):
         import __pypy__
         raises(KeyError, __pypy__.move_to_end, {}, 'foo')
@@ -1129,7 +1153,7 @@ class AppTestStrategies(object):
     def test_empty_to_string(self):
         d = {}
         assert "EmptyDictStrategy" in self.get_strategy(d)
-        d[b"a"] = 1
+        d[b"a"] = "x"
         assert "BytesDictStrategy" in self.get_strategy(d)
 
         class O(object):
@@ -1137,7 +1161,7 @@ class AppTestStrategies(object):
         o = O()
         d = o.__dict__ = {}
         assert "EmptyDictStrategy" in self.get_strategy(d)
-        o.a = 1
+        o.a = "x"
         assert "BytesDictStrategy" in self.get_strategy(d)
 
     def test_empty_to_unicode(self):
@@ -1157,6 +1181,100 @@ class AppTestStrategies(object):
         assert "IntDictStrategy" in self.get_strategy(d)
         assert d[1L] == "hi"
 
+    def test_empty_to_float(self):
+        d = {}
+        d[1.5] = "a"
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        d[-0.0] = "b"
+        assert d[0.0] == "b"
+        nan = float("nan")
+        d[nan] = "c"
+        assert d[nan] == "c"
+        assert float("nan") in d     # same as "float('nan') is nan"
+        assert d.get(None) is None
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert sorted(d.keys()[:2]) == [-0.0, 1.5]
+        assert type(d.keys()[0]) is float
+        assert d.get(0) == "b"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+
+    def test_empty_to_tuple(self):
+        d = {}
+        d[1, 2] = "a"
+        assert "IntPairDictStrategy" in self.get_strategy(d)
+        d[3, -4] = "b"
+        assert d[(1, 2)] == "a"
+        assert d.get((1, 3)) is None
+        assert d.get(5) is None
+        assert sorted(d) == [(1, 2), (3, -4)]
+        assert type(d.keys()[0]) is tuple
+        assert "IntPairDictStrategy" in self.get_strategy(d)
+        assert d[1.0, 2] == "a"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        #
+        d = {}
+        d["x", 2] = "a"
+        assert "BytesIntPairDictStrategy" in self.get_strategy(d)
+        assert d["x", 2] == "a"
+        del d["x", 2]
+        assert not d
+        d["y", 3] = "b"
+        d[1, 2] = "c"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d == {("y", 3): "b", (1, 2): "c"}
+        #
+        for key in [(1, 2, 3), (1,), (1.5, 2), ("x", "y")]:
+            d = {}
+            d[key] = 1
+            assert "ObjectDictStrategy" in self.get_strategy(d)
+
+    def test_unboxed_values(self):
+        d = {}
+        d["a"] = 1
+        assert "BytesIntDictStrategy" in self.get_strategy(d)
+        d["a"] += 41
+        d["b"] = -5
+        assert d["a"] == 42
+        assert d.get("c") is None
+        assert d.setdefault("b", 0) == -5
+        assert d.setdefault("c", 7) == 7
+        assert sorted(d.values()) == [-5, 7, 42]
+        assert sorted(d.items()) == [("a", 42), ("b", -5), ("c", 7)]
+        assert sorted(d.itervalues()) == [-5, 7, 42]
+        assert d.pop("c") == 7
+        assert d.pop("c", None) is None
+        assert d == {"a": 42, "b": -5}
+        assert "BytesIntDictStrategy" in self.get_strategy(d)
+        assert "BytesIntDictStrategy" in self.get_strategy(d.copy())
+        d["c"] = 1.5
+        assert "BytesDictStrategy" in self.get_strategy(d)
+        assert d == {"a": 42, "b": -5, "c": 1.5}
+        #
+        d = {"x": 1.5}
+        assert "BytesFloatDictStrategy" in self.get_strategy(d)
+        d["x"] += 1.0
+        assert d["x"] == 2.5
+        d["y"] = True
+        assert "BytesDictStrategy" in self.get_strategy(d)
+        assert d["y"] is True
+        #
+        d = {1: 2}
+        assert "IntIntDictStrategy" in self.get_strategy(d)
+        d[3] = 4
+        assert d.popitem() in [(1, 2), (3, 4)]
+        d[5] = "x"
+        assert "IntDictStrategy" in self.get_strategy(d)
+        assert sorted(d.items()) == [(1, 2), (5, "x")] or \
+               sorted(d.items()) == [(3, 4), (5, "x")]
+        #
+        d = {1: 2}
+        d["x"] = 3
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d == {1: 2, "x": 3}
+        d = {1: 2}
+        assert d.get(1.0) == 2
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+
     def test_iter_dict_length_change(self):
         d = {1: 2, 3: 4, 5: 6}
         it = d.iteritems()
@@ -1242,7 +1360,7 @@ class FakeSpace:
 
     def wrap(self, obj):
         return obj
-    newtext = newbytes = wrap
+    newtext = newbytes = newint = newfloat = wrap
 
     def isinstance_w(self, obj, klass):
         return isinstance(obj, klass)
@@ -1503,6 +1503,121 @@ class AppTestListObject(object):
         l1[:] = l2
         assert len(l1) == 0
 
+    def test_list_topk(self):
+        if self.on_cpython:
+            skip('pypy-only test')
+        from __pypy__ import list_topk, strategy
+        rnd = [(i * 7919 + 13) % 50 for i in range(300)]
+        lists = [
+            rnd,
+            [x * 0.5 for x in rnd],
+            [[1, 2.5, 3, 2**70 // 2**67][x % 4] for x in rnd[:100]],
+            [str(x) for x in rnd[:200]],
+            [unicode(x) for x in rnd[:200]],
+            [(x % 10, i) for i, x in enumerate(rnd[:200])],
+            range(100, 0, -3),
+            [],
+        ]
+        for l in lists:
+            copy = l[:]
+            for k in [-1, 0, 1, 2, 7, 50, len(l) - 1, len(l), len(l) + 5]:
+                for reverse in [False, True]:
+                    res = list_topk(l, k, reverse=reverse)
+                    assert res == sorted(l, reverse=reverse)[:max(k, 0)]
+                    if l and k > 0 and not isinstance(l[0], tuple):
+                        assert strategy(res) == strategy(l)
+            assert l == copy
+        raises(TypeError, list_topk, (1, 2), 1)
+
+    def test_list_topk_stable(self):
+        if self.on_cpython:
+            skip('pypy-only test')
+        from __pypy__ import list_topk
+        l = [0.0, -0.0, 1.0, 0.0, -0.0, -1.0, 0.0]
+        for reverse in [False, True]:
+            for k in range(len(l)):
+                res = list_topk(l, k, reverse=reverse)
+                expected = sorted(l, reverse=reverse)[:k]
+                assert map(str, res) == map(str, expected)
+        l = [(i % 7, i) for i in range(100)]
+        key = lambda x: x[0]
+        for reverse in [False, True]:
+            for k in [1, 10, 20, 99]:
+                res = list_topk(l, k, key=key, reverse=reverse)
+                assert res == sorted(l, key=key, reverse=reverse)[:k]
+
+    def test_list_topk_key(self):
+        if self.on_cpython:
+            skip('pypy-only test')
+        from __pypy__ import list_topk
+        calls = []
+        def key(x):
+            calls.append(x)
+            return -x if isinstance(x, int) else 0
+        l = range(20)
+        assert list_topk(l, 3, key=key) == [19, 18, 17]
+        assert calls == l
+        assert list_topk(l, 3, key=key, reverse=True) == [0, 1, 2]
+        l = ['x', 3, 'y', 5, 4]
+        assert list_topk(l, 2, key=key) == [5, 4]
+        assert list_topk(l, 4, key=str) == [3, 4, 5, 'x']
+
+    def test_heapq_uses_list_topk(self):
+        if self.on_cpython:
+            skip('pypy-only test')
+        import heapq
+        l = [(i * 37) % 101 for i in range(200)]
+        assert heapq.nsmallest(5, l) == sorted(l)[:5]
+        assert heapq.nlargest(5, l) == sorted(l, reverse=True)[:5]
+        assert heapq.nsmallest(5, l, key=lambda x: -x) == sorted(l)[-5:][::-1]
+        assert heapq.nlargest(5, iter(l)) == sorted(l, reverse=True)[:5]
+
+    def test_list_topk_mutating_cmp(self):
+        if self.on_cpython:
+            skip('pypy-only test')
+        from __pypy__ import list_topk
+        l = []
+        class A(object):
+            def __init__(self, x):
+                self.x = x
+            def __lt__(self, other):
+                del l[:]
+                return self.x < other.x
+        l.extend([A(i % 13) for i in range(50)])
+        res = list_topk(l, 5)
+        assert [a.x for a in res] == [0, 0, 0, 0, 1]
+        assert l == []
+
+    def test_heapq_mutating_key(self):
+        if self.on_cpython:
+            skip('pypy-only test')
+        import heapq
+        from __pypy__ import strategy
+        class A(object):
+            def __init__(self, x):
+                self.x = x
+            def __lt__(self, other):
+                l.reverse()
+                return self.x < other.x
+        values = [(i * 37) % 101 for i in range(200)]
+        # the key function reverses the list in-place: the items of the
+        # list at the time of the call are used
+        l = [A(x) for x in values]
+        assert strategy(l) == "ObjectListStrategy"
+        orig = l[:]
+        def key(a):
+            l.reverse()
+            return -a.x
+        res = heapq.nsmallest(5, l, key=key)
+        assert [a.x for a in res] == sorted(values, reverse=True)[:5]
+        assert l == orig
+        # same with the comparisons of the items themselves
+        res = heapq.nsmallest(5, l)
+        assert [a.x for a in res] == sorted(values)[:5]
+        res = heapq.nlargest(5, l)
+        assert [a.x for a in res] == sorted(values, reverse=True)[:5]
+        assert sorted([a.x for a in l]) == sorted(values)
+
     def test_use_method_for_wrong_object(self):
         if self.on_cpython:
             skip('pypy-only test')
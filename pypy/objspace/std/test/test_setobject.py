@@ -81,6 +81,7 @@ class TestW_SetObject:
     def test_create_set_from_list(self):
         from pypy.interpreter.baseobjspace import W_Root
         from pypy.objspace.std.setobject import BytesSetStrategy, ObjectSetStrategy, UnicodeSetStrategy
+        from pypy.objspace.std.setobject import FloatSetStrategy
         from pypy.objspace.std.floatobject import W_FloatObject
 
         w = self.space.wrap
@@ -118,9 +119,15 @@ class TestW_SetObject:
         w_list = W_ListObject(self.space, [w(1.0), w(2.0), w(3.0)])
         w_set = W_SetObject(self.space)
         _initialize_set(self.space, w_set, w_list)
+        assert w_set.strategy is self.space.fromcache(FloatSetStrategy)
+        assert sorted(w_set.strategy.unerase(w_set.sstorage)) == [1.0, 2.0, 3.0]
+
+        w_list = W_ListObject(self.space, [w(1.0), w(2), w(3.0)])
+        w_set = W_SetObject(self.space)
+        _initialize_set(self.space, w_set, w_list)
         assert w_set.strategy is self.space.fromcache(ObjectSetStrategy)
         for item in w_set.strategy.unerase(w_set.sstorage):
-            assert isinstance(item, W_FloatObject)
+            assert isinstance(item, W_Root)
 
         # changed cached object, need to change it back for other tests to pass
         intstr.get_storage_from_list = tmp_func
@@ -666,6 +673,41 @@ class AppTestAppSetTest:
         c = a.intersection(b)
         assert c == set([3.0])
 
+    def test_intersection_difference_update_typed_list(self):
+        s = set(range(10))
+        assert s.intersection([3, 5, 20, 5]) == set([3, 5])
+        assert s.intersection([3, 5], (5, 7)) == set([5])
+        s.difference_update([1, 2, 3], [9, 11])
+        assert s == set([0, 4, 5, 6, 7, 8])
+        s = set([1.5, 2.5, float('nan')])
+        assert s.intersection([2.5, 3.5]) == set([2.5])
+        s.difference_update([1.5, 7.5])
+        assert s.pop() == 2.5 or len(s) == 2
+        s = set(["a", "b", "c"])
+        assert s.intersection(["b", "d"]) == set(["b"])
+        s.difference_update(["a", "b"])
+        assert s == set(["c"])
+        # items that are equal but use another strategy
+        assert set([1, 2]).intersection([1.0]) == set([1])
+        s = set([1.0, 2.0])
+        s.difference_update([1])
+        assert s == set([2.0])
+
+    def test_float_set(self):
+        s = set([1.5, 2.5])
+        s.add(3.5)
+        assert 2.5 in s
+        assert 2 not in s
+        assert s == set([1.5, 2.5, 3.5])
+        assert s == frozenset([3.5, 2.5, 1.5])
+        s.add(4)
+        assert s == set([1.5, 2.5, 3.5, 4])
+        assert set([1.0, 2.0]) == set([1, 2])
+        assert set([0.0]) & set([-0.0]) == set([0.0])
+        nan = float('nan')
+        assert nan in set([nan])
+        assert sorted(set(range(5, -5, -3))) == [-4, -1, 2, 5]
+
     def test_difference(self):
         assert set([1,2,3]).difference(set([2,3,4])) == set([1])
         assert set([1,2,3]).difference(frozenset([2,3,4])) == set([1])
@@ -1,9 +1,10 @@
 from pypy.objspace.std.setobject import W_SetObject
 from pypy.objspace.std.setobject import (
     BytesIteratorImplementation, BytesSetStrategy, EmptySetStrategy,
-    IntegerIteratorImplementation, IntegerSetStrategy, ObjectSetStrategy,
-    UnicodeIteratorImplementation, UnicodeSetStrategy)
-from pypy.objspace.std.listobject import W_ListObject
+    FloatSetStrategy, IntegerIteratorImplementation, IntegerSetStrategy,
+    ObjectSetStrategy, UnicodeIteratorImplementation, UnicodeSetStrategy)
+from pypy.objspace.std.listobject import (
+    IntegerListStrategy, W_ListObject, make_range_list)
 
 class TestW_SetStrategies:
 
@@ -29,6 +30,39 @@ class TestW_SetStrategies:
         s = W_SetObject(self.space, self.wrapped([u"a", u"b"]))
         assert s.strategy is self.space.fromcache(UnicodeSetStrategy)
 
+        s = W_SetObject(self.space, self.wrapped([1.5, 2.5]))
+        assert s.strategy is self.space.fromcache(FloatSetStrategy)
+
+    def test_from_range(self):
+        space = self.space
+        w_range = make_range_list(space, 3, 4, 5)
+        s = W_SetObject(space, w_range)
+        assert s.strategy is space.fromcache(IntegerSetStrategy)
+        assert sorted(space.listview_int(s)) == [3, 7, 11, 15, 19]
+        # the range list was not turned into an int list
+        assert w_range.strategy is not space.fromcache(IntegerListStrategy)
+
+    def test_switch_to_float(self):
+        s = W_SetObject(self.space, self.wrapped([]))
+        s.add(self.space.wrap(1.5))
+        assert s.strategy is self.space.fromcache(FloatSetStrategy)
+        s.add(self.space.wrap(2))
+        assert s.strategy is self.space.fromcache(ObjectSetStrategy)
+
+    def test_update_from_list(self):
+        space = self.space
+        s = W_SetObject(space, self.wrapped([1, 2, 3, 4, 5]))
+        strategy = s.strategy
+        assert strategy.difference_update_from_list(s, self.wrapped([2, 4, 6]))
+        assert sorted(space.listview_int(s)) == [1, 3, 5]
+        assert strategy.intersect_update_from_list(s, self.wrapped([5, 1, 7]))
+        assert sorted(space.listview_int(s)) == [1, 5]
+        assert not strategy.intersect_update_from_list(s, self.wrapped(["a"]))
+        #
+        s = W_SetObject(space, self.wrapped([1.5, 2.5]))
+        assert s.strategy.difference_update_from_list(s, self.wrapped([2.5]))
+        assert space.listview_float(s) == [1.5]
+
     def test_switch_to_object(self):
         s = W_SetObject(self.space, self.wrapped([1,2,3,4,5]))
         s.add(self.space.wrap("six"))
@@ -144,3 +178,6 @@ class TestW_SetStrategies:
         #
         s = W_SetObject(space, self.wrapped([u"a", u"b"]))
         assert sorted(space.listview_unicode(s)) == [u"a", u"b"]
+        #
+        s = W_SetObject(space, self.wrapped([1.5, 2.5]))
+        assert sorted(space.listview_float(s)) == [1.5, 2.5]
@@ -1,4 +1,5 @@
-from pypy.objspace.std.specialisedtupleobject import _specialisations
+from pypy.objspace.std.specialisedtupleobject import (_specialisations,
+    W_IntTupleObject, W_FloatTupleObject, W_BytesTupleObject)
 from pypy.objspace.std.test import test_tupleobject
 from pypy.objspace.std.tupleobject import W_TupleObject
 from pypy.tool.pytest.objspace import gettestobjspace
@@ -52,6 +53,21 @@ class TestW_SpecialisedTupleObject():
         hash_test([1, 2, 3], must_be_specialized=False)
         hash_test([1 << 62, 0])
 
+    def test_homogeneous_against_normal_tuple(self):
+        space = self.space
+        for cls, values in [(W_IntTupleObject, [1, -1, 1 << 62, 5]),
+                            (W_FloatTupleObject, [1.5, -1.0, 2.0, 0.0]),
+                            (W_BytesTupleObject, ['a', '', 'bc', 'a'])]:
+            N_w_tuple = W_TupleObject([space.wrap(x) for x in values])
+            H_w_tuple = cls(space, values[:])
+            assert space.eq_w(N_w_tuple, H_w_tuple)
+            assert space.eq_w(H_w_tuple, N_w_tuple)
+            assert space.eq_w(H_w_tuple, cls(space, values[:]))
+            assert not space.eq_w(H_w_tuple, cls(space, values[:-1]))
+            assert space.int_w(space.hash(N_w_tuple)) == \
+                   space.int_w(space.hash(H_w_tuple))
+            assert space.unwrap(H_w_tuple) == tuple(values)
+
     try:
         from hypothesis import given, strategies
     except ImportError:
@@ -244,6 +260,32 @@ class AppTestW_SpecialisedTupleObject:
         t = (F(42), F(43))
         assert type(t[0]) is F
 
+    def test_tuple_from_list(self):
+        import __pypy__
+        for lst in [[1, 2, 3, 4], [1.5, 2.5, -0.0], ["a", "bc", ""]]:
+            t = tuple(lst)
+            kind = type(lst[0]).__name__.capitalize()
+            if kind == 'Str':
+                kind = 'Bytes'
+            assert ('W_%sTupleObject' % kind) in __pypy__.internal_repr(t)
+            assert t == tuple(iter(lst))
+            assert hash(t) == hash(tuple(iter(lst)))
+            assert list(t) == lst
+            assert len(t) == len(lst)
+            assert t[-1] is lst[-1]
+            assert t[1:] == tuple(lst[1:])
+            assert lst[0] in t
+            lst.append(None)
+            assert len(t) == len(lst) - 1
+        raises(IndexError, "tuple([1, 2])[2]")
+        assert tuple([1, 2]) == (1.0, 2)
+        assert tuple([1, 2]) < (1, 2, 0)
+        assert tuple([]) is ()
+        assert "W_TupleObject" in __pypy__.internal_repr(tuple([1, "x", 3]))
+        N = float('nan')
+        assert tuple([N, 1.0]) == tuple([N, 1.0])
+        assert tuple([N, 1.0]) == (N, 1.0)
+
     def test_bug_tuples_of_nans(self):
         N = float('nan')
         T = (N, N)
@@ -0,0 +1,90 @@
+from pypy.objspace.std.test import test_bytesobject, test_unicodeobject
+
+
+class AppTestStringObject(test_bytesobject.AppTestBytesObject):
+    spaceconfig = {"objspace.std.withstrbuf": True}
+
+    def test_basic(self):
+        import __pypy__
+        s = "Hello, ".__add__("World!")
+        assert type(s) is str
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+
+    def test_add_twice(self):
+        x = "a".__add__("b")
+        y = x + "c"
+        c = x + "d"
+        assert y == "abc"
+        assert c == "abd"
+
+    def test_add(self):
+        import __pypy__
+        all = ""
+        for i in range(20):
+            all += str(i)
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(all)
+        assert all == "012345678910111213141516171819"
+        assert len(all) == 30
+        assert hash(all) == hash("012345678910111213141516171819")
+
+    def test_compare_two_buffers(self):
+        a = "ab".__add__("c")
+        b = "a".__add__("bc")
+        assert a == b
+        assert not (a != b)
+        assert a <= b and a >= b and not (a < b) and not (a > b)
+        assert a is not b
+        assert len(set([a, b])) == 1
+
+    def test_mixed(self):
+        s = "ab".__add__("cd")
+        assert s + u"\xe9" == u"abcd\xe9"
+        assert s + bytearray("e") == bytearray("abcde")
+        assert s[1:3] == "bc"
+        assert s.upper() == "ABCD"
+        assert "bc" in s
+        assert s.find("cd") == 2
+        assert "%s!" % s == "abcd!"
+        assert "x{0}".format(s) == "xabcd"
+        assert str(buffer(s)) == "abcd"
+        raises(TypeError, "s + 5")
+
+
+class AppTestUnicodeString(test_unicodeobject.AppTestUnicodeString):
+    spaceconfig = {"objspace.std.withstrbuf": True,
+                   "usemodules": ["unicodedata"]}
+
+    def test_basic(self):
+        import __pypy__
+        s = u"Hello, ".__add__(u"World!")
+        assert type(s) is unicode
+        assert 'W_UnicodeBufferObject' in __pypy__.internal_repr(s)
+
+    def test_add(self):
+        import __pypy__
+        all = u""
+        for i in range(20):
+            all += unicode(i)
+        all += "\xe9".decode("latin-1")
+        assert 'W_UnicodeBufferObject' in __pypy__.internal_repr(all)
+        assert all == u"012345678910111213141516171819\xe9"
+        assert len(all) == 31
+        assert hash(all) == hash(u"012345678910111213141516171819\xe9")
+        assert {all: 5}[u"012345678910111213141516171819\xe9"] == 5
+        assert all.encode("utf-8") == "012345678910111213141516171819\xc3\xa9"
+
+    def test_add_twice(self):
+        x = u"a".__add__(u"b")
+        y = x + u"c"
+        c = x + u"d"
+        assert y == u"abc"
+        assert c == u"abd"
+
+    def test_identity(self):
+        a = u"ab".__add__(u"c")
+        b = u"a".__add__(u"bc")
+        assert a == b
+        assert a is not b
+        assert a is a
+        assert id(a) != id(b)
+        assert u"a".__add__(u"") is u"a"
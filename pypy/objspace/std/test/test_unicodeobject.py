@@ -33,6 +33,79 @@ class TestUnicodeObject:
                 space.w_unicode, "__new__", space.w_unicode, w_uni)
         assert w_new is w_uni
 
+    def test_compact(self):
+        space = self.space
+        w_u = space.newlatin1('caf\xe9 au lait')
+        assert w_u._value is None
+        assert space.unicode_w(w_u) == u'caf\xe9 au lait'
+        assert space.len_w(w_u) == 12
+        assert space.hash_w(w_u) == space.hash_w(space.wrap(u'caf\xe9 au lait'))
+        assert space.eq_w(w_u, space.wrap(u'caf\xe9 au lait'))
+        # operations between compact objects give compact objects
+        w_res = space.getitem(w_u, space.newint(3))
+        assert w_res._latin1 == '\xe9'
+        w_res = space.add(w_u, space.newlatin1('!'))
+        assert w_res._latin1 == 'caf\xe9 au lait!'
+        w_res = space.call_method(w_u, 'replace', space.newlatin1('lait'),
+                                  space.newlatin1('the'))
+        assert w_res._latin1 == 'caf\xe9 au the'
+        # other operations widen the value
+        w_res = space.call_method(w_u, 'upper')
+        assert space.unicode_w(w_res) == u'CAF\xc9 AU LAIT'
+        w_res = space.add(w_u, space.wrap(u'\u1234'))
+        assert space.unicode_w(w_res) == u'caf\xe9 au lait\u1234'
+
+    def test_compact_not_widened_in_place(self):
+        space = self.space
+        w_u = space.newlatin1('caf\xe9')
+        u1 = space.unicode_w(w_u)
+        assert u1 == u'caf\xe9'
+        # the widened value is not kept, the object stays compact
+        assert w_u._value is None
+        assert w_u._latin1 == 'caf\xe9'
+        w_d = space.newdict()
+        space.setitem(w_d, w_u, space.wrap(1))
+        assert space.int_w(space.getitem(w_d, space.newlatin1('caf\xe9'))) == 1
+        space.call_method(space.newset(), 'add', w_u)
+        assert w_u._value is None
+        w_res = space.add(w_u, space.newlatin1('!'))
+        assert w_res._latin1 == 'caf\xe9!'
+        assert space.is_w(w_u, space.newlatin1(w_u._latin1))
+        assert not space.is_w(w_u, space.wrap(u1))
+        assert not space.is_w(space.wrap(u1), w_u)
+
+    def test_compact_decode_encode(self):
+        space = self.space
+        for encoding in ['ascii', 'latin-1', 'utf-8']:
+            w_u = space.call_method(space.newbytes('abc'), 'decode',
+                                    space.wrap(encoding))
+            assert w_u._latin1 == 'abc'
+            w_s = space.call_method(w_u, 'encode', space.wrap(encoding))
+            assert space.bytes_w(w_s) == 'abc'
+        w_u = space.call_method(space.newbytes('\xe9'), 'decode',
+                                space.wrap('latin-1'))
+        assert w_u._latin1 == '\xe9'
+        w_s = space.call_method(w_u, 'encode', space.wrap('utf-8'))
+        assert space.bytes_w(w_s) == '\xc3\xa9'
+        w_u = space.call_method(space.newbytes('\xc3\xa9'), 'decode',
+                                space.wrap('utf-8'))
+        assert space.unicode_w(w_u) == u'\xe9'
+
+    def test_compact_is(self):
+        space = self.space
+        w_a = space.newlatin1('abc')
+        w_b = space.newlatin1(w_a._latin1)
+        assert space.is_w(w_a, w_b)
+        assert space.is_w(space.id(w_a), space.id(w_b))
+        assert not space.is_w(w_a, space.wrap(u'abc'))
+        assert space.is_w(space.newlatin1('a'), space.wrap(u'a'))
+        assert space.eq_w(space.id(space.newlatin1('a')),
+                          space.id(space.wrap(u'a')))
+        w_s = space.newbytes('abc')
+        w_u = space.call_method(w_s, 'decode', space.wrap('ascii'))
+        assert w_u._latin1 is space.bytes_w(w_s)
+        assert not space.eq_w(space.id(w_s), space.id(w_u))
+
 
 try:
     from hypothesis import given, strategies
@@ -48,6 +121,23 @@ else:
         v = u[start : start + len1]
         w_u = space.wrap(u)
         w_v = space.wrap(v)
+        check_index_find(space, u, v, w_u, w_v, start, len1)
+
+    @given(u=strategies.text(alphabet=strategies.characters(max_codepoint=255)),
+           start=strategies.integers(min_value=0, max_value=10),
+           len1=strategies.integers(min_value=-1, max_value=10))
+    def test_hypo_index_find_compact(u, start, len1, space):
+        if start + len1 < 0:
+            return   # skip this case
+        v = u[start : start + len1]
+        w_u = space.newlatin1(u.encode('latin-1'))
+        w_v = space.newlatin1(v.encode('latin-1'))
+        check_index_find(space, u, v, w_u, w_v, start, len1)
+        # one compact and one non-compact operand
+        check_index_find(space, u, v, w_u, space.wrap(v), start, len1)
+        check_index_find(space, u, v, space.wrap(u), w_v, start, len1)
+
+    def check_index_find(space, u, v, w_u, w_v, start, len1):
         expected = u.find(v, start, start + len1)
         try:
             w_index = space.call_method(w_u, 'index', w_v,
@@ -128,6 +218,40 @@ class AppTestUnicodeStringStdOnly:
 class AppTestUnicodeString:
     spaceconfig = dict(usemodules=('unicodedata',))
 
+    def test_latin1_decoded(self):
+        # these are stored in the compact form
+        u = 'caf\xe9, th\xe9'.decode('latin-1')
+        assert u == u'caf\xe9, th\xe9'
+        assert list(u) == list(u'caf\xe9, th\xe9')
+        assert u[1:4] == u'af\xe9'
+        assert u[::-2] == u'\xe9t,fc'
+        assert u[-1] == u'\xe9'
+        assert u * 2 == u'caf\xe9, th\xe9caf\xe9, th\xe9'
+        assert u + u'\u1234' == u'caf\xe9, th\xe9\u1234'
+        assert u.split(u', ') == [u'caf\xe9', u'th\xe9']
+        assert u.upper() == u'CAF\xc9, TH\xc9'
+        assert u.find('\xe9'.decode('latin-1'), 4) == 8
+        assert u.count(u'\xe9') == 2
+        assert u.strip(u'c\xe9') == u'af\xe9, th'
+        assert u.startswith(u'caf') and u.endswith(u'th\xe9')
+        assert hash(u) == hash(u'caf\xe9, th\xe9')
+        assert {u'caf\xe9, th\xe9': 42}[u] == 42
+        assert u.encode('utf-8') == 'caf\xc3\xa9, th\xc3\xa9'
+        assert u.encode('latin-1') == 'caf\xe9, th\xe9'
+        raises(UnicodeEncodeError, u.encode, 'ascii')
+
+    def test_latin1_decoded_id(self):
+        # the compact object shares its characters with the str, but
+        # it must not share its id()
+        s = 'hello world'
+        for u in [s.decode('ascii'), s.decode('latin-1'), s.decode('utf-8'),
+                  unicode(s)]:
+            assert u is not s
+            assert id(u) != id(s)
+        assert 'abc'.decode('ascii') < 'abd'.decode('ascii') < u'\xe9'
+        assert unicode('abc') == u'abc'
+        assert repr('a\xe9'.decode('latin-1')) == "u'a\\xe9'"
+
     def test_addition(self):
         def check(a, b):
             assert a == b
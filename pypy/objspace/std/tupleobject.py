@@ -94,6 +94,15 @@ class W_AbstractTupleObject(W_Root):
               space.is_w(space.type(w_sequence), space.w_tuple)):
             return w_sequence
         else:
+            if (space.is_w(w_tupletype, space.w_tuple) and
+                    space.config.objspace.std.withspecialisedtuple):
+                from pypy.objspace.std.listobject import W_ListObject
+                from pypy.objspace.std.specialisedtupleobject import (
+                    make_tuple_from_list)
+                if type(w_sequence) is W_ListObject:
+                    w_tuple = make_tuple_from_list(space, w_sequence)
+                    if w_tuple is not None:
+                        return w_tuple
             tuple_w = space.fixedview(w_sequence)
         w_obj = space.allocate_instance(W_TupleObject, w_tupletype)
         W_TupleObject.__init__(w_obj, tuple_w)
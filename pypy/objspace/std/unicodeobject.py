@@ -2,13 +2,13 @@
 
 from rpython.rlib.objectmodel import (
     compute_hash, compute_unique_id, import_from_mixin,
-    enforceargs)
+    enforceargs, instantiate)
 from rpython.rlib.buffer import StringBuffer
 from rpython.rlib.mutbuffer import MutableStringBuffer
 from rpython.rlib.rstring import StringBuilder, UnicodeBuilder
 from rpython.rlib.runicode import (
     make_unicode_escape_function, str_decode_ascii, str_decode_utf_8,
-    unicode_encode_ascii, unicode_encode_utf_8, fast_str_decode_ascii)
+    unicode_encode_ascii, unicode_encode_utf_8)
 
 from pypy.interpreter import unicodehelper
 from pypy.interpreter.baseobjspace import W_Root
@@ -20,7 +20,7 @@ from pypy.objspace.std import newformat
 from pypy.objspace.std.basestringtype import basestring_typedef
 from pypy.objspace.std.formatting import mod_format
 from pypy.objspace.std.stringmethods import StringMethods
-from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT
+from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT, IDTAG_ALT_UID
 
 __all__ = ['W_UnicodeObject', 'wrapunicode', 'plain_str2unicode',
            'encode_object', 'decode_object', 'unicode_from_object',
@@ -28,26 +28,50 @@ __all__ = ['W_UnicodeObject', 'wrapunicode', 'plain_str2unicode',
 
 
 class W_UnicodeObject(W_Root):
+    """A unicode object stores either a full RPython unicode string in
+    '_value', or, if all its characters are latin-1, a byte string with
+    one byte per character in '_latin1' (and then '_value' is None).
+    The compact objects are widened on demand by unicode_w(), and the
+    result is not kept, so that they stay compact even when they are
+    used as keys of unicode dicts or sets; the operations that matter
+    most have fast paths working directly on '_latin1'.
+    """
     import_from_mixin(StringMethods)
-    _immutable_fields_ = ['_value']
+    _immutable_fields_ = ['_value', '_latin1']
 
     @enforceargs(uni=unicode)
     def __init__(self, unistr):
         assert isinstance(unistr, unicode)
         self._value = unistr
+        self._latin1 = None
+
+    @staticmethod
+    def from_latin1(s):
+        """Make a compact unicode object with the characters of the byte
+        string 's', i.e. 's' decoded as latin-1."""
+        assert isinstance(s, str)
+        w_self = instantiate(W_UnicodeObject)
+        w_self._value = None
+        w_self._latin1 = s
+        return w_self
 
     def __repr__(self):
         """representation for debugging purposes"""
+        if self._latin1 is not None:
+            return "%s(%r, compact)" % (self.__class__.__name__,
+                                        self._as_unicode())
         return "%s(%r)" % (self.__class__.__name__, self._value)
 
     def unwrap(self, space):
         # for testing
-        return self._value
+        return self.unicode_w(space)
 
     def create_if_subclassed(self):
         if type(self) is W_UnicodeObject:
             return self
-        return W_UnicodeObject(self._value)
+        if self._latin1 is not None:
+            return W_UnicodeObject.from_latin1(self._latin1)
+        return W_UnicodeObject(self._as_unicode())
 
     def is_w(self, space, w_other):
         if not isinstance(w_other, W_UnicodeObject):
@@ -56,22 +80,30 @@ class W_UnicodeObject(W_Root):
             return True
         if self.user_overridden_class or w_other.user_overridden_class:
             return False
-        s1 = space.unicode_w(self)
-        s2 = space.unicode_w(w_other)
-        if len(s2) > 1:
-            return s1 is s2
+        if self._len() > 1:
+            # compare the underlying strings; a compact and a non-compact
+            # object of more than one character are never identical
+            if self._latin1 is not None or w_other._latin1 is not None:
+                return self._latin1 is w_other._latin1
+            return self._value is w_other._value
         else:            # strings of len <= 1 are unique-ified
-            return s1 == s2
+            return space.unicode_w(self) == space.unicode_w(w_other)
 
     def immutable_unique_id(self, space):
         if self.user_overridden_class:
             return None
-        s = space.unicode_w(self)
-        if len(s) > 1:
-            uid = compute_unique_id(s)
+        length = self._len()
+        if length > 1:
+            if self._latin1 is not None:
+                # '_latin1' is often the very string of the W_BytesObject
+                # we were decoded from: add IDTAG_ALT_UID to make sure we
+                # don't get the same id() as that other object
+                uid = compute_unique_id(self._latin1) + IDTAG_ALT_UID
+            else:
+                uid = compute_unique_id(self._value)
         else:            # strings of len <= 1 are unique-ified
-            if len(s) == 1:
-                base = ~ord(s[0])      # negative base values
+            if length == 1:
+                base = ~self._ord_at(0)      # negative base values
             else:
                 base = 257       # empty unicode string: base value 257
             uid = (base << IDTAG_SHIFT) | IDTAG_SPECIAL
@@ -81,13 +113,21 @@ class W_UnicodeObject(W_Root):
         return space.text_w(space.str(self))
 
     def unicode_w(self, space):
-        return self._value
+        return self._as_unicode()
+
+    def _as_unicode(self):
+        value = self._value
+        if value is None:
+            # widen a compact object
+            value = self._latin1.decode('latin-1')
+        return value
 
     def readbuf_w(self, space):
         from rpython.rlib.rstruct.unichar import pack_unichar, UNICODE_SIZE
-        buf = MutableStringBuffer(len(self._value) * UNICODE_SIZE)
+        value = self.unicode_w(space)
+        buf = MutableStringBuffer(len(value) * UNICODE_SIZE)
         pos = 0
-        for unich in self._value:
+        for unich in value:
             pack_unichar(unich, buf, pos)
             pos += UNICODE_SIZE
         return StringBuffer(buf.finish())
@@ -99,18 +139,35 @@ class W_UnicodeObject(W_Root):
     charbuf_w = str_w
 
     def listview_unicode(self):
-        return _create_list_from_unicode(self._value)
+        return _create_list_from_unicode(self._as_unicode())
 
     def ord(self, space):
-        if len(self._value) != 1:
+        if self._len() != 1:
             raise oefmt(space.w_TypeError,
                          "ord() expected a character, but string of length %d "
-                         "found", len(self._value))
-        return space.newint(ord(self._value[0]))
+                         "found", self._len())
+        return space.newint(self._ord_at(0))
+
+    def _ord_at(self, index):
+        if self._latin1 is not None:
+            return ord(self._latin1[index])
+        return ord(self._value[index])
 
     def _new(self, value):
         return W_UnicodeObject(value)
 
+    def _new_compact(self, value):
+        return W_UnicodeObject.from_latin1(value)
+
+    def _compact_val(self):
+        return self._latin1
+
+    @staticmethod
+    def _compact_op_val(w_other):
+        if isinstance(w_other, W_UnicodeObject):
+            return w_other._latin1
+        return None
+
     def _new_from_list(self, value):
         return W_UnicodeObject(u''.join(value))
 
@@ -118,6 +175,8 @@ class W_UnicodeObject(W_Root):
         return W_UnicodeObject.EMPTY
 
     def _len(self):
+        if self._latin1 is not None:
+            return len(self._latin1)
         return len(self._value)
 
     _val = unicode_w
@@ -131,14 +190,14 @@ class W_UnicodeObject(W_Root):
     @staticmethod
     def _op_val(space, w_other, strict=None):
         if isinstance(w_other, W_UnicodeObject):
-            return w_other._value
+            return w_other.unicode_w(space)
         if space.isinstance_w(w_other, space.w_bytes):
-            return unicode_from_string(space, w_other)._value
+            return unicode_from_string(space, w_other).unicode_w(space)
         if strict:
             raise oefmt(space.w_TypeError,
                 "%s arg must be None, unicode or str", strict)
         return unicode_from_encoded_object(
-            space, w_other, None, "strict")._value
+            space, w_other, None, "strict").unicode_w(space)
 
     def _chr(self, char):
         assert len(char) == 1
@@ -225,11 +284,11 @@ class W_UnicodeObject(W_Root):
 
         assert isinstance(w_value, W_UnicodeObject)
         w_newobj = space.allocate_instance(W_UnicodeObject, w_unicodetype)
-        W_UnicodeObject.__init__(w_newobj, w_value._value)
+        W_UnicodeObject.__init__(w_newobj, w_value.unicode_w(space))
         return w_newobj
 
     def descr_repr(self, space):
-        chars = self._value
+        chars = self.unicode_w(space)
         size = len(chars)
         s = _repr_function(chars, size, "strict")
         return space.newtext(s)
@@ -238,11 +297,19 @@ class W_UnicodeObject(W_Root):
         return encode_object(space, self, None, None)
 
     def descr_hash(self, space):
-        x = compute_hash(self._value)
+        # a latin-1 byte string has the same hash as the unicode string
+        if self._latin1 is not None:
+            x = compute_hash(self._latin1)
+        else:
+            x = compute_hash(self._as_unicode())
         x -= (x == -1) # convert -1 to -2 without creating a bridge
         return space.newint(x)
 
     def descr_eq(self, space, w_other):
+        if self._latin1 is not None:
+            other = self._compact_op_val(w_other)
+            if other is not None:
+                return space.newbool(self._latin1 == other)
         try:
             res = self._val(space) == self._op_val(space, w_other)
         except OperationError as e:
@@ -259,6 +326,10 @@ class W_UnicodeObject(W_Root):
         return space.newbool(res)
 
     def descr_ne(self, space, w_other):
+        if self._latin1 is not None:
+            other = self._compact_op_val(w_other)
+            if other is not None:
+                return space.newbool(self._latin1 != other)
         try:
             res = self._val(space) != self._op_val(space, w_other)
         except OperationError as e:
@@ -275,6 +346,10 @@ class W_UnicodeObject(W_Root):
         return space.newbool(res)
 
     def descr_lt(self, space, w_other):
+        if self._latin1 is not None:
+            other = self._compact_op_val(w_other)
+            if other is not None:
+                return space.newbool(self._latin1 < other)
         try:
             res = self._val(space) < self._op_val(space, w_other)
         except OperationError as e:
@@ -284,6 +359,10 @@ class W_UnicodeObject(W_Root):
         return space.newbool(res)
 
     def descr_le(self, space, w_other):
+        if self._latin1 is not None:
+            other = self._compact_op_val(w_other)
+            if other is not None:
+                return space.newbool(self._latin1 <= other)
         try:
             res = self._val(space) <= self._op_val(space, w_other)
         except OperationError as e:
@@ -293,6 +372,10 @@ class W_UnicodeObject(W_Root):
         return space.newbool(res)
 
     def descr_gt(self, space, w_other):
+        if self._latin1 is not None:
+            other = self._compact_op_val(w_other)
+            if other is not None:
+                return space.newbool(self._latin1 > other)
         try:
             res = self._val(space) > self._op_val(space, w_other)
         except OperationError as e:
@@ -302,6 +385,10 @@ class W_UnicodeObject(W_Root):
         return space.newbool(res)
 
     def descr_ge(self, space, w_other):
+        if self._latin1 is not None:
+            other = self._compact_op_val(w_other)
+            if other is not None:
+                return space.newbool(self._latin1 >= other)
         try:
             res = self._val(space) >= self._op_val(space, w_other)
         except OperationError as e:
@@ -320,7 +407,7 @@ class W_UnicodeObject(W_Root):
         formatter = newformat.unicode_formatter(space, spec)
         self2 = unicode_from_object(space, self)
         assert isinstance(self2, W_UnicodeObject)
-        return formatter.format_string(self2._value)
+        return formatter.format_string(self2.unicode_w(space))
 
     def descr_mod(self, space, w_values):
         return mod_format(space, self, w_values, do_unicode=True)
@@ -329,7 +416,7 @@ class W_UnicodeObject(W_Root):
         return mod_format(space, w_values, self, do_unicode=True)
 
     def descr_translate(self, space, w_table):
-        selfvalue = self._value
+        selfvalue = self._val(space)
         w_sys = space.getbuiltinmodule('sys')
         maxunicode = space.int_w(space.getattr(w_sys,
                                                space.newtext("maxunicode")))
@@ -365,6 +452,19 @@ class W_UnicodeObject(W_Root):
                                                     w_errors)
         return encode_object(space, self, encoding, errors)
 
+    _StringMethods_descr_add = descr_add
+    def descr_add(self, space, w_other):
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_UnicodeBufferObject
+            try:
+                other = self._op_val(space, w_other)
+            except OperationError as e:
+                if e.match(space, space.w_TypeError):
+                    return space.w_NotImplemented
+                raise
+            return W_UnicodeBufferObject.concat(self, other)
+        return self._StringMethods_descr_add(space, w_other)
+
     _StringMethods_descr_join = descr_join
     def descr_join(self, space, w_list):
         l = space.listview_unicode(w_list)
@@ -401,7 +501,7 @@ class W_UnicodeObject(W_Root):
 
     def descr_islower(self, space):
         cased = False
-        for uchar in self._value:
+        for uchar in self._val(space):
             if (unicodedb.isupper(ord(uchar)) or
                 unicodedb.istitle(ord(uchar))):
                 return space.w_False
@@ -411,7 +511,7 @@ class W_UnicodeObject(W_Root):
 
     def descr_isupper(self, space):
         cased = False
-        for uchar in self._value:
+        for uchar in self._val(space):
             if (unicodedb.islower(ord(uchar)) or
                 unicodedb.istitle(ord(uchar))):
                 return space.w_False
@@ -465,6 +565,11 @@ def encode_object(space, w_object, encoding, errors):
         w_encoder = space.sys.get_w_default_encoder()
     else:
         if errors is None or errors == 'strict':
+            if (isinstance(w_object, W_UnicodeObject) and
+                    w_object._latin1 is not None):
+                w_res = _encode_compact(space, w_object._latin1, encoding)
+                if w_res is not None:
+                    return w_res
             if encoding == 'ascii':
                 u = space.unicode_w(w_object)
                 eh = unicodehelper.encode_error_handler(space)
@@ -491,6 +596,16 @@ def encode_object(space, w_object, encoding, errors):
     return w_retval
 
 
+def _encode_compact(space, s, encoding):
+    # 's' are the latin-1 characters of a compact unicode object
+    if encoding == 'latin-1' or encoding == 'latin1':
+        return space.newbytes(s)
+    if encoding == 'ascii' or encoding == 'utf-8':
+        if unicodehelper.is_ascii(s):
+            return space.newbytes(s)
+    return None     # use the general path
+
+
 def decode_object(space, w_obj, encoding, errors):
     if encoding is None:
         encoding = getdefaultencoding(space)
@@ -498,15 +613,18 @@ def decode_object(space, w_obj, encoding, errors):
         if encoding == 'ascii':
             # XXX error handling
             s = space.charbuf_w(w_obj)
-            try:
-                u = fast_str_decode_ascii(s)
-            except ValueError:
-                eh = unicodehelper.decode_error_handler(space)
-                u = str_decode_ascii(     # try again, to get the error right
-                    s, len(s), None, final=True, errorhandler=eh)[0]
+            if unicodehelper.is_ascii(s):
+                return space.newlatin1(s)
+            eh = unicodehelper.decode_error_handler(space)
+            u = str_decode_ascii(     # get the error right
+                s, len(s), None, final=True, errorhandler=eh)[0]
             return space.newunicode(u)
+        if encoding == 'latin-1' or encoding == 'latin1':
+            return space.newlatin1(space.charbuf_w(w_obj))
         if encoding == 'utf-8':
             s = space.charbuf_w(w_obj)
+            if unicodehelper.is_ascii(s):
+                return space.newlatin1(s)
             eh = unicodehelper.decode_error_handler(space)
             return space.newunicode(str_decode_utf_8(
                     s, len(s), None, final=True, errorhandler=eh,
@@ -564,11 +682,10 @@ def unicode_from_string(space, w_bytes):
     if encoding != 'ascii':
         return unicode_from_encoded_object(space, w_bytes, encoding, "strict")
     s = space.bytes_w(w_bytes)
-    try:
-        return W_UnicodeObject(s.decode("ascii"))
-    except UnicodeDecodeError:
-        # raising UnicodeDecodeError is messy, "please crash for me"
-        return unicode_from_encoded_object(space, w_bytes, "ascii", "strict")
+    if unicodehelper.is_ascii(s):
+        return W_UnicodeObject.from_latin1(s)
+    # raising UnicodeDecodeError is messy, "please crash for me"
+    return unicode_from_encoded_object(space, w_bytes, "ascii", "strict")
 
 
 class UnicodeDocstrings:
@@ -1122,7 +1239,7 @@ W_UnicodeObject.EMPTY = W_UnicodeObject(u'')
 def unicode_to_decimal_w(space, w_unistr):
     if not isinstance(w_unistr, W_UnicodeObject):
         raise oefmt(space.w_TypeError, "expected unicode, got '%T'", w_unistr)
-    unistr = w_unistr._value
+    unistr = w_unistr._val(space)
     result = ['\0'] * len(unistr)
     digits = ['0', '1', '2', '3', '4',
               '5', '6', '7', '8', '9']
@@ -16,6 +16,8 @@ IDTAG_SPECIAL = 11    # -1 - (-maxunicode-1): unichar
                       # 258: empty tuple
                       # 259: empty frozenset
 
+IDTAG_ALT_UID = 2     # gives an alternate id() from the same real uid
+
 CMP_OPS = dict(lt='<', le='<=', eq='==', ne='!=', gt='>', ge='>=')
 BINARY_BITWISE_OPS = {'and': '&', 'lshift': '<<', 'or': '|', 'rshift': '>>',
                       'xor': '^'}
@@ -515,6 +515,9 @@ class __extend__(SomeDict):
     def method__prepare_dict_update(dct, num):
         pass
 
+    def method__dict_compact(dct):
+        pass
+
     def method_keys(self):
         bk = getbookkeeper()
         return bk.newlist(self.dictdef.read_key(bk.position_key))
@@ -917,6 +917,22 @@ class LLGraphCPU(model.AbstractCPU):
         assert len(vx) == len(vy) == count
         return [_vx != _vy for _vx,_vy in zip(vx,vy)]
 
+    def bh_vec_float_lt(self, vx, vy, count):
+        assert len(vx) == len(vy) == count
+        return [_vx < _vy for _vx,_vy in zip(vx,vy)]
+
+    def bh_vec_float_le(self, vx, vy, count):
+        assert len(vx) == len(vy) == count
+        return [_vx <= _vy for _vx,_vy in zip(vx,vy)]
+
+    def bh_vec_float_gt(self, vx, vy, count):
+        assert len(vx) == len(vy) == count
+        return [_vx > _vy for _vx,_vy in zip(vx,vy)]
+
+    def bh_vec_float_ge(self, vx, vy, count):
+        assert len(vx) == len(vy) == count
+        return [_vx >= _vy for _vx,_vy in zip(vx,vy)]
+
     bh_vec_int_eq = bh_vec_float_eq
     bh_vec_int_ne = bh_vec_float_ne
 
@@ -178,6 +178,30 @@ class StoreRestrict(OpRestrict):
         descr = op.getdescr()
         return vec_reg_size // descr.get_item_size_in_bytes()
 
+class IntOf4or8Restrict(TypeRestrict):
+    def __init__(self):
+        TypeRestrict.__init__(self, INT, TypeRestrict.ANY_SIZE, 2)
+
+    def check(self, value):
+        TypeRestrict.check(self, value)
+        bytesize = forwarded_vecinfo(value).bytesize
+        if bytesize != 4 and bytesize != 8:
+            msg = "bytesize mismatch %s is neither 4 nor 8" % bytesize
+            failnbail_transformation(msg)
+
+class CastIntToFloatRestrict(OpRestrict):
+    """ The integers converted to floats are either 4 or 8 bytes wide,
+        the backend picks the instruction from the input size. Smaller
+        integers in a vector are sign extended to 4 bytes.
+    """
+    def must_crop_vector(self, op, index):
+        vecinfo = forwarded_vecinfo(op.getarg(index))
+        size = vecinfo.bytesize
+        return size != 4 and size != 8
+
+    def crop_to_size(self, op, index):
+        return 4
+
 class OpMatchSizeTypeFirst(OpRestrict):
     def check_operation(self, state, pack, op):
         i = 0
@@ -280,10 +304,15 @@ class VectorExt(object):
         # weird but the trace will store single floats in int boxes
         rop.VEC_CAST_SINGLEFLOAT_TO_FLOAT:  OpRestrict([TR_INT32_2]),
         rop.VEC_CAST_FLOAT_TO_INT:          OpRestrict([TR_DOUBLE_2]),
-        rop.VEC_CAST_INT_TO_FLOAT:          OpRestrict([TR_INT32_2]),
+        rop.VEC_CAST_INT_TO_FLOAT:          CastIntToFloatRestrict(
+                                                [IntOf4or8Restrict()]),
 
         rop.VEC_FLOAT_EQ:           OpRestrict([TR_ANY_FLOAT,TR_ANY_FLOAT]),
         rop.VEC_FLOAT_NE:           OpRestrict([TR_ANY_FLOAT,TR_ANY_FLOAT]),
+        rop.VEC_FLOAT_LT:           OpRestrict([TR_ANY_FLOAT,TR_ANY_FLOAT]),
+        rop.VEC_FLOAT_LE:           OpRestrict([TR_ANY_FLOAT,TR_ANY_FLOAT]),
+        rop.VEC_FLOAT_GT:           OpRestrict([TR_ANY_FLOAT,TR_ANY_FLOAT]),
+        rop.VEC_FLOAT_GE:           OpRestrict([TR_ANY_FLOAT,TR_ANY_FLOAT]),
         rop.VEC_INT_IS_TRUE:        OpRestrict([TR_ANY_INTEGER,TR_ANY_INTEGER]),
     }
 
@@ -290,6 +290,9 @@ class CompiledLoopToken(object):
         self.cpu = cpu
         self.number = number
         self.bridges_count = 0
+        self.guard_failures = 0   # guards that left the compiled code
+        self.bridge_limit_reached = False
+        self.bridge_sites = None  # {promote site: number of bridges}
         self.invalidate_positions = []
         # a list of weakrefs to looptokens that has been redirected to
         # this one
@@ -87,7 +87,12 @@ class AltiVectorExt(VectorExt):
             self.enable(16, accum=True)
             asm.setup_once_vector()
         self._setup = True
+AltiVectorExt.TR_MAPPING = VectorExt.TR_MAPPING.copy()
 AltiVectorExt.TR_MAPPING[rop.VEC_CAST_INT_TO_FLOAT] = OpRestrict([TR_INT64_2])
+# ordered float comparisons are not (yet) implemented by this backend
+for _opnum in (rop.VEC_FLOAT_LT, rop.VEC_FLOAT_LE,
+               rop.VEC_FLOAT_GT, rop.VEC_FLOAT_GE):
+    del AltiVectorExt.TR_MAPPING[_opnum]
 
 class VectorAssembler(object):
     _mixin_ = True
@@ -360,6 +360,36 @@ class VectorAssemblerMixin(object):
             self.mc.CMPPD_xxi(lhsloc.value, rhsloc.value, 1 << 2)
         self.flush_vec_cc(rx86.Conditions["NE"], lhsloc, resloc, sizeloc.value)
 
+    def _genop_vec_float_cmp(self, lhsloc, rhsloc, resloc, size, predicate):
+        # CMPPS/CMPPD leave a mask of all ones in each element that
+        # matches, it is turned into 0/1 per element afterwards
+        self.mc.MOVAPD(resloc, lhsloc)
+        if size == 4:
+            self.mc.CMPPS_xxi(resloc.value, rhsloc.value, predicate)
+        else:
+            self.mc.CMPPD_xxi(resloc.value, rhsloc.value, predicate)
+        self.mc.PAND(resloc, heap(self.element_ones[get_scale(size)]))
+
+    def genop_vec_float_lt(self, op, arglocs, resloc):
+        lhsloc, rhsloc, sizeloc = arglocs
+        # 1 means less than
+        self._genop_vec_float_cmp(lhsloc, rhsloc, resloc, sizeloc.value, 1)
+
+    def genop_vec_float_le(self, op, arglocs, resloc):
+        lhsloc, rhsloc, sizeloc = arglocs
+        # 2 means less or equal
+        self._genop_vec_float_cmp(lhsloc, rhsloc, resloc, sizeloc.value, 2)
+
+    def genop_vec_float_gt(self, op, arglocs, resloc):
+        lhsloc, rhsloc, sizeloc = arglocs
+        # there is no ordered 'greater than' predicate before AVX,
+        # a > b is computed as b < a
+        self._genop_vec_float_cmp(rhsloc, lhsloc, resloc, sizeloc.value, 1)
+
+    def genop_vec_float_ge(self, op, arglocs, resloc):
+        lhsloc, rhsloc, sizeloc = arglocs
+        self._genop_vec_float_cmp(rhsloc, lhsloc, resloc, sizeloc.value, 2)
+
     def genop_vec_int_eq(self, op, arglocs, resloc):
         lhsloc, rhsloc, sizeloc = arglocs
         size = sizeloc.value
@@ -574,7 +604,21 @@ class VectorAssemblerMixin(object):
         self.mc.CVTPD2DQ(resloc, arglocs[0])
 
     def genop_vec_cast_int_to_float(self, op, arglocs, resloc):
-        self.mc.CVTDQ2PD(resloc, arglocs[0])
+        srcloc, sizeloc = arglocs
+        if sizeloc.value == 4:
+            self.mc.CVTDQ2PD(resloc, srcloc)
+            return
+        assert sizeloc.value == 8
+        # there is no packed conversion from 64 bit integers before
+        # AVX-512, convert the two elements one after another
+        scratch = X86_64_SCRATCH_REG.value
+        temp = X86_64_XMM_SCRATCH_REG
+        self.mc.forget_scratch_register()
+        self.mc.PEXTRQ_rxi(scratch, srcloc.value, 1)
+        self.mc.CVTSI2SD_xr(temp.value, scratch)
+        self.mc.PEXTRQ_rxi(scratch, srcloc.value, 0)
+        self.mc.CVTSI2SD_xr(resloc.value, scratch)
+        self.mc.UNPCKLPD(resloc, temp)
 
     def genop_vec_cast_singlefloat_to_float(self, op, arglocs, resloc):
         self.mc.CVTPS2PD(resloc, arglocs[0])
@@ -722,6 +766,23 @@ class VectorRegallocMixin(object):
             return self.xrm.force_allocate_reg(var)
 
     consider_vec_float_ne = consider_vec_float_eq
+
+    def consider_vec_float_cmp(self, op):
+        assert isinstance(op, VectorOp)
+        lhs = op.getarg(0)
+        assert isinstance(lhs, VectorOp)
+        args = op.getarglist()
+        lhsloc = self.make_sure_var_in_reg(op.getarg(0), args)
+        rhsloc = self.make_sure_var_in_reg(op.getarg(1), args)
+        resloc = self.xrm.force_allocate_reg(op, args)
+        self.perform(op, [lhsloc, rhsloc, imm(lhs.bytesize)], resloc)
+
+    consider_vec_float_lt = consider_vec_float_cmp
+    consider_vec_float_le = consider_vec_float_cmp
+    consider_vec_float_gt = consider_vec_float_cmp
+    consider_vec_float_ge = consider_vec_float_cmp
+    del consider_vec_float_cmp
+
     consider_vec_int_eq = consider_vec_float_eq
     consider_vec_int_ne = consider_vec_float_eq
 
@@ -828,7 +889,14 @@ class VectorRegallocMixin(object):
         resloc = self.xrm.force_result_in_reg(op, op.getarg(0), args)
         self.perform(op, [srcloc], resloc)
 
-    consider_vec_cast_int_to_float = consider_vec_cast_float_to_int
+    def consider_vec_cast_int_to_float(self, op):
+        arg = op.getarg(0)
+        assert isinstance(arg, VectorOp)
+        args = op.getarglist()
+        srcloc = self.make_sure_var_in_reg(arg, args)
+        resloc = self.xrm.force_result_in_reg(op, arg, args)
+        self.perform(op, [srcloc, imm(arg.bytesize)], resloc)
+
     consider_vec_cast_float_to_singlefloat = consider_vec_cast_float_to_int
     consider_vec_cast_singlefloat_to_float = consider_vec_cast_float_to_int
 
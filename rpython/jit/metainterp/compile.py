@@ -540,6 +540,7 @@ def send_loop_to_backend(greenkey, jitdriver_sd, metainterp_sd, loop, type,
 
     original_jitcell_token = loop.original_jitcell_token
     original_jitcell_token.number = n = metainterp_sd.jitlog.trace_id
+    original_jitcell_token.greenkey = greenkey
 
     if not we_are_translated():
         show_procedures(metainterp_sd, loop)
@@ -719,6 +720,9 @@ class AbstractResumeGuardDescr(ResumeDescr):
         raise NotImplementedError("abstract base class")
 
     def handle_fail(self, deadframe, metainterp_sd, jitdriver_sd):
+        clt = self.rd_loop_token
+        if clt is not None:
+            clt.guard_failures += 1
         if (self.must_compile(deadframe, metainterp_sd, jitdriver_sd)
                 and not rstack.stack_almost_full()):
             self.start_compiling()
@@ -750,6 +754,9 @@ class AbstractResumeGuardDescr(ResumeDescr):
     def get_jitcounter_hash(self):
         return self.status & self.ST_SHIFT_MASK
 
+    def is_guard_value(self):
+        return (self.status & self.ST_TYPE_MASK) != 0
+
     def must_compile(self, deadframe, metainterp_sd, jitdriver_sd):
         jitcounter = metainterp_sd.warmrunnerdesc.jitcounter
         #
@@ -796,7 +803,27 @@ class AbstractResumeGuardDescr(ResumeDescr):
                           intval * 1442968193)
         #
         increment = jitdriver_sd.warmstate.increment_trace_eagerness
-        return jitcounter.tick(hash, increment)
+        if not jitcounter.tick(hash, increment):
+            return False
+        return not self.too_many_bridges(metainterp_sd, jitdriver_sd)
+
+    def too_many_bridges(self, metainterp_sd, jitdriver_sd):
+        # Guards of a loop that already got 'bridge_limit' bridges are no
+        # longer traced; they fall back to the blackhole interpreter.
+        # This stops bridge storms in e.g. megamorphic dispatch loops.
+        # Usually the loop is also retraced as a more general version, see
+        # generalize_loop().
+        clt = self.rd_loop_token
+        if clt is None:
+            return False
+        limit = jitdriver_sd.warmstate.bridge_limit
+        if limit <= 0 or clt.bridges_count < limit:
+            return False
+        if not clt.bridge_limit_reached:
+            clt.bridge_limit_reached = True
+            report_bridge_limit(metainterp_sd, jitdriver_sd, clt)
+            generalize_loop(metainterp_sd, jitdriver_sd, clt)
+        return True
 
     def start_compiling(self):
         # start tracing and compiling from this guard.
@@ -864,6 +891,65 @@ class ResumeGuardCopiedDescr(AbstractResumeGuardDescr):
         assert isinstance(prev, ResumeGuardDescr)
         return prev
 
+def report_bridge_limit(metainterp_sd, jitdriver_sd, clt):
+    metainterp_sd.profiler.count(Counters.ABORT_TOO_MANY_BRIDGES)
+    greenkey = None
+    looptoken = clt.loop_token_wref()
+    if looptoken is not None:
+        greenkey = looptoken.greenkey
+    debug_start("jit-abort-too-many-bridges")
+    if greenkey is not None:
+        loc = jitdriver_sd.warmstate.get_location_str(greenkey)
+        debug_print("loop", clt.number, "at", loc, "has",
+                    clt.bridges_count, "bridges")
+    else:
+        debug_print("loop", clt.number, "has", clt.bridges_count, "bridges")
+    debug_stop("jit-abort-too-many-bridges")
+    if greenkey is not None and metainterp_sd.warmrunnerdesc is not None:
+        hooks = metainterp_sd.warmrunnerdesc.hooks
+        if hooks.are_hooks_enabled():
+            hooks.on_abort(Counters.ABORT_TOO_MANY_BRIDGES,
+                jitdriver_sd.jitdriver, greenkey,
+                jitdriver_sd.warmstate.get_location_str(greenkey),
+                metainterp_sd.logger_ops._make_log_operations({}), [])
+
+def generalize_loop(metainterp_sd, jitdriver_sd, clt):
+    # Bridge storms usually come from one megamorphic promote(): every new
+    # value seen there fails the guard_value and gets its own bridge,
+    # which ends in another guard_value at the same place.  Stop promoting
+    # at the place that started most of the bridges of this loop, and
+    # invalidate the loop.  It is then retraced as a new, more general
+    # version, which gets its own 'bridge_limit'.  Every retrace
+    # generalizes one more promote(), so this stops when no promote()
+    # started more than one bridge; the loop then just keeps the
+    # bridges it has.
+    looptoken = clt.loop_token_wref()
+    if looptoken is None or looptoken.greenkey is None:
+        return
+    if clt.bridge_sites is None:
+        return
+    best_site = None
+    best_count = 1
+    for site, count in clt.bridge_sites.iteritems():
+        if count > best_count:
+            best_site = site
+            best_count = count
+    if best_site is None:
+        return
+    jitdriver_sd.warmstate.generalize_promote(looptoken.greenkey, best_site)
+    jitcode, pc, _, _ = best_site
+    debug_start("jit-abort-too-many-bridges")
+    debug_print("retracing loop", clt.number, "without the promote at",
+                jitcode.name, "pc", pc, "which started", best_count,
+                "bridges")
+    debug_stop("jit-abort-too-many-bridges")
+    looptoken.invalidated = True
+    metainterp_sd.cpu.invalidate_loop(looptoken)
+    if not we_are_translated():
+        metainterp_sd.cpu.stats.invalidated_token_numbers.add(
+            looptoken.number)
+
+
 class ResumeGuardDescr(AbstractResumeGuardDescr):
     _attrs_ = ('rd_numb', 'rd_consts', 'rd_virtuals',
                'rd_pendingfields', 'status')
@@ -118,6 +118,7 @@ class AbstractFailDescr(AbstractDescr):
     _attrs_ = ('adr_jump_offset', 'rd_locs', 'rd_loop_token', 'rd_vector_info')
 
     rd_vector_info = None
+    rd_loop_token = None
 
     def handle_fail(self, deadframe, metainterp_sd, jitdriver_sd):
         raise NotImplementedError
@@ -406,6 +407,8 @@ class JitCellToken(AbstractDescr):
     retraced_count = 0
     invalidated = False
     outermost_jitdriver_sd = None
+    entry_count = 0     # number of times the interpreter entered this loop
+    greenkey = None     # where the loop was compiled, if known
     # and more data specified by the backend when the loop is compiled
     number = -1
     generation = r_int64(0)
@@ -152,6 +152,8 @@ class Profiler(BaseProfiler):
         self._print_intline("abort: bad loop", cnt[Counters.ABORT_BAD_LOOP])
         self._print_intline("abort: force quasi-immut",
                             cnt[Counters.ABORT_FORCE_QUASIIMMUT])
+        self._print_intline("abort: too many bridges",
+                            cnt[Counters.ABORT_TOO_MANY_BRIDGES])
         self._print_intline("nvirtuals", cnt[Counters.NVIRTUALS])
         self._print_intline("nvholes", cnt[Counters.NVHOLES])
         self._print_intline("nvreused", cnt[Counters.NVREUSED])
@@ -126,7 +126,6 @@ class Test(SchedulerBaseTest, LLtypeMixin):
         """, False)
         self.assert_equal(loop2, loop3)
 
-    @py.test.mark.skipif("not platform.machine().startswith('x86')")
     def test_int_to_float(self):
         loop1 = self.parse_trace("""
         i10 = raw_load_i(p0, i0, descr=long)
@@ -147,6 +146,62 @@ class Test(SchedulerBaseTest, LLtypeMixin):
         """, False)
         self.assert_equal(loop2, loop3)
 
+    def test_int16_to_float(self):
+        loop1 = self.parse_trace("""
+        i10 = raw_load_i(p0, i0, descr=short)
+        i11 = raw_load_i(p0, i1, descr=short)
+        i12 = raw_load_i(p0, i2, descr=short)
+        i13 = raw_load_i(p0, i3, descr=short)
+        i14 = raw_load_i(p0, i4, descr=short)
+        i15 = raw_load_i(p0, i5, descr=short)
+        i16 = raw_load_i(p0, i6, descr=short)
+        i17 = raw_load_i(p0, i7, descr=short)
+        f10 = cast_int_to_float(i10)
+        f11 = cast_int_to_float(i11)
+        """)
+        pack1 = self.pack(loop1, 0, 8)
+        pack2 = self.pack(loop1, 8, 10)
+        # extending int16 to int32 is not worth it
+        py.test.raises(NotAProfitableLoop, self.schedule, loop1,
+                       [pack1, pack2])
+
+    def test_int64_to_float(self):
+        loop1 = self.parse_trace("""
+        i10 = raw_load_i(p0, i0, descr=long)
+        i11 = raw_load_i(p0, i1, descr=long)
+        f10 = cast_int_to_float(i10)
+        f11 = cast_int_to_float(i11)
+        """)
+        pack1 = self.pack(loop1, 0, 2)
+        pack2 = self.pack(loop1, 2, 4)
+        loop2 = self.schedule(loop1, [pack1, pack2])
+        loop3 = self.parse_trace("""
+        v10[2xi64] = vec_load_i(p0, i0, 1, 0, descr=long)
+        v20[2xf64] = vec_cast_int_to_float(v10[2xi64])
+        """, False)
+        self.assert_equal(loop2, loop3)
+
+    def test_float_ordered_compare_guard(self):
+        loop1 = self.parse_trace("""
+        f10 = raw_load_f(p0, i0, descr=double)
+        f11 = raw_load_f(p0, i1, descr=double)
+        i10 = float_gt(f10, f5)
+        i11 = float_gt(f11, f5)
+        guard_false(i10) []
+        guard_false(i11) []
+        """)
+        pack1 = self.pack(loop1, 0, 2)
+        pack2 = self.pack(loop1, 2, 4)
+        pack3 = self.pack(loop1, 4, 6)
+        loop2 = self.schedule(loop1, [pack1,pack2,pack3], prepend_invariant=True)
+        loop3 = self.parse_trace("""
+        v9[2xf64] = vec_expand_f(f5)
+        v10[2xf64] = vec_load_f(p0, i0, 1, 0, descr=double)
+        v11[2xf64] = vec_float_gt(v10[2xf64], v9[2xf64])
+        vec_guard_false(v11[2xf64]) []
+        """, False)
+        self.assert_equal(loop2, loop3)
+
     def test_scalar_pack(self):
         loop1 = self.parse_trace("""
         i10 = int_add(i0, 73)
@@ -344,6 +344,24 @@ class BaseTestVectorize(VecTestHelper):
             'vec_guard_true(v11[4xi32]) [i100]',
         ], trace)
 
+    def test_vectorize_float_compare_guard(self):
+        # the common path of a max() loop, the guard fails
+        # whenever a new maximum is found
+        trace = self.parse_loop("""
+        [p0,i0,f0]
+        f10 = getarrayitem_raw_f(p0,i0,descr=floatarraydescr)
+        i10 = float_gt(f10, f0)
+        guard_false(i10) [p0,i0]
+        i1 = int_add(i0, 1)
+        jump(p0,i1,f0)
+        """)
+        self.vectorize(trace)
+        self.ensure_operations([
+            'v10[2xf64] = vec_load_f(p0,i0,8,0,descr=floatarraydescr)',
+            'v11[2xf64] = vec_float_gt(v10[2xf64], v9[2xf64])',
+            'vec_guard_false(v11[2xf64]) [p0,i0]',
+        ], trace)
+
     def test_vectorize_skip(self):
         ops = """
         [p0,i0]
@@ -179,7 +179,7 @@ def user_loop_bail_fast_path(loop, warmstate):
     resop_count = 0 # the count of operations minus debug_merge_points
     vector_instr = 0
     guard_count = 0
-    at_least_one_array_access = True
+    at_least_one_array_access = False
     for i,op in enumerate(loop.operations):
         if rop.is_jit_debug(op.opnum):
             continue
@@ -734,8 +734,21 @@ class PackSet(object):
         if self.prohibit_packing(origin_pack, origin_pack.rightmost(),
                                  rnode.getoperation(), forward):
             return False
+        if forward and self.crosses_lanes(origin_pack, lnode, rnode):
+            return False
         return True
 
+    def crosses_lanes(self, pack, lnode, rnode):
+        """ The right operation consumes the value of the left lane (or
+            vice versa), e.g. max(a[i], a[i-1]) in a loop carrying the
+            last element. Such pairs cannot be executed side by side.
+        """
+        if pack.leftmost() in rnode.getoperation().getarglist():
+            return True
+        if pack.rightmost() in lnode.getoperation().getarglist():
+            return True
+        return False
+
     def prohibit_packing(self, pack, packed, inquestion, forward):
         """ Blocks the packing of some operations """
         if inquestion.vector == -1:
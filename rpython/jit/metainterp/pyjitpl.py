@@ -1214,6 +1214,10 @@ class MIFrame(object):
 
     @arguments("box", "orgpc")
     def _opimpl_guard_value(self, box, orgpc):
+        generalized = self.metainterp.generalized_promotes
+        if (generalized is not None and
+                self.metainterp.get_promote_site(orgpc) in generalized):
+            return      # megamorphic, see compile.generalize_loop()
         self.implement_guard_value(box, orgpc)
 
     @arguments("box", "box", "descr", "orgpc")
@@ -1870,6 +1874,24 @@ class MetaInterpStaticData(object):
         self.op_catch_exception = insns.get('catch_exception/L', -1)
         self.op_rvmprof_code = insns.get('rvmprof_code/ii', -1)
 
+    def is_skippable_promote(self, jitcode, pc):
+        # Is there a '*_guard_value' at 'pc' that comes from a promote()
+        # or from an indirect call?  The codewriter also puts one before
+        # 'jit_merge_point' and 'recursive_call_*' for each green argument;
+        # these cannot be skipped, because the greens must be constants.
+        code = jitcode.code
+        position = pc
+        while position < len(code):
+            name = self.opcode_names[ord(code[position])]
+            if (name != 'int_guard_value/i' and name != 'ref_guard_value/r'
+                    and name != 'float_guard_value/f'):
+                if position == pc:
+                    return False
+                return not (name.startswith('jit_merge_point/') or
+                            name.startswith('recursive_call_'))
+            position += 2
+        return False
+
     def setup_descrs(self, descrs):
         self.opcode_descrs = descrs
 
@@ -2031,6 +2053,7 @@ class MetaInterp(object):
 
         self.aborted_tracing_jitdriver = None
         self.aborted_tracing_greenkey = None
+        self.generalized_promotes = None
 
     def retrace_needed(self, trace, exported_state):
         self.partial_trace = trace
@@ -2447,6 +2470,9 @@ class MetaInterp(object):
         num_green_args = self.jitdriver_sd.num_green_args
         original_greenkey = original_boxes[:num_green_args]
         self.resumekey = compile.ResumeFromInterpDescr(original_greenkey)
+        self.generalized_promotes = (
+            self.jitdriver_sd.warmstate.get_generalized_promotes(
+                original_greenkey))
         self.seen_loop_header_for_jdindex = -1
         try:
             self.create_empty_history()
@@ -2467,9 +2493,14 @@ class MetaInterp(object):
         self.resumekey_original_loop_token = resumedescr.rd_loop_token.loop_token_wref()
         if self.resumekey_original_loop_token is None:
             raise compile.giveup() # should be rare
+        greenkey = self.resumekey_original_loop_token.greenkey
+        if greenkey is not None:
+            self.generalized_promotes = (
+                self.jitdriver_sd.warmstate.get_generalized_promotes(greenkey))
         self.staticdata.try_to_free_some_loops()
         try:
             inputargs = self.initialize_state_from_guard_failure(key, deadframe)
+            self.record_bridge_site(resumedescr)
             return self._handle_guard_failure(resumedescr, key, inputargs, deadframe)
         except SwitchToBlackhole as stb:
             self.run_blackhole_interp_to_cancel_tracing(stb)
@@ -2478,6 +2509,32 @@ class MetaInterp(object):
             self.staticdata.profiler.end_tracing()
             debug_stop('jit-tracing')
 
+    def record_bridge_site(self, resumedescr):
+        # With a bridge_limit, count the bridges of the loop per promote()
+        # that they start from; see compile.generalize_loop()
+        if self.jitdriver_sd.warmstate.bridge_limit <= 0:
+            return
+        if not resumedescr.is_guard_value():
+            return
+        frame = self.framestack[-1]
+        if not self.staticdata.is_skippable_promote(frame.jitcode, frame.pc):
+            return
+        clt = resumedescr.rd_loop_token
+        if clt.bridge_sites is None:
+            clt.bridge_sites = {}
+        site = self.get_promote_site(frame.pc)
+        clt.bridge_sites[site] = clt.bridge_sites.get(site, 0) + 1
+
+    def get_promote_site(self, pc):
+        # the guard_value at 'pc' in the current frame, together with the
+        # call that leads to it: promote() itself may be a jitcode of its
+        # own, shared by all its callers
+        frame = self.framestack[-1]
+        if len(self.framestack) >= 2:
+            caller = self.framestack[-2]
+            return (frame.jitcode, pc, caller.jitcode, caller.pc)
+        return (frame.jitcode, pc, None, -1)
+
     def _handle_guard_failure(self, resumedescr, key, inputargs, deadframe):
         self.current_merge_points = []
         self.resumekey = resumedescr
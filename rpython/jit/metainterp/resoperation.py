@@ -993,6 +993,10 @@ _oplist = [
     '_VEC_ARITHMETIC_LAST',
     'VEC_FLOAT_EQ/2b/i',
     'VEC_FLOAT_NE/2b/i',
+    'VEC_FLOAT_LT/2b/i',
+    'VEC_FLOAT_LE/2b/i',
+    'VEC_FLOAT_GT/2b/i',
+    'VEC_FLOAT_GE/2b/i',
     'VEC_FLOAT_XOR/2/f',
     'VEC_INT_IS_TRUE/1b/i',
     'VEC_INT_NE/2b/i',
@@ -1177,8 +1181,8 @@ _oplist = [
 _cast_ops = {
     'CAST_FLOAT_TO_INT': ('f', 8, 'i', 4, 2),
     'VEC_CAST_FLOAT_TO_INT': ('f', 8, 'i', 4, 2),
-    'CAST_INT_TO_FLOAT': ('i', 4, 'f', 8, 2),
-    'VEC_CAST_INT_TO_FLOAT': ('i', 4, 'f', 8, 2),
+    'CAST_INT_TO_FLOAT': ('i', 8, 'f', 8, 2),
+    'VEC_CAST_INT_TO_FLOAT': ('i', 8, 'f', 8, 2),
     'CAST_FLOAT_TO_SINGLEFLOAT': ('f', 8, 'i', 4, 2),
     'VEC_CAST_FLOAT_TO_SINGLEFLOAT': ('f', 8, 'i', 4, 2),
     'CAST_SINGLEFLOAT_TO_FLOAT': ('i', 4, 'f', 8, 2),
@@ -1192,8 +1196,6 @@ if not platform.machine().startswith('x86'):
     # Uh, that should be moved to vector_ext really!
     _cast_ops['CAST_FLOAT_TO_INT'] = ('f', 8, 'i', 8, 2)
     _cast_ops['VEC_CAST_FLOAT_TO_INT'] = ('f', 8, 'i', 8, 2)
-    _cast_ops['CAST_INT_TO_FLOAT'] = ('i', 8, 'f', 8, 2)
-    _cast_ops['VEC_CAST_INT_TO_FLOAT'] = ('i', 8, 'f', 8, 2)
 
 # ____________________________________________________________
 
@@ -1770,6 +1772,10 @@ _opvector = {
     rop.FLOAT_NEG: rop.VEC_FLOAT_NEG,
     rop.FLOAT_EQ:  rop.VEC_FLOAT_EQ,
     rop.FLOAT_NE:  rop.VEC_FLOAT_NE,
+    rop.FLOAT_LT:  rop.VEC_FLOAT_LT,
+    rop.FLOAT_LE:  rop.VEC_FLOAT_LE,
+    rop.FLOAT_GT:  rop.VEC_FLOAT_GT,
+    rop.FLOAT_GE:  rop.VEC_FLOAT_GE,
     rop.INT_IS_TRUE: rop.VEC_INT_IS_TRUE,
     rop.INT_EQ:  rop.VEC_INT_EQ,
     rop.INT_NE:  rop.VEC_INT_NE,
@@ -43,6 +43,9 @@ def _get_jitcodes(testself, CPUClass, func, values,
         def get_location_str(self, args):
             return 'location'
 
+        def get_generalized_promotes(self, greenkey):
+            return None
+
         class JitCell:
             @staticmethod
             def get_jit_cell_at_key(greenkey):
@@ -51,6 +54,7 @@ def _get_jitcodes(testself, CPUClass, func, values,
         _cell = FakeJitCell()
 
         trace_limit = sys.maxint
+        bridge_limit = 0
         enable_opts = ALL_OPTS_DICT
         vec = True
 
@@ -1,8 +1,9 @@
 
 import py
 from rpython.rlib.jit import JitDriver, JitHookInterface, Counters, dont_look_inside
+from rpython.rlib.jit import promote
 from rpython.rlib import jit_hooks
-from rpython.jit.metainterp.test.support import LLJitMixin
+from rpython.jit.metainterp.test.support import LLJitMixin, get_stats
 from rpython.jit.codewriter.policy import JitPolicy
 from rpython.jit.metainterp.resoperation import rop
 from rpython.rtyper.annlowlevel import hlstr, cast_instance_to_gcref
@@ -157,6 +158,120 @@ class JitHookInterfaceTests(object):
             assert jit_hooks.stats_get_times_value(None, Counters.TRACING) == 0
         self.meta_interp(main, [], ProfilerClass=EmptyProfiler)
 
+    def test_get_loop_summary(self):
+        driver = JitDriver(greens = [], reds = ['i', 's'])
+
+        def loop(i):
+            s = 0
+            while i > 0:
+                driver.jit_merge_point(i=i, s=s)
+                if i % 2:
+                    s += 1
+                i -= 1
+                s += 2
+            return s
+
+        def main():
+            for j in range(5):
+                loop(30)
+            l = jit_hooks.stats_get_loop_summary(None)
+            assert len(l) == 1
+            assert l[0].entries >= 5
+            # the loop exit is a guard failure at least in the calls
+            # that run after the bridges were compiled
+            assert l[0].guard_failures >= 1
+            assert l[0].bridges == jit_hooks.stats_get_counter_value(None,
+                                          Counters.TOTAL_COMPILED_BRIDGES)
+            assert l[0].bridges > 0
+
+        self.meta_interp(main, [], ProfilerClass=Profiler)
+
+    def test_bridge_limit(self):
+        reasons = []
+
+        class MyJitIface(JitHookInterface):
+            def on_abort(self, reason, jitdriver, greenkey, greenkey_repr,
+                         logops, ops):
+                reasons.append((reason, greenkey_repr, len(ops)))
+
+        driver = JitDriver(greens = [], reds = ['i', 's'],
+                           get_printable_location=lambda: 'dispatch')
+
+        def loop(i):
+            s = 0
+            while i > 0:
+                driver.jit_merge_point(i=i, s=s)
+                k = i % 5
+                if k == 0:
+                    s += 1
+                elif k == 1:
+                    s += 3
+                elif k == 2:
+                    s -= 2
+                elif k == 3:
+                    s += 7
+                else:
+                    s *= 2
+                i -= 1
+            return s
+
+        def main():
+            loop(100)
+            loop(100)
+            return jit_hooks.stats_get_counter_value(None,
+                                            Counters.TOTAL_COMPILED_BRIDGES)
+
+        res = self.meta_interp(main, [], ProfilerClass=Profiler,
+                               policy=JitPolicy(MyJitIface()))
+        assert res > 2
+        reasons = []
+        res = self.meta_interp(main, [], ProfilerClass=Profiler,
+                               policy=JitPolicy(MyJitIface()), bridge_limit=2)
+        assert res == 2
+        assert reasons == [(Counters.ABORT_TOO_MANY_BRIDGES, 'dispatch', 0)]
+        assert loop(100) == self.meta_interp(loop, [100], bridge_limit=1)
+
+    def test_bridge_limit_generalize(self):
+        reasons = []
+
+        class MyJitIface(JitHookInterface):
+            def on_abort(self, reason, jitdriver, greenkey, greenkey_repr,
+                         logops, ops):
+                reasons.append(reason)
+
+        driver = JitDriver(greens = [], reds = ['i', 's'])
+
+        def loop(i):
+            s = 0
+            while i > 0:
+                driver.jit_merge_point(i=i, s=s)
+                k = promote(i % 13)
+                s += k * k
+                i -= 1
+            return s
+
+        def main(n):
+            loop(n)
+            return (jit_hooks.stats_get_counter_value(None,
+                                            Counters.TOTAL_COMPILED_LOOPS),
+                    jit_hooks.stats_get_counter_value(None,
+                                            Counters.TOTAL_COMPILED_BRIDGES))
+
+        def f(n):
+            loops, bridges = main(n)
+            return loops * 1000 + bridges
+
+        res = self.meta_interp(f, [500], ProfilerClass=Profiler)
+        assert res % 1000 > 3
+        res = self.meta_interp(f, [500], ProfilerClass=Profiler,
+                               policy=JitPolicy(MyJitIface()), bridge_limit=3)
+        # the loop got 3 bridges from the promote(), and was then retraced
+        # without it: the second version needs no bridges at all
+        assert res == 2 * 1000 + 3
+        assert reasons == [Counters.ABORT_TOO_MANY_BRIDGES]
+        assert len(get_stats().invalidated_token_numbers) == 1
+        assert self.meta_interp(loop, [500], bridge_limit=3) == loop(500)
+
     def test_get_jitcell_at_key(self):
         driver = JitDriver(greens = ['s'], reds = ['i'], name='jit')
 
@@ -114,3 +114,26 @@ def test_get_name_from_address():
     assert metainterp_sd.get_name_from_address(123) == 'a'
     assert metainterp_sd.get_name_from_address(456) == 'b'
     assert metainterp_sd.get_name_from_address(789) == ''
+
+def test_is_skippable_promote():
+    class FakeMetaInterpSd(pyjitpl.MetaInterpStaticData):
+        def __init__(self):
+            pass
+    metainterp_sd = FakeMetaInterpSd()
+    metainterp_sd.opcode_names = ['int_guard_value/i', 'ref_guard_value/r',
+                                  'jit_merge_point/iIRFIRF',
+                                  'recursive_call_i/iIRFIRF',
+                                  'residual_call_r_i/iRd>i']
+    # promote() or indirect call: can be skipped
+    jitcode = JitCode("test")
+    jitcode.setup('\x00\x05\x04\x00\x06\x07\x08')
+    assert metainterp_sd.is_skippable_promote(jitcode, 0)
+    assert not metainterp_sd.is_skippable_promote(jitcode, 2)
+    # green arguments: cannot be skipped
+    jitcode = JitCode("test")
+    jitcode.setup('\x00\x05\x01\x06\x02\x00\x00\x00\x00\x00\x00\x00')
+    assert not metainterp_sd.is_skippable_promote(jitcode, 0)
+    assert not metainterp_sd.is_skippable_promote(jitcode, 2)
+    jitcode = JitCode("test")
+    jitcode.setup('\x01\x06\x03\x00\x00\x00\x00\x00\x00\x00')
+    assert not metainterp_sd.is_skippable_promote(jitcode, 0)
@@ -327,6 +327,50 @@ class VectorizeTests(object):
         res = self.meta_interp(f, [30], vec=True)
         assert res == f(30) == 128
 
+    @py.test.mark.parametrize('size', [30, 61])
+    def test_vec_max_vec_all(self, size):
+        myjitdriver = JitDriver(greens = [], reds = 'auto')
+        T = lltype.Array(rffi.DOUBLE, hints={'nolength': True})
+        def f(d):
+            va = lltype.malloc(T, d, flavor='raw', zero=True)
+            for j in range(d):
+                va[j] = float(j % 7)
+            va[d // 2] = 128.0
+            m = -128.0
+            i = 0
+            while i < d:
+                myjitdriver.jit_merge_point()
+                a = va[i]
+                if a > m:
+                    m = a
+                i += 1
+            lltype.free(va, flavor='raw')
+            return m
+        res = self.meta_interp(f, [size], vec=False, vec_all=True)
+        assert res == f(size) == 128.0
+
+    def test_int64_float_casts(self):
+        myjitdriver = JitDriver(greens = [], reds = 'auto', vectorize=True)
+        T = lltype.Array(lltype.Signed, hints={'nolength': True})
+        F = lltype.Array(rffi.DOUBLE, hints={'nolength': True})
+        def f(d):
+            va = lltype.malloc(T, d, flavor='raw', zero=True)
+            vb = lltype.malloc(F, d, flavor='raw', zero=True)
+            for j in range(d):
+                # does not fit into 32 bits
+                va[j] = (j + 1) * (2**40 + 1)
+            i = 0
+            while i < d:
+                myjitdriver.jit_merge_point()
+                vb[i] = float(va[i]) * 0.5
+                i += 1
+            res = vb[d - 1]
+            lltype.free(va, flavor='raw')
+            lltype.free(vb, flavor='raw')
+            return res
+        res = self.meta_interp(f, [40], vec=True)
+        assert res == f(40) == 40 * (2**40 + 1) * 0.5
+
     @py.test.mark.parametrize('type,func,init,insert,at,count,breaks',
             # all
            [(rffi.DOUBLE, lambda x: not bool(x), 1.0, None, -1,32, False),
@@ -237,6 +237,10 @@ class WarmEnterState(object):
             self.profiler = warmrunnerdesc.metainterp_sd.profiler
         except AttributeError:       # for tests
             self.profiler = None
+        # {greenkey hash: {promote site: None}}: the promote() sites that
+        # are not promoted any more when tracing the loop at that greenkey;
+        # see MetaInterp.get_promote_site()
+        self.generalized_promotes = {}
         # initialize the state with the default values of the
         # parameters specified in rlib/jit.py
         if self.warmrunnerdesc is not None:
@@ -259,6 +263,9 @@ class WarmEnterState(object):
     def set_param_trace_limit(self, value):
         self.trace_limit = value
 
+    def set_param_bridge_limit(self, value):
+        self.bridge_limit = value
+
     def set_param_decay(self, decay):
         self.warmrunnerdesc.jitcounter.set_decay(decay)
 
@@ -385,6 +392,7 @@ class WarmEnterState(object):
                 virtualizable = args[index_of_virtualizable]
                 vinfo.clear_vable_token(virtualizable)
             
+            loop_token.entry_count += 1
             deadframe = func_execute_token(loop_token, *args)
             #
             # Record in the memmgr that we just ran this loop,
@@ -667,6 +675,28 @@ class WarmEnterState(object):
             cell.flags |= JC_DONT_TRACE_HERE
         self.dont_trace_here = dont_trace_here
 
+        def generalize_promote(greenkey, site):
+            # Don't promote at 'site' any more when tracing the loop at
+            # 'greenkey' or its bridges; see compile.generalize_loop().
+            # Greenkeys with the same hash share their sites, which is
+            # harmless: a promote() is only an optimization hint.
+            greenargs = unwrap_greenkey(greenkey)
+            hash = JitCell.get_uhash(*greenargs)
+            sites = self.generalized_promotes.get(hash, None)
+            if sites is None:
+                sites = {}
+                self.generalized_promotes[hash] = sites
+            sites[site] = None
+        self.generalize_promote = generalize_promote
+
+        def get_generalized_promotes(greenkey):
+            if not self.generalized_promotes:
+                return None     # common case
+            greenargs = unwrap_greenkey(greenkey)
+            hash = JitCell.get_uhash(*greenargs)
+            return self.generalized_promotes.get(hash, None)
+        self.get_generalized_promotes = get_generalized_promotes
+
         if jd._should_unroll_one_iteration_ptr is None:
             def should_unroll_one_iteration(greenkey):
                 return False
@@ -24,6 +24,7 @@ REGEXES = [
     (('abort.vable_escape',), '^abort: vable escape:\s+(\d+)$'),
     (('abort.bad_loop',), '^abort: bad loop:\s+(\d+)$'),
     (('abort.force_quasiimmut',), '^abort: force quasi-immut:\s+(\d+)$'),
+    (('abort.too_many_bridges',), '^abort: too many bridges:\s+(\d+)$'),
     (('nvirtuals',), '^nvirtuals:\s+(\d+)$'),
     (('nvholes',), '^nvholes:\s+(\d+)$'),
     (('nvreused',), '^nvreused:\s+(\d+)$'),
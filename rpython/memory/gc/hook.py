@@ -21,6 +21,14 @@ class GcHooks(object):
     def is_gc_collect_enabled(self):
         return False
 
+    def get_alloc_sample_period(self):
+        """
+        Return the number of bytes to allocate in the nursery between two
+        calls to on_gc_alloc_sample(), or 0 to disable allocation sampling.
+        Changes are taken into account at the next minor collection.
+        """
+        return 0
+
     def on_gc_minor(self, duration, total_memory_used, pinned_objects):
         """
         Called after a minor collection
@@ -45,6 +53,28 @@ class GcHooks(object):
         Called after a major collection is fully done
         """
 
+    def on_gc_alloc_sample(self, size):
+        """
+        Called when an allocation in the nursery is sampled, before the
+        object is initialized.  Return a non-negative integer to follow
+        the object: it is then passed to on_gc_alloc_sample_promoted() and
+        on_gc_alloc_sample_freed().  Return -1 to ignore it.
+        """
+        return -1
+
+    def on_gc_alloc_sample_promoted(self, sample):
+        """
+        Called when a sampled object survives its first minor collection
+        and is moved out of the nursery
+        """
+
+    def on_gc_alloc_sample_freed(self, sample, major_collections):
+        """
+        Called when a sampled object is found to be dead.
+        ``major_collections`` is the number of major collections that it
+        survived, or -1 if it died in the nursery.
+        """
+
     # the fire_* methods are meant to be called from the GC are should NOT be
     # overridden
 
@@ -68,3 +98,15 @@ class GcHooks(object):
                                arenas_count_before, arenas_count_after,
                                arenas_bytes, rawmalloc_bytes_before,
                                rawmalloc_bytes_after)
+
+    @rgc.no_collect
+    def fire_gc_alloc_sample(self, size):
+        return self.on_gc_alloc_sample(size)
+
+    @rgc.no_collect
+    def fire_gc_alloc_sample_promoted(self, sample):
+        self.on_gc_alloc_sample_promoted(sample)
+
+    @rgc.no_collect
+    def fire_gc_alloc_sample_freed(self, sample, major_collections):
+        self.on_gc_alloc_sample_freed(sample, major_collections)
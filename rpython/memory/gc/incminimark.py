@@ -190,6 +190,14 @@ FORWARDSTUB = lltype.GcStruct('forwarding_stub',
 FORWARDSTUBPTR = lltype.Ptr(FORWARDSTUB)
 NURSARRAY = lltype.Array(llmemory.Address)
 
+def _sample_to_adr(n):
+    # store a non-negative number in an AddressStack; only odd numbers,
+    # like in GCBase._next_id(), to avoid clashes with real addresses
+    return llmemory.cast_int_to_adr(n * 2 + 1)
+
+def _adr_to_sample(adr):
+    return llmemory.cast_adr_to_int(adr) >> 1
+
 # ____________________________________________________________
 
 class IncrementalMiniMarkGC(MovingGCBase):
@@ -314,6 +322,13 @@ class IncrementalMiniMarkGC(MovingGCBase):
         self.nursery_free = llmemory.NULL
         self.nursery_top  = llmemory.NULL
         self.debug_tiny_nursery = -1
+        #
+        # Allocation sampling (see GcHooks.get_alloc_sample_period()).
+        # While 'alloc_sample_real_top' is not NULL, 'nursery_top' was
+        # lowered to the next sampling point and this is the real value.
+        self.alloc_sample_period = 0
+        self.alloc_sample_remaining = 0
+        self.alloc_sample_real_top = llmemory.NULL
         self.debug_rotating_nurseries = lltype.nullptr(NURSARRAY)
         self.extra_threshold = 0
         #
@@ -398,6 +413,13 @@ class IncrementalMiniMarkGC(MovingGCBase):
         self.young_objects_with_weakrefs = self.AddressStack()
         self.old_objects_with_weakrefs = self.AddressStack()
         #
+        # The objects whose allocation was sampled and which are followed
+        # by the GC hooks: pairs (obj, sample) for the young ones, and
+        # triples (obj, sample, num_major_collects when promoted) for the
+        # old ones.  The numbers are stored with _sample_to_adr().
+        self.young_alloc_samples = self.AddressStack()
+        self.old_alloc_samples = self.AddressStack()
+        #
         # Support for id and identityhash: map nursery objects with
         # GCFLAG_HAS_SHADOW to their future location at the next
         # minor collection.
@@ -755,6 +777,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
         else:
             self.minor_and_major_collection()
         self.rrc_invoke_callback()
+        self._cut_nursery_top()
 
 
     def minor_collection_with_major_progress(self, extrasize=0):
@@ -802,6 +825,22 @@ class IncrementalMiniMarkGC(MovingGCBase):
         major collection, and finally reserve totalsize bytes.
         """
 
+        take_sample = False
+        overshoot = 0
+        if self.alloc_sample_real_top:
+            # 'nursery_top' was lowered by _cut_nursery_top(): this
+            # allocation crosses the sampling point.  Usually there is
+            # enough room in the real nursery for it.
+            overshoot = self.nursery_free - self.nursery_top
+            self.nursery_top = self.alloc_sample_real_top
+            self.alloc_sample_real_top = llmemory.NULL
+            if self.nursery_free <= self.nursery_top:
+                result = self.nursery_free - totalsize
+                self._take_alloc_sample(result, totalsize, overshoot)
+                self._cut_nursery_top()
+                return result
+            take_sample = True
+
         minor_collection_count = 0
         while True:
             self.nursery_free = llmemory.NULL      # debug: don't use me
@@ -878,9 +917,52 @@ class IncrementalMiniMarkGC(MovingGCBase):
             if self.nursery_top - self.nursery_free > self.debug_tiny_nursery:
                 self.nursery_free = self.nursery_top - self.debug_tiny_nursery
         #
+        if take_sample:
+            self._take_alloc_sample(result, totalsize, overshoot)
+        self._cut_nursery_top()
         return result
     collect_and_reserve._dont_inline_ = True
 
+    def _cut_nursery_top(self):
+        """If allocation sampling is enabled, lower 'nursery_top' to the
+        next sampling point, so that the allocation that crosses it goes
+        through collect_and_reserve().  This works for the allocations
+        inlined in the JIT-compiled code too.
+        """
+        period = self.hooks.get_alloc_sample_period()
+        if period != self.alloc_sample_period:
+            self.alloc_sample_period = period
+            self.alloc_sample_remaining = period
+        if period > 0:
+            available = self.nursery_top - self.nursery_free
+            if available > self.alloc_sample_remaining:
+                self.alloc_sample_real_top = self.nursery_top
+                self.nursery_top = (self.nursery_free +
+                                    self.alloc_sample_remaining)
+            else:
+                # the sampling point is not in this part of the nursery
+                self.alloc_sample_remaining -= available
+
+    def _uncut_nursery_top(self):
+        if self.alloc_sample_real_top:
+            self.alloc_sample_remaining = self.nursery_top - self.nursery_free
+            self.nursery_top = self.alloc_sample_real_top
+            self.alloc_sample_real_top = llmemory.NULL
+
+    def _take_alloc_sample(self, result, totalsize, overshoot):
+        # 'overshoot' is the number of bytes of this allocation after the
+        # sampling point.  The next sampling point is 'period' bytes after
+        # this one, not after the end of this allocation, otherwise the
+        # sampling rate would depend on the size of the sampled objects.
+        period = self.alloc_sample_period
+        ll_assert(period > 0, "allocation sample with sampling disabled")
+        self.alloc_sample_remaining = period - overshoot % period
+        sample = self.hooks.fire_gc_alloc_sample(raw_malloc_usage(totalsize))
+        if sample >= 0:
+            obj = result + self.gcheaderbuilder.size_gc_header
+            self.young_alloc_samples.append(obj)
+            self.young_alloc_samples.append(_sample_to_adr(sample))
+
 
     # XXX kill alloc_young and make it always True
     def external_malloc(self, typeid, length, alloc_young):
@@ -1038,6 +1120,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
         if self.next_major_collection_threshold < 0:
             # cannot trigger a full collection now, but we can ensure
             # that one will occur very soon
+            self._uncut_nursery_top()
             self.nursery_free = self.nursery_top
 
     def can_optimize_clean_setarrayitems(self):
@@ -1647,6 +1730,10 @@ class IncrementalMiniMarkGC(MovingGCBase):
         start = read_timestamp()
         debug_start("gc-minor")
         #
+        # If we don't come from collect_and_reserve(), 'nursery_top' may
+        # still be lowered for allocation sampling.
+        self._uncut_nursery_top()
+        #
         # All nursery barriers are invalid from this point on.  They
         # are evaluated anew as part of the minor collection.
         self.nursery_barriers.delete()
@@ -1745,6 +1832,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
             self.invalidate_young_weakrefs()
         if self.young_objects_with_destructors.non_empty():
             self.deal_with_young_objects_with_destructors()
+        if self.young_alloc_samples.non_empty():
+            self.update_young_alloc_samples()
         #
         # Clear this mapping.  Without pinned objects we just clear the dict
         # as all objects in the nursery are dragged out of the nursery and, if
@@ -2358,6 +2447,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
                     # (if we call deal_with_objects_with_finalizers(), it will
                     # invoke invalidate_old_weakrefs() itself directly)
                     self.invalidate_old_weakrefs()
+                if self.old_alloc_samples.non_empty():
+                    self.update_old_alloc_samples()
 
                 ll_assert(not self.objects_to_trace.non_empty(),
                           "objects_to_trace should be empty")
@@ -2976,6 +3067,46 @@ class IncrementalMiniMarkGC(MovingGCBase):
         self.old_objects_with_weakrefs.delete()
         self.old_objects_with_weakrefs = new_with_weakref
 
+    def update_young_alloc_samples(self):
+        """Called during a nursery collection."""
+        new_samples = self.AddressStack()
+        while self.young_alloc_samples.non_empty():
+            sample = _adr_to_sample(self.young_alloc_samples.pop())
+            obj = self.young_alloc_samples.pop()
+            if self.is_forwarded(obj):
+                self.old_alloc_samples.append(self.get_forwarding_address(obj))
+                self.old_alloc_samples.append(_sample_to_adr(sample))
+                self.old_alloc_samples.append(
+                    _sample_to_adr(self.num_major_collects))
+                self.hooks.fire_gc_alloc_sample_promoted(sample)
+            elif self.header(obj).tid & GCFLAG_VISITED:
+                # a surviving pinned object: it stays in the nursery, so
+                # it is still young at the next minor collection
+                new_samples.append(obj)
+                new_samples.append(_sample_to_adr(sample))
+            else:
+                self.hooks.fire_gc_alloc_sample_freed(sample, -1)
+        self.young_alloc_samples.delete()
+        self.young_alloc_samples = new_samples
+
+    def update_old_alloc_samples(self):
+        """Called during a major collection."""
+        new_samples = self.AddressStack()
+        while self.old_alloc_samples.non_empty():
+            promoted_at = self.old_alloc_samples.pop()
+            sample = self.old_alloc_samples.pop()
+            obj = self.old_alloc_samples.pop()
+            if self.header(obj).tid & GCFLAG_VISITED:
+                new_samples.append(obj)
+                new_samples.append(sample)
+                new_samples.append(promoted_at)
+            else:
+                self.hooks.fire_gc_alloc_sample_freed(
+                    _adr_to_sample(sample),
+                    self.num_major_collects - _adr_to_sample(promoted_at))
+        self.old_alloc_samples.delete()
+        self.old_alloc_samples = new_samples
+
     def get_stats(self, stats_no):
         from rpython.memory.gc import inspector
 
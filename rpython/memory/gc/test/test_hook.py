@@ -2,6 +2,8 @@ from rpython.rtyper.lltypesystem import lltype, llmemory
 from rpython.memory.gc.hook import GcHooks
 from rpython.memory.gc.test.test_direct import BaseDirectGCTest, S
 
+# no GC pointers: can be pinned
+T = lltype.GcStruct('T', ('x', lltype.Signed))
 
 class MyGcHooks(GcHooks):
 
@@ -10,6 +12,7 @@ class MyGcHooks(GcHooks):
         self._gc_minor_enabled = False
         self._gc_collect_step_enabled = False
         self._gc_collect_enabled = False
+        self.alloc_sample_period = 0
         self.reset()
 
     def is_gc_minor_enabled(self):
@@ -21,11 +24,17 @@ class MyGcHooks(GcHooks):
     def is_gc_collect_enabled(self):
         return self._gc_collect_enabled
 
+    def get_alloc_sample_period(self):
+        return self.alloc_sample_period
+
     def reset(self):
         self.minors = []
         self.steps = []
         self.collects = []
         self.durations = []
+        self.samples = []
+        self.promoted = []
+        self.freed = []
 
     def on_gc_minor(self, duration, total_memory_used, pinned_objects):
         self.durations.append(duration)
@@ -51,6 +60,16 @@ class MyGcHooks(GcHooks):
             'rawmalloc_bytes_before': rawmalloc_bytes_before,
             'rawmalloc_bytes_after': rawmalloc_bytes_after})
 
+    def on_gc_alloc_sample(self, size):
+        self.samples.append(size)
+        return len(self.samples) - 1
+
+    def on_gc_alloc_sample_promoted(self, sample):
+        self.promoted.append(sample)
+
+    def on_gc_alloc_sample_freed(self, sample, major_collections):
+        self.freed.append((sample, major_collections))
+
 
 class TestIncMiniMarkHooks(BaseDirectGCTest):
     from rpython.memory.gc.incminimark import IncrementalMiniMarkGC as GCClass
@@ -123,3 +142,68 @@ class TestIncMiniMarkHooks(BaseDirectGCTest):
         assert self.gc.hooks.minors == []
         assert self.gc.hooks.steps == []
         assert self.gc.hooks.collects == []
+        assert self.gc.hooks.samples == []
+
+    def test_alloc_sampling(self):
+        hooks = self.gc.hooks
+        hooks.alloc_sample_period = self.size_of_S * 2
+        self.gc.collect(0)     # starts sampling
+        objs = [self.malloc(S) for i in range(6)]
+        # the allocations that contain the bytes at 2*S and 4*S are sampled
+        assert hooks.samples == [self.size_of_S, self.size_of_S]
+        self.stackroots.append(objs[2])
+        self.gc._minor_collection()
+        assert hooks.promoted == [0]
+        assert hooks.freed == [(1, -1)]
+        hooks.alloc_sample_period = 0
+        self.gc.collect()
+        assert hooks.freed == [(1, -1)]
+        self.stackroots.pop()
+        self.gc.collect()
+        assert hooks.freed == [(1, -1), (0, 1)]
+        self.malloc(S)
+        self.gc._minor_collection()
+        assert len(hooks.samples) == 2
+
+    def test_alloc_sampling_nursery_full(self):
+        hooks = self.gc.hooks
+        hooks.alloc_sample_period = self.gc.nursery_size // 3
+        self.gc.collect(0)
+        n = self.gc.nursery_size // self.size_of_S * 2
+        for i in range(n):
+            self.malloc(S)
+        assert 5 <= len(hooks.samples) <= 6
+        assert hooks.promoted == []
+
+    def test_alloc_sampling_rate(self):
+        # the sampling points are exactly 'period' bytes apart, even if
+        # the sampled allocations end after them
+        hooks = self.gc.hooks
+        hooks.alloc_sample_period = self.size_of_S * 3 // 2
+        self.gc.collect(0)
+        objs = [self.malloc(S) for i in range(12)]
+        # one sample every 1.5*S bytes, starting at 1.5*S, in 12*S bytes
+        assert len(hooks.samples) == 7
+
+    def test_alloc_sampling_pinned(self):
+        hooks = self.gc.hooks
+        self.gc.max_number_of_pinned_objects = 1
+        size = llmemory.sizeof(T) + self.gc.gcheaderbuilder.size_gc_header
+        size_of_T = llmemory.raw_malloc_usage(size)
+        hooks.alloc_sample_period = size_of_T
+        self.gc.collect(0)
+        self.malloc(T)
+        ptr = self.malloc(T)
+        assert hooks.samples == [size_of_T]
+        hooks.alloc_sample_period = 0
+        self.stackroots.append(ptr)
+        adr = llmemory.cast_ptr_to_adr(ptr)
+        assert self.gc.pin(adr)
+        self.gc._minor_collection()
+        # still young: neither promoted nor freed
+        assert hooks.promoted == []
+        assert hooks.freed == []
+        self.gc.unpin(adr)
+        self.gc._minor_collection()
+        assert hooks.promoted == [0]
+        assert hooks.freed == []
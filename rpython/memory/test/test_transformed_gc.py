@@ -1396,6 +1396,11 @@ class GcHooksStats(object):
     minors = 0
     steps = 0
     collects = 0
+    alloc_sample_period = 0
+    samples = 0
+    promoted = 0
+    freed_young = 0
+    freed_old = 0
 
     def reset(self):
         # the NonConstant are needed so that the annotator annotates the
@@ -1405,6 +1410,11 @@ class GcHooksStats(object):
         self.minors = NonConstant(0)
         self.steps = NonConstant(0)
         self.collects = NonConstant(0)
+        self.alloc_sample_period = NonConstant(0)
+        self.samples = NonConstant(0)
+        self.promoted = NonConstant(0)
+        self.freed_young = NonConstant(0)
+        self.freed_old = NonConstant(0)
 
 
 class MyGcHooks(GcHooks):
@@ -1433,6 +1443,22 @@ class MyGcHooks(GcHooks):
                       rawmalloc_bytes_after):
         self.stats.collects += 1
 
+    def get_alloc_sample_period(self):
+        return self.stats.alloc_sample_period
+
+    def on_gc_alloc_sample(self, size):
+        self.stats.samples += 1
+        return self.stats.samples
+
+    def on_gc_alloc_sample_promoted(self, sample):
+        self.stats.promoted += 1
+
+    def on_gc_alloc_sample_freed(self, sample, major_collections):
+        if major_collections < 0:
+            self.stats.freed_young += 1
+        else:
+            self.stats.freed_old += 1
+
 
 class TestIncrementalMiniMarkGC(TestMiniMarkGC):
     gcname = "incminimark"
@@ -1514,6 +1540,42 @@ class TestIncrementalMiniMarkGC(TestMiniMarkGC):
         assert steps == 4 * collects   # 4 steps for each major collection
         assert minors == steps         # one minor collection for each step
 
+    def define_gc_alloc_sampling(cls):
+        S = lltype.GcStruct('S', ('x', lltype.Signed))
+        stats = cls.gchooks.stats
+        def allocate(n):
+            keep = []
+            for i in range(n):
+                s = lltype.malloc(S)
+                if i < n // 2:
+                    keep.append(s)
+            # the first half is promoted, the second half dies young
+            llop.gc__collect(lltype.Void)
+            return len(keep)
+        def f():
+            stats.reset()
+            stats.alloc_sample_period = 5 * WORD
+            llop.gc__collect(lltype.Void)     # starts sampling
+            allocate(60)
+            stats.alloc_sample_period = 0
+            llop.gc__collect(lltype.Void)     # the promoted objects die
+            return (1000000 * stats.samples +
+                      10000 * stats.promoted +
+                        100 * stats.freed_young +
+                          1 * stats.freed_old)
+        return f
+
+    def test_gc_alloc_sampling(self):
+        run = self.runner("gc_alloc_sampling")
+        count = run([])
+        samples, count = divmod(count, 1000000)
+        promoted, count = divmod(count, 10000)
+        freed_young, freed_old = divmod(count, 100)
+        assert promoted > 0
+        assert freed_young > 0
+        assert samples == promoted + freed_young
+        assert freed_old == promoted
+
 # ________________________________________________________________
 # tagged pointers
 
@@ -547,6 +547,7 @@ PARAMETER_DOCS = {
     'trace_eagerness': 'number of times a guard has to fail before we start compiling a bridge',
     'decay': 'amount to regularly decay counters by (0=none, 1000=max)',
     'trace_limit': 'number of recorded operations before we abort tracing with ABORT_TOO_LONG',
+    'bridge_limit': 'number of bridges a loop can get before it is retraced without its most megamorphic promote, or its failing guards stop being traced (ABORT_TOO_MANY_BRIDGES); 0=no limit',
     'inlining': 'inline python functions or not (1/0)',
     'loop_longevity': 'a parameter controlling how long loops will be kept before being freed, an estimate',
     'retrace_limit': 'how many times we can try retracing before giving up',
@@ -568,6 +569,7 @@ PARAMETERS = {'threshold': 1039, # just above 1024, prime
               'trace_eagerness': 200,
               'decay': 40,
               'trace_limit': 6000,
+              'bridge_limit': 0,
               'inlining': 1,
               'loop_longevity': 1000,
               'retrace_limit': 0,
@@ -1324,6 +1326,7 @@ class Counters(object):
     ABORT_BAD_LOOP
     ABORT_ESCAPE
     ABORT_FORCE_QUASIIMMUT
+    ABORT_TOO_MANY_BRIDGES
     NVIRTUALS
     NVHOLES
     NVREUSED
@@ -129,6 +129,33 @@ LOOP_RUN_CONTAINER = lltype.GcArray(lltype.Struct('elem',
 def stats_get_loop_run_times(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.get_all_loop_runs()
 
+LOOP_SUMMARY_CONTAINER = lltype.GcArray(lltype.Struct('elem',
+                                              ('number', lltype.Signed),
+                                              ('entries', lltype.Signed),
+                                              ('guard_failures', lltype.Signed),
+                                              ('bridges', lltype.Signed)))
+
+@register_helper(lltype.Ptr(LOOP_SUMMARY_CONTAINER))
+def stats_get_loop_summary(warmrunnerdesc):
+    """ Returns, for every loop currently alive, the number of times it
+    was entered from the interpreter, the number of guard failures that
+    left the compiled code and the number of bridges attached to it.
+    These counters are always maintained, so no debugging mode is needed.
+    """
+    looptokens = []
+    for looptoken in warmrunnerdesc.memory_manager.alive_loops.keys():
+        if looptoken.compiled_loop_token is not None:
+            looptokens.append(looptoken)
+    l = lltype.malloc(LOOP_SUMMARY_CONTAINER, len(looptokens))
+    for i in range(len(looptokens)):
+        looptoken = looptokens[i]
+        clt = looptoken.compiled_loop_token
+        l[i].number = looptoken.number
+        l[i].entries = looptoken.entry_count
+        l[i].guard_failures = clt.guard_failures
+        l[i].bridges = clt.bridges_count
+    return l
+
 @register_helper(annmodel.SomeInteger(unsigned=True))
 def stats_asmmemmgr_allocated(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_stats()[0]
@@ -891,6 +891,14 @@ def prepare_dict_update(dict, n_elements):
         dict._prepare_dict_update(n_elements)
         # ^^ call an extra method that doesn't exist before translation
 
+@specialize.call_location()
+def dict_compact(dict):
+    """RPython hint that the given dict (or r_dict) had many items
+    removed: shrink its memory to fit the items that are left."""
+    if we_are_translated():
+        dict._dict_compact()
+        # ^^ call an extra method that doesn't exist before translation
+
 @specialize.call_location()
 def reversed_dict(d):
     """Equivalent to reversed(ordered_dict), but works also for
@@ -83,6 +83,23 @@ else:
 
 KARATSUBA_SQUARE_CUTOFF = 2 * KARATSUBA_CUTOFF
 
+# Toom-Cook 3-way multiplication is O(N**1.465).  It splits the operands
+# in three pieces instead of two, but has a larger overhead: only use it
+# if both operands contain more than TOOM_COOK_CUTOFF digits.
+TOOM_COOK_CUTOFF = 8 * KARATSUBA_CUTOFF
+
+# For long division, use the O(N**2) school algorithm unless both the
+# divisor and the quotient contain more than BURNIKEL_ZIEGLER_CUTOFF
+# digits.  Above that, use the recursive algorithm of Burnikel and
+# Ziegler, whose complexity is the one of the multiplication.
+BURNIKEL_ZIEGLER_CUTOFF = 3 * KARATSUBA_CUTOFF
+
+# When converting a string to a long, the digits are first collected in
+# groups that fit in a single digit each.  Up to FROMSTR_CUTOFF groups
+# are combined one after the other, which is O(N**2); longer strings are
+# split in two halves recursively.
+FROMSTR_CUTOFF = 2 * KARATSUBA_CUTOFF
+
 # For exponentiation, use the binary left-to-right algorithm
 # unless the exponent contains more than FIVEARY_CUTOFF digits.
 # In that case, do 5 bits at a time.  The potential drawback is that
@@ -717,6 +734,8 @@ class rbigint(object):
                 result = _x_mul(a, b)
                 """elif 2 * asize <= bsize:
                     result = _k_lopsided_mul(a, b)"""
+            elif asize > TOOM_COOK_CUTOFF and 2 * asize > bsize:
+                result = _tc_mul(a, b)
             else:
                 result = _k_mul(a, b)
         else:
@@ -1805,6 +1824,95 @@ def _k_lopsided_mul(a, b):
     ret._normalize()
     return ret
 
+def _tcmul_split(n, size):
+    """
+    A helper for Toom-Cook multiplication (_tc_mul).  Like _kmul_split(),
+    but splits "n" in three pieces such that
+    abs(n) == (high << 2*size) + (mid << size) + low, viewing the shifts
+    as being by digits.  The return values are >= 0.
+    """
+    size_n = n.numdigits()
+    size_lo = min(size_n, size)
+    size_mid = min(size_n, 2 * size)
+
+    lo = rbigint(n._digits[:size_lo] or [NULLDIGIT], 1)
+    mid = rbigint(n._digits[size_lo:size_mid] or [NULLDIGIT], 1)
+    hi = rbigint(n._digits[size_mid:n.size] or [NULLDIGIT], 1)
+    lo._normalize()
+    mid._normalize()
+    hi._normalize()
+    return hi, mid, lo
+
+def _tc_mul(a, b):
+    """
+    Toom-Cook 3-way multiplication.  Ignores the input signs, and returns
+    the absolute value of the product.  The pieces are evaluated at the
+    points 0, 1, -1, -2 and infinity, and the interpolation follows
+    Bodrato, "Towards Optimal Toom-Cook Multiplication for Univariate and
+    Multivariate Polynomials in Characteristic 2 and 0" (2007).
+    """
+    asize = a.numdigits()
+    bsize = b.numdigits()
+
+    # Split a & b into three pieces of 'shift' digits:
+    #     a = a2*X*X + a1*X + a0,   b = b2*X*X + b1*X + b0
+    shift = (bsize + 2) // 3
+    a2, a1, a0 = _tcmul_split(a, shift)
+    if a is b:
+        b2, b1, b0 = a2, a1, a0
+    else:
+        b2, b1, b0 = _tcmul_split(b, shift)
+
+    # Evaluate both polynomials.  The values at -1 and -2 may be negative.
+    t = a0.add(a2)
+    a_p1 = t.add(a1)
+    a_m1 = t.sub(a1)
+    a_m2 = a_m1.add(a2).lshift(1).sub(a0)
+    if a is b:
+        b_p1, b_m1, b_m2 = a_p1, a_m1, a_m2
+    else:
+        t = b0.add(b2)
+        b_p1 = t.add(b1)
+        b_m1 = t.sub(b1)
+        b_m2 = b_m1.add(b2).lshift(1).sub(b0)
+
+    # Pointwise products, recursively.
+    r0 = a0.mul(b0)
+    r_p1 = a_p1.mul(b_p1)
+    r_m1 = a_m1.mul(b_m1)
+    r_m2 = a_m2.mul(b_m2)
+    r4 = a2.mul(b2)
+
+    # Interpolation.  All the divisions are exact.
+    t = r_m2.sub(r_p1)
+    r3, rem = _divrem1(t, 3)
+    assert rem == 0
+    r3.sign *= t.sign
+    r1 = r_p1.sub(r_m1).rshift(1)
+    r2 = r_m1.sub(r0)
+    r3 = r2.sub(r3).rshift(1).add(r4.lshift(1))
+    r2 = r2.add(r1).sub(r4)
+    r1 = r1.sub(r3)
+
+    # The r's are the coefficients of the product of the polynomials,
+    # so they are all >= 0.  Add them into the result at the right place.
+    ret = rbigint([NULLDIGIT] * (asize + bsize), 1)
+    if r0.sign != 0:
+        for i in range(r0.numdigits()):
+            ret._digits[i] = r0._digits[i]
+    if r4.sign != 0:
+        assert 4*shift + r4.numdigits() <= ret.numdigits()
+        for i in range(r4.numdigits()):
+            ret._digits[4*shift + i] = r4._digits[i]
+    for j, r in [(1, r1), (2, r2), (3, r3)]:
+        assert r.sign >= 0
+        if r.sign != 0:
+            i = ret.numdigits() - j * shift
+            _v_iadd(ret, j * shift, i, r, r.numdigits())
+
+    ret._normalize()
+    return ret
+
 def _inplace_divrem1(pout, pin, n):
     """
     Divide bigint pin by non-zero digit n, storing quotient
@@ -2047,6 +2155,9 @@ def _divrem(a, b):
     if size_b == 1:
         z, urem = _divrem1(a, b.digit(0))
         rem = rbigint([_store_digit(urem)], int(urem != 0), 1)
+    elif (size_b > BURNIKEL_ZIEGLER_CUTOFF and
+          size_a - size_b > BURNIKEL_ZIEGLER_CUTOFF):
+        z, rem = _bz_divrem(a, b)
     else:
         z, rem = _x_divrem(a, b)
     # Set the signs.
@@ -2059,6 +2170,81 @@ def _divrem(a, b):
         rem.sign = - rem.sign
     return z, rem
 
+def _bz_divrem(a, b):
+    """
+    Unsigned bigint division with remainder, using the recursive algorithm
+    of Burnikel and Ziegler, "Fast Recursive Division" (1998).  The signs
+    are ignored, and the quotient and remainder returned are >= 0.
+    """
+    n = b.numdigits()
+    a = rbigint(a._digits[:a.size], 1, a.size)
+    b = rbigint(b._digits[:b.size], 1, b.size)
+
+    # normalize: shift b left so that its top digit is >= BASE/2, and
+    # shift a by the same amount.
+    d = SHIFT - bits_in_digit(b.digit(n - 1))
+    a = a.lshift(d)
+    b = b.lshift(d)
+
+    # Cut a in chunks of n digits, and divide them from the most
+    # significant one.  Each step divides a number of 2n digits by b.
+    size_a = a.numdigits()
+    nchunks = (size_a + n - 1) // n
+    z = rbigint([NULLDIGIT] * (nchunks * n), 1)
+    r = NULLRBIGINT
+    i = nchunks - 1
+    while i >= 0:
+        chunk = rbigint(a._digits[i * n:min((i + 1) * n, size_a)], 1)
+        chunk._normalize()
+        q, r = _bz_div2n1n(r.lshift(n * SHIFT).add(chunk), b, n)
+        if q.sign != 0:
+            for j in range(q.numdigits()):
+                z._digits[i * n + j] = q._digits[j]
+        i -= 1
+    z._normalize()
+
+    r = r.rshift(d)
+    return z, rbigint(r._digits[:r.size], r.sign, r.size)
+
+def _bz_div2n1n(a, b, n):
+    """
+    Divide a by b, where b has n digits and is normalized, and
+    0 <= a < (b << n), viewing the shift as being by digits.  Returns
+    the quotient (which has at most n digits) and the remainder.
+    """
+    if n <= BURNIKEL_ZIEGLER_CUTOFF:
+        return _divrem(a, b)
+    pad = n & 1
+    if pad:
+        a = a.lshift(SHIFT)
+        b = b.lshift(SHIFT)
+        n += 1
+    half = n >> 1
+    b1, b2 = _kmul_split(b, half)
+    a12, a3, a4 = _tcmul_split(a, half)
+    q1, r = _bz_div3n2n(a12, a3, b, b1, b2, half)
+    q2, r = _bz_div3n2n(r, a4, b, b1, b2, half)
+    if pad:
+        r = r.rshift(SHIFT)
+    return q1.lshift(half * SHIFT).add(q2), r
+
+def _bz_div3n2n(a12, a3, b, b1, b2, n):
+    """
+    Helper for _bz_div2n1n(): divide (a12 << n) + a3 by b == (b1 << n) + b2,
+    where b1 and b2 have n digits and 0 <= a12 < (b << n).
+    """
+    if a12.rshift(n * SHIFT).eq(b1):
+        q = rbigint([_store_digit(MASK)] * n, 1, n)
+        r = a12.sub(b1.lshift(n * SHIFT)).add(b1)
+    else:
+        q, r = _bz_div2n1n(a12, b1, n)
+    # q is an estimate of the quotient which is at most 2 too large
+    r = r.lshift(n * SHIFT).add(a3).sub(q.mul(b2))
+    while r.sign < 0:
+        q = q.int_sub(1)
+        r = r.add(b)
+    return q, r
+
 # ______________ conversions to double _______________
 
 def _AsScaledDouble(v):
@@ -2752,6 +2938,34 @@ BASE_MAX = [0, 0] + [digits_max_for_base(_base) for _base in range(2, 37)]
 DEC_MAX = digits_max_for_base(10)
 assert DEC_MAX == BASE_MAX[10]
 
+def _groups_to_bigint(groups, groupbase):
+    """Turn the list 'groups' of digits in base 'groupbase', the most
+    significant first, into a bigint.  Long lists are split in two
+    recursively, so that the work is done by a few big multiplications.
+    """
+    n = len(groups)
+    # powers[i] == groupbase ** (2 ** i)
+    powers = [rbigint.fromint(groupbase)]
+    while (1 << len(powers)) < n and n > FROMSTR_CUTOFF:
+        powers.append(powers[-1].mul(powers[-1]))
+    return _groups_to_bigint_rec(groups, 0, n, groupbase, powers)
+
+def _groups_to_bigint_rec(groups, start, stop, groupbase, powers):
+    n = stop - start
+    if n <= FROMSTR_CUTOFF:
+        a = rbigint()
+        for i in range(start, stop):
+            a = _muladd1(a, groupbase, groups[i])
+        return a
+    # split off the last 2 ** j groups, with 2 ** j < n <= 2 ** (j + 1)
+    j = 0
+    while (2 << j) < n:
+        j += 1
+    mid = stop - (1 << j)
+    hi = _groups_to_bigint_rec(groups, start, mid, groupbase, powers)
+    lo = _groups_to_bigint_rec(groups, mid, stop, groupbase, powers)
+    return hi.mul(powers[j]).add(lo)
+
 def _decimalstr_to_bigint(s):
     # a string that has been already parsed to be decimal and valid,
     # is turned into a bigint
@@ -2764,7 +2978,7 @@ def _decimalstr_to_bigint(s):
     elif s[p] == '+':
         p += 1
 
-    a = rbigint()
+    groups = []
     tens = 1
     dig = 0
     ord0 = ord('0')
@@ -2772,10 +2986,12 @@ def _decimalstr_to_bigint(s):
         dig = dig * 10 + ord(s[p]) - ord0
         p += 1
         tens *= 10
-        if tens == DEC_MAX or p == lim:
-            a = _muladd1(a, tens, dig)
+        if tens == DEC_MAX:
+            groups.append(dig)
             tens = 1
             dig = 0
+    a = _groups_to_bigint(groups, DEC_MAX)
+    a = _muladd1(a, tens, dig)
     if sign and a.sign == 1:
         a.sign = -1
     return a
@@ -2785,20 +3001,22 @@ def parse_digit_string(parser):
     base = parser.base
     if (base & (base - 1)) == 0:
         return parse_string_from_binary_base(parser)
-    a = rbigint()
     digitmax = BASE_MAX[base]
+    groups = []
     tens, dig = 1, 0
     while True:
         digit = parser.next_digit()
-        if tens == digitmax or digit < 0:
-            a = _muladd1(a, tens, dig)
-            if digit < 0:
-                break
+        if digit < 0:
+            break
+        if tens == digitmax:
+            groups.append(dig)
             dig = digit
             tens = base
         else:
             dig = dig * base + digit
             tens *= base
+    a = _groups_to_bigint(groups, digitmax)
+    a = _muladd1(a, tens, dig)
     a.sign *= parser.sign
     return a
 
@@ -0,0 +1,173 @@
+"""
+SHA-1, SHA-224, SHA-256, SHA-384 and SHA-512 written in C, and a faster
+CRC-32 for large strings.  On x86 CPUs with the SHA extensions, SHA-1
+and SHA-256 (and SHA-224) use the SHA-NI instructions, and the CRC-32
+is computed with PCLMULQDQ; this is detected at runtime, and portable C
+code is used otherwise (there is no zlib fallback in this module: see
+rzlib.crc32()).
+
+See also rsha.py and rmd5.py, which are written in RPython.
+"""
+
+import py
+
+from rpython.rlib.rarithmetic import r_ulonglong
+from rpython.rlib.rstring import StringBuilder
+from rpython.rtyper.annlowlevel import llstr
+from rpython.rtyper.lltypesystem import lltype, rffi
+from rpython.rtyper.lltypesystem.rstr import copy_string_to_raw
+from rpython.translator import cdir
+from rpython.translator.tool.cbuild import ExternalCompilationInfo
+
+cdir = py.path.local(cdir)
+
+eci = ExternalCompilationInfo(
+    includes = ['src/hashaccel.h'],
+    include_dirs = [str(cdir)],
+    separate_module_files = [cdir / 'src' / 'hashaccel.c'],
+)
+
+# constants from hashaccel.h
+FEATURE_SHA = 1
+FEATURE_CLMUL = 2
+SHA1 = 1
+SHA224 = 224
+SHA256 = 256
+SHA384 = 384
+SHA512 = 512
+STATE_SIZE = 64
+DIGEST_SIZE = 64
+
+CRC32_CLMUL_MIN = 256    # below, zlib's own crc32() is as fast
+
+
+def llexternal(*args, **kwds):
+    kwds['compilation_info'] = eci
+    kwds['sandboxsafe'] = True
+    return rffi.llexternal(*args, **kwds)
+
+_features = llexternal('pypy_hashaccel_features', [], rffi.INT,
+                       releasegil=False, _nowrapper=True)
+_set_mask = llexternal('pypy_hashaccel_set_mask', [rffi.INT], lltype.Void,
+                       releasegil=False, _nowrapper=True)
+_hash_init = llexternal('pypy_hash_init', [rffi.INT, rffi.CCHARP],
+                        lltype.Void, releasegil=False)
+_hash_blocks = llexternal('pypy_hash_blocks',
+                          [rffi.INT, rffi.CCHARP, rffi.CCHARP, rffi.LONG],
+                          lltype.Void)
+_hash_final = llexternal('pypy_hash_final',
+                         [rffi.INT, rffi.CCHARP, rffi.CCHARP, rffi.LONG,
+                          rffi.ULONGLONG, rffi.CCHARP],
+                         lltype.Void, releasegil=False)
+_crc32_clmul = llexternal('pypy_crc32_clmul',
+                          [rffi.ULONG, rffi.CCHARP, rffi.LONG], rffi.ULONG)
+
+
+def get_features():
+    """Return the FEATURE_* bits of the CPU features in use."""
+    return rffi.cast(lltype.Signed, _features())
+
+def set_features_mask(mask):
+    """Only use the FEATURE_* bits in 'mask' from now on; for tests."""
+    _set_mask(rffi.cast(rffi.INT, mask))
+
+def has_clmul():
+    return (get_features() & FEATURE_CLMUL) != 0
+
+def crc32_clmul(crc, ptr, length):
+    """Update the CRC-32 'crc' with the 'length' bytes at 'ptr', like
+    zlib's crc32().  Only the largest multiple of 16 bytes is processed.
+    Needs has_clmul() and a length of at least CRC32_CLMUL_MIN."""
+    return _crc32_clmul(rffi.cast(rffi.ULONG, crc), ptr, length)
+
+
+def _digest_size(algo):
+    if algo == SHA1:
+        return 20
+    return algo // 8
+
+def _block_size(algo):
+    if algo == SHA384 or algo == SHA512:
+        return 128
+    return 64
+
+
+class RHash(object):
+    """RPython-level hash object for one of the algorithms above, with
+    the interface of RSHA.
+    """
+    _immutable_fields_ = ['algo', 'digest_size', 'block_size']
+
+    def __init__(self, algo, initialdata=''):
+        self.algo = algo
+        self.digest_size = _digest_size(algo)
+        self.block_size = _block_size(algo)
+        self.count = r_ulonglong(0)   # total number of bytes
+        self.input = ""   # pending unprocessed data, < block_size bytes
+        with lltype.scoped_alloc(rffi.CCHARP.TO, STATE_SIZE) as state:
+            _hash_init(rffi.cast(rffi.INT, algo), state)
+            self.state = rffi.charpsize2str(state, STATE_SIZE)
+        self.update(initialdata)
+
+    def update(self, data):
+        """Add to the current message.  The full blocks are processed
+        immediately, directly from 'data'."""
+        length = len(data)
+        self.count += length
+        index = len(self.input)
+        block_size = self.block_size
+        if index + length < block_size:
+            self.input = self.input + data
+            return
+        algo = rffi.cast(rffi.INT, self.algo)
+        with lltype.scoped_alloc(rffi.CCHARP.TO, STATE_SIZE) as state:
+            copy_string_to_raw(llstr(self.state), state, 0, STATE_SIZE)
+            start = 0
+            if index > 0:
+                start = block_size - index
+                assert start > 0
+                block = self.input + data[:start]
+                with rffi.scoped_nonmovingbuffer(block) as buf:
+                    _hash_blocks(algo, state, buf, 1)
+            nblocks = (length - start) // block_size
+            if nblocks > 0:
+                with rffi.scoped_nonmovingbuffer(data) as buf:
+                    _hash_blocks(algo, state, rffi.ptradd(buf, start),
+                                 nblocks)
+            self.state = rffi.charpsize2str(state, STATE_SIZE)
+        end = start + nblocks * block_size
+        assert end >= 0
+        self.input = data[end:]
+
+    def digest(self):
+        """Return the digest of the data passed to update() so far.
+        The hash object can still be updated afterwards."""
+        with lltype.scoped_alloc(rffi.CCHARP.TO, STATE_SIZE) as state:
+            copy_string_to_raw(llstr(self.state), state, 0, STATE_SIZE)
+            with lltype.scoped_alloc(rffi.CCHARP.TO, DIGEST_SIZE) as digest:
+                with rffi.scoped_nonmovingbuffer(self.input) as buf:
+                    _hash_final(rffi.cast(rffi.INT, self.algo), state, buf,
+                                len(self.input), self.count, digest)
+                return rffi.charpsize2str(digest, self.digest_size)
+
+    def hexdigest(self):
+        """Like digest(), but in hexadecimal."""
+        hx = '0123456789abcdef'
+        digest = self.digest()
+        builder = StringBuilder(2 * len(digest))
+        for c in digest:
+            builder.append(hx[ord(c) >> 4])
+            builder.append(hx[ord(c) & 0xF])
+        return builder.build()
+
+    def copy(self):
+        """Return a clone of the hash object."""
+        clone = RHash(self.algo)
+        clone._copyfrom(self)
+        return clone
+
+    def _copyfrom(self, other):
+        assert self.algo == other.algo
+        self.count = other.count
+        self.input = other.input
+        self.state = other.state
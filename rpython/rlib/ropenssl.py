@@ -587,6 +587,10 @@ EVP_DigestInit = external(
 EVP_DigestUpdate = external(
     'EVP_DigestUpdate',
     [EVP_MD_CTX, rffi.CCHARP, rffi.SIZE_T], rffi.INT)
+# the same, for small amounts of data: not worth releasing the GIL
+EVP_DigestUpdate_nogil = external(
+    'EVP_DigestUpdate',
+    [EVP_MD_CTX, rffi.CCHARP, rffi.SIZE_T], rffi.INT, releasegil=False)
 EVP_DigestFinal = external(
     'EVP_DigestFinal',
     [EVP_MD_CTX, rffi.CCHARP, rffi.VOIDP], rffi.INT)
@@ -2637,6 +2637,67 @@ if not _WIN32:
         res = c_sendfile(out_fd, in_fd, lltype.nullptr(_OFF_PTR_T.TO), count)
         return handle_posix_error('sendfile', res)
 
+if sys.platform.startswith('linux'):
+    class CConfig:
+        _compilation_info_ = ExternalCompilationInfo(
+            includes=['unistd.h', 'fcntl.h'])
+        HAVE_COPY_FILE_RANGE = rffi_platform.Has('copy_file_range')
+        HAVE_SPLICE = rffi_platform.Has('splice')
+        SPLICE_F_MOVE = rffi_platform.DefinedConstantInteger('SPLICE_F_MOVE')
+        SPLICE_F_NONBLOCK = rffi_platform.DefinedConstantInteger(
+            'SPLICE_F_NONBLOCK')
+        SPLICE_F_MORE = rffi_platform.DefinedConstantInteger('SPLICE_F_MORE')
+
+    cConfig = rffi_platform.configure(CConfig)
+    globals().update(cConfig)
+
+    @specialize.arg(0, 1)
+    def _copy_between_fds(c_func, name, src, dst, count, offset_src,
+                          offset_dst, flags):
+        # an offset of -1 means NULL, i.e. use and update the current
+        # file position
+        with lltype.scoped_alloc(_OFF_PTR_T.TO, 2) as p_offsets:
+            p_src = lltype.nullptr(_OFF_PTR_T.TO)
+            p_dst = lltype.nullptr(_OFF_PTR_T.TO)
+            if offset_src != -1:
+                p_offsets[0] = rffi.cast(OFF_T, offset_src)
+                p_src = p_offsets
+            if offset_dst != -1:
+                p_offsets[1] = rffi.cast(OFF_T, offset_dst)
+                p_dst = rffi.ptradd(p_offsets, 1)
+            res = c_func(src, p_src, dst, p_dst, count, flags)
+        return handle_posix_error(name, res)
+
+    if HAVE_COPY_FILE_RANGE:
+        c_copy_file_range = external('copy_file_range',
+            [rffi.INT, _OFF_PTR_T, rffi.INT, _OFF_PTR_T, rffi.SIZE_T,
+             rffi.UINT], rffi.SSIZE_T,
+            compilation_info=CConfig._compilation_info_,
+            save_err=rffi.RFFI_SAVE_ERRNO)
+
+        def copy_file_range(src, dst, count, offset_src=-1, offset_dst=-1):
+            """Copy up to 'count' bytes from the file 'src' to the file
+            'dst' inside the kernel.  Returns the number of bytes copied,
+            which is 0 at the end of 'src'."""
+            return _copy_between_fds(c_copy_file_range, 'copy_file_range',
+                                     src, dst, count, offset_src, offset_dst,
+                                     rffi.cast(rffi.UINT, 0))
+
+    if HAVE_SPLICE:
+        c_splice = external('splice',
+            [rffi.INT, _OFF_PTR_T, rffi.INT, _OFF_PTR_T, rffi.SIZE_T,
+             rffi.UINT], rffi.SSIZE_T,
+            compilation_info=CConfig._compilation_info_,
+            save_err=rffi.RFFI_SAVE_ERRNO)
+
+        def splice(src, dst, count, offset_src=-1, offset_dst=-1, flags=0):
+            """Move up to 'count' bytes from 'src' to 'dst', one of which
+            must be a pipe, without copying them to user space.  The offset
+            of a pipe must be -1.  Returns the number of bytes moved."""
+            return _copy_between_fds(c_splice, 'splice', src, dst, count,
+                                     offset_src, offset_dst,
+                                     rffi.cast(rffi.UINT, flags))
+
 # ____________________________________________________________
 # Support for *xattr functions
 
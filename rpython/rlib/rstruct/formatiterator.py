@@ -6,6 +6,29 @@ from rpython.rlib.rstruct.standardfmttable import standard_fmttable
 from rpython.rlib.unroll import unrolling_iterable
 
 
+def _make_operate_fmtchar(standard):
+    # 'table' must be a constant for the loop to be unrolled
+    def _operate_fmtchar(self, c, repetitions):
+        if standard:
+            table = unroll_standard_fmtdescs
+        else:
+            table = unroll_native_fmtdescs
+        for fmtdesc in table:
+            if c == fmtdesc.fmtchar:
+                if self._operate_is_specialized_:
+                    if fmtdesc.alignment > 1:
+                        self.align(fmtdesc.mask)
+                    self.operate(fmtdesc, repetitions)
+                break
+        else:
+            raise StructError("bad char in struct format")
+        if not self._operate_is_specialized_:
+            if fmtdesc.alignment > 1:
+                self.align(fmtdesc.mask)
+            self.operate(fmtdesc, repetitions)
+    return _operate_fmtchar
+
+
 class FormatIterator(object):
     """
     An iterator-like object that follows format strings step by step.
@@ -19,7 +42,7 @@ class FormatIterator(object):
     @jit.look_inside_iff(lambda self, fmt: jit.isconstant(fmt))
     def interpret(self, fmt):
         # decode the byte order, size and alignment based on the 1st char
-        table = unroll_native_fmtdescs
+        standard = False
         self.bigendian = native_is_bigendian
         index = 0
         if len(fmt) > 0:
@@ -28,15 +51,16 @@ class FormatIterator(object):
             if c == '@':
                 pass
             elif c == '=':
-                table = unroll_standard_fmtdescs
+                standard = True
             elif c == '<':
-                table = unroll_standard_fmtdescs
+                standard = True
                 self.bigendian = False
             elif c == '>' or c == '!':
-                table = unroll_standard_fmtdescs
+                standard = True
                 self.bigendian = True
             else:
                 index = 0
+        self.standard = standard
 
         # interpret the format string,
         # calling self.operate() for each format unit
@@ -64,21 +88,29 @@ class FormatIterator(object):
             else:
                 repetitions = 1
 
-            for fmtdesc in table:
-                if c == fmtdesc.fmtchar:
-                    if self._operate_is_specialized_:
-                        if fmtdesc.alignment > 1:
-                            self.align(fmtdesc.mask)
-                        self.operate(fmtdesc, repetitions)
-                    break
+            if standard:
+                self._operate_standard(c, repetitions)
+            else:
+                self._operate_native(c, repetitions)
+        self.finished()
+
+    @jit.look_inside_iff(lambda self, plan: jit.isconstant(plan))
+    def interpret_plan(self, plan):
+        """Same as interpret(), with a format string already parsed by
+        compile_format()."""
+        self.bigendian = plan.bigendian
+        for i in range(len(plan.fmtchars)):
+            c = plan.fmtchars[i]
+            repetitions = plan.counts[i]
+            if plan.standard:
+                self._operate_standard(c, repetitions)
             else:
-                raise StructError("bad char in struct format")
-            if not self._operate_is_specialized_:
-                if fmtdesc.alignment > 1:
-                    self.align(fmtdesc.mask)
-                self.operate(fmtdesc, repetitions)
+                self._operate_native(c, repetitions)
         self.finished()
 
+    _operate_standard = _make_operate_fmtchar(standard=True)
+    _operate_native = _make_operate_fmtchar(standard=False)
+
     def finished(self):
         pass
 
@@ -101,6 +133,51 @@ class CalcSizeFormatIterator(FormatIterator):
             raise StructError("total struct size too long")
 
 
+class FormatPlan(object):
+    """A format string parsed once and for all, to be used with
+    interpret_plan(): the byte order, and the format characters with
+    their repetition counts.  'nfields' is the number of values packed
+    or unpacked."""
+    _immutable_fields_ = ['standard', 'bigendian', 'fmtchars[*]',
+                          'counts[*]', 'size', 'nfields']
+
+    def __init__(self, standard, bigendian, fmtchars, counts, size, nfields):
+        self.standard = standard
+        self.bigendian = bigendian
+        self.fmtchars = fmtchars
+        self.counts = counts
+        self.size = size
+        self.nfields = nfields
+
+
+class CompileFormatIterator(CalcSizeFormatIterator):
+    def __init__(self):
+        self.fmtchars = []
+        self.counts = []
+        self.nfields = 0
+
+    def operate(self, fmtdesc, repetitions):
+        CalcSizeFormatIterator.operate(self, fmtdesc, repetitions)
+        self.fmtchars.append(fmtdesc.fmtchar)
+        self.counts.append(repetitions)
+        if fmtdesc.fmtchar == 'x':
+            pass
+        elif fmtdesc.needcount:
+            self.nfields += 1
+        else:
+            self.nfields += repetitions
+
+
+def compile_format(fmt):
+    """Parse 'fmt' into a FormatPlan.  Raises StructError if the format
+    is invalid."""
+    fmtiter = CompileFormatIterator()
+    fmtiter.interpret(fmt)
+    return FormatPlan(fmtiter.standard, fmtiter.bigendian,
+                      fmtiter.fmtchars[:], fmtiter.counts[:],
+                      fmtiter.totalsize, fmtiter.nfields)
+
+
 class FmtDesc(object):
     def __init__(self, fmtchar, attrs):
         self.fmtchar = fmtchar
@@ -2,6 +2,7 @@ from rpython.rlib.objectmodel import specialize
 from rpython.rlib.rvmprof.rvmprof import _get_vmprof, VMProfError
 from rpython.rlib.rvmprof.rvmprof import vmprof_execute_code, MAX_FUNC_NAME
 from rpython.rlib.rvmprof.rvmprof import _was_registered
+from rpython.rlib.rvmprof.rvmprof import CallTreeNode, DEFAULT_RING_SLOTS
 from rpython.rlib.rvmprof.cintf import VMProfPlatformUnsupported
 from rpython.rtyper.lltypesystem import rffi, lltype
 
@@ -38,6 +39,39 @@ def enable(fileno, interval, memory=0, native=0, real_time=0):
 def disable():
     _get_vmprof().disable()
 
+def enable_aggregating(interval, nslots=DEFAULT_RING_SLOTS, real_time=0):
+    _get_vmprof().enable_aggregating(interval, nslots, real_time)
+
+def is_aggregating():
+    return _get_vmprof().is_aggregating
+
+def drain():
+    _get_vmprof().drain()
+
+def get_call_tree():
+    """Return the root CallTreeNode built by the last call to
+    enable_aggregating(), after merging the pending samples into it;
+    or None if enable_aggregating() was never called.  The root node
+    itself has the key 0.
+    """
+    vmp = _get_vmprof()
+    vmp.drain()
+    return vmp.call_tree
+
+def clear_call_tree():
+    """Start a new call tree in aggregating mode."""
+    vmp = _get_vmprof()
+    vmp.drain()
+    if vmp.call_tree is not None:
+        vmp.call_tree = CallTreeNode(0)
+        vmp.lost_samples = 0
+
+def get_lost_samples():
+    return _get_vmprof().lost_samples
+
+def get_code_name(unique_id):
+    return _get_vmprof().get_code_name(unique_id)
+
 def is_enabled():
     vmp = _get_vmprof()
     return vmp.is_enabled
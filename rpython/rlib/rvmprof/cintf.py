@@ -146,6 +146,18 @@ def setup():
                                             lltype.Void, compilation_info=eci,
                                             _nowrapper=True)
 
+    vmprof_ring_init = rffi.llexternal("vmprof_ring_init", [lltype.Signed],
+                                       rffi.INT, compilation_info=eci,
+                                       _nowrapper=True)
+    vmprof_ring_free = rffi.llexternal("vmprof_ring_free", [],
+                                       lltype.Void, compilation_info=eci,
+                                       _nowrapper=True)
+    vmprof_ring_next = rffi.llexternal("vmprof_ring_next",
+                                       [rffi.SIGNEDP, lltype.Signed,
+                                        rffi.SIGNEDP],
+                                       lltype.Signed, compilation_info=eci,
+                                       _nowrapper=True)
+
     return CInterface(locals())
 
 
@@ -162,6 +174,10 @@ class CInterface(object):
 
 VMPROF_CODE_TAG = 1
 
+# --- and from src/rvmprof.h ---
+
+VMPROF_RING_STACK_LENGTH = 256
+
 VMPROFSTACK = lltype.ForwardReference()
 PVMPROFSTACK = lltype.Ptr(VMPROFSTACK)
 VMPROFSTACK.become(rffi.CStruct("vmprof_stack_s",
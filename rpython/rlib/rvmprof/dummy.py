@@ -2,6 +2,9 @@ from rpython.rlib.objectmodel import specialize
 
 class DummyVMProf(object):
     is_enabled = False
+    is_aggregating = False
+    call_tree = None
+    lost_samples = 0
 
     def __init__(self):
         self._unique_id = 0
@@ -20,6 +23,15 @@ class DummyVMProf(object):
     def disable(self):
         pass
 
+    def enable_aggregating(self, interval, nslots=0, real_time=0):
+        pass
+
+    def drain(self):
+        pass
+
+    def get_code_name(self, unique_id):
+        return ""
+
     def start_sampling(self):
         pass
 
@@ -21,6 +21,10 @@ VMPROF_BLACKHOLE_TAG = 2
 VMPROF_JITTED_TAG = 3
 VMPROF_JITTING_TAG = 4
 VMPROF_GC_TAG = 5
+VMPROF_ASSEMBLER_TAG = 6
+
+# default number of samples kept by the ring buffer of enable_aggregating()
+DEFAULT_RING_SLOTS = 1024
 
 class VMProfError(Exception):
     msg = ''   # annotation hack
@@ -35,6 +39,44 @@ class FakeWeakCodeObjectList(object):
     def get_all_handles(self):
         return []
 
+class CallTreeNode(object):
+    """A node of the call tree built by the aggregating mode.  The 'key'
+    is the unique id of the code object shifted left by one, with the
+    lowest bit set if the samples were taken in JIT-compiled code.
+    There are no line numbers: the codemap only gives the unique ids
+    of the code objects for an address in JIT-compiled code.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.count = 0         # samples in this node and its children
+        self.self_count = 0    # samples in this node only
+        self.children = {}     # {key: CallTreeNode}
+
+    def get_unique_id(self):
+        return self.key >> 1
+
+    def is_jitted(self):
+        return bool(self.key & 1)
+
+    def add_sample(self, keys, length):
+        """Add one sample.  'keys[:length]' lists the keys of the frames,
+        starting with the innermost one."""
+        node = self
+        node.count += 1
+        i = length - 1
+        while i >= 0:
+            key = keys[i]
+            child = node.children.get(key, None)
+            if child is None:
+                child = CallTreeNode(key)
+                node.children[key] = child
+            child.count += 1
+            node = child
+            i -= 1
+        node.self_count += 1
+
+
 class VMProf(object):
     """
     NOTE: the API of this class should be kept in sync with dummy.DummyVMProf
@@ -49,12 +91,18 @@ class VMProf(object):
         "use _get_vmprof()"
         self._code_classes = set()
         self._gather_all_code_objs = lambda: None
+        self._resolve_code_names = lambda: None
         self._cleanup_()
         self._code_unique_id = 4
         self.cintf = cintf.setup()
 
     def _cleanup_(self):
         self.is_enabled = False
+        self.is_aggregating = False
+        self._ring_fileno = -1
+        self.call_tree = None
+        self.lost_samples = 0
+        self._code_names = {}
 
     @jit.dont_look_inside
     @specialize.argtype(1)
@@ -71,7 +119,7 @@ class VMProf(object):
             uid = self._code_unique_id + 4
             code._vmprof_unique_id = uid
             self._code_unique_id = uid
-            if self.is_enabled:
+            if self.is_enabled and not self.is_aggregating:
                 self._write_code_registration(uid, full_name_func(code))
             elif self.use_weaklist:
                 code._vmprof_weak_list.add_handle(code)
@@ -127,6 +175,19 @@ class VMProf(object):
         # the types of code objects
         prev = self._gather_all_code_objs
         self._gather_all_code_objs = gather_all_code_objs
+        #
+        def resolve_code_names():
+            code_names = self._code_names
+            all_code_wrefs = CodeClass._vmprof_weak_list.get_all_handles()
+            for wref in all_code_wrefs:
+                code = wref()
+                if code is not None:
+                    uid = code._vmprof_unique_id
+                    if uid != 0 and not code_names.get(uid, ''):
+                        code_names[uid] = full_name_func(code)
+            prev_resolve()
+        prev_resolve = self._resolve_code_names
+        self._resolve_code_names = resolve_code_names
 
     @jit.dont_look_inside
     def enable(self, fileno, interval, memory=0, native=0, real_time=0):
@@ -162,8 +223,92 @@ class VMProf(object):
             raise VMProfError("vmprof is not enabled")
         self.is_enabled = False
         res = self.cintf.vmprof_disable()
+        if self.is_aggregating:
+            self.drain()
+            self.is_aggregating = False
+            self.cintf.vmprof_ring_free()
+            os.close(self._ring_fileno)
+            self._ring_fileno = -1
+        if res < 0:
+            raise VMProfError(os.strerror(rposix.get_saved_errno()))
+
+    @jit.dont_look_inside
+    def enable_aggregating(self, interval, nslots=DEFAULT_RING_SLOTS,
+                           real_time=0):
+        """Enable vmprof without writing a profile file.  The samples
+        are kept in memory, in a ring buffer of 'nslots' entries, and
+        drain() merges them into the tree 'self.call_tree'.  Samples
+        that are overwritten before drain() is called are counted in
+        'self.lost_samples'.  Raises VMProfError if something goes wrong.
+        """
+        if self.is_enabled:
+            raise VMProfError("vmprof is already enabled")
+        if PLAT_WINDOWS:
+            raise VMProfError("aggregating mode is not supported on Windows")
+        # the header and the trailer of the profile are still written
+        # by vmprof_enable() and vmprof_disable(): send them nowhere
+        try:
+            fileno = os.open('/dev/null', os.O_WRONLY, 0)
+        except OSError as e:
+            raise VMProfError(os.strerror(e.errno))
+        res = self.cintf.vmprof_ring_init(nslots)
+        if rffi.cast(lltype.Signed, res) < 0:
+            os.close(fileno)
+            raise VMProfError("cannot allocate the sample buffer")
+        p_error = self.cintf.vmprof_init(fileno, interval, 0, 0, "pypy", 0,
+                                         real_time)
+        if p_error:
+            self.cintf.vmprof_ring_free()
+            os.close(fileno)
+            raise VMProfError(rffi.charp2str(p_error))
+        self.call_tree = CallTreeNode(0)
+        self.lost_samples = 0
+        self._code_names = {}
+        self._ring_fileno = fileno
+        self.is_aggregating = True
+        res = self.cintf.vmprof_enable(0, 0, real_time)
         if res < 0:
+            self.is_aggregating = False
+            self.cintf.vmprof_ring_free()
+            os.close(fileno)
+            self._ring_fileno = -1
             raise VMProfError(os.strerror(rposix.get_saved_errno()))
+        self.is_enabled = True
+
+    @jit.dont_look_inside
+    def drain(self):
+        """Merge the samples collected so far in the ring buffer into
+        'self.call_tree'.  Does nothing if not in aggregating mode.
+        """
+        if not self.is_aggregating:
+            return
+        length = cintf.VMPROF_RING_STACK_LENGTH
+        keys = [0] * (length // 2)
+        with lltype.scoped_alloc(rffi.SIGNEDP.TO, length) as buf:
+            with lltype.scoped_alloc(rffi.SIGNEDP.TO, 1) as p_lost:
+                p_lost[0] = 0
+                while True:
+                    n = self.cintf.vmprof_ring_next(buf, length, p_lost)
+                    if n < 0:
+                        break
+                    self.call_tree.add_sample(keys, _decode_sample(buf, n,
+                                                                   keys))
+                self.lost_samples += p_lost[0]
+
+    def get_code_name(self, unique_id):
+        """Return the name of the code object with the given unique id,
+        as returned by the 'full_name_func' given to
+        register_code_object_class(), or "" if it is not known (e.g.
+        because the code object died already).
+        """
+        name = self._code_names.get(unique_id, None)
+        if name is None:
+            self._resolve_code_names()
+            name = self._code_names.get(unique_id, None)
+            if name is None:
+                name = ""
+                self._code_names[unique_id] = name
+        return name
 
 
     def _write_code_registration(self, uid, name):
@@ -188,6 +333,29 @@ class VMProf(object):
         self.cintf.vmprof_start_sampling()
 
 
+def _decode_sample(buf, n, keys):
+    # Turn the (tag, value) pairs of a stack trace into call tree keys
+    # stored in 'keys', innermost first, and return how many there are.
+    # The frame that enters the JIT-compiled code is recorded both as
+    # a VMPROF_CODE_TAG and, with the frames inlined in it, as the last
+    # of the VMPROF_JITTED_TAG entries that come from the codemap: it is
+    # counted only once, as jitted.
+    length = 0
+    i = 0
+    while i + 1 < n:
+        tag = buf[i]
+        value = buf[i + 1]
+        if tag == VMPROF_CODE_TAG:
+            if not (length > 0 and keys[length - 1] == ((value << 1) | 1)):
+                keys[length] = value << 1
+                length += 1
+        elif tag == VMPROF_JITTED_TAG:
+            keys[length] = (value << 1) | 1
+            length += 1
+        i += 2
+    return length
+
+
 def vmprof_execute_code(name, get_code_fn, result_class=None,
                         _hack_update_stack_untranslated=False):
     """Decorator to be used on the function that interprets a code object.
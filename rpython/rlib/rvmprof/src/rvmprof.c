@@ -46,3 +46,121 @@ void vmprof_start_sampling(void)
 {
     vmprof_ignore_signals(0);
 }
+
+
+/* In-memory ring buffer of samples.  When it is allocated, the signal
+   handler stores the stack traces here instead of writing them to the
+   profile file.  Each slot is protected by a sequence number: the
+   signal handler sets it to -1 while it fills the slot, and then to the
+   index of the sample.  The reader (which holds the GIL) copies the
+   slot and checks that the sequence number did not change meanwhile;
+   samples that were overwritten before being read are counted as lost.
+*/
+#ifdef VMPROF_UNIX
+#include <string.h>
+
+struct vmprof_ring_slot_s {
+    volatile long seq;
+    long depth;
+    void *stack[VMPROF_RING_STACK_LENGTH];
+};
+
+static struct vmprof_ring_slot_s *ring_slots = NULL;
+static long ring_size = 0;
+static volatile long ring_head = 0;
+static long ring_tail = 0;
+
+int vmprof_ring_init(long nslots)
+{
+    long i;
+    if (ring_slots != NULL || nslots <= 0)
+        return -1;
+    ring_slots = (struct vmprof_ring_slot_s *)malloc(
+                     nslots * sizeof(struct vmprof_ring_slot_s));
+    if (ring_slots == NULL)
+        return -1;
+    for (i = 0; i < nslots; i++)
+        ring_slots[i].seq = -1;
+    ring_head = 0;
+    ring_tail = 0;
+    __sync_synchronize();
+    ring_size = nslots;
+    return 0;
+}
+
+void vmprof_ring_free(void)
+{
+    /* must only be called after vmprof_disable(); wait for the signal
+       handlers that might still be running in other threads */
+    struct vmprof_ring_slot_s *slots = ring_slots;
+    vmprof_ignore_signals(1);
+    ring_size = 0;
+    ring_slots = NULL;
+    vmprof_ignore_signals(0);
+    free(slots);
+}
+
+int vmprof_ring_enabled(void)
+{
+    return ring_size != 0;
+}
+
+void vmprof_ring_sample(void *ucontext)
+{
+    long n = __sync_fetch_and_add(&ring_head, 1);
+    struct vmprof_ring_slot_s *slot = &ring_slots[n % ring_size];
+    slot->seq = -1;
+    __sync_synchronize();
+    slot->depth = vmprof_get_traceback(NULL, ucontext, slot->stack,
+                                       VMPROF_RING_STACK_LENGTH);
+    __sync_synchronize();
+    slot->seq = n;
+}
+
+long vmprof_ring_next(intptr_t *result, long length, long *p_lost)
+{
+    /* Copy the next sample into 'result' and return its length, or
+       return -1 if there is no complete sample left to read. */
+    while (1) {
+        long head = ring_head;
+        long seq, depth;
+        struct vmprof_ring_slot_s *slot;
+
+        if (head - ring_tail > ring_size) {
+            *p_lost += head - ring_tail - ring_size;
+            ring_tail = head - ring_size;
+        }
+        if (ring_tail >= head)
+            return -1;
+
+        slot = &ring_slots[ring_tail % ring_size];
+        seq = slot->seq;
+        if (seq == -1 || seq < ring_tail)
+            return -1;     /* still being written by the signal handler */
+        __sync_synchronize();
+        depth = slot->depth;
+        if (depth > length)
+            depth = length;
+        if (depth > 0)
+            memcpy(result, slot->stack, depth * sizeof(void *));
+        __sync_synchronize();
+        if (slot->seq != ring_tail) {
+            *p_lost += 1;  /* overwritten while we were copying it */
+            ring_tail++;
+            continue;
+        }
+        ring_tail++;
+        if (depth > 0)
+            return depth;
+    }
+}
+#else
+int vmprof_ring_init(long nslots) { return -1; }
+void vmprof_ring_free(void) { }
+int vmprof_ring_enabled(void) { return 0; }
+void vmprof_ring_sample(void *ucontext) { }
+long vmprof_ring_next(intptr_t *result, long length, long *p_lost)
+{
+    return -1;
+}
+#endif
@@ -40,8 +40,16 @@ RPY_EXTERN intptr_t vmprof_get_traceback(void *, void *, void**, intptr_t);
 RPY_EXTERN long vmprof_get_profile_path(char *, long);
 RPY_EXTERN int vmprof_stop_sampling(void);
 RPY_EXTERN void vmprof_start_sampling(void);
+RPY_EXTERN int vmprof_ring_init(long);
+RPY_EXTERN void vmprof_ring_free(void);
+RPY_EXTERN int vmprof_ring_enabled(void);
+RPY_EXTERN void vmprof_ring_sample(void *);
+RPY_EXTERN long vmprof_ring_next(intptr_t *, long, long *);
 
 long vmprof_write_header_for_jit_addr(intptr_t *result, long n,
                                       intptr_t addr, int max_depth);
 
 #define RVMPROF_TRACEBACK_ESTIMATE_N(num_entries)  (2 * (num_entries) + 4)
+
+/* maximum number of words stored for one sample in the ring buffer */
+#define VMPROF_RING_STACK_LENGTH 256
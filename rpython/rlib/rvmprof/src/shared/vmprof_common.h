@@ -101,6 +101,8 @@ PY_STACK_FRAME_T *get_vmprof_stack(void);
 RPY_EXTERN
 intptr_t vmprof_get_traceback(void *stack, void *ucontext,
                               void **result_p, intptr_t result_length);
+RPY_EXTERN int vmprof_ring_enabled(void);
+RPY_EXTERN void vmprof_ring_sample(void *ucontext);
 #endif
 
 int vmprof_get_signal_type(void);
@@ -229,6 +229,15 @@ void sigprof_handler(int sig_nr, siginfo_t* info, void *ucontext)
 
     if (val == 0) {
         int saved_errno = errno;
+#ifdef RPYTHON_VMPROF
+        if (vmprof_ring_enabled()) {
+            /* samples are aggregated in memory, see rvmprof.c */
+            vmprof_ring_sample(ucontext);
+            errno = saved_errno;
+            vmprof_exit_signal();
+            return;
+        }
+#endif
         int fd = vmp_profile_fileno();
         assert(fd >= 0);
 
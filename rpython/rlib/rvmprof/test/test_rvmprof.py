@@ -140,6 +140,44 @@ class TestEnable(RVMProfSamplingTest):
         assert self.approx_equal(tree.count, 0.5/self.SAMPLING_INTERVAL)
 
 
+class TestAggregating(RVMProfSamplingTest):
+
+    def entry_point(self, value, delta_t):
+        code = self.MyCode('py:code:52:test_aggregating')
+        rvmprof.register_code(code, self.MyCode.get_name)
+        rvmprof.enable_aggregating(self.SAMPLING_INTERVAL)
+        start = time.time()
+        while time.time() < start+delta_t:
+            self.main(code, value)
+        rvmprof.disable()
+        tree = rvmprof.get_call_tree()
+        if rvmprof.get_lost_samples() != 0:
+            return -1
+        for node in tree.children.values():
+            name = rvmprof.get_code_name(node.get_unique_id())
+            if name != 'py:code:52:test_aggregating':
+                return -2
+            if node.is_jitted() or node.children:
+                return -3
+            if node.count != node.self_count:
+                return -4
+        return tree.count
+
+    @rvmprof.vmprof_execute_code("xcode1", lambda self, code, count: code)
+    def main(self, code, count):
+        s = 0
+        for i in range(count):
+            s += (i << 1)
+        return s
+
+    def test(self):
+        assert self.entry_point(10**4, 0.1) >= 0
+        count = self.rpy_entry_point(10**4, 0.5)
+        # the kernel may deliver fewer signals than asked for, see above
+        assert 0 < count <= 0.5/self.SAMPLING_INTERVAL * 1.1
+        assert not self.tmpfile.check()
+
+
 class TestNative(RVMProfSamplingTest):
 
     @pytest.fixture
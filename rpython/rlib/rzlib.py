@@ -1,7 +1,7 @@
 from __future__ import with_statement
 import sys
 
-from rpython.rlib import rgc
+from rpython.rlib import rgc, rhashaccel
 from rpython.rlib.rstring import StringBuilder
 from rpython.rtyper.annlowlevel import llstr
 from rpython.rtyper.lltypesystem import rffi, lltype
@@ -188,12 +188,22 @@ def _crc_or_adler(string, start, function):
 
 CRC32_DEFAULT_START = 0
 
+def _crc32_accel(checksum, ptr, count):
+    # on CPUs with PCLMULQDQ, fold the bulk of large strings ourselves
+    if count >= rhashaccel.CRC32_CLMUL_MIN and rhashaccel.has_clmul():
+        length = count & ~15
+        checksum = rhashaccel.crc32_clmul(checksum,
+                                          rffi.cast(rffi.CCHARP, ptr), length)
+        ptr = rffi.ptradd(ptr, length)
+        count -= length
+    return _crc32(checksum, ptr, count)
+
 def crc32(string, start=CRC32_DEFAULT_START):
     """
     Compute the CRC32 checksum of the string, possibly with the given
     start value, and return it as a unsigned 32 bit integer.
     """
-    return _crc_or_adler(string, start, _crc32)
+    return _crc_or_adler(string, start, _crc32_accel)
 
 ADLER32_DEFAULT_START = 1
 
@@ -354,6 +364,30 @@ def compress(stream, data, flush=Z_NO_FLUSH):
     return data
 
 
+def deflate_block(data, dictionary="", level=Z_DEFAULT_COMPRESSION,
+                  wbits=-MAX_WBITS, last=False):
+    """
+    Compress 'data' as one piece of a raw deflate stream, the way pigz
+    does it: a new deflate stream is primed with 'dictionary', which
+    should be the end of the data before this piece, and is flushed
+    with Z_SYNC_FLUSH so that the output ends on a byte boundary.
+    Concatenating the results for consecutive pieces, the last one with
+    last=True, gives a valid raw deflate stream.  The pieces can be
+    compressed in parallel: deflate() is called without the GIL.
+    """
+    stream = deflateInit(level, wbits=wbits)
+    try:
+        if dictionary:
+            deflateSetDictionary(stream, dictionary)
+        if last:
+            flush = Z_FINISH
+        else:
+            flush = Z_SYNC_FLUSH
+        return compress(stream, data, flush)
+    finally:
+        deflateEnd(stream)
+
+
 def decompress(stream, data, flush=Z_SYNC_FLUSH, max_length=sys.maxint,
                zdict=None):
     """
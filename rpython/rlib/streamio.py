@@ -34,11 +34,13 @@ an outout-buffering stream.
 # where r_longlong values end up: as argument to seek() and truncate() and
 # return value of tell(), but not as argument to read().
 
-import os, sys, errno
+import os, sys, errno, stat
 from rpython.rlib.objectmodel import specialize, we_are_translated, not_rpython
 from rpython.rlib.rarithmetic import r_longlong, intmask
-from rpython.rlib import rposix, nonconst, _rsocket_rffi as _c
+from rpython.rlib import rposix, rmmap, nonconst, _rsocket_rffi as _c
 from rpython.rlib.rstring import StringBuilder
+from rpython.rtyper.lltypesystem import lltype, rffi
+from rpython.translator.tool.cbuild import ExternalCompilationInfo
 
 from os import O_RDONLY, O_WRONLY, O_RDWR, O_CREAT, O_TRUNC, O_APPEND
 O_BINARY = getattr(os, "O_BINARY", 0)
@@ -75,13 +77,37 @@ def replace_char_with_str(string, c, s):
     return s.join(string.split(c))
 
 
+# buffering value for open_file_as_stream() that asks for an MMapFile
+MMAP_BUFFERING = -2
+
 @specialize.argtype(0)
 def open_file_as_stream(path, mode="r", buffering=-1, signal_checker=None):
     os_flags, universal, reading, writing, basemode, binary = decode_mode(mode)
     stream = open_path_helper(path, os_flags, basemode == "a", signal_checker)
+    if buffering == MMAP_BUFFERING and not writing:
+        mmapfile = mmap_disk_file(stream)
+        if mmapfile is not None:
+            return construct_stream_tower(mmapfile, 0, universal, reading,
+                                          writing, binary)
     return construct_stream_tower(stream, buffering, universal, reading,
                                   writing, binary)
 
+def mmap_disk_file(stream):
+    """Returns an MMapFile reading the same file as the DiskFile 'stream',
+    or None if it is not a non-empty regular file.  Files that are empty
+    when we open them are not mapped: this includes the files of /proc,
+    whose st_size is zero."""
+    try:
+        st = os.fstat(stream.fd)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode) or st.st_size <= 0:
+        return None
+    try:
+        return MMapFile(stream.fd)
+    except StreamErrors:
+        return None
+
 def _setfd_binary(fd):
     pass
 
@@ -180,6 +206,12 @@ def construct_stream_tower(stream, buffering, universal, reading, writing,
     return stream
 
 
+c_memchr = rffi.llexternal('memchr', [rffi.CCHARP, rffi.INT, rffi.SIZE_T],
+                           rffi.CCHARP, compilation_info=ExternalCompilationInfo(
+                               includes=['string.h']),
+                           releasegil=False, sandboxsafe=True)
+
+
 class StreamError(Exception):
     def __init__(self, message):
         self.message = message
@@ -389,103 +421,121 @@ class DiskFile(Stream):
     def try_to_find_file_descriptor(self):
         return self.fd
 
-# next class is not RPython
-
 class MMapFile(Stream):
-    """Standard I/O basis stream using mmap."""
-
-    @not_rpython
-    def __init__(self, fd, mmapaccess):
+    """Read-only basis stream using mmap.  read() and readline() copy
+    their result directly out of the mapping, so this stream doesn't
+    need a BufferingInputStream on top of it.  If the file grows, it is
+    mapped again when we reach the end of the old mapping.  Like with
+    the mmap module, the file must not be truncated while it is mapped
+    (reading the missing part would crash with SIGBUS)."""
+
+    def __init__(self, fd):
         self.fd = fd
-        self.access = mmapaccess
         self.pos = 0
+        self.mm = None
+        self.mapsize = 0
         self.remapfile()
 
     def remapfile(self):
-        import mmap
         size = os.fstat(self.fd).st_size
-        self.mm = mmap.mmap(self.fd, size, access=self.access)
+        mapsize = intmask(size)
+        if mapsize != size:
+            raise StreamError("file too large to be memory-mapped")
+        if mapsize == self.mapsize:
+            return
+        mm = None
+        if mapsize > 0:
+            try:
+                mm = rmmap.mmap(self.fd, mapsize, access=rmmap.ACCESS_READ)
+            except rmmap.RMMapError as e:
+                raise StreamError(e.message)
+        self.unmap()
+        self.mm = mm
+        self.mapsize = mapsize
+
+    def unmap(self):
+        mm = self.mm
+        if mm is not None:
+            self.mm = None
+            self.mapsize = 0
+            mm.close()
+
+    def available(self):
+        """Number of bytes that can be read from the current position,
+        after mapping the file again if it grew."""
+        if self.pos >= self.mapsize:
+            self.remapfile()
+        return self.mapsize - self.pos
 
     def close1(self, closefileno):
-        self.mm.close()
+        self.unmap()
         if closefileno:
             os.close(self.fd)
 
     def tell(self):
-        return self.pos
+        return r_longlong(self.pos)
 
     def seek(self, offset, whence):
         if whence == 0:
-            self.pos = max(0, offset)
+            pos = offset
         elif whence == 1:
-            self.pos = max(0, self.pos + offset)
+            pos = self.pos + offset
         elif whence == 2:
-            self.pos = max(0, self.mm.size() + offset)
+            self.remapfile()
+            pos = self.mapsize + offset
         else:
             raise StreamError("seek(): whence must be 0, 1 or 2")
-
-    def readall(self):
-        filesize = self.mm.size() # Actual file size, may be more than mapped
-        n = filesize - self.pos
-        data = self.mm[self.pos:]
-        if len(data) < n:
-            del data
-            # File grew since opened; remap to get the new data
-            self.remapfile()
-            data = self.mm[self.pos:]
-        self.pos += len(data)
-        return data
+        if pos < 0:
+            raise OSError(errno.EINVAL, "Invalid argument")
+        intpos = intmask(pos)
+        if intpos != pos:
+            raise StreamError("seek(): offset out of range")
+        self.pos = intpos
 
     def read(self, n):
         assert isinstance(n, int)
-        end = self.pos + n
-        data = self.mm[self.pos:end]
-        if not data:
-            # is there more data to read?
-            filesize = self.mm.size() #Actual file size, may be more than mapped
-            if filesize > self.pos:
-                # File grew since opened; remap to get the new data
-                self.remapfile()
-                data = self.mm[self.pos:end]
-        self.pos += len(data)
+        avail = self.available()
+        if n > avail:
+            n = avail
+        if n <= 0:
+            return ''
+        assert self.mm is not None
+        data = self.mm.getslice(self.pos, n)
+        self.pos += n
         return data
 
+    def readall(self):
+        self.remapfile()
+        return self.read(self.mapsize - self.pos)
+
     def readline(self):
-        hit = self.mm.find("\n", self.pos) + 1
-        if not hit:
-            # is there more data to read?
-            filesize = self.mm.size() #Actual file size, may be more than mapped
-            if filesize > len(self.mm):
-                # File grew since opened; remap to get the new data
-                self.remapfile()
-                hit = self.mm.find("\n", self.pos) + 1
-        if hit:
-            # Got a whole line
-            data = self.mm[self.pos:hit]
-            self.pos = hit
+        avail = self.available()
+        if avail <= 0:
+            return ''
+        mm = self.mm
+        assert mm is not None
+        start = mm.getptr(self.pos)
+        p = c_memchr(start, ord('\n'), avail)
+        if p:
+            n = rffi.cast(lltype.Signed, p) - rffi.cast(lltype.Signed, start)
+            n += 1
         else:
-            # Read whatever we've got -- may be empty
-            data = self.mm[self.pos:]
-            self.pos += len(data)
+            n = avail
+        data = mm.getslice(self.pos, n)
+        self.pos += n
+        if not p:
+            # the file might have grown in the meantime
+            data += self.readline()
         return data
 
-    def write(self, data):
-        end = self.pos + len(data)
-        try:
-            self.mm[self.pos:end] = data
-            # This can raise IndexError on Windows, ValueError on Unix
-        except (IndexError, ValueError):
-            # XXX On Unix, this resize() call doesn't work
-            self.mm.resize(end)
-            self.mm[self.pos:end] = data
-        self.pos = end
-
-    def flush(self):
-        self.mm.flush()
-
-    def flushable(self):
-        import mmap
-        return self.access == mmap.ACCESS_WRITE
+    def peek(self):
+        n = self.available()
+        if n > 8192:
+            n = 8192
+        if n <= 0:
+            return (0, '')
+        assert self.mm is not None
+        return (0, self.mm.getslice(self.pos, n))
 
     def try_to_find_file_descriptor(self):
         return self.fd
@@ -4,6 +4,7 @@ from rpython.rlib.objectmodel import (
     r_dict, UnboxedValue, Symbolic, compute_hash, compute_identity_hash,
     compute_unique_id, current_object_addr_as_int, we_are_translated,
     prepare_dict_update, reversed_dict, specialize, enforceargs, newlist_hint,
+    dict_compact,
     resizelist_hint, is_annotation_constant, always_inline, NOT_CONSTANT,
     iterkeys_with_hash, iteritems_with_hash, contains_with_hash,
     setitem_with_hash, getitem_with_hash, delitem_with_hash, import_from_mixin,
@@ -353,6 +354,28 @@ class TestObjectModel(BaseRtypingTest):
         res = self.interpret(g, [3])
         assert res == 42     # "did not crash"
 
+    def test_dict_compact(self):
+        def g(n):
+            d = {}
+            for i in range(n):
+                d[i] = i
+            for i in range(n - 2):
+                del d[i]
+            dict_compact(d)
+            return d[n - 2] * 1000 + d[n - 1] * 10 + len(d)
+        res = self.interpret(g, [100])
+        assert res == 98992
+        def g2(n):
+            d = OrderedDict()
+            for i in range(n):
+                d[i] = i
+            for i in range(n - 2):
+                del d[i]
+            dict_compact(d)
+            return d.keys()[0] * 1000 + d.keys()[1] * 10 + len(d)
+        res = self.interpret(g2, [100])
+        assert res == 98992
+
     def test_reversed_dict(self):
         d1 = {2: 3, 4: 5, 6: 7}
         def g():
@@ -816,6 +816,36 @@ class TestInternalFunctions(object):
                 assert rem.tolong() == _rem
         py.test.raises(ZeroDivisionError, rbigint.fromlong(x).divmod, rbigint.fromlong(0))
 
+    def test__bz_divrem(self, monkeypatch):
+        # with a tiny cutoff, to go through many levels of recursion
+        monkeypatch.setattr(lobj, 'BURNIKEL_ZIEGLER_CUTOFF', 3)
+        seed(42)
+        for i in range(40):
+            ybits = randint(1, 30 * SHIFT)
+            y = long(randint(1, 1 << ybits))
+            x = long(randint(0, 1 << (ybits + randint(0, 50 * SHIFT))))
+            if i % 5 == 0:
+                y = (1 << ybits) - 1
+            if i % 7 == 0:
+                x = (1 << (ybits * 3)) - 1
+            div, rem = lobj._bz_divrem(rbigint.fromlong(x),
+                                       rbigint.fromlong(y))
+            assert (div.tolong(), rem.tolong()) == divmod(x, y)
+            for sx, sy in (1, 1), (1, -1), (-1, -1), (-1, 1):
+                div, rem = rbigint.fromlong(sx * x).divmod(
+                    rbigint.fromlong(sy * y))
+                assert (div.tolong(), rem.tolong()) == divmod(sx * x, sy * y)
+
+    def test_divmod_big(self):
+        y = 7 ** (lobj.BURNIKEL_ZIEGLER_CUTOFF * SHIFT // 2)
+        x = 3 ** (lobj.BURNIKEL_ZIEGLER_CUTOFF * SHIFT * 2) + 12345
+        f1 = rbigint.fromlong(x)
+        f2 = rbigint.fromlong(y)
+        div, rem = f1.divmod(f2)
+        assert (div.tolong(), rem.tolong()) == divmod(x, y)
+        assert f1.mod(f2).tolong() == x % y
+        assert f1.neg().floordiv(f2).tolong() == -x // y
+
     # testing Karatsuba stuff
     def test__v_iadd(self):
         f1 = bigint([lobj.MASK] * 10, 1)
@@ -855,6 +885,40 @@ class TestInternalFunctions(object):
         ret = lobj._k_lopsided_mul(f1, f2)
         assert ret.tolong() == f1.tolong() * f2.tolong()
 
+    def test__tcmul_split(self):
+        split = 5
+        dig0 = [1] * split
+        dig1 = [0] * split
+        dig2 = [lobj.MASK] * 3
+        f1 = bigint(dig0 + dig1 + dig2, 1)
+        hi, mid, lo = lobj._tcmul_split(f1, split)
+        assert lo._digits == map(_store_digit, dig0)
+        assert mid._digits == [_store_digit(0)]
+        assert mid.sign == 0
+        assert hi._digits == map(_store_digit, dig2)
+
+    def test__tc_mul(self):
+        digs = lobj.TOOM_COOK_CUTOFF + 5
+        f1 = bigint([lobj.MASK] * digs, 1)
+        f2 = lobj._x_add(f1, bigint([1], 1))
+        ret = lobj._tc_mul(f1, f2)
+        assert ret.tolong() == f1.tolong() * f2.tolong()
+        ret = lobj._tc_mul(f1, f1)
+        assert ret.tolong() == f1.tolong() ** 2
+
+    def test_mul_toom_cook(self, monkeypatch):
+        monkeypatch.setattr(lobj, 'TOOM_COOK_CUTOFF', 3)
+        seed(42)
+        for i in range(20):
+            x = long(randint(0, 1 << randint(1, 40 * SHIFT)))
+            y = long(randint(0, 1 << randint(1, 40 * SHIFT)))
+            for sx, sy in (1, 1), (1, -1), (-1, -1):
+                f1 = rbigint.fromlong(sx * x)
+                f2 = rbigint.fromlong(sy * y)
+                assert f1.mul(f2).tolong() == sx * x * sy * y
+            f1 = rbigint.fromlong(x)
+            assert f1.mul(f1).tolong() == x * x
+
     def test_longlong(self):
         max = 1L << (r_longlong.BITS-1)
         f1 = rbigint.fromlong(max-1)    # fits in r_longlong
@@ -934,6 +998,21 @@ class TestInternalFunctions(object):
                           for i in range(len(inp)))
                 assert x.eq(rbigint.fromlong(-num))
 
+    def test_fromstr_recursive(self, monkeypatch):
+        seed(42)
+        for cutoff in [1, 2, 5]:
+            monkeypatch.setattr(lobj, 'FROMSTR_CUTOFF', cutoff)
+            for n in range(1, 300, 23):
+                s = ''.join([str(randint(0, 9)) for i in range(n)])
+                assert rbigint.fromdecimalstr(s).tolong() == long(s)
+                assert rbigint.fromdecimalstr('-' + s).tolong() == -long(s)
+                assert rbigint.fromstr(s, 10).tolong() == long(s)
+                s7 = s.replace('7', '0').replace('8', '1').replace('9', '2')
+                assert rbigint.fromstr(s7, 7).tolong() == long(s7, 7)
+                assert rbigint.fromstr(s, 36).tolong() == long(s, 36)
+        s = '0' * 500 + '1' + '0' * 500
+        assert rbigint.fromdecimalstr(s).tolong() == 10 ** 500
+
 
 BASE = 2 ** SHIFT
 
@@ -0,0 +1,75 @@
+import hashlib
+import random
+import zlib
+
+import pytest
+
+from rpython.rlib import rhashaccel, rzlib
+from rpython.rlib.rarithmetic import r_uint
+from rpython.rtyper.test.test_llinterp import interpret
+
+ALGOS = [(rhashaccel.SHA1, 'sha1'), (rhashaccel.SHA224, 'sha224'),
+         (rhashaccel.SHA256, 'sha256'), (rhashaccel.SHA384, 'sha384'),
+         (rhashaccel.SHA512, 'sha512')]
+
+
+@pytest.fixture(params=['accel', 'portable'])
+def features(request):
+    if request.param == 'portable':
+        rhashaccel.set_features_mask(0)
+        request.addfinalizer(lambda: rhashaccel.set_features_mask(-1))
+    return rhashaccel.get_features()
+
+
+def test_features():
+    assert rhashaccel.get_features() & ~(rhashaccel.FEATURE_SHA |
+                                         rhashaccel.FEATURE_CLMUL) == 0
+
+@pytest.mark.parametrize('algo, name', ALGOS)
+def test_known_values(algo, name, features):
+    for data in ['', 'abc', 'a' * 55, 'a' * 56, 'a' * 111, 'a' * 112,
+                 'abcdefgh' * 1000]:
+        h = rhashaccel.RHash(algo, data)
+        expected = hashlib.new(name, data)
+        assert h.digest_size == expected.digest_size
+        assert h.block_size == expected.block_size
+        assert h.digest() == expected.digest()
+        assert h.hexdigest() == expected.hexdigest()
+
+@pytest.mark.parametrize('algo, name', ALGOS)
+def test_random_updates(algo, name, features):
+    rnd = random.Random(42)
+    for i in range(20):
+        h = rhashaccel.RHash(algo)
+        expected = hashlib.new(name)
+        for j in range(rnd.randrange(6)):
+            data = ''.join([chr(rnd.randrange(256))
+                            for k in range(rnd.randrange(600))])
+            h.update(data)
+            expected.update(data)
+            assert h.digest() == expected.digest()
+
+@pytest.mark.parametrize('algo, name', ALGOS)
+def test_copy(algo, name):
+    h1 = rhashaccel.RHash(algo, 'abc' * 30)
+    h2 = h1.copy()
+    h1.update('def' * 30)
+    h2.update('gh' * 30)
+    assert h1.digest() == hashlib.new(name, 'abc' * 30 + 'def' * 30).digest()
+    assert h2.digest() == hashlib.new(name, 'abc' * 30 + 'gh' * 30).digest()
+
+def test_crc32(features):
+    rnd = random.Random(42)
+    data = ''.join([chr(rnd.randrange(256)) for k in range(5000)])
+    for length in [0, 15, 255, 256, 257, 1000, 4095, 5000]:
+        for start in [0, 42, 0xffffffff]:
+            expected = r_uint(zlib.crc32(data[:length], start) & 0xffffffff)
+            assert rzlib.crc32(data[:length], r_uint(start)) == expected
+
+def test_translated():
+    def f(n):
+        h = rhashaccel.RHash(rhashaccel.SHA256, 'x' * n)
+        h2 = h.copy()
+        h2.update('y')
+        return len(h.hexdigest()) + len(h2.digest())
+    assert interpret(f, [100]) == 64 + 32
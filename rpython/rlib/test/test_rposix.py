@@ -727,6 +727,57 @@ if sys.platform.startswith('linux'):
         s2.close()
         s1.close()
 
+@rposix_requires('copy_file_range')
+def test_copy_file_range():
+    fd1 = os.open(str(udir.join('test_copy_file_range_1')),
+                  os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0777)
+    fd2 = os.open(str(udir.join('test_copy_file_range_2')),
+                  os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0777)
+    try:
+        os.write(fd1, 'abcdefghij')
+        os.lseek(fd1, 0, 0)
+        try:
+            res = rposix.copy_file_range(fd1, fd2, 4)
+        except OSError as e:
+            if e.errno in (errno.ENOSYS, errno.EXDEV, errno.EOPNOTSUPP):
+                py.test.skip("copy_file_range() not supported here")
+            raise
+        assert res == 4
+        assert os.lseek(fd1, 0, 1) == 4
+        assert rposix.copy_file_range(fd1, fd2, 100, offset_src=7) == 3
+        assert os.lseek(fd1, 0, 1) == 4
+        assert rposix.copy_file_range(fd1, fd2, 2, offset_dst=20) == 2
+        assert rposix.copy_file_range(fd1, fd2, 100, 10, 10) == 0
+        os.lseek(fd2, 0, 0)
+        assert os.read(fd2, 100) == 'abcdhij' + '\x00' * 13 + 'ef'
+        with py.test.raises(OSError) as excinfo:
+            rposix.copy_file_range(fd1, 1234567, 5)
+        assert excinfo.value.errno == errno.EBADF
+    finally:
+        os.close(fd1)
+        os.close(fd2)
+
+@rposix_requires('splice')
+def test_splice():
+    fd = os.open(str(udir.join('test_splice')),
+                 os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0777)
+    r, w = os.pipe()
+    try:
+        os.write(fd, 'abcdefghij')
+        res = rposix.splice(fd, w, 5, offset_src=2)
+        assert res == 5
+        assert os.read(r, 10) == 'cdefg'
+        os.write(w, 'XYZ')
+        res = rposix.splice(r, fd, 10, offset_dst=8,
+                            flags=rposix.SPLICE_F_MOVE)
+        assert res == 3
+        os.lseek(fd, 0, 0)
+        assert os.read(fd, 20) == 'abcdefghXYZ'
+    finally:
+        os.close(fd)
+        os.close(r)
+        os.close(w)
+
 @rposix_requires('pread')
 def test_pread():
     fname = str(udir.join('os_test.txt'))
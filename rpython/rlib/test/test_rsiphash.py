@@ -2,6 +2,8 @@ import os
 from rpython.rlib.rsiphash import siphash24, _siphash24, choosen_seed
 from rpython.rlib.rsiphash import initialize_from_env, enable_siphash24
 from rpython.rlib.rsiphash import ll_hash_string_siphash24
+from rpython.rlib.rsiphash import siphash13, _siphash13, enable_siphash13
+from rpython.rlib.rsiphash import ll_hash_string_siphash13
 from rpython.rlib.objectmodel import compute_hash
 from rpython.rlib.rarithmetic import intmask
 from rpython.rtyper.annlowlevel import llstr, llunicode
@@ -64,6 +66,48 @@ def test_siphash24_latin1_unicode_prebuilt():
     for expected, string in CASES:
         check_latin1(string.decode('latin1'), expected, test_prebuilt=True)
 
+CASES13 = [    # computed with CPython 3.11 and PYTHONHASHSEED=0
+    (15970285404234903785, "h"),
+    (75654996145437033   , "he"),
+    (11013347158978293036, "hel"),
+    (7152750046684093927 , "hell"),
+    (16350172494705860510, "hello"),
+    (15039473455294701491, "hello "),
+    (15848535137682637051, "hello w"),
+    (10260330891384554701, "hello wo"),
+    (17357602464721933062, "hello wor"),
+    (9977682501103436981 , "hello worl"),
+    (12804282289674824842, "hello world"),
+    (17667430405188316055, "hello world\x9a"),
+    (10013484365859632549, "\xffhel\x82lo world\xbc"),
+    (11638998149961497046, "hexlylxox rewqwkashdw89"),
+    (4709962869857759987 , "hello woadwealidewd 3829ez 32ig dxwaebderld"),
+]
+
+def check13(s, test_prebuilt=False):
+    q = rffi.str2charp('?' + s)
+    with choosen_seed(0, 0, test_misaligned_path=True,
+                      test_prebuilt=test_prebuilt):
+        x = siphash13(s)
+        y = _siphash13(llmemory.cast_ptr_to_adr(rffi.ptradd(q, 1)), len(s))
+        z = ll_hash_string_siphash13(llstr(s))
+        u = ll_hash_string_siphash13(llunicode(s.decode('latin1')))
+    rffi.free_charp(q)
+    assert x == y
+    assert z == u == intmask(x)
+    return x
+
+def test_siphash13():
+    for expected, string in CASES13:
+        assert check13(string) == expected
+        assert check13(string, test_prebuilt=True) == expected
+
+def test_siphash13_differs_from_siphash24():
+    with choosen_seed(0x8a9f065a358479f4, 0x11cb1e9ee7f40e1f):
+        for expected, string in CASES:
+            assert siphash24(string) == expected
+            assert siphash13(string) != expected
+
 def test_fix_seed():
     old_val = os.environ.get('PYTHONHASHSEED', None)
     try:
@@ -71,6 +115,8 @@ def test_fix_seed():
         initialize_from_env()
         assert siphash24("foo") == 15988776847138518036
         # value checked with CPython 3.5 (turned positive by adding 2**64)
+        assert siphash13("foo") == 7664243301495174138
+        # value checked with CPython 3.11
 
         os.environ['PYTHONHASHSEED'] = '4000000000'
         initialize_from_env()
@@ -166,3 +212,30 @@ def test_translated():
             del os.environ['PYTHONHASHSEED']
         else:
             os.environ['PYTHONHASHSEED'] = old_val
+
+def test_translated_siphash13():
+    d1 = {"foo": 123}
+    class G:
+        pass
+    g = G()
+    g.v1 = d1.copy()
+
+    def entrypoint(n):
+        enable_siphash13()
+        g.v1["bar"] = -2
+        return '%d %d %d %d' % (d1.get("foo", -1), g.v1.get("foo", -1),
+                                compute_hash("foo"), compute_hash(u"foo"))
+
+    fn = compile(entrypoint, [int])
+
+    old_val = os.environ.get('PYTHONHASHSEED', None)
+    try:
+        os.environ['PYTHONHASHSEED'] = '0'
+        assert map(int, fn(0).split()) == [
+            123, 123, intmask(7664243301495174138),
+            intmask(7664243301495174138)]
+    finally:
+        if old_val is None:
+            del os.environ['PYTHONHASHSEED']
+        else:
+            os.environ['PYTHONHASHSEED'] = old_val
@@ -271,6 +271,24 @@ def test_cornercases():
         buf = buf[-unused:]
     rzlib.deflateEnd(stream)
 
+def test_deflate_block():
+    data = ''.join(['%d:%s,' % (i, 'x' * (i % 37)) for i in range(5000)])
+    size = 10000
+    pieces = []
+    for start in range(0, len(data), size):
+        dictionary = data[max(0, start - 32768):start]
+        pieces.append(rzlib.deflate_block(data[start:start + size],
+                                          dictionary,
+                                          last=start + size >= len(data)))
+    assert len(pieces) > 2
+    raw = ''.join(pieces)
+    assert zlib.decompress(raw, -15) == data
+    # priming with the previous data gives back what would otherwise be lost
+    unprimed = [rzlib.deflate_block(data[start:start + size])
+                for start in range(0, len(data), size)]
+    assert len(raw) < len(''.join(unprimed))
+    assert zlib.decompress(rzlib.deflate_block('', last=True), -15) == ''
+
 def test_zlibVersion():
     runtime_version = rzlib.zlibVersion()
     assert runtime_version[0] == rzlib.ZLIB_VERSION[0]
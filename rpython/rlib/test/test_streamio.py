@@ -695,39 +695,73 @@ class TestMMapFile(BaseTestBufferingInputStreamTests):
             except os.error as msg:
                 print "can't remove %s: %s" % (tfn, msg)
 
-    def makeStream(self, tell=None, seek=None, bufsize=-1, mode="r"):
-        mmapmode = 0
-        filemode = 0
-        import mmap
-        if "r" in mode:
-            mmapmode = mmap.ACCESS_READ
-            filemode = os.O_RDONLY
-        if "w" in mode:
-            mmapmode |= mmap.ACCESS_WRITE
-            filemode |= os.O_WRONLY
+    def makeStream(self, tell=None, seek=None, bufsize=-1):
         self.teardown_method(None) # for tests calling makeStream() several time
         self.tfn = str(udir.join('streamio%03d' % TestMMapFile.Counter))
         TestMMapFile.Counter += 1
         f = open(self.tfn, "wb")
         f.writelines(self.packets)
         f.close()
-        self.fd = os.open(self.tfn, filemode)
-        return streamio.MMapFile(self.fd, mmapmode)
+        self.fd = os.open(self.tfn, os.O_RDONLY)
+        return streamio.MMapFile(self.fd)
 
-    def test_write(self):
-        if os.name == "posix" or os.name == 'nt':
-            return # write() does't work on Unix nor on win32:-(
-        file = self.makeStream(mode="w")
-        file.write("BooHoo\n")
-        file.write("Barf\n")
-        file.writelines(["a\n", "b\n", "c\n"])
-        assert file.tell() == len("BooHoo\nBarf\na\nb\nc\n")
-        file.seek(0, 0)
-        assert file.read() == "BooHoo\nBarf\na\nb\nc\n"
-        file.seek(0, 0)
-        assert file.readlines() == (
-                         ["BooHoo\n", "Barf\n", "a\n", "b\n", "c\n"])
-        assert file.tell() == len("BooHoo\nBarf\na\nb\nc\n")
+    def test_file_grows(self):
+        file = self.makeStream()
+        assert file.readall() == "".join(self.packets)
+        assert file.read(5) == ""
+        assert file.readline() == ""
+        with open(self.tfn, "ab") as f:
+            f.write("yz\nlast")
+        assert file.readline() == "yz\n"
+        assert file.read(100) == "last"
+        file.seek(-6, 2)
+        assert file.readline() == "z\n"
+        assert file.tell() == len("".join(self.packets)) + 3
+        with open(self.tfn, "ab") as f:
+            f.write(" line\n")
+        assert file.readline() == "last line\n"
+        file.close()
+
+    def test_open_file_as_stream(self):
+        fo = streamio.open_file_as_stream
+        self.makeStream().close()
+        for mode in ['rb', 'r', 'rU']:
+            file = fo(self.tfn, mode, streamio.MMAP_BUFFERING)
+            assert file.readline() == "ab\n"
+            assert file.read(2) == "de"
+            assert file.readall() == "f\nxy\npq\nuvwx"
+            file.close()
+        file = fo(self.tfn, 'r+b', streamio.MMAP_BUFFERING)
+        assert isinstance(file, streamio.BufferingInputStream)
+        file.close()
+        # empty files and non-regular files are not mapped
+        open(self.tfn, "wb").close()
+        file = fo(self.tfn, 'rb', streamio.MMAP_BUFFERING)
+        assert isinstance(file, streamio.BufferingInputStream)
+        assert file.readall() == ""
+        file.close()
+
+
+class TestMMapFileLLinterp(BaseRtypingTest):
+
+    def test_open_file_as_stream(self):
+        tfn = str(udir.join('streamio-mmap-llinterp'))
+        with open(tfn, 'wb') as f:
+            f.write("ab\ncd\nef")
+        def f():
+            file = streamio.open_file_as_stream(tfn, 'rb',
+                                                streamio.MMAP_BUFFERING)
+            n = 0
+            while True:
+                line = file.readline()
+                if not line:
+                    break
+                n = n * 10 + len(line)
+            file.seek(1, 0)
+            n = n * 10 + len(file.read(100))
+            file.close()
+            return n
+        assert self.interpret(f, []) == 3327
 
 
 class BaseTestBufferingInputOutputStreamTests(BaseRtypingTest):
@@ -1201,17 +1235,8 @@ def speed_main():
         return streamio.BufferingInputStream(base)
 
     def mmapopen(fn, mode):
-        mmapmode = 0
-        filemode = 0
-        import mmap
-        if "r" in mode:
-            mmapmode = mmap.ACCESS_READ
-            filemode = os.O_RDONLY
-        if "w" in mode:
-            mmapmode |= mmap.ACCESS_WRITE
-            filemode |= os.O_WRONLY
-        fd = os.open(fn, filemode)
-        return streamio.MMapFile(fd, mmapmode)
+        fd = os.open(fn, os.O_RDONLY)
+        return streamio.MMapFile(fd)
 
     timeit(opener=diskopen)
     timeit(opener=mmapopen)
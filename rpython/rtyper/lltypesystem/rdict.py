@@ -286,6 +286,11 @@ class DictRepr(AbstractDictRepr):
         hop.exception_cannot_occur()
         hop.gendirectcall(ll_prepare_dict_update, v_dict, v_num)
 
+    def rtype_method__dict_compact(self, hop):
+        v_dict, = hop.inputargs(self)
+        hop.exception_cannot_occur()
+        hop.gendirectcall(ll_dict_compact, v_dict)
+
     def _rtype_method_kvi(self, hop, ll_func):
         v_dic, = hop.inputargs(self)
         r_list = hop.r_result
@@ -817,6 +822,10 @@ def ll_prepare_dict_update(d, num_extra):
     jit.conditional_call(d.resize_counter <= x * 3,
                          _ll_dict_resize_to, d, num_extra)
 
+def ll_dict_compact(d):
+    # reallocate 'd' with the smallest size that can hold its items
+    _ll_dict_resize_to(d, 0)
+
 # this is an implementation of keys(), values() and items()
 # in a single function.
 # note that by specialization on func, three different
@@ -315,6 +315,11 @@ class OrderedDictRepr(AbstractDictRepr):
         hop.exception_cannot_occur()
         hop.gendirectcall(ll_prepare_dict_update, v_dict, v_num)
 
+    def rtype_method__dict_compact(self, hop):
+        v_dict, = hop.inputargs(self)
+        hop.exception_cannot_occur()
+        hop.gendirectcall(ll_dict_compact, v_dict)
+
     def _rtype_method_kvi(self, hop, ll_func):
         v_dic, = hop.inputargs(self)
         r_list = hop.r_result
@@ -782,11 +787,24 @@ def ll_dict_grow(d):
     return False
 
 @jit.dont_look_inside
-def ll_dict_remove_deleted_items(d):
+def ll_dict_remove_deleted_items(d, new_size=0):
+    # Compact the entries and reindex.  If 'new_size' is given, the indexes
+    # are reallocated with this size, which may be smaller than before.
     if d.num_live_items < len(d.entries) // 4:
         # At least 75% of the allocated entries are dead, so shrink the memory
         # allocated as well as doing a compaction.
         new_allocated = _overallocate_entries_len(d.num_live_items)
+    else:
+        new_allocated = len(d.entries)
+    _ll_dict_compact_entries(d, new_allocated)
+    if new_size == 0:
+        new_size = _ll_len_of_d_indexes(d)
+    ll_dict_reindex(d, new_size)
+
+def _ll_dict_compact_entries(d, new_allocated):
+    # Move the live entries to the start of an array of length
+    # 'new_allocated', which is 'd.entries' itself if it has this length.
+    if new_allocated != len(d.entries):
         newitems = lltype.malloc(lltype.typeOf(d).TO.entries.TO, new_allocated)
     else:
         newitems = d.entries
@@ -830,7 +848,23 @@ def ll_dict_remove_deleted_items(d):
     else:
         d.entries = newitems
 
-    ll_dict_reindex(d, _ll_len_of_d_indexes(d))
+@jit.dont_look_inside
+def ll_dict_compact(d):
+    # Remove the deleted entries, and shrink both 'd.entries' and
+    # 'd.indexes' to the smallest size that can hold the live items.
+    # The next insertion will grow them again.
+    if (d.lookup_function_no & FUNC_MASK) == FUNC_MUST_REINDEX:
+        return     # fresh or prebuilt dict, nothing was deleted
+    if d.num_live_items == 0:
+        d.entries = _ll_empty_array(lltype.typeOf(d).TO)
+        d.num_ever_used_items = 0
+        ll_dict_reindex(d, DICT_INITSIZE)
+        return
+    _ll_dict_compact_entries(d, d.num_live_items)
+    new_size = DICT_INITSIZE
+    while new_size * 2 - d.num_live_items * 3 <= 0:
+        new_size *= 2
+    ll_dict_reindex(d, new_size)
 
 
 def ll_dict_delitem(d, key):
@@ -909,7 +943,9 @@ def _ll_dict_resize_to(d, num_extra):
         new_size *= 2
 
     if new_size < _ll_len_of_d_indexes(d):
-        ll_dict_remove_deleted_items(d)
+        # many entries were deleted: compact the dict, and shrink
+        # the indexes too
+        ll_dict_remove_deleted_items(d, new_size)
     else:
         ll_dict_reindex(d, new_size)
 
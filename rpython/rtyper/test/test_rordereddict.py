@@ -141,6 +141,52 @@ class TestRDictDirect(object):
             rordereddict.ll_dict_delitem(ll_d, lls)
         assert ll_d.num_ever_used_items <= 10
 
+    def test_dict_shrink(self):
+        DICT = self._get_int_dict()
+        ll_d = rordereddict.ll_newdict(DICT)
+        for i in range(10000):
+            rordereddict.ll_dict_setitem(ll_d, i, i)
+        big_indexes = len(get_indexes(ll_d))
+        big_entries = len(ll_d.entries)
+        for i in range(9990):
+            rordereddict.ll_dict_delitem(ll_d, i)
+        assert len(get_indexes(ll_d)) <= big_indexes // 16
+        assert len(ll_d.entries) <= big_entries // 16
+        for i in range(9990, 10000):
+            assert rordereddict.ll_dict_getitem(ll_d, i) == i
+        for i in range(100):
+            rordereddict.ll_dict_setitem(ll_d, i, -i)
+        for i in range(100):
+            assert rordereddict.ll_dict_getitem(ll_d, i) == -i
+        assert rordereddict.ll_dict_len(ll_d) == 110
+
+    def test_dict_compact(self):
+        DICT = self._get_int_dict()
+        ll_d = rordereddict.ll_newdict(DICT)
+        rordereddict.ll_dict_compact(ll_d)     # no index yet
+        for i in range(100):
+            rordereddict.ll_dict_setitem(ll_d, i, i)
+        for i in range(0, 100, 4):
+            rordereddict.ll_dict_delitem(ll_d, i)
+        assert len(get_indexes(ll_d)) == 256
+        rordereddict.ll_dict_compact(ll_d)
+        assert len(get_indexes(ll_d)) == 128
+        assert len(ll_d.entries) == 75
+        assert ll_d.num_ever_used_items == 75
+        keys = [i for i in range(100) if i % 4 != 0]
+        assert [entry.key for entry in self._ll_iter(ll_d)] == keys
+        for i in keys:
+            assert rordereddict.ll_dict_getitem(ll_d, i) == i
+        rordereddict.ll_dict_setitem(ll_d, 1000, 1000)
+        assert rordereddict.ll_dict_getitem(ll_d, 1000) == 1000
+        for i in keys + [1000]:
+            rordereddict.ll_dict_delitem(ll_d, i)
+        rordereddict.ll_dict_compact(ll_d)
+        assert len(get_indexes(ll_d)) == rordereddict.DICT_INITSIZE
+        assert len(ll_d.entries) == 0
+        rordereddict.ll_dict_setitem(ll_d, 5, 6)
+        assert rordereddict.ll_dict_getitem(ll_d, 5) == 6
+
     def test_dict_iteration(self):
         DICT = self._get_str_dict()
         ll_d = rordereddict.ll_newdict(DICT)
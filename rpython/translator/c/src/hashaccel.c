@@ -0,0 +1,563 @@
+/* SHA-1, SHA-2 and CRC-32, with the x86 SHA extensions and PCLMULQDQ
+   when the CPU has them.  The portable versions are used otherwise. */
+
+#include "src/hashaccel.h"
+
+#include <string.h>
+#include <stdint.h>
+
+#if (defined(__x86_64__) || defined(__i386__)) && \
+    (defined(__clang__) || (defined(__GNUC__) && __GNUC__ >= 5))
+#  define HASHACCEL_X86
+#  include <cpuid.h>
+#  include <immintrin.h>
+#  define TARGET(features)  __attribute__((target(features)))
+#endif
+
+
+static int features = -1;
+
+static int detect_features(void)
+{
+    int result = 0;
+#ifdef HASHACCEL_X86
+    unsigned int eax, ebx, ecx, edx;
+    int sse41 = 0;
+    if (__get_cpuid(1, &eax, &ebx, &ecx, &edx)) {
+        sse41 = (ecx & bit_SSSE3) && (ecx & bit_SSE4_1);
+        if (sse41 && (ecx & bit_PCLMUL))
+            result |= PYPY_HASHACCEL_CLMUL;
+    }
+    if (sse41 && __get_cpuid_max(0, NULL) >= 7) {
+        __cpuid_count(7, 0, eax, ebx, ecx, edx);
+        if (ebx & (1 << 29))       /* SHA */
+            result |= PYPY_HASHACCEL_SHA;
+    }
+#endif
+    return result;
+}
+
+int pypy_hashaccel_features(void)
+{
+    if (features < 0)
+        features = detect_features();
+    return features;
+}
+
+void pypy_hashaccel_set_mask(int mask)
+{
+    features = detect_features() & mask;
+}
+
+
+static uint32_t load_be32(const unsigned char *p)
+{
+    return ((uint32_t)p[0] << 24) | ((uint32_t)p[1] << 16) |
+           ((uint32_t)p[2] << 8) | (uint32_t)p[3];
+}
+
+static uint64_t load_be64(const unsigned char *p)
+{
+    return ((uint64_t)load_be32(p) << 32) | load_be32(p + 4);
+}
+
+static void store_be32(unsigned char *p, uint32_t x)
+{
+    p[0] = (unsigned char)(x >> 24);
+    p[1] = (unsigned char)(x >> 16);
+    p[2] = (unsigned char)(x >> 8);
+    p[3] = (unsigned char)x;
+}
+
+static void store_be64(unsigned char *p, uint64_t x)
+{
+    store_be32(p, (uint32_t)(x >> 32));
+    store_be32(p + 4, (uint32_t)x);
+}
+
+#define ROL32(x, n)  (((x) << (n)) | ((x) >> (32 - (n))))
+#define ROR32(x, n)  (((x) >> (n)) | ((x) << (32 - (n))))
+#define ROR64(x, n)  (((x) >> (n)) | ((x) << (64 - (n))))
+
+
+/************************************************************/
+/* SHA-1                                                    */
+
+static void sha1_blocks_generic(uint32_t *state, const unsigned char *data,
+                                long nblocks)
+{
+    uint32_t w[80], a, b, c, d, e, f, k, tmp;
+    int t;
+
+    while (nblocks-- > 0) {
+        for (t = 0; t < 16; t++)
+            w[t] = load_be32(data + 4 * t);
+        for (t = 16; t < 80; t++)
+            w[t] = ROL32(w[t-3] ^ w[t-8] ^ w[t-14] ^ w[t-16], 1);
+        a = state[0]; b = state[1]; c = state[2]; d = state[3]; e = state[4];
+        for (t = 0; t < 80; t++) {
+            if (t < 20) {
+                f = (b & c) | (~b & d);
+                k = 0x5A827999U;
+            }
+            else if (t < 40) {
+                f = b ^ c ^ d;
+                k = 0x6ED9EBA1U;
+            }
+            else if (t < 60) {
+                f = (b & c) | (b & d) | (c & d);
+                k = 0x8F1BBCDCU;
+            }
+            else {
+                f = b ^ c ^ d;
+                k = 0xCA62C1D6U;
+            }
+            tmp = ROL32(a, 5) + f + e + k + w[t];
+            e = d;
+            d = c;
+            c = ROL32(b, 30);
+            b = a;
+            a = tmp;
+        }
+        state[0] += a; state[1] += b; state[2] += c; state[3] += d;
+        state[4] += e;
+        data += 64;
+    }
+}
+
+#ifdef HASHACCEL_X86
+/* Four rounds, and the message words for the next ones.  The group 'g'
+   of four message words is computed from the four previous groups,
+   which are kept in msg[g & 3], ..., msg[(g + 3) & 3]. */
+#define SHA1_GROUP(g)                                                   \
+    if ((g) >= 4) {                                                     \
+        msg[(g) & 3] = _mm_sha1msg2_epu32(                              \
+            _mm_xor_si128(_mm_sha1msg1_epu32(msg[(g) & 3],              \
+                                             msg[((g) + 1) & 3]),       \
+                          msg[((g) + 2) & 3]),                          \
+            msg[((g) + 3) & 3]);                                        \
+    }                                                                   \
+    if ((g) == 0)                                                       \
+        e = _mm_add_epi32(e, msg[0]);                                   \
+    else                                                                \
+        e = _mm_sha1nexte_epu32(prev, msg[(g) & 3]);                    \
+    prev = abcd;                                                        \
+    abcd = _mm_sha1rnds4_epu32(abcd, e, (g) / 5)
+
+TARGET("sha,sse4.1,ssse3")
+static void sha1_blocks_shani(uint32_t *state, const unsigned char *data,
+                              long nblocks)
+{
+    const __m128i mask = _mm_set_epi64x(0x0001020304050607ULL,
+                                        0x08090a0b0c0d0e0fULL);
+    __m128i abcd, e, prev, abcd_save, e_save, msg[4];
+    int i;
+
+    abcd = _mm_loadu_si128((const __m128i *)state);
+    abcd = _mm_shuffle_epi32(abcd, 0x1B);
+    e = _mm_set_epi32(state[4], 0, 0, 0);
+
+    while (nblocks-- > 0) {
+        abcd_save = abcd;
+        e_save = e;
+        for (i = 0; i < 4; i++)
+            msg[i] = _mm_shuffle_epi8(
+                _mm_loadu_si128((const __m128i *)(data + 16 * i)), mask);
+        SHA1_GROUP(0);  SHA1_GROUP(1);  SHA1_GROUP(2);  SHA1_GROUP(3);
+        SHA1_GROUP(4);  SHA1_GROUP(5);  SHA1_GROUP(6);  SHA1_GROUP(7);
+        SHA1_GROUP(8);  SHA1_GROUP(9);  SHA1_GROUP(10); SHA1_GROUP(11);
+        SHA1_GROUP(12); SHA1_GROUP(13); SHA1_GROUP(14); SHA1_GROUP(15);
+        SHA1_GROUP(16); SHA1_GROUP(17); SHA1_GROUP(18); SHA1_GROUP(19);
+        e = _mm_sha1nexte_epu32(prev, e_save);
+        abcd = _mm_add_epi32(abcd, abcd_save);
+        data += 64;
+    }
+
+    abcd = _mm_shuffle_epi32(abcd, 0x1B);
+    _mm_storeu_si128((__m128i *)state, abcd);
+    state[4] = (uint32_t)_mm_extract_epi32(e, 3);
+}
+#endif
+
+
+/************************************************************/
+/* SHA-256                                                  */
+
+static const uint32_t k256[64] = {
+    0x428a2f98U, 0x71374491U, 0xb5c0fbcfU, 0xe9b5dba5U, 0x3956c25bU, 0x59f111f1U,
+    0x923f82a4U, 0xab1c5ed5U, 0xd807aa98U, 0x12835b01U, 0x243185beU, 0x550c7dc3U,
+    0x72be5d74U, 0x80deb1feU, 0x9bdc06a7U, 0xc19bf174U, 0xe49b69c1U, 0xefbe4786U,
+    0x0fc19dc6U, 0x240ca1ccU, 0x2de92c6fU, 0x4a7484aaU, 0x5cb0a9dcU, 0x76f988daU,
+    0x983e5152U, 0xa831c66dU, 0xb00327c8U, 0xbf597fc7U, 0xc6e00bf3U, 0xd5a79147U,
+    0x06ca6351U, 0x14292967U, 0x27b70a85U, 0x2e1b2138U, 0x4d2c6dfcU, 0x53380d13U,
+    0x650a7354U, 0x766a0abbU, 0x81c2c92eU, 0x92722c85U, 0xa2bfe8a1U, 0xa81a664bU,
+    0xc24b8b70U, 0xc76c51a3U, 0xd192e819U, 0xd6990624U, 0xf40e3585U, 0x106aa070U,
+    0x19a4c116U, 0x1e376c08U, 0x2748774cU, 0x34b0bcb5U, 0x391c0cb3U, 0x4ed8aa4aU,
+    0x5b9cca4fU, 0x682e6ff3U, 0x748f82eeU, 0x78a5636fU, 0x84c87814U, 0x8cc70208U,
+    0x90befffaU, 0xa4506cebU, 0xbef9a3f7U, 0xc67178f2U
+};
+
+static void sha256_blocks_generic(uint32_t *state, const unsigned char *data,
+                                  long nblocks)
+{
+    uint32_t w[64], s[8], s0, s1, t1, t2;
+    int t;
+
+    while (nblocks-- > 0) {
+        for (t = 0; t < 16; t++)
+            w[t] = load_be32(data + 4 * t);
+        for (t = 16; t < 64; t++) {
+            s0 = ROR32(w[t-15], 7) ^ ROR32(w[t-15], 18) ^ (w[t-15] >> 3);
+            s1 = ROR32(w[t-2], 17) ^ ROR32(w[t-2], 19) ^ (w[t-2] >> 10);
+            w[t] = w[t-16] + s0 + w[t-7] + s1;
+        }
+        memcpy(s, state, sizeof(s));
+        for (t = 0; t < 64; t++) {
+            t1 = s[7] + (ROR32(s[4], 6) ^ ROR32(s[4], 11) ^ ROR32(s[4], 25))
+                 + (s[6] ^ (s[4] & (s[5] ^ s[6]))) + k256[t] + w[t];
+            t2 = (ROR32(s[0], 2) ^ ROR32(s[0], 13) ^ ROR32(s[0], 22))
+                 + ((s[0] & s[1]) | (s[2] & (s[0] | s[1])));
+            s[7] = s[6]; s[6] = s[5]; s[5] = s[4]; s[4] = s[3] + t1;
+            s[3] = s[2]; s[2] = s[1]; s[1] = s[0]; s[0] = t1 + t2;
+        }
+        for (t = 0; t < 8; t++)
+            state[t] += s[t];
+        data += 64;
+    }
+}
+
+#ifdef HASHACCEL_X86
+/* Four rounds, and the message words for the next ones, as above */
+#define SHA256_GROUP(g)                                                 \
+    if ((g) >= 4) {                                                     \
+        tmp = _mm_sha256msg1_epu32(msg[(g) & 3], msg[((g) + 1) & 3]);   \
+        tmp = _mm_add_epi32(tmp, _mm_alignr_epi8(msg[((g) + 3) & 3],    \
+                                                 msg[((g) + 2) & 3], 4)); \
+        msg[(g) & 3] = _mm_sha256msg2_epu32(tmp, msg[((g) + 3) & 3]);   \
+    }                                                                   \
+    tmp = _mm_add_epi32(msg[(g) & 3],                                   \
+                   _mm_loadu_si128((const __m128i *)(k256 + 4 * (g)))); \
+    state1 = _mm_sha256rnds2_epu32(state1, state0, tmp);                \
+    tmp = _mm_shuffle_epi32(tmp, 0x0E);                                 \
+    state0 = _mm_sha256rnds2_epu32(state0, state1, tmp)
+
+TARGET("sha,sse4.1,ssse3")
+static void sha256_blocks_shani(uint32_t *state, const unsigned char *data,
+                                long nblocks)
+{
+    const __m128i mask = _mm_set_epi64x(0x0c0d0e0f08090a0bULL,
+                                        0x0405060700010203ULL);
+    __m128i state0, state1, save0, save1, tmp, msg[4];
+    int i;
+
+    /* reorder the state words as needed by sha256rnds2 */
+    tmp = _mm_loadu_si128((const __m128i *)state);
+    state1 = _mm_loadu_si128((const __m128i *)(state + 4));
+    tmp = _mm_shuffle_epi32(tmp, 0xB1);                 /* CDAB */
+    state1 = _mm_shuffle_epi32(state1, 0x1B);           /* EFGH */
+    state0 = _mm_alignr_epi8(tmp, state1, 8);           /* ABEF */
+    state1 = _mm_blend_epi16(state1, tmp, 0xF0);        /* CDGH */
+
+    while (nblocks-- > 0) {
+        save0 = state0;
+        save1 = state1;
+        for (i = 0; i < 4; i++)
+            msg[i] = _mm_shuffle_epi8(
+                _mm_loadu_si128((const __m128i *)(data + 16 * i)), mask);
+        SHA256_GROUP(0);  SHA256_GROUP(1);  SHA256_GROUP(2);  SHA256_GROUP(3);
+        SHA256_GROUP(4);  SHA256_GROUP(5);  SHA256_GROUP(6);  SHA256_GROUP(7);
+        SHA256_GROUP(8);  SHA256_GROUP(9);  SHA256_GROUP(10); SHA256_GROUP(11);
+        SHA256_GROUP(12); SHA256_GROUP(13); SHA256_GROUP(14); SHA256_GROUP(15);
+        state0 = _mm_add_epi32(state0, save0);
+        state1 = _mm_add_epi32(state1, save1);
+        data += 64;
+    }
+
+    tmp = _mm_shuffle_epi32(state0, 0x1B);              /* FEBA */
+    state1 = _mm_shuffle_epi32(state1, 0xB1);           /* DCHG */
+    state0 = _mm_blend_epi16(tmp, state1, 0xF0);        /* DCBA */
+    state1 = _mm_alignr_epi8(state1, tmp, 8);           /* HGFE */
+    _mm_storeu_si128((__m128i *)state, state0);
+    _mm_storeu_si128((__m128i *)(state + 4), state1);
+}
+#endif
+
+
+/************************************************************/
+/* SHA-512 (there are no SHA-512 instructions on most CPUs) */
+
+static const uint64_t k512[80] = {
+    0x428a2f98d728ae22ULL, 0x7137449123ef65cdULL, 0xb5c0fbcfec4d3b2fULL,
+    0xe9b5dba58189dbbcULL, 0x3956c25bf348b538ULL, 0x59f111f1b605d019ULL,
+    0x923f82a4af194f9bULL, 0xab1c5ed5da6d8118ULL, 0xd807aa98a3030242ULL,
+    0x12835b0145706fbeULL, 0x243185be4ee4b28cULL, 0x550c7dc3d5ffb4e2ULL,
+    0x72be5d74f27b896fULL, 0x80deb1fe3b1696b1ULL, 0x9bdc06a725c71235ULL,
+    0xc19bf174cf692694ULL, 0xe49b69c19ef14ad2ULL, 0xefbe4786384f25e3ULL,
+    0x0fc19dc68b8cd5b5ULL, 0x240ca1cc77ac9c65ULL, 0x2de92c6f592b0275ULL,
+    0x4a7484aa6ea6e483ULL, 0x5cb0a9dcbd41fbd4ULL, 0x76f988da831153b5ULL,
+    0x983e5152ee66dfabULL, 0xa831c66d2db43210ULL, 0xb00327c898fb213fULL,
+    0xbf597fc7beef0ee4ULL, 0xc6e00bf33da88fc2ULL, 0xd5a79147930aa725ULL,
+    0x06ca6351e003826fULL, 0x142929670a0e6e70ULL, 0x27b70a8546d22ffcULL,
+    0x2e1b21385c26c926ULL, 0x4d2c6dfc5ac42aedULL, 0x53380d139d95b3dfULL,
+    0x650a73548baf63deULL, 0x766a0abb3c77b2a8ULL, 0x81c2c92e47edaee6ULL,
+    0x92722c851482353bULL, 0xa2bfe8a14cf10364ULL, 0xa81a664bbc423001ULL,
+    0xc24b8b70d0f89791ULL, 0xc76c51a30654be30ULL, 0xd192e819d6ef5218ULL,
+    0xd69906245565a910ULL, 0xf40e35855771202aULL, 0x106aa07032bbd1b8ULL,
+    0x19a4c116b8d2d0c8ULL, 0x1e376c085141ab53ULL, 0x2748774cdf8eeb99ULL,
+    0x34b0bcb5e19b48a8ULL, 0x391c0cb3c5c95a63ULL, 0x4ed8aa4ae3418acbULL,
+    0x5b9cca4f7763e373ULL, 0x682e6ff3d6b2b8a3ULL, 0x748f82ee5defb2fcULL,
+    0x78a5636f43172f60ULL, 0x84c87814a1f0ab72ULL, 0x8cc702081a6439ecULL,
+    0x90befffa23631e28ULL, 0xa4506cebde82bde9ULL, 0xbef9a3f7b2c67915ULL,
+    0xc67178f2e372532bULL, 0xca273eceea26619cULL, 0xd186b8c721c0c207ULL,
+    0xeada7dd6cde0eb1eULL, 0xf57d4f7fee6ed178ULL, 0x06f067aa72176fbaULL,
+    0x0a637dc5a2c898a6ULL, 0x113f9804bef90daeULL, 0x1b710b35131c471bULL,
+    0x28db77f523047d84ULL, 0x32caab7b40c72493ULL, 0x3c9ebe0a15c9bebcULL,
+    0x431d67c49c100d4cULL, 0x4cc5d4becb3e42b6ULL, 0x597f299cfc657e2aULL,
+    0x5fcb6fab3ad6faecULL, 0x6c44198c4a475817ULL
+};
+
+static void sha512_blocks_generic(uint64_t *state, const unsigned char *data,
+                                  long nblocks)
+{
+    uint64_t w[80], s[8], s0, s1, t1, t2;
+    int t;
+
+    while (nblocks-- > 0) {
+        for (t = 0; t < 16; t++)
+            w[t] = load_be64(data + 8 * t);
+        for (t = 16; t < 80; t++) {
+            s0 = ROR64(w[t-15], 1) ^ ROR64(w[t-15], 8) ^ (w[t-15] >> 7);
+            s1 = ROR64(w[t-2], 19) ^ ROR64(w[t-2], 61) ^ (w[t-2] >> 6);
+            w[t] = w[t-16] + s0 + w[t-7] + s1;
+        }
+        memcpy(s, state, sizeof(s));
+        for (t = 0; t < 80; t++) {
+            t1 = s[7] + (ROR64(s[4], 14) ^ ROR64(s[4], 18) ^ ROR64(s[4], 41))
+                 + (s[6] ^ (s[4] & (s[5] ^ s[6]))) + k512[t] + w[t];
+            t2 = (ROR64(s[0], 28) ^ ROR64(s[0], 34) ^ ROR64(s[0], 39))
+                 + ((s[0] & s[1]) | (s[2] & (s[0] | s[1])));
+            s[7] = s[6]; s[6] = s[5]; s[5] = s[4]; s[4] = s[3] + t1;
+            s[3] = s[2]; s[2] = s[1]; s[1] = s[0]; s[0] = t1 + t2;
+        }
+        for (t = 0; t < 8; t++)
+            state[t] += s[t];
+        data += 128;
+    }
+}
+
+
+/************************************************************/
+/* the interface                                            */
+
+static const uint32_t init_sha1[5] = {
+    0x67452301U, 0xEFCDAB89U, 0x98BADCFEU, 0x10325476U, 0xC3D2E1F0U
+};
+static const uint32_t init_sha224[8] = {
+    0xc1059ed8U, 0x367cd507U, 0x3070dd17U, 0xf70e5939U,
+    0xffc00b31U, 0x68581511U, 0x64f98fa7U, 0xbefa4fa4U
+};
+static const uint32_t init_sha256[8] = {
+    0x6a09e667U, 0xbb67ae85U, 0x3c6ef372U, 0xa54ff53aU,
+    0x510e527fU, 0x9b05688cU, 0x1f83d9abU, 0x5be0cd19U
+};
+static const uint64_t init_sha384[8] = {
+    0xcbbb9d5dc1059ed8ULL, 0x629a292a367cd507ULL,
+    0x9159015a3070dd17ULL, 0x152fecd8f70e5939ULL,
+    0x67332667ffc00b31ULL, 0x8eb44a8768581511ULL,
+    0xdb0c2e0d64f98fa7ULL, 0x47b5481dbefa4fa4ULL
+};
+static const uint64_t init_sha512[8] = {
+    0x6a09e667f3bcc908ULL, 0xbb67ae8584caa73bULL,
+    0x3c6ef372fe94f82bULL, 0xa54ff53a5f1d36f1ULL,
+    0x510e527fade682d1ULL, 0x9b05688c2b3e6c1fULL,
+    0x1f83d9abfb41bd6bULL, 0x5be0cd19137e2179ULL
+};
+
+void pypy_hash_init(int algo, char *state)
+{
+    memset(state, 0, PYPY_HASH_STATE_SIZE);
+    switch (algo) {
+    case PYPY_HASH_SHA1:   memcpy(state, init_sha1, sizeof(init_sha1)); break;
+    case PYPY_HASH_SHA224: memcpy(state, init_sha224, sizeof(init_sha224)); break;
+    case PYPY_HASH_SHA256: memcpy(state, init_sha256, sizeof(init_sha256)); break;
+    case PYPY_HASH_SHA384: memcpy(state, init_sha384, sizeof(init_sha384)); break;
+    case PYPY_HASH_SHA512: memcpy(state, init_sha512, sizeof(init_sha512)); break;
+    }
+}
+
+void pypy_hash_blocks(int algo, char *state, const char *data, long nblocks)
+{
+    /* copy the state, which might not be aligned */
+    union { uint32_t w32[16]; uint64_t w64[8]; } s;
+    const unsigned char *p = (const unsigned char *)data;
+
+    memcpy(&s, state, PYPY_HASH_STATE_SIZE);
+    switch (algo) {
+    case PYPY_HASH_SHA1:
+#ifdef HASHACCEL_X86
+        if (pypy_hashaccel_features() & PYPY_HASHACCEL_SHA) {
+            sha1_blocks_shani(s.w32, p, nblocks);
+            break;
+        }
+#endif
+        sha1_blocks_generic(s.w32, p, nblocks);
+        break;
+    case PYPY_HASH_SHA224:
+    case PYPY_HASH_SHA256:
+#ifdef HASHACCEL_X86
+        if (pypy_hashaccel_features() & PYPY_HASHACCEL_SHA) {
+            sha256_blocks_shani(s.w32, p, nblocks);
+            break;
+        }
+#endif
+        sha256_blocks_generic(s.w32, p, nblocks);
+        break;
+    case PYPY_HASH_SHA384:
+    case PYPY_HASH_SHA512:
+        sha512_blocks_generic(s.w64, p, nblocks);
+        break;
+    }
+    memcpy(state, &s, PYPY_HASH_STATE_SIZE);
+}
+
+void pypy_hash_final(int algo, const char *state, const char *tail,
+                     long taillen, unsigned long long count, char *digest)
+{
+    union { uint32_t w32[16]; uint64_t w64[8]; } s;
+    unsigned char block[256];
+    unsigned char *out = (unsigned char *)digest;
+    long blocksize, total;
+    int i, wide = (algo == PYPY_HASH_SHA384 || algo == PYPY_HASH_SHA512);
+
+    /* padding: 0x80, zeroes, and the length in bits on 8 bytes
+       (16 bytes for the wide algorithms) */
+    blocksize = wide ? 128 : 64;
+    memcpy(block, tail, taillen);
+    block[taillen] = 0x80;
+    total = (taillen + 1 + (wide ? 16 : 8) <= blocksize) ? blocksize
+                                                         : 2 * blocksize;
+    memset(block + taillen + 1, 0, total - taillen - 1);
+    store_be64(block + total - 8, (uint64_t)count << 3);
+    if (wide)
+        store_be64(block + total - 16, (uint64_t)count >> 61);
+
+    memcpy(&s, state, PYPY_HASH_STATE_SIZE);
+    pypy_hash_blocks(algo, (char *)&s, (const char *)block,
+                     total / blocksize);
+
+    memset(out, 0, PYPY_HASH_DIGEST_SIZE);
+    if (wide) {
+        for (i = 0; i < 8; i++)
+            store_be64(out + 8 * i, s.w64[i]);
+    }
+    else {
+        for (i = 0; i < (algo == PYPY_HASH_SHA1 ? 5 : 8); i++)
+            store_be32(out + 4 * i, s.w32[i]);
+    }
+}
+
+
+/************************************************************/
+/* CRC-32                                                   */
+
+#ifdef HASHACCEL_X86
+/* Folding with carry-less multiplications, as described in Intel's paper
+   "Fast CRC Computation for Generic Polynomials Using PCLMULQDQ
+   Instruction"; the constants are for the bit-reflected CRC-32 of zlib.
+   Four 128-bit lanes are folded in parallel, then folded into one, which
+   is finally reduced to 32 bits. */
+TARGET("pclmul,sse4.1")
+static uint32_t crc32_fold_clmul(uint32_t crc, const unsigned char *buf,
+                                 long len)
+{
+    const __m128i k1k2 = _mm_set_epi64x(0x01c6e41596LL, 0x0154442bd4LL);
+    const __m128i k3k4 = _mm_set_epi64x(0x00ccaa009eLL, 0x01751997d0LL);
+    const __m128i k5k0 = _mm_set_epi64x(0x0000000000LL, 0x0163cd6124LL);
+    const __m128i poly = _mm_set_epi64x(0x01f7011641LL, 0x01db710641LL);
+    const __m128i mask32 = _mm_setr_epi32(~0, 0, ~0, 0);
+    __m128i x0, x1, x2, x3, x4, x5, x6, x7, x8;
+
+    x1 = _mm_loadu_si128((const __m128i *)(buf + 0x00));
+    x2 = _mm_loadu_si128((const __m128i *)(buf + 0x10));
+    x3 = _mm_loadu_si128((const __m128i *)(buf + 0x20));
+    x4 = _mm_loadu_si128((const __m128i *)(buf + 0x30));
+    x1 = _mm_xor_si128(x1, _mm_cvtsi32_si128((int)crc));
+    buf += 64;
+    len -= 64;
+
+    /* fold four lanes at a time */
+    x0 = k1k2;
+    while (len >= 64) {
+        x5 = _mm_clmulepi64_si128(x1, x0, 0x00);
+        x6 = _mm_clmulepi64_si128(x2, x0, 0x00);
+        x7 = _mm_clmulepi64_si128(x3, x0, 0x00);
+        x8 = _mm_clmulepi64_si128(x4, x0, 0x00);
+        x1 = _mm_clmulepi64_si128(x1, x0, 0x11);
+        x2 = _mm_clmulepi64_si128(x2, x0, 0x11);
+        x3 = _mm_clmulepi64_si128(x3, x0, 0x11);
+        x4 = _mm_clmulepi64_si128(x4, x0, 0x11);
+        x1 = _mm_xor_si128(_mm_xor_si128(x1, x5),
+                           _mm_loadu_si128((const __m128i *)(buf + 0x00)));
+        x2 = _mm_xor_si128(_mm_xor_si128(x2, x6),
+                           _mm_loadu_si128((const __m128i *)(buf + 0x10)));
+        x3 = _mm_xor_si128(_mm_xor_si128(x3, x7),
+                           _mm_loadu_si128((const __m128i *)(buf + 0x20)));
+        x4 = _mm_xor_si128(_mm_xor_si128(x4, x8),
+                           _mm_loadu_si128((const __m128i *)(buf + 0x30)));
+        buf += 64;
+        len -= 64;
+    }
+
+    /* fold the four lanes into one */
+    x0 = k3k4;
+    x5 = _mm_clmulepi64_si128(x1, x0, 0x00);
+    x1 = _mm_clmulepi64_si128(x1, x0, 0x11);
+    x1 = _mm_xor_si128(_mm_xor_si128(x1, x2), x5);
+    x5 = _mm_clmulepi64_si128(x1, x0, 0x00);
+    x1 = _mm_clmulepi64_si128(x1, x0, 0x11);
+    x1 = _mm_xor_si128(_mm_xor_si128(x1, x3), x5);
+    x5 = _mm_clmulepi64_si128(x1, x0, 0x00);
+    x1 = _mm_clmulepi64_si128(x1, x0, 0x11);
+    x1 = _mm_xor_si128(_mm_xor_si128(x1, x4), x5);
+
+    /* fold the remaining blocks of 16 bytes */
+    while (len >= 16) {
+        x2 = _mm_loadu_si128((const __m128i *)buf);
+        x5 = _mm_clmulepi64_si128(x1, x0, 0x00);
+        x1 = _mm_clmulepi64_si128(x1, x0, 0x11);
+        x1 = _mm_xor_si128(_mm_xor_si128(x1, x2), x5);
+        buf += 16;
+        len -= 16;
+    }
+
+    /* fold 128 bits to 64 bits */
+    x2 = _mm_clmulepi64_si128(x1, x0, 0x10);
+    x1 = _mm_xor_si128(_mm_srli_si128(x1, 8), x2);
+    x0 = k5k0;
+    x2 = _mm_srli_si128(x1, 4);
+    x1 = _mm_and_si128(x1, mask32);
+    x1 = _mm_clmulepi64_si128(x1, x0, 0x00);
+    x1 = _mm_xor_si128(x1, x2);
+
+    /* Barrett reduction to 32 bits */
+    x0 = poly;
+    x2 = _mm_and_si128(x1, mask32);
+    x2 = _mm_clmulepi64_si128(x2, x0, 0x10);
+    x2 = _mm_and_si128(x2, mask32);
+    x2 = _mm_clmulepi64_si128(x2, x0, 0x00);
+    x1 = _mm_xor_si128(x1, x2);
+    return (uint32_t)_mm_extract_epi32(x1, 1);
+}
+#endif
+
+unsigned long pypy_crc32_clmul(unsigned long crc, const char *data,
+                               long length)
+{
+#ifdef HASHACCEL_X86
+    if ((pypy_hashaccel_features() & PYPY_HASHACCEL_CLMUL) && length >= 64)
+        return ~crc32_fold_clmul(~(uint32_t)crc,
+                                 (const unsigned char *)data,
+                                 length & ~15L) & 0xffffffffUL;
+#endif
+    return crc;   /* not reachable if the caller checked the features */
+}
@@ -0,0 +1,46 @@
+#ifndef _PYPY_HASHACCEL_H
+#define _PYPY_HASHACCEL_H
+
+#include "src/precommondefs.h"
+
+
+/* bits in the result of pypy_hashaccel_features() */
+#define PYPY_HASHACCEL_SHA     1    /* SHA-NI: SHA-1 and SHA-256 */
+#define PYPY_HASHACCEL_CLMUL   2    /* PCLMULQDQ: CRC-32 folding */
+
+/* the algorithm numbers */
+#define PYPY_HASH_SHA1      1
+#define PYPY_HASH_SHA224    224
+#define PYPY_HASH_SHA256    256
+#define PYPY_HASH_SHA384    384
+#define PYPY_HASH_SHA512    512
+
+#define PYPY_HASH_STATE_SIZE    64    /* bytes, enough for any algorithm */
+#define PYPY_HASH_DIGEST_SIZE   64    /* idem, before truncation */
+
+/* the CPU features detected at runtime, and used by the functions below */
+RPY_EXTERN
+int pypy_hashaccel_features(void);
+/* only use the features in 'mask' from now on (for tests) */
+RPY_EXTERN
+void pypy_hashaccel_set_mask(int mask);
+
+/* 'state' is an opaque buffer of PYPY_HASH_STATE_SIZE bytes */
+RPY_EXTERN
+void pypy_hash_init(int algo, char *state);
+/* process 'nblocks' blocks of 64 bytes (128 for SHA-384 and SHA-512) */
+RPY_EXTERN
+void pypy_hash_blocks(int algo, char *state, const char *data, long nblocks);
+/* pad the 'taillen' pending bytes, where 'count' is the total number of
+   bytes, and write the digest; 'state' is not modified */
+RPY_EXTERN
+void pypy_hash_final(int algo, const char *state, const char *tail,
+                     long taillen, unsigned long long count, char *digest);
+
+/* the same result as zlib's crc32(), for a 'length' that must be a
+   multiple of 16, and at least 64; needs PYPY_HASHACCEL_CLMUL */
+RPY_EXTERN
+unsigned long pypy_crc32_clmul(unsigned long crc, const char *data,
+                               long length);
+
+#endif
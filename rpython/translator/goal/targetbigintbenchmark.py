@@ -250,6 +250,42 @@ def entry_point(argv):
     _time = time() - t
     sumTime += _time
     print "v = v + v", _time
+
+    t = time()
+    digits = "1234567890" * 10000
+    for n in xrange(5):
+        rbigint.fromdecimalstr(digits)
+
+    _time = time() - t
+    sumTime += _time
+    print "long(100000 digits string):", _time
+
+    t = time()
+    v4 = rbigint.fromdecimalstr(digits)
+    for n in xrange(5):
+        v4.str()
+
+    _time = time() - t
+    sumTime += _time
+    print "str(100000 digits long):", _time
+
+    t = time()
+    v5 = rbigint.pow(rbigint.fromint(3), rbigint.fromint(200000))
+    for n in xrange(20):
+        v5.mul(v5.add(V2))
+
+    _time = time() - t
+    sumTime += _time
+    print "v * v (300000 bits, Toom-Cook):", _time
+
+    t = time()
+    v6 = rbigint.pow(rbigint.fromint(7), rbigint.fromint(50000))
+    for n in xrange(20):
+        rbigint.divmod(v5, v6)
+
+    _time = time() - t
+    sumTime += _time
+    print "divmod 300000 bits by 140000 bits (Burnikel-Ziegler):", _time
     
     print "Sum: ", sumTime
     